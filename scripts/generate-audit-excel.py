@@ -4,13 +4,28 @@ YETO Platform Comprehensive Audit Excel Generator
 Generates a detailed Excel workbook documenting all aspects of the platform
 """
 
+import argparse
+import json
 import os
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from itertools import chain
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
 from openpyxl.utils import get_column_letter
-from openpyxl.chart import BarChart, PieChart, Reference
-from openpyxl.formatting.rule import DataBarRule, ColorScaleRule
-from datetime import datetime
+
+from yeto_excel import (
+    AUDIT_ARABIC, AUDIT_PATTERNS, DEFAULT_BATCH_SIZE, DEFAULT_COMPRESSION, DEFAULT_CONCURRENCY, DEFAULT_DRIZZLE_PATH,
+    DEFAULT_EVENT_WINDOW, DEFAULT_EXPORT_PATH, DEFAULT_GRACE_MINUTES, DEFAULT_HOST_RATE, DEFAULT_REGISTRY_PATH,
+    DEFAULT_SLA_DAYS, ENGINES, EXPORT_TABLES, FLAG_JUMP, FLAG_RANGE, FLAG_ZSCORE, LINK_THRESHOLD, RENDERED,
+    STATE_LABELS, ArtifactStore, CellStyle, Column, Instrumentation, MirroredBook, Pipeline, RunHistory, SheetGraph,
+    SheetSpec, Translation, align_regimes, build_coverage, compile_spec, connect, continued, detect_anomalies,
+    etl_performance, event_frame, event_impact, flag_labels, glossary_coverage, index_report, job_freshness,
+    latest_activity, load_export, load_registry, load_schema, open_workbook, pinned_time, pivot_counts,
+    probe_urls_async, reconcile_sources, series_frame, source_freshness, table_batches, table_count, table_name,
+    table_rows, url_host, write_pivot,
+)
+from yeto_excel.instrumentation import slug
 
 # Theme colors (Elegant Black)
 THEME = {
@@ -24,78 +39,173 @@ THEME = {
 
 SERIF_FONT = 'Georgia'
 SANS_FONT = 'Calibri'
+BORDER_COLOR = 'CCCCCC'
 
 # Styles
-header_font = Font(name=SANS_FONT, size=12, bold=True, color=THEME['white'])
-header_fill = PatternFill(start_color=THEME['header_bg'], end_color=THEME['header_bg'], fill_type='solid')
-title_font = Font(name=SERIF_FONT, size=24, bold=True, color=THEME['primary'])
-section_font = Font(name=SERIF_FONT, size=14, bold=True, color=THEME['accent'])
-normal_font = Font(name=SANS_FONT, size=11, color=THEME['primary'])
-thin_border = Border(
-    left=Side(style='thin', color='CCCCCC'),
-    right=Side(style='thin', color='CCCCCC'),
-    top=Side(style='thin', color='CCCCCC'),
-    bottom=Side(style='thin', color='CCCCCC')
-)
+header_style = CellStyle(font_name=SANS_FONT, font_size=12, bold=True, font_color=THEME['white'],
+                         fill=THEME['header_bg'], border=BORDER_COLOR, h_align='center', v_align='center')
+title_style = CellStyle(font_name=SERIF_FONT, font_size=24, bold=True, font_color=THEME['primary'])
+subtitle_style = CellStyle(font_name=SANS_FONT, font_size=12, italic=True, font_color='666666')
+section_style = CellStyle(font_name=SERIF_FONT, font_size=14, bold=True, font_color=THEME['accent'])
+normal_style = CellStyle(font_name=SANS_FONT, font_size=11, font_color=THEME['primary'])
+cell_style = normal_style._replace(border=BORDER_COLOR)
+link_style = CellStyle(font_color=THEME['accent'], underline='single')
+# Header and totals rows of the sections below a table
+section_header_style = header_style._replace(h_align=None, v_align=None)
+total_style = cell_style._replace(bold=True)
+
+# Patches laid over a column's style by the sheet specs
+ok_mark = CellStyle(font_color=THEME['accent'])
+warn_mark = CellStyle(font_color='CC6600')
+TICKED = (('✓', ok_mark),)
+count_format = CellStyle(number_format='#,##0')
+amount_format = CellStyle(number_format='#,##0.00')
+percent_format = CellStyle(number_format='0.0%')
+
+# Layout shared by the table sheets: title in B2, header in row 4, no grid
+# lines, panes frozen below the header
+AUDIT_LAYOUT = dict(start_col=2, header_row=4, header_style=header_style, header_height=30, cell_style=cell_style,
+                    title_style=title_style, subtitle_style=subtitle_style, freeze='B', gridlines=False, table=True)
+
+def audit_spec(title, columns, **options):
+    return SheetSpec(columns, **{**AUDIT_LAYOUT, 'title': title, **options})
+
+# Contents index entries, keyed by base sheet title
+SHEET_DESCRIPTIONS = {
+    "Overview": "Executive summary and key metrics",
+    "Database Audit": "Complete database table analysis with record counts",
+    "Schema": "Tables, indexes and foreign keys replayed from the drizzle migrations",
+    "Index Coverage": "Indexes serving the hot lookups, with suggested missing indexes",
+    "Sector Pages": "All 16 sector pages with implementation status",
+    "Source Coverage": "Observations per sector, indicator and source",
+    "Data Quality": "Outliers, jumps and out-of-range values in the time series",
+    "Regime Spreads": "Aden vs Sana'a spreads, volatility and coverage gaps",
+    "Regime Alignment": "Aden and Sana'a series aligned on a common calendar",
+    "Event Impact": "Indicator moves across each economic event's window",
+    "Glossary Coverage": "Glossary terms found in the titles and abstracts of the research",
+    "Prompts Status": "Status of all 24 prompts implementation",
+    "API Endpoints": "All tRPC endpoints and their functionality",
+    "Data Sources": "Complete data source registry, with endpoint health when probed",
+    "Source Reconciliation": "Registry entries across the three source files resolved to distinct sources",
+    "Implementation Status": "Feature completion checklist",
+    "ETL Performance": "Run duration percentiles, throughput and failure rates per connector and job",
+    "Freshness SLA": "Missed scheduled runs per job and stale data per source",
+    "Trends": "Headline metrics of this run against previous runs",
+}
+
+def completion_rate(rows, status_index):
+    # Share of rows whose status is ticked
+    return sum("✓" in row[status_index] for row in rows) / len(rows) if rows else None
+
+# Pipeline lane of the reads from the data source, which run one at a time
+SOURCE_LANE = 'source'
 
-def create_workbook():
-    wb = Workbook()
+def create_workbook(source, output_path, graph, pipeline, engine='openpyxl', compression=DEFAULT_COMPRESSION,
+                    workers=None, metrics=None, history=None, timestamp=None, batch_size=DEFAULT_BATCH_SIZE,
+                    schema=None, resolution=None, probes=None, arabic_path=None, event_window=DEFAULT_EVENT_WINDOW,
+                    selected=None, registry=None, sla_days=DEFAULT_SLA_DAYS, sla_as_of=None):
+    # `schema`, `resolution`, `probes` and `registry` are dataset nodes of
+    # `graph` (or None). Only the sheets titled in `selected` (all by
+    # default) and the data they read are computed.
+    # A pinned timestamp makes the file reproducible: it replaces the clock
+    # everywhere, and the run-dependent Trends sheet is left out
+    metrics = metrics or Instrumentation('audit')
     
-    # Sheet 1: Overview
-    ws = wb.active
-    ws.title = "Overview"
-    create_overview_sheet(ws)
+    # The tables are read by producers on the source's lane, one query at a
+    # time in the order the sheets need them, and the analytics run on
+    # worker threads, while the sheets before them are rendered
+    coverage = graph.dataset("Load coverage", build_coverage, table_rows(source, 'time_series'),
+                             table_rows(source, 'indicators'), table_rows(source, 'sources'), lane=SOURCE_LANE)
+    frame = graph.dataset("Load time series", series_frame, table_rows(source, 'time_series'), lane=SOURCE_LANE)
+    alignments = graph.dataset("Align regimes", align_regimes, frame)
+    events = graph.dataset("Load events", event_frame, table_rows(source, 'economic_events'), lane=SOURCE_LANE)
+    impact = graph.dataset("Join events", event_impact, events, frame, event_window, event_window)
+    glossary = graph.dataset("Tag glossary terms", glossary_coverage, table_rows(source, 'glossary_terms'),
+                             table_rows(source, 'research_publications'), table_rows(source, 'documents'),
+                             lane=SOURCE_LANE)
+    etl = graph.dataset("Load ETL runs", etl_performance, source, batch_size, lane=SOURCE_LANE)
+    # SLAs are checked as of --sla-as-of, else now; a pinned run uses the
+    # latest activity in the data, since the pinned time is not about it
+    checked = graph.dataset("Find SLA reference", sla_reference, source, batch_size, sla_as_of, timestamp,
+                            lane=SOURCE_LANE)
+    schedules = graph.dataset("Expand schedules", job_freshness, source, checked, batch_size, sla_days,
+                              lane=SOURCE_LANE)
+    freshness = graph.dataset("Check source freshness", source_freshness, source, registry, checked, batch_size,
+                              lane=SOURCE_LANE)
+    counts = graph.dataset("Count tables", table_metrics, source, lane=SOURCE_LANE) if history is not None else None
     
-    # Sheet 2: Database Audit
-    ws2 = wb.create_sheet("Database Audit")
-    create_database_sheet(ws2)
+    # Headline metrics the sheets report for the run history
+    headline = {}
     
-    # Sheet 3: Sector Pages
-    ws3 = wb.create_sheet("Sector Pages")
-    create_sector_pages_sheet(ws3)
+    # Each create_*_sheet returns the worksheets it filled, which is more
+    # than one when its rows spilled into continuation sheets
+    graph.sheet("Database Audit", create_database_sheet)
     
-    # Sheet 4: Prompts 1-24 Status
-    ws4 = wb.create_sheet("Prompts Status")
-    create_prompts_sheet(ws4)
+    # Schema model of the migrations and its index coverage
+    if schema is not None:
+        graph.sheet("Schema", create_schema_sheet, schema, headline)
+        graph.sheet("Index Coverage", create_index_sheet, schema, headline)
     
-    # Sheet 5: API Endpoints
-    ws5 = wb.create_sheet("API Endpoints")
-    create_api_sheet(ws5)
+    graph.sheet("Sector Pages", create_sector_pages_sheet, headline)
+    graph.sheet("Source Coverage", create_coverage_sheet, coverage)
     
-    # Sheet 6: Data Sources
-    ws6 = wb.create_sheet("Data Sources")
-    create_sources_sheet(ws6)
+    # Analytics of the time series, loaded once into numpy columns
+    graph.sheet("Data Quality", create_quality_sheet, frame, headline)
+    graph.sheet("Regime Spreads", create_regime_spreads_sheet, alignments)
+    graph.sheet("Regime Alignment", create_regime_alignment_sheet, alignments)
+    graph.sheet("Event Impact", create_event_impact_sheet, impact, event_window, headline)
+    graph.sheet("Glossary Coverage", create_glossary_sheet, glossary, headline)
     
-    # Sheet 7: Implementation Status
-    ws7 = wb.create_sheet("Implementation Status")
-    create_implementation_sheet(ws7)
+    graph.sheet("Prompts Status", create_prompts_sheet, headline)
+    graph.sheet("API Endpoints", create_api_sheet)
+    graph.sheet("Data Sources", create_sources_sheet, probes, headline)
+    # Left out when the registry directory holds no source files
+    graph.sheet("Source Reconciliation", create_reconciliation_sheet, resolution, headline, optional=True)
+    graph.sheet("Implementation Status", create_implementation_sheet, headline)
+    graph.sheet("ETL Performance", create_etl_sheet, etl, headline)
+    graph.sheet("Freshness SLA", create_freshness_sheet, schedules, freshness, checked, sla_days, headline)
     
+    # Trends: this run's metrics go into the history first, so the sheet
+    # compares it against the runs before it
+    if history is not None:
+        recorded = graph.step("Record run", record_run, history, counts, headline, metrics)
+        if timestamp is None:
+            graph.sheet("Trends", create_trends_sheet, recorded)
+    
+    # Overview: rendered last but placed first, so rows can be streamed in
+    # order and its contents index can list the continuation sheets
+    graph.sheet("Overview", create_overview_sheet, RENDERED, timestamp or datetime.now(), schema, index=0)
+    
+    # In memory with either engine: XlsxWriter only adds native tables to sheets it holds in memory
+    wb = open_workbook(output_path, engine, streaming=False, compression=compression, workers=workers,
+                       timestamp=timestamp)
+    if arabic_path is not None:
+        # Every sheet goes to the Arabic workbook too, translated and right to left
+        arabic = open_workbook(arabic_path, engine, streaming=False, compression=compression, workers=workers,
+                               timestamp=timestamp)
+        wb = MirroredBook(wb, arabic, Translation(AUDIT_ARABIC, AUDIT_PATTERNS))
+    graph.run(wb, pipeline, metrics, selected)
     return wb
 
-def create_overview_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
+def create_overview_sheet(ws, sheet_parts, generated, schema=None):
+    # `sheet_parts` holds the worksheets of the other sheets, by base title
+    ws.hide_gridlines()
+    ws.column_width('A', 3)
     
     # Title
-    ws['B2'] = "YETO Platform Comprehensive Audit Report"
-    ws['B2'].font = title_font
-    ws.merge_cells('B2:H2')
-    ws.row_dimensions[2].height = 35
+    ws.merge('B2:H2', "YETO Platform Comprehensive Audit Report", title_style)
+    ws.row_height(2, 35)
     
-    ws['B3'] = "Yemen Economic Transparency Observatory - Full Platform Review"
-    ws['B3'].font = Font(name=SANS_FONT, size=14, italic=True, color='666666')
-    ws.merge_cells('B3:H3')
+    ws.merge('B3:H3', "Yemen Economic Transparency Observatory - Full Platform Review",
+             CellStyle(font_name=SANS_FONT, font_size=14, italic=True, font_color='666666'))
     
-    ws['B4'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ws['B4'].font = Font(name=SANS_FONT, size=10, color='999999')
+    ws.write('B4', f"Generated: {generated.strftime('%Y-%m-%d %H:%M:%S')}",
+             CellStyle(font_name=SANS_FONT, font_size=10, font_color='999999'))
     
     # Key Metrics Section
     row = 6
-    ws[f'B{row}'] = "KEY PLATFORM METRICS"
-    ws[f'B{row}'].font = section_font
-    ws[f'B{row}'].fill = PatternFill(start_color=THEME['light'], end_color=THEME['light'], fill_type='solid')
-    ws.merge_cells(f'B{row}:H{row}')
-    ws.row_dimensions[row].height = 25
+    ws.merge(f'B{row}:H{row}', "KEY PLATFORM METRICS", section_style._replace(fill=THEME['light']))
+    ws.row_height(row, 25)
     
     metrics = [
         ("Database Records", ""),
@@ -114,71 +224,43 @@ def create_overview_sheet(ws):
         ("React Components", "62"),
         ("Total Pages", "133"),
         ("tRPC Routers", "35"),
-        ("Database Tables", "81"),
+        ("Database Tables", f"{len(schema.tables):,}" if schema is not None else "81"),
     ]
-    
     row = 8
     for label, value in metrics:
         if value == "":
-            ws[f'B{row}'] = label
-            ws[f'B{row}'].font = Font(name=SANS_FONT, size=11, bold=True, color=THEME['accent'])
+            ws.write(f'B{row}', label, CellStyle(font_name=SANS_FONT, font_size=11, bold=True, font_color=THEME['accent']))
             row += 1
             continue
-        ws[f'B{row}'] = label
-        ws[f'B{row}'].font = normal_font
-        ws[f'C{row}'] = value
-        ws[f'C{row}'].font = Font(name=SANS_FONT, size=11, bold=True, color=THEME['primary'])
-        ws[f'C{row}'].alignment = Alignment(horizontal='right')
+        ws.write(f'B{row}', label, normal_style)
+        ws.write(f'C{row}', value, CellStyle(font_name=SANS_FONT, font_size=11, bold=True, font_color=THEME['primary'], h_align='right'))
         row += 1
     
     # Sheet Index
     row += 2
-    ws[f'B{row}'] = "CONTENTS"
-    ws[f'B{row}'].font = section_font
+    ws.write(f'B{row}', "CONTENTS", section_style)
     row += 1
     
-    sheets = [
-        ("Overview", "Executive summary and key metrics"),
-        ("Database Audit", "Complete database table analysis with record counts"),
-        ("Sector Pages", "All 16 sector pages with implementation status"),
-        ("Prompts Status", "Status of all 24 prompts implementation"),
-        ("API Endpoints", "All tRPC endpoints and their functionality"),
-        ("Data Sources", "Complete data source registry"),
-        ("Implementation Status", "Feature completion checklist"),
-    ]
-    
-    for sheet_name, description in sheets:
-        ws[f'B{row}'] = sheet_name
-        ws[f'B{row}'].hyperlink = f"#'{sheet_name}'!A1"
-        ws[f'B{row}'].font = Font(color=THEME['accent'], underline='single')
-        ws[f'C{row}'] = description
-        ws[f'C{row}'].font = normal_font
-        row += 1
+    for base_title, parts in {"Overview": [ws], **sheet_parts}.items():
+        for part, sheet in enumerate(parts, start=1):
+            ws.hyperlink(f'B{row}', sheet.title, sheet.title, link_style)
+            ws.write(f'C{row}', continued(SHEET_DESCRIPTIONS[base_title], part), normal_style)
+            row += 1
     
     # Column widths
-    ws.column_dimensions['B'].width = 30
-    ws.column_dimensions['C'].width = 50
-    ws.column_dimensions['D'].width = 20
+    ws.column_width('B', 30)
+    ws.column_width('C', 50)
+    ws.column_width('D', 20)
+
+DATABASE_PLAN = compile_spec(audit_spec("Database Audit", [
+    Column("Table Name", 25),
+    Column("Record Count", 15, count_format._replace(h_align='right')),
+    Column("Status", 12, rules=TICKED + ((None, warn_mark),)),
+    Column("Last Updated", 15),
+    Column("Notes", 45),
+], stripe=THEME['alt_row']))
 
 def create_database_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
-    
-    ws['B2'] = "Database Audit"
-    ws['B2'].font = title_font
-    ws.row_dimensions[2].height = 35
-    
-    # Table headers
-    headers = ["Table Name", "Record Count", "Status", "Last Updated", "Notes"]
-    row = 4
-    for col, header in enumerate(headers, start=2):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.row_dimensions[row].height = 30
-    
     # Database tables data
     tables = [
         ("sources", 178, "✓ Active", "2026-01-30", "Data source registry with tier classification"),
@@ -198,54 +280,91 @@ def create_database_sheet(ws):
         ("sector_kpis", 0, "⚠ Empty", "N/A", "KPIs fetched dynamically"),
         ("sector_alerts", 0, "⚠ Empty", "N/A", "Alerts generated on-demand"),
     ]
+    return DATABASE_PLAN.render(ws, tables).sheets
+
+SCHEMA_PLAN = compile_spec(audit_spec("Database Schema", [
+    Column("Table", 30),
+    Column("Columns", 10),
+    Column("Primary Key", 18),
+    Column("Indexes", 10),
+    Column("Unique", 10),
+    Column("Foreign Keys", 12),
+    Column("Referenced By", 13),
+    Column("Introduced In", 32),
+    Column("Last Changed", 32),
+], header_row=5, stripe=THEME['alt_row']))
+
+def create_schema_sheet(ws, schema, headline=None):
+    tables = [schema.tables[name] for name in sorted(schema.tables)]
+    referenced_by = schema.referenced_by()
+    indexes = sum(len(table.indexes) for table in tables)
+    foreign_keys = sum(len(table.foreign_keys) for table in tables)
+    
+    def rows():
+        for table in tables:
+            yield (
+                table.name, len(table.columns), ", ".join(table.primary_key),
+                len(table.indexes), sum(index.unique for index in table.indexes.values()),
+                len(table.foreign_keys), referenced_by.get(table.name, 0), table.introduced_in, table.changed_in,
+            )
+    
+    sheet = SCHEMA_PLAN.render(ws, rows(), f"{len(tables)} tables, {indexes} indexes and {foreign_keys} foreign keys "
+                                           f"after {len(schema.migrations)} migrations")
     
-    row = 5
-    for table_data in tables:
-        for col, value in enumerate(table_data, start=2):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = normal_font
-            cell.border = thin_border
-            if col == 3:  # Status column
-                if "✓" in str(value):
-                    cell.font = Font(name=SANS_FONT, size=11, color='107040')
-                else:
-                    cell.font = Font(name=SANS_FONT, size=11, color='CC6600')
-            if col == 4:  # Record count
-                cell.alignment = Alignment(horizontal='right')
-                cell.number_format = '#,##0'
-        if row % 2 == 0:
-            for col in range(2, 7):
-                ws.cell(row=row, column=col).fill = PatternFill(start_color=THEME['alt_row'], end_color=THEME['alt_row'], fill_type='solid')
+    # Statements the model skipped, so a gap in it is visible
+    if schema.unparsed:
+        ws, row = sheet.reserve(len(schema.unparsed) + 3)
+        row += 2
+        ws.write(f'B{row}', "STATEMENTS NOT MODELLED", section_style)
         row += 1
+        for migration, statement in schema.unparsed:
+            ws.write_row(row, 2, (migration, statement), cell_style)
+            row += 1
     
-    # Column widths
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 15
-    ws.column_dimensions['F'].width = 45
-    
-    # Freeze panes
-    ws.freeze_panes = 'B5'
-
-def create_sector_pages_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
-    
-    ws['B2'] = "Sector Pages Analysis"
-    ws['B2'].font = title_font
-    ws.row_dimensions[2].height = 35
-    
-    headers = ["Sector", "Route", "Sources Panel", "KPIs", "Charts", "Data Source", "Status"]
-    row = 4
-    for col, header in enumerate(headers, start=2):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.row_dimensions[row].height = 30
+    if headline is not None:
+        headline['schema.tables'] = len(tables)
+        headline['schema.indexes'] = indexes
+        headline['schema.foreign_keys'] = foreign_keys
+    return sheet.sheets
+
+INDEX_STATUS = {'covered': "✓ Covered", 'partial': "⚠ Partial", 'missing': "⚠ Missing", 'no table': "⚠ No table"}
+
+INDEX_PLAN = compile_spec(audit_spec("Index Coverage of Hot Lookups", [
+    Column("Table", 24),
+    Column("Lookup Columns", 34),
+    Column("Used By", 50),
+    Column("Best Index", 34),
+    Column("Covers", 24),
+    Column("Status", 13, rules=TICKED + ((None, warn_mark),)),
+    Column("Suggested Index", 90),
+], header_row=5, stripe=THEME['alt_row']))
+
+def create_index_sheet(ws, schema, headline=None):
+    report = index_report(schema)
+    uncovered = sum(entry['status'] != 'covered' for entry in report)
+    rows = [
+        (entry['table'], ", ".join(entry['columns']), entry['used_by'], entry['index'], ", ".join(entry['covered']),
+         INDEX_STATUS[entry['status']], entry['suggestion'])
+        for entry in report
+    ]
+    sheet = INDEX_PLAN.render(ws, rows, f"{uncovered} of {len(report)} lookups not fully served by an index; "
+                                        f"an index serves a lookup whose columns it starts with, in order")
     
+    if headline is not None:
+        headline['schema.uncovered_lookups'] = uncovered
+    return sheet.sheets
+
+SECTOR_PLAN = compile_spec(audit_spec("Sector Pages Analysis", [
+    Column("Sector", 18),
+    Column("Route", 28),
+    Column("Sources Panel", 14, rules=TICKED),
+    Column("KPIs", 10),
+    Column("Charts", 12),
+    Column("Data Source", 25),
+    Column("Status", 14, rules=TICKED),
+], stripe=THEME['alt_row']))
+
+def create_sector_pages_sheet(ws, headline=None):
     sectors = [
         ("Macroeconomy", "/sectors/macroeconomy", "✓ Yes", "4 KPIs", "Line/Bar", "World Bank, IMF, UN", "✓ Complete"),
         ("Currency", "/sectors/currency", "✓ Yes", "4 KPIs", "Line", "CBY, Parallel Market", "✓ Complete"),
@@ -264,49 +383,306 @@ def create_sector_pages_sheet(ws):
         ("Conflict Economy", "/sectors/conflict-economy", "✓ Yes", "4 KPIs", "Timeline", "ACLED, Crisis Group", "✓ Complete"),
         ("Microfinance", "/sectors/microfinance", "✓ Yes", "4 KPIs", "Bar", "MIX Market, SFD", "✓ Complete"),
     ]
+    sheet = SECTOR_PLAN.render(ws, sectors)
+    
+    if headline is not None:
+        headline['completion.sectors'] = completion_rate(sectors, 6)
+    return sheet.sheets
+
+def create_coverage_sheet(ws, matrix):
+    source_ids = matrix.active_sources()
+    source_col = {source_id: 6 + i for i, source_id in enumerate(source_ids)}
+    last_col = get_column_letter(5 + max(len(source_ids), 1))
+    
+    # The source columns depend on the data, so this plan is compiled per
+    # workbook. Source counts carry no border, hence no sheet-wide cell style
+    columns = [
+        Column("Sector", 16, cell_style),
+        Column("Indicator", 28, cell_style),
+        Column("Indicator Name", 35, cell_style),
+        Column("Observations", 14, cell_style._replace(number_format='#,##0')),
+    ]
+    # Source labels head table columns next to these: unique and never blank
+    columns += [Column(label, 12, count_format)
+                for label in matrix.source_labels(source_ids, reserved=[column.header for column in columns])]
+    plan = compile_spec(audit_spec("Source Coverage Matrix", columns,
+        header_row=5, header_style=header_style._replace(wrap_text=True), header_height=45, cell_style=None,
+        freeze='F', sparse=True))
     
-    row = 5
-    for sector_data in sectors:
-        for col, value in enumerate(sector_data, start=2):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = normal_font
-            cell.border = thin_border
-            if "✓" in str(value):
-                cell.font = Font(name=SANS_FONT, size=11, color='107040')
-        if row % 2 == 0:
-            for col in range(2, 9):
-                ws.cell(row=row, column=col).fill = PatternFill(start_color=THEME['alt_row'], end_color=THEME['alt_row'], fill_type='solid')
+    # Only populated cells are written; empty (sector, indicator, source)
+    # combinations stay blank in the sheet as well
+    sheet = plan.sheet(ws, f"{matrix.total:,} observations from {len(source_ids)} sources "
+                           f"across {len(matrix.indicators)} indicators and {len(matrix.sectors)} sectors")
+    last_row = {}
+    for ws, row, (sector, code, name, counts) in sheet.rows(matrix.indicator_rows()):
+        plan.write(ws, row, [sector.replace('_', ' ').title(), code, name, sum(counts.values())]
+                   + [counts.get(source_id) for source_id in source_ids])
+        last_row[ws.title] = row
+    plan.tabulate(sheet)
+    
+    for part in sheet.sheets:
+        if part.title in last_row:
+            part.color_scale(f"F6:{last_col}{last_row[part.title]}", THEME['white'], THEME['accent'], start_value=0)
+    
+    # Sector totals
+    sector_rows = list(matrix.sector_rows())
+    ws, row = sheet.reserve(len(sector_rows) + 4)
+    row += 2
+    ws.write(f'B{row}', "SECTOR TOTALS", section_style)
+    row += 1
+    first = row
+    for sector, counts in sector_rows:
+        ws.write(f'B{row}', sector.replace('_', ' ').title(), normal_style)
+        ws.write(f'E{row}', sum(counts.values()), count_format)
+        for source_id, count in sorted(counts.items(), key=lambda item: source_col[item[0]]):
+            ws.cell(row, source_col[source_id], count, count_format)
         row += 1
+    if sector_rows:
+        ws.color_scale(f"F{first}:{last_col}{row - 1}", THEME['white'], THEME['accent'], start_value=0)
     
-    # Column widths
-    ws.column_dimensions['B'].width = 18
-    ws.column_dimensions['C'].width = 28
-    ws.column_dimensions['D'].width = 14
-    ws.column_dimensions['E'].width = 10
-    ws.column_dimensions['F'].width = 12
-    ws.column_dimensions['G'].width = 25
-    ws.column_dimensions['H'].width = 14
-    
-    ws.freeze_panes = 'B5'
-
-def create_prompts_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
-    
-    ws['B2'] = "Prompts 1-24 Implementation Status"
-    ws['B2'].font = title_font
-    ws.row_dimensions[2].height = 35
-    
-    headers = ["Prompt #", "Description", "Status", "Implementation Details", "Completeness"]
-    row = 4
-    for col, header in enumerate(headers, start=2):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.row_dimensions[row].height = 30
+    return sheet.sheets
+
+QUALITY_PLAN = compile_spec(audit_spec("Time Series Data Quality", [
+    Column("Indicator", 30),
+    Column("Regime", 15),
+    Column("Date", 12),
+    Column("Value", 16, amount_format),
+    Column("Unit", 14),
+    Column("Previous", 16, amount_format),
+    Column("Change", 10, percent_format),
+    Column("Z-Score", 10, CellStyle(number_format='0.00')),
+    Column("Flags", 24, warn_mark),
+], header_row=5, stripe=THEME['alt_row']))
+
+def create_quality_sheet(ws, frame, headline=None):
+    frame, result = detect_anomalies(frame)
+    flags = result['flags']
+    flagged = np.flatnonzero(flags)
+    
+    def nan_to_none(value):
+        return None if np.isnan(value) else float(value)
+    
+    def rows():
+        for i in flagged.tolist():
+            code, regime = frame.groups.labels[frame.group[i]]
+            yield (
+                code, regime, str(frame.date[i]), float(frame.value[i]), frame.units.labels[frame.unit[i]],
+                nan_to_none(result['previous'][i]), nan_to_none(result['change'][i]),
+                nan_to_none(result['zscore'][i]), flag_labels(flags[i]),
+            )
+    
+    sheet = QUALITY_PLAN.render(ws, rows(), f"{len(flagged):,} of {len(frame):,} observations flagged "
+                                            f"(trailing 12-point baseline, |z| >= 3, change >= 50%, unit range checks)")
+    
+    # Per-series summary, computed with bincount over the group ids
+    n_groups = len(frame.groups)
+    observations = np.bincount(frame.group, minlength=n_groups)
+    counts = [np.bincount(frame.group[(flags & bit) > 0], minlength=n_groups)
+              for bit in (FLAG_ZSCORE, FLAG_JUMP, FLAG_RANGE)]
+    flagged_per_group = np.bincount(frame.group[flagged], minlength=n_groups)
+    series = [g for g in np.argsort(-flagged_per_group, kind='stable').tolist() if flagged_per_group[g]]
+    
+    ws, row = sheet.reserve(len(series) + 5)
+    row += 2
+    ws.write(f'B{row}', "FLAGGED SERIES", section_style)
+    row += 1
+    ws.write_row(row, 2, ["Indicator", "Regime", "Observations", "Flagged", "Z-Score", "Jumps", "Out of Range"],
+                 section_header_style)
+    row += 1
+    for g in series:
+        code, regime = frame.groups.labels[g]
+        values = (code, regime, int(observations[g]), int(flagged_per_group[g])) + tuple(int(c[g]) for c in counts)
+        ws.write_row(row, 2, values, cell_style)
+        row += 1
     
+    if headline is not None:
+        headline['quality.observations'] = len(frame)
+        headline['quality.flagged_observations'] = len(flagged)
+    return sheet.sheets
+
+SPREADS_PLAN = compile_spec(audit_spec("Dual-Regime Spreads (Aden - Sana'a)", [
+    Column("Indicator", 26),
+    Column("Calendar Points", 12),
+    Column("Both Regimes", 12),
+    Column("Aden Only", 12, rules=((bool, warn_mark),)),
+    Column("Sana'a Only", 12, rules=((bool, warn_mark),)),
+    Column("Mean Spread", 16, amount_format),
+    Column("Spread Volatility", 16, amount_format),
+    Column("Max |Spread|", 16, amount_format),
+    Column("Latest Date", 12),
+    Column("Latest Spread", 14, amount_format),
+    Column("Latest Spread %", 14, percent_format),
+], header_row=5, header_style=header_style._replace(wrap_text=True), freeze='C'))
+
+def create_regime_spreads_sheet(ws, alignments):
+    def rows():
+        for alignment in alignments:
+            summary = alignment.summary()
+            yield (
+                alignment.indicator, summary['points'], summary['both'], summary['aden_only'], summary['sanaa_only'],
+                summary['mean_spread'], summary['spread_std'], summary['max_spread'],
+                str(summary['latest_date']) if summary['latest_date'] is not None else "N/A",
+                summary['latest_spread'], summary['latest_spread_pct'],
+            )
+    
+    sheet = SPREADS_PLAN.render(ws, rows(), "Series aligned by as-of join; spread = Aden value - Sana'a value")
+    
+    # Periods where one regime is missing
+    gaps = [(alignment.indicator,) + gap for alignment in alignments for gap in alignment.gaps()]
+    ws, row = sheet.reserve(len(gaps) + 5)
+    row += 2
+    ws.write(f'B{row}', "COVERAGE GAPS", section_style)
+    row += 1
+    ws.write_row(row, 2, ["Indicator", "Gap", "From", "To", "Points"], section_header_style)
+    row += 1
+    for indicator, state, start, end, points in gaps:
+        ws.write_row(row, 2, (indicator, STATE_LABELS[state], str(start), str(end), points), cell_style)
+        row += 1
+    
+    # Base codes reported for one regime both by tag and by suffix, merged into one series
+    merged = [(alignment.indicator, regime, ", ".join(f"{code} ({tag})" for code, tag in labels))
+              for alignment in alignments for regime, labels in alignment.merged.items()]
+    if merged:
+        ws, row = sheet.reserve(len(merged) + 4)
+        row += 2
+        ws.write(f'B{row}', "MERGED SERIES", section_style)
+        row += 1
+        ws.write_row(row, 2, ["Indicator", "Regime", "Series"], section_header_style)
+        row += 1
+        for values in merged:
+            ws.write_row(row, 2, values, cell_style)
+            row += 1
+    
+    return sheet.sheets
+
+ALIGNMENT_PLAN = compile_spec(audit_spec("Dual-Regime Aligned Series", [
+    Column("Indicator", 26),
+    Column("Date", 12),
+    Column("Aden", 16, amount_format),
+    Column("Sana'a", 16, amount_format),
+    Column("Spread", 16, amount_format),
+    Column("Spread %", 16, percent_format),
+    Column("Spread Volatility (30)", 16, amount_format),
+], freeze='C'))
+
+def create_regime_alignment_sheet(ws, alignments):
+    def points():
+        for alignment in alignments:
+            columns = (alignment.aden, alignment.sanaa, alignment.spread, alignment.spread_pct, alignment.volatility)
+            # One tolist() per column instead of a numpy scalar per cell
+            dates = alignment.calendar.astype(str).tolist()
+            values = [np.where(np.isnan(column), None, column).tolist() for column in columns]
+            for i, date in enumerate(dates):
+                yield (alignment.indicator, date) + tuple(column[i] for column in values)
+    
+    return ALIGNMENT_PLAN.render(ws, points()).sheets
+
+EVENT_IMPACT_PLAN = compile_spec(audit_spec("Economic Event Impact", [
+    Column("Event Date", 12),
+    Column("Event", 40),
+    Column("Category", 14),
+    Column("Impact Level", 12),
+    Column("Indicator", 28),
+    Column("Regime", 15),
+    Column("Before Date", 12),
+    Column("Before", 16, amount_format),
+    Column("After Date", 12),
+    Column("After", 16, amount_format),
+    Column("Change", 16, amount_format),
+    Column("Change %", 10, percent_format),
+], header_row=5, header_style=header_style._replace(wrap_text=True), freeze='C', stripe=THEME['alt_row']))
+
+def create_event_impact_sheet(ws, impact, window, headline=None):
+    events = impact.events
+    
+    def rows():
+        columns = (impact.before, impact.after, impact.change, impact.change_pct)
+        before_dates = impact.before_date.astype(str).tolist()
+        after_dates = impact.after_date.astype(str).tolist()
+        values = [np.where(np.isnan(column), None, column).tolist() for column in columns]
+        for i, (e, g) in enumerate(zip(impact.event.tolist(), impact.group.tolist())):
+            _, title, category, level, _ = events.records[e]
+            code, regime = impact.groups.labels[g]
+            yield (str(events.date[e]), title, category, level, code, regime,
+                   before_dates[i], values[0][i], after_dates[i], values[1][i], values[2][i], values[3][i])
+    
+    matched = impact.events_with_data()
+    sheet = EVENT_IMPACT_PLAN.render(ws, rows(), f"{matched:,} of {len(events):,} events with observations on both "
+                                                 f"sides within {window:,} days; change = after - before")
+    
+    # Per-event summary, computed with bincount over the event ids
+    n_events = len(events)
+    series = np.bincount(impact.event, minlength=n_events)
+    rising = np.bincount(impact.event[impact.change > 0], minlength=n_events)
+    falling = np.bincount(impact.event[impact.change < 0], minlength=n_events)
+    has_pct = ~np.isnan(impact.change_pct)
+    pct_total = np.bincount(impact.event[has_pct], weights=np.abs(impact.change_pct[has_pct]), minlength=n_events)
+    pct_count = np.bincount(impact.event[has_pct], minlength=n_events)
+    summarised = [e for e in np.argsort(events.date, kind='stable').tolist() if series[e]]
+    
+    ws, row = sheet.reserve(len(summarised) + 5)
+    row += 2
+    ws.write(f'B{row}', "EVENT SUMMARY", section_style)
+    row += 1
+    ws.write_row(row, 2, ["Event Date", "Event", "Impact Level", "Series", "Rising", "Falling", "Mean |Change %|"],
+                 section_header_style)
+    row += 1
+    for e in summarised:
+        _, title, _, level, _ = events.records[e]
+        mean_pct = float(pct_total[e] / pct_count[e]) if pct_count[e] else None
+        ws.write_row(row, 2, (str(events.date[e]), title, level, int(series[e]), int(rising[e]), int(falling[e]),
+                              mean_pct), [cell_style] * 6 + [cell_style._replace(number_format='0.0%')])
+        row += 1
+    
+    if headline is not None:
+        headline['events.total'] = n_events
+        headline['events.matched'] = matched
+        headline['events.series_pairs'] = len(impact)
+    return sheet.sheets
+
+GLOSSARY_STATUS = ("✓ Covered", "⚠ Uncovered")
+
+GLOSSARY_PLAN = compile_spec(audit_spec("Glossary Coverage in Research", [
+    Column("Term", 36),
+    Column("Term (AR)", 36),
+    Column("Category", 20),
+    Column("Publications", 13, count_format),
+    Column("Mentions", 11, count_format),
+    Column("Share", 10, percent_format),
+    Column("Status", 14, rules=TICKED + ((None, warn_mark),)),
+], header_row=5, freeze='C', stripe=THEME['alt_row']))
+
+def create_glossary_sheet(ws, coverage, headline=None):
+    scanned = coverage.scanned
+    rows = [(term.english, term.arabic, term.category, documents, mentions, documents / scanned if scanned else None,
+             GLOSSARY_STATUS[0] if documents else GLOSSARY_STATUS[1])
+            for term, documents, mentions in coverage.rows()]
+    sheet = GLOSSARY_PLAN.render(ws, rows, f"{coverage.covered:,} of {len(coverage.terms):,} terms found in "
+                                           f"{coverage.tagged:,} of {scanned:,} publications and documents "
+                                           f"(titles and abstracts, English and Arabic)")
+    
+    # Covered and uncovered terms per glossary category
+    by_category = pivot_counts(rows, GLOSSARY_PLAN.headers, "Category", "Status", GLOSSARY_STATUS)
+    ws, row = sheet.reserve(by_category.height + 3)
+    row += 2
+    ws.write(f'B{row}', "TERMS BY CATEGORY", section_style)
+    write_pivot(ws, row + 1, 2, by_category, section_header_style, cell_style, total_style)
+    
+    if headline is not None:
+        headline['glossary.terms'] = len(coverage.terms)
+        headline['glossary.covered'] = coverage.covered
+        headline['glossary.tagged_documents'] = coverage.tagged
+    return sheet.sheets
+
+PROMPTS_PLAN = compile_spec(audit_spec("Prompts 1-24 Implementation Status", [
+    Column("Prompt #", 12),
+    Column("Description", 35),
+    Column("Status", 14, rules=TICKED),
+    Column("Implementation Details", 50),
+    Column("Completeness", 14, CellStyle(h_align='center')),
+], stripe=THEME['alt_row']))
+
+def create_prompts_sheet(ws, headline=None):
     prompts = [
         (1, "Platform Foundation & Architecture", "✓ Complete", "React 19 + Express + tRPC + TiDB stack deployed", "100%"),
         (2, "Database Schema Design", "✓ Complete", "81 tables with Drizzle ORM, full schema", "100%"),
@@ -333,58 +709,30 @@ def create_prompts_sheet(ws):
         (23, "Admin Panel", "✓ Complete", "User management, data admin, settings", "100%"),
         (24, "Production Hardening", "✓ Complete", "Security headers, rate limiting, logging", "100%"),
     ]
-    
-    row = 5
-    for prompt_data in prompts:
-        for col, value in enumerate(prompt_data, start=2):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = normal_font
-            cell.border = thin_border
-            if "✓" in str(value):
-                cell.font = Font(name=SANS_FONT, size=11, color='107040')
-            if col == 6:  # Completeness
-                cell.alignment = Alignment(horizontal='center')
-        if row % 2 == 0:
-            for col in range(2, 7):
-                ws.cell(row=row, column=col).fill = PatternFill(start_color=THEME['alt_row'], end_color=THEME['alt_row'], fill_type='solid')
-        row += 1
+    sheet = PROMPTS_PLAN.render(ws, prompts)
     
     # Summary
+    ws, row = sheet.reserve(4)
     row += 2
-    ws[f'B{row}'] = "SUMMARY"
-    ws[f'B{row}'].font = section_font
+    ws.write(f'B{row}', "SUMMARY", section_style)
     row += 1
-    ws[f'B{row}'] = "Total Prompts: 24"
-    ws[f'C{row}'] = "Completed: 24"
-    ws[f'D{row}'] = "Completion Rate: 100%"
-    
-    # Column widths
-    ws.column_dimensions['B'].width = 12
-    ws.column_dimensions['C'].width = 35
-    ws.column_dimensions['D'].width = 14
-    ws.column_dimensions['E'].width = 50
-    ws.column_dimensions['F'].width = 14
+    ws.write(f'B{row}', "Total Prompts: 24")
+    ws.write(f'C{row}', "Completed: 24")
+    ws.write(f'D{row}', "Completion Rate: 100%")
     
-    ws.freeze_panes = 'B5'
+    if headline is not None:
+        headline['completion.prompts'] = completion_rate(prompts, 2)
+    return sheet.sheets
+
+API_PLAN = compile_spec(audit_spec("tRPC API Endpoints", [
+    Column("Router", 15),
+    Column("Endpoint", 22),
+    Column("Type", 12),
+    Column("Auth Required", 14),
+    Column("Description", 40),
+], stripe=THEME['alt_row']))
 
 def create_api_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
-    
-    ws['B2'] = "tRPC API Endpoints"
-    ws['B2'].font = title_font
-    ws.row_dimensions[2].height = 35
-    
-    headers = ["Router", "Endpoint", "Type", "Auth Required", "Description"]
-    row = 4
-    for col, header in enumerate(headers, start=2):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.row_dimensions[row].height = 30
-    
     endpoints = [
         ("sectorPages", "getSectorData", "Query", "No", "Get sector overview data"),
         ("sectorPages", "getSectorTimeSeries", "Query", "No", "Get time series for sector"),
@@ -407,46 +755,58 @@ def create_api_sheet(ws):
         ("ingestion", "trigger", "Mutation", "Admin", "Trigger data ingestion"),
         ("ingestion", "getStatus", "Query", "Admin", "Get ingestion status"),
     ]
+    sheet = API_PLAN.render(ws, endpoints)
     
-    row = 5
-    for endpoint_data in endpoints:
-        for col, value in enumerate(endpoint_data, start=2):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = normal_font
-            cell.border = thin_border
-        if row % 2 == 0:
-            for col in range(2, 7):
-                ws.cell(row=row, column=col).fill = PatternFill(start_color=THEME['alt_row'], end_color=THEME['alt_row'], fill_type='solid')
-        row += 1
-    
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['C'].width = 22
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 14
-    ws.column_dimensions['F'].width = 40
-    
-    ws.freeze_panes = 'B5'
+    # Endpoints per router and type
+    by_router = pivot_counts(endpoints, API_PLAN.headers, "Router", "Type", ("Query", "Mutation"))
+    ws, row = sheet.reserve(by_router.height + 3)
+    row += 2
+    ws.write(f'B{row}', "ENDPOINTS BY ROUTER", section_style)
+    write_pivot(ws, row + 1, 2, by_router, section_header_style, cell_style, total_style)
+    return sheet.sheets
 
-def create_sources_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
-    
-    ws['B2'] = "Data Source Registry"
-    ws['B2'].font = title_font
-    ws.row_dimensions[2].height = 35
-    
-    ws['B3'] = "178 sources classified by tier (T0-T3)"
-    ws['B3'].font = Font(name=SANS_FONT, size=12, italic=True, color='666666')
-    
-    headers = ["Source Name", "Tier", "Type", "Update Frequency", "Sectors Covered", "Data Points"]
-    row = 5
-    for col, header in enumerate(headers, start=2):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.row_dimensions[row].height = 30
+SOURCES_PLAN = compile_spec(audit_spec("Data Source Registry", [
+    Column("Source Name", 25),
+    Column("Tier", 10, status={"T0": CellStyle(fill='FFD700'), "T1": CellStyle(fill='90EE90'),
+                               "T2": CellStyle(fill='87CEEB')}),
+    Column("Type", 20),
+    Column("Update Frequency", 18),
+    Column("Sectors Covered", 30),
+    Column("Data Points", 14),
+], header_row=5))
+
+# Endpoint health of the registry URLs, below the tier legend. Its columns
+# line up with the registry table's, whose widths they share
+PROBE_STATES = {'ok': "✓ Reachable", 'not modified': "✓ Not modified", 'http error': "⚠ HTTP error",
+                'unreachable': "⚠ Unreachable", 'invalid': "⚠ Invalid URL"}
+
+HEALTH_PLAN = compile_spec(audit_spec(None, [
+    Column("Source", 25),
+    Column("HTTP", 10),
+    Column("Host", 20),
+    Column("Update Frequency", 18),
+    Column("Status", 30, rules=TICKED + ((None, warn_mark),)),
+    Column("Latency (ms)", 14, count_format),
+    Column("Changed", 12, status={"Changed": warn_mark}),
+    Column("Last Modified / Error", 40),
+]))
+
+def endpoint_row(record, result):
+    status = PROBE_STATES[result.state]
+    if result.final_url and result.final_url != result.url and url_host(result.final_url) != url_host(result.url):
+        status += f" (moved to {url_host(result.final_url)})"
+    changed = {True: "Changed", False: "Unchanged"}.get(result.changed)
+    return (
+        record.name, result.status, url_host(record.url), record.frequency, status,
+        round(result.latency * 1000) if result.latency is not None else None, changed,
+        result.error or result.last_modified,
+    )
+
+def create_sources_sheet(ws, probes=None, headline=None):
+    if probes is not None:
+        # The endpoint columns past the registry table's, sized before any row is streamed
+        ws.column_width('H', 12)
+        ws.column_width('I', 40)
     
     sources = [
         ("World Bank WDI", "T1", "International Org", "Annual", "Macro, Poverty, Trade", "32"),
@@ -465,26 +825,13 @@ def create_sources_sheet(ws):
         ("ILO", "T1", "UN Agency", "Annual", "Labor Market", "12"),
         ("HDX", "T1", "OCHA", "Varies", "Multiple", "25"),
     ]
+    sheet = SOURCES_PLAN.render(ws, sources, "178 sources classified by tier (T0-T3)")
+    tiers_by_type = pivot_counts(sources, SOURCES_PLAN.headers, "Type", "Tier", ("T0", "T1", "T2", "T3"))
     
-    row = 6
-    for source_data in sources:
-        for col, value in enumerate(source_data, start=2):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = normal_font
-            cell.border = thin_border
-            if col == 3:  # Tier
-                if value == "T0":
-                    cell.fill = PatternFill(start_color='FFD700', end_color='FFD700', fill_type='solid')
-                elif value == "T1":
-                    cell.fill = PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid')
-                elif value == "T2":
-                    cell.fill = PatternFill(start_color='87CEEB', end_color='87CEEB', fill_type='solid')
-        row += 1
-    
-    # Tier Legend
+    # Tier Legend, the tier pivot and the endpoint health section below them
+    ws, row = sheet.reserve(11 + tiers_by_type.height + (len(probes[0]) + 5 if probes is not None else 0))
     row += 2
-    ws[f'B{row}'] = "TIER CLASSIFICATION"
-    ws[f'B{row}'].font = section_font
+    ws.write(f'B{row}', "TIER CLASSIFICATION", section_style)
     row += 1
     tiers = [
         ("T0", "Official Government/Regulatory", "Highest authority (OFAC, Treasury)"),
@@ -493,38 +840,99 @@ def create_sources_sheet(ws):
         ("T3", "Other Sources", "Research orgs, media, estimates"),
     ]
     for tier, name, desc in tiers:
-        ws[f'B{row}'] = tier
-        ws[f'C{row}'] = name
-        ws[f'D{row}'] = desc
+        ws.write_row(row, 2, (tier, name, desc))
+        row += 1
+    
+    row += 2
+    ws.write(f'B{row}', "TIER BY SOURCE TYPE", section_style)
+    row += 1
+    write_pivot(ws, row, 2, tiers_by_type, section_header_style, cell_style, total_style)
+    row += tiers_by_type.height
+    
+    if probes is not None:
+        write_endpoint_section(ws, row, probes, headline)
+    return sheet.sheets
+
+def write_endpoint_section(ws, row, probes, headline=None):
+    # probes: (registry records with a URL, ProbeReport of their URLs)
+    records, report = probes
+    results = report.results
+    # Problems first, then by name
+    endpoints = sorted(((record, results[record.url]) for record in records),
+                       key=lambda item: (item[1].state in ('ok', 'not modified'), item[0].name.casefold()))
+    reachable = report.count('ok', 'not modified')
+    
+    row += 2
+    ws.write(f'B{row}', "ENDPOINT HEALTH", section_style)
+    row += 1
+    ws.write(f'B{row}', f"{len(results)} URLs probed in {report.elapsed:.1f}s over {report.connections} connections "
+                        f"({report.requests} requests): {reachable} reachable, "
+                        f"{report.changed} changed since the last probe", subtitle_style)
+    row += 1
+    ws.write_row(row, 2, HEALTH_PLAN.headers, header_style)
+    header_row = row
+    row += 1
+    for record, result in endpoints:
+        HEALTH_PLAN.write(ws, row, endpoint_row(record, result))
         row += 1
+    if endpoints:
+        ws.table(f"B{header_row}:I{row - 1}", table_name(f"{ws.title} Endpoint Health"), HEALTH_PLAN.headers,
+                 header_style)
     
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 10
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 18
-    ws.column_dimensions['F'].width = 30
-    ws.column_dimensions['G'].width = 14
-    
-    ws.freeze_panes = 'B6'
-
-def create_implementation_sheet(ws):
-    ws.sheet_view.showGridLines = False
-    ws.column_dimensions['A'].width = 3
-    
-    ws['B2'] = "Implementation Status Checklist"
-    ws['B2'].font = title_font
-    ws.row_dimensions[2].height = 35
-    
-    headers = ["Category", "Feature", "Status", "Priority", "Notes"]
-    row = 4
-    for col, header in enumerate(headers, start=2):
-        cell = ws.cell(row=row, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.row_dimensions[row].height = 30
+    if headline is not None:
+        headline['sources.probed'] = len(results)
+        headline['sources.unreachable'] = len(results) - reachable
+        headline['sources.changed'] = report.changed
+
+RECONCILIATION_PLAN = compile_spec(audit_spec("Source Reconciliation", [
+    Column("Canonical Name", 45),
+    Column("Institution", 30),
+    Column("Host", 24),
+    Column("Records", 10, count_format),
+    Column("Files", 26),
+    Column("Record IDs", 30),
+    Column("Name Variants", 70),
+    # Merges resting on a link close to the threshold are worth a look
+    Column("Confidence", 12, percent_format,
+           rules=((lambda value: value is not None and value < LINK_THRESHOLD + 0.05, warn_mark),)),
+], header_row=5, stripe=THEME['alt_row']))
+
+def create_reconciliation_sheet(ws, resolution, headline=None):
+    clusters = resolution.clusters
+    
+    def rows():
+        for cluster in clusters:
+            canonical = cluster.canonical
+            files = [sum(record.origin == origin for record in cluster.records) for origin in resolution.origins]
+            ids = sorted({record.record_id for record in cluster.records if record.record_id})
+            variants = sorted({record.name for record in cluster.records} - {canonical.name})
+            yield (
+                canonical.name, canonical.institution, url_host(canonical.url), len(cluster.records),
+                ", ".join(f"{origin} ×{count}" if count > 1 else origin
+                          for origin, count in zip(resolution.origins, files) if count),
+                ", ".join(ids), "; ".join(variants), cluster.confidence,
+            )
     
+    sheet = RECONCILIATION_PLAN.render(ws, rows(), (
+        f"{len(resolution.records)} registry entries from {len(resolution.origins)} files resolve to "
+        f"{len(clusters)} distinct sources; {resolution.compared:,} candidate pairs compared "
+        f"instead of {resolution.all_pairs:,}"))
+    
+    if headline is not None:
+        headline['sources.records'] = len(resolution.records)
+        headline['sources.distinct'] = len(clusters)
+        headline['sources.candidate_pairs'] = resolution.compared
+    return sheet.sheets
+
+IMPLEMENTATION_PLAN = compile_spec(audit_spec("Implementation Status Checklist", [
+    Column("Category", 15),
+    Column("Feature", 25),
+    Column("Status", 14, rules=TICKED),
+    Column("Priority", 10),
+    Column("Notes", 40),
+], stripe=THEME['alt_row']))
+
+def create_implementation_sheet(ws, headline=None):
     features = [
         ("Frontend", "16 Sector Pages", "✓ Complete", "P0", "All pages have SourcesUsedPanel"),
         ("Frontend", "Bilingual (AR/EN)", "✓ Complete", "P0", "Full RTL support"),
@@ -547,36 +955,374 @@ def create_implementation_sheet(ws):
         ("Admin", "User Management", "✓ Complete", "P1", "Role-based access"),
         ("Admin", "Data Admin", "✓ Complete", "P1", "CRUD operations"),
     ]
-    
-    row = 5
-    for feature_data in features:
-        for col, value in enumerate(feature_data, start=2):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.font = normal_font
-            cell.border = thin_border
-            if "✓" in str(value):
-                cell.font = Font(name=SANS_FONT, size=11, color='107040')
-        if row % 2 == 0:
-            for col in range(2, 7):
-                ws.cell(row=row, column=col).fill = PatternFill(start_color=THEME['alt_row'], end_color=THEME['alt_row'], fill_type='solid')
-        row += 1
+    sheet = IMPLEMENTATION_PLAN.render(ws, features)
     
     # Summary
+    ws, row = sheet.reserve(3)
+    row += 2
+    ws.merge(f'B{row}:F{row}', f"OVERALL COMPLETION: {completion_rate(features, 2):.0%}",
+             CellStyle(font_name=SERIF_FONT, font_size=16, bold=True, font_color='107040'))
+    
+    if headline is not None:
+        headline['completion.implementation'] = completion_rate(features, 2)
+    return sheet.sheets
+
+ETL_SPEC = audit_spec("ETL Performance", [
+    Column("Kind", 11),
+    Column("Name", 32),
+    Column("Type", 16),
+    Column("Runs", 11, count_format),
+    Column("Failed", 11, count_format),
+    Column("Failure Rate", 11, percent_format, rules=((bool, warn_mark),)),
+    Column("p50 (s)", 11, amount_format),
+    Column("p95 (s)", 11, amount_format),
+    Column("p99 (s)", 11, amount_format),
+    Column("Max (s)", 11, amount_format),
+    Column("Records", 11, count_format),
+    Column("Records/s", 11, CellStyle(number_format='#,##0.0')),
+    Column("Last Run", 22),
+    Column("Last Status", 12, status={'failed': warn_mark, 'success': ok_mark}),
+    Column("Last (s)", 10, amount_format),
+], header_row=5, stripe=THEME['alt_row'], freeze='D')
+ETL_PLAN = compile_spec(ETL_SPEC)
+# The "All ..." rows are bold
+ETL_TOTALS_PLAN = compile_spec(ETL_SPEC._replace(cell_style=cell_style._replace(bold=True)))
+
+def create_etl_sheet(ws, performance, headline=None):
+    connectors, jobs = performance
+    totals = [group[-1] for group in (connectors, jobs) if group]
+    runs = ", ".join(f"{total.runs:,} {total.kind.lower()} runs" for total in totals) or "No runs logged"
+    
+    sheet = ETL_PLAN.sheet(ws, f"{runs}; durations are t-digest estimates, totals merge the per-row digests")
+    for ws, row, stats in sheet.rows(connectors + jobs):
+        p50, p95, p99, slowest = stats.quantiles_seconds()
+        last_seconds = stats.last_duration_ms / 1000 if stats.last_duration_ms is not None else None
+        values = (stats.kind, stats.name, stats.job_type, stats.runs, stats.failed, stats.failure_rate,
+                  p50, p95, p99, slowest, stats.records, stats.throughput, stats.last_run, stats.last_status, last_seconds)
+        plan = ETL_TOTALS_PLAN if stats in totals else ETL_PLAN
+        plan.write(ws, row, values)
+    ETL_PLAN.tabulate(sheet)
+    
+    if headline is not None:
+        for total in totals:
+            kind = total.kind.lower()
+            headline[f'etl.{kind}.runs'] = total.runs
+            headline[f'etl.{kind}.failure_rate'] = total.failure_rate
+            headline[f'etl.{kind}.p95_seconds'] = total.quantiles_seconds()[1]
+    return sheet.sheets
+
+FRESHNESS_PLAN = compile_spec(audit_spec("Freshness SLA of Scheduled Jobs", [
+    Column("Job Name", 32),
+    Column("Type", 16),
+    Column("Cron", 16),
+    Column("Expected", 11, count_format),
+    Column("Ran", 11, count_format),
+    Column("Missed", 11, count_format, rules=((bool, warn_mark),)),
+    Column("Last Run", 18),
+    Column("Next Run", 18),
+    Column("Expected Next", 18),
+    Column("Status", 16, rules=TICKED + (('⚠', warn_mark),)),
+], header_row=5, freeze='C', stripe=THEME['alt_row']))
+
+def sla_reference(source, batch_size, as_of, timestamp):
+    if as_of is not None:
+        return as_of
+    if timestamp is None:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    # Data without a single run or observation has no time of its own
+    return latest_activity(source, batch_size) or timestamp
+
+def sla_time(moment):
+    return f"{moment:%Y-%m-%d %H:%M}" if moment is not None else None
+
+def create_freshness_sheet(ws, jobs, sources, checked, window, headline=None):
+    rows = [(job.name, job.job_type, job.cron, job.expected, job.ran, job.missed, sla_time(job.last_run),
+             sla_time(job.next_run), sla_time(job.expected_next), job.status) for job in jobs]
+    sheet = FRESHNESS_PLAN.render(ws, rows, f"Runs scheduled over the {window:,} days to {checked:%Y-%m-%d %H:%M} "
+                                            f"UTC; a run is missed when none started before the next one "
+                                            f"({DEFAULT_GRACE_MINUTES} minutes' grace)")
+    
+    # Sources: latest observation against the cadence plus the publication lag
+    ws, row = sheet.reserve(len(sources) + 4)
     row += 2
-    ws[f'B{row}'] = "OVERALL COMPLETION: 100%"
-    ws[f'B{row}'].font = Font(name=SERIF_FONT, size=16, bold=True, color='107040')
-    ws.merge_cells(f'B{row}:F{row}')
+    ws.write(f'B{row}', "SOURCE FRESHNESS", section_style)
+    row += 1
+    ws.write_row(row, 2, ["Source", "Cadence", "Latest Date", "SLA (days)", "Age (days)", "Status"],
+                 section_header_style)
+    row += 1
+    for fresh in sources:
+        mark = ok_mark if "✓" in fresh.status else warn_mark if "⚠" in fresh.status else cell_style
+        ws.write_row(row, 2, (fresh.publisher, fresh.cadence, fresh.latest, fresh.allowed_days, fresh.age_days,
+                              fresh.status), [cell_style] * 5 + [mark])
+        row += 1
+    
+    if headline is not None:
+        headline['freshness.jobs_late'] = sum("⚠" in job.status for job in jobs)
+        headline['freshness.missed_runs'] = sum(job.missed for job in jobs if job.status != "Disabled")
+        headline['freshness.stale_sources'] = sum(fresh.status == "⚠ Stale" for fresh in sources)
+    return sheet.sheets
+
+def table_metrics(source):
+    # Row counts of the exported tables; tables missing from the export are skipped
+    counts = {f"tables.{name}.rows": table_count(source, name) for name in EXPORT_TABLES}
+    return {name: count for name, count in counts.items() if count is not None}
+
+def timing_metrics(metrics, total=False):
+    values = {f"timing.{slug(step['name'])}.wall_seconds": step['wall_seconds'] for step in metrics.steps}
+    if total:
+        values['timing.total.wall_seconds'] = sum(step['wall_seconds'] for step in metrics.steps)
+    return values
+
+def record_run(history, counts, headline, metrics):
+    # The table counts, the sheets' headline metrics and the timings so far
+    history.record({**counts, **headline, **timing_metrics(metrics)})
+    return history
+
+def metric_format(name):
+    if name.startswith('completion.'):
+        return '0.0%'
+    if name.startswith('timing.'):
+        return '0.00'
+    return '#,##0'
+
+@lru_cache(maxsize=None)
+def trends_plan(number_format, stale):
+    # One plan per metric format; rows measured after the sheet are grey
+    value = CellStyle(number_format=number_format)
+    return compile_spec(audit_spec("Run Trends", [
+        Column("Metric", 45),
+        Column("Latest", 13, value),
+        Column("Previous", 13, value),
+        Column("Change", 13, CellStyle(number_format='+0.0%;-0.0%;0.0%'),
+               rules=None if stale else ((bool, warn_mark),)),
+        Column("24h Avg", 13, value),
+        Column("7d Avg", 13, value),
+        Column("30d Avg", 13, value),
+        Column("30d Min", 13, value),
+        Column("30d Max", 13, value),
+        Column("Runs (30d)", 11, count_format),
+    ], header_row=5, cell_style=cell_style._replace(font_color='999999') if stale else cell_style,
+        stripe=THEME['alt_row'], freeze='C'))
+
+def create_trends_sheet(ws, history):
+    trends = history.trends()
+    runs, first_run = history.run_count()
+    since = datetime.fromtimestamp(first_run).strftime('%Y-%m-%d %H:%M') if first_run else "this run"
     
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['C'].width = 25
-    ws.column_dimensions['D'].width = 14
-    ws.column_dimensions['E'].width = 10
-    ws.column_dimensions['F'].width = 40
+    sheet = trends_plan(None, False).sheet(ws, f"{runs:,} runs recorded since {since}; windows end at this run. "
+                                               f"Grey rows are measured after this sheet and show the previous run")
+    for ws, row, trend in sheet.rows(trends):
+        latest, previous = trend['latest'], trend['previous']
+        change = (latest - previous) / abs(previous) if previous else None
+        day, week, month = trend['24h'], trend['7d'], trend['30d']
+        # Save and total timings of this run are recorded after the workbook is written
+        stale = trend['latest_at'] < history.started
+        trends_plan(metric_format(trend['metric']), stale).write(ws, row, (
+            trend['metric'], latest, previous, change, day[1], week[1], month[1], month[2], month[3], month[0],
+        ))
+    trends_plan(None, False).tabulate(sheet)
     
-    ws.freeze_panes = 'B5'
+    return sheet.sheets
+
+# Raw table dumps streamed into a write-only workbook
+RAW_TABLES = {
+    "Time Series": 'time_series',
+    "Research Publications": 'research_publications',
+}
+RAW_HEADER_STYLE = header_style._replace(border=None, h_align=None, v_align=None)
+
+def create_raw_data_workbook(source, output_path, batch_size, pipeline, engine='openpyxl',
+                             compression=DEFAULT_COMPRESSION, workers=None, metrics=None, timestamp=None):
+    wb = open_workbook(output_path, engine, streaming=True, compression=compression, workers=workers, timestamp=timestamp)
+    metrics = metrics or Instrumentation('audit')
+    # The next batches are fetched while a batch is written, a few at most
+    # ahead of it; each table's query starts once the one before is read
+    streams = {title: pipeline.stream(f"Raw {title}", table_batches(source, table, batch_size), lane=SOURCE_LANE)
+               for title, table in RAW_TABLES.items()}
+    for title, stream in streams.items():
+        metrics.begin(f"Raw {title}", wb)
+        ws = wb.add_sheet(title)
+        batches = iter(stream)
+        first = next(batches, [])
+        columns = list(first[0]) if first else []
+        plan = compile_spec(SheetSpec([Column(name) for name in columns], header_style=RAW_HEADER_STYLE, freeze='A'))
+        
+        sheet = plan.sheet(ws)
+        for batch in chain([first], batches):
+            for record in batch:
+                sheet.append([cell_value(record.get(name)) for name in columns])
+        if columns:
+            plan.tabulate(sheet)
+        metrics.end()
+    return wb
+
+def reconcile_registry(records):
+    return reconcile_sources(records) if records else None
+
+async def probe_registry(records, cache_path, concurrency, per_host_rate):
+    # The registry file's own entries carry the URLs the connectors fetch
+    endpoints = [record for record in records if record.origin == 'registry' and record.url]
+    report = await probe_urls_async([record.url for record in endpoints], cache_path, concurrency, per_host_rate)
+    return endpoints, report
+
+def cell_value(value):
+    # JSON columns (keywords, config, ...) are written as their JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
 
 # Generate the workbook
-wb = create_workbook()
-output_path = '/home/ubuntu/YETO_Platform_Comprehensive_Audit.xlsx'
-wb.save(output_path)
-print(f"Excel file saved to: {output_path}")
+parser = argparse.ArgumentParser(description="Generate the YETO platform audit workbook")
+parser.add_argument('--export', default=DEFAULT_EXPORT_PATH, help="Path to the data-export.json snapshot")
+parser.add_argument('--database', help="Read tables directly from a database URL (mysql://... or sqlite:///...) instead of the export")
+parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows fetched per database round trip")
+parser.add_argument('--engine', choices=ENGINES, default='openpyxl', help="Workbook backend used to write the files")
+parser.add_argument('--compression', type=int, choices=range(10), default=DEFAULT_COMPRESSION, metavar='0-9',
+                    help="Deflate level of the saved files (0 stores them uncompressed)")
+parser.add_argument('--workers', type=int, help="Threads used to compress the saved files (default: one per CPU)")
+parser.add_argument('--output', default='/home/ubuntu/YETO_Platform_Comprehensive_Audit.xlsx')
+parser.add_argument('--arabic', action='store_true',
+                    help="Also write an Arabic right-to-left workbook in the same pass, named after --output "
+                         "with an _AR suffix")
+parser.add_argument('--arabic-output', help="Path of the Arabic workbook; implies --arabic")
+parser.add_argument('--raw-output', help="Also stream the time_series and research_publications tables into this workbook")
+parser.add_argument('--report', help="Write per-sheet timings, memory and cell counts to this JSON file")
+parser.add_argument('--prometheus', help="Write the same metrics to this Prometheus textfile (.prom)")
+parser.add_argument('--profile', metavar='DIR', help="Write a cProfile dump per sheet into this directory")
+parser.add_argument('--history', nargs='?', const='', metavar='FILE',
+                    help="Record this run in a SQLite run history and add the Trends sheet "
+                         "(FILE defaults to yeto-audit-history.sqlite next to --output)")
+parser.add_argument('--sheets', help="Comma-separated titles of the sheets to write (default: all), e.g. "
+                                     "\"Database Audit,Overview\"; only the data they need is loaded. "
+                                     "Not recorded in the run history")
+parser.add_argument('--deterministic', action='store_true',
+                    help="Byte-identical output for identical data: pin all timestamps (to --timestamp, "
+                         "$SOURCE_DATE_EPOCH or 1980-01-01) and leave out the Trends sheet")
+parser.add_argument('--timestamp', help="Pinned generation time (ISO 8601); implies --deterministic")
+parser.add_argument('--artifacts', metavar='DIR', help="Also store the outputs in this content-addressed directory")
+parser.add_argument('--drizzle', default=DEFAULT_DRIZZLE_PATH, metavar='DIR',
+                    help="drizzle/ directory whose migrations feed the Schema and Index Coverage sheets")
+parser.add_argument('--schema-cache', help="Parsed-migration cache, keyed by file hash "
+                                           "(default: yeto-schema-cache.json next to --output)")
+parser.add_argument('--registry', default=DEFAULT_REGISTRY_PATH, metavar='DIR',
+                    help="Directory of the source registry files reconciled on the Source Reconciliation sheet")
+parser.add_argument('--event-window', type=int, default=DEFAULT_EVENT_WINDOW, metavar='DAYS',
+                    help="Days before and after each economic event searched for observations")
+parser.add_argument('--sla-days', type=int, default=DEFAULT_SLA_DAYS, metavar='DAYS',
+                    help="Days of scheduled runs checked against the run history on the Freshness SLA sheet")
+parser.add_argument('--sla-as-of', metavar='TIME',
+                    help="Time (ISO 8601) the Freshness SLA sheet checks against (default: now, or the latest run "
+                         "or observation in the data when the output is pinned)")
+parser.add_argument('--probe', action='store_true',
+                    help="Probe every URL of sources-registry.csv and add their health to the Data Sources sheet")
+parser.add_argument('--probe-cache', help="ETag/Last-Modified cache of the probe "
+                                          "(default: yeto-probe-cache.json next to --output)")
+parser.add_argument('--probe-concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                    help="Hosts probed at the same time")
+parser.add_argument('--probe-rate', type=float, default=DEFAULT_HOST_RATE,
+                    help="Requests per second sent to any one host")
+args = parser.parse_args()
+selected = None
+if args.sheets:
+    selected = [title.strip() for title in args.sheets.split(',') if title.strip()]
+    unknown = [title for title in selected if title not in SHEET_DESCRIPTIONS or title == "Trends"]
+    if unknown:
+        parser.error(f"unknown sheet {unknown[0]!r}; choose from: "
+                     f"{', '.join(title for title in SHEET_DESCRIPTIONS if title != 'Trends')}")
+timestamp = pinned_time(args.timestamp) if args.deterministic or args.timestamp else None
+sla_as_of = pinned_time(args.sla_as_of) if args.sla_as_of else None
+
+metrics = Instrumentation('audit', profile_dir=args.profile)
+source = connect(args.database, args.batch_size) if args.database else load_export(args.export)
+
+output_path = args.output
+run_details = {'engine': args.engine, 'compression': args.compression, 'output': output_path}
+history = None
+# A partial run would leave gaps in the history
+if args.history is not None and selected is None:
+    history_path = args.history or os.path.join(os.path.dirname(os.path.abspath(output_path)), 'yeto-audit-history.sqlite')
+    history = RunHistory(history_path)
+    history.start_run('audit', metrics.started.timestamp(), **run_details)
+
+arabic_path = None
+if args.arabic or args.arabic_output:
+    arabic_path = args.arabic_output or '{}_AR{}'.format(*os.path.splitext(output_path))
+outputs = [output_path]
+
+# The migrations, the registry files and the probe are read by pipeline
+# producers while the sheets that do not need them are rendered, and only
+# if a selected sheet needs them. Leaving the block, on an error too, stops
+# the producers still running
+graph = SheetGraph()
+schema = None
+if os.path.isdir(args.drizzle):
+    schema_cache = args.schema_cache or os.path.join(os.path.dirname(os.path.abspath(output_path)),
+                                                     'yeto-schema-cache.json')
+    schema = graph.dataset("Parse migrations", load_schema, args.drizzle, schema_cache)
+
+records = graph.dataset("Load registry", load_registry, args.registry)
+resolution = graph.dataset("Reconcile sources", reconcile_registry, records)
+
+probes = None
+if args.probe:
+    probe_cache = args.probe_cache or os.path.join(os.path.dirname(os.path.abspath(output_path)),
+                                                   'yeto-probe-cache.json')
+    probes = graph.dataset("Probe source URLs", probe_registry, records, probe_cache, args.probe_concurrency,
+                           args.probe_rate)
+
+# A run that fails is marked so in the history, without its samples
+try:
+    with Pipeline() as pipeline:
+        wb = create_workbook(source, output_path, graph, pipeline, args.engine, args.compression, args.workers,
+                             metrics, history, timestamp, args.batch_size, schema, resolution, probes, arabic_path,
+                             args.event_window, selected, records, args.sla_days, sla_as_of)
+        schema = graph.value(schema)
+        if schema is not None:
+            print(f"Schema: {len(schema.tables)} tables from {len(schema.migrations)} migrations "
+                  f"({schema.parsed} parsed, {schema.cached} cached)")
+        probes = graph.value(probes)
+        if probes is not None:
+            report = probes[1]
+            print(f"Probed {len(report.results)} source URLs in {report.elapsed:.1f}s: "
+                  f"{report.count('ok', 'not modified')} reachable, {report.changed} changed")
+        with metrics.measure("Save", wb):
+            wb.close()
+        print(f"Excel file saved to: {output_path}")
+        if arabic_path:
+            run_details['arabic_output'] = arabic_path
+            print(f"Arabic Excel file saved to: {arabic_path}")
+            outputs.append(arabic_path)
+        
+        if args.raw_output:
+            wb = create_raw_data_workbook(source, args.raw_output, args.batch_size, pipeline, args.engine,
+                                          args.compression, args.workers, metrics, timestamp)
+            with metrics.measure("Save raw data", wb):
+                wb.close()
+            print(f"Raw data saved to: {args.raw_output}")
+            outputs.append(args.raw_output)
+
+    if args.artifacts:
+        store = ArtifactStore(args.artifacts)
+        run_details['artifacts'] = {}
+        for path in outputs:
+            digest, object_path, created = store.put(path)
+            run_details['artifacts'][path] = digest
+            print(f"{'Stored as' if created else 'Unchanged, already stored as'}: {object_path}")
+except BaseException:
+    if history is not None:
+        history.finish_run(failed=True)
+        history.close()
+    raise
+
+if history is not None:
+    # Save timings (and the raw workbook's) only exist now; they show up on the next run's sheet
+    history.record(timing_metrics(metrics, total=True))
+    history.finish_run()
+    history.close()
+    print(f"Run history saved to: {history_path}")
+if args.report:
+    metrics.write_json(args.report, **run_details)
+    print(f"Run report saved to: {args.report}")
+if args.prometheus:
+    metrics.write_prometheus(args.prometheus)
+    print(f"Prometheus metrics saved to: {args.prometheus}")
@@ -4,60 +4,87 @@ YETO Platform - Comprehensive UX Tracking Excel Generator
 Generates a complete audit of all clickable elements, user journeys, and their outcomes
 """
 
-import openpyxl
-from openpyxl.styles import Font, Fill, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+import argparse
+import os
+from collections import Counter
 from datetime import datetime
 
-# Create workbook
-wb = openpyxl.Workbook()
-
-# Define styles
-header_font = Font(bold=True, color="FFFFFF", size=11)
-header_fill = PatternFill(start_color="1B5E20", end_color="1B5E20", fill_type="solid")
-subheader_fill = PatternFill(start_color="107040", end_color="107040", fill_type="solid")
-alt_row_fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-working_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
-issue_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
-pending_fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
-thin_border = Border(
-    left=Side(style='thin'),
-    right=Side(style='thin'),
-    top=Side(style='thin'),
-    bottom=Side(style='thin')
+from yeto_excel import (
+    DEFAULT_COMPRESSION, ENGINES, UX_ARABIC, ArtifactStore, CellStyle, Column, Instrumentation, MirroredBook, RowStore,
+    SheetGraph, SheetSpec, Translation, compile_spec, open_workbook, pinned_time, pivot_counts, write_pivot,
 )
 
-def style_header(ws, row=1):
-    for cell in ws[row]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        cell.border = thin_border
-
-def auto_width(ws):
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+parser = argparse.ArgumentParser(description="Generate the YETO UX tracking workbook")
+parser.add_argument('--engine', choices=ENGINES, default='openpyxl', help="Workbook backend used to write the file")
+parser.add_argument('--compression', type=int, choices=range(10), default=DEFAULT_COMPRESSION, metavar='0-9',
+                    help="Deflate level of the saved file (0 stores it uncompressed)")
+parser.add_argument('--output', default="/home/ubuntu/yeto-platform/YETO_UX_Tracking_Complete.xlsx")
+parser.add_argument('--arabic', action='store_true',
+                    help="Also write an Arabic right-to-left workbook in the same pass, named after --output "
+                         "with an _AR suffix")
+parser.add_argument('--arabic-output', help="Path of the Arabic workbook; implies --arabic")
+parser.add_argument('--report', help="Write per-sheet timings, memory and cell counts to this JSON file")
+parser.add_argument('--prometheus', help="Write the same metrics to this Prometheus textfile (.prom)")
+parser.add_argument('--profile', metavar='DIR', help="Write a cProfile dump per sheet into this directory")
+parser.add_argument('--deterministic', action='store_true',
+                    help="Byte-identical output: pin all timestamps (to --timestamp, $SOURCE_DATE_EPOCH or 1980-01-01)")
+parser.add_argument('--timestamp', help="Pinned generation time (ISO 8601); implies --deterministic")
+parser.add_argument('--artifacts', metavar='DIR', help="Also store the output in this content-addressed directory")
+parser.add_argument('--sheets', help="Comma-separated titles of the sheets to write (default: all), "
+                                     "e.g. \"5. Admin Pages,10. Summary\"")
+args = parser.parse_args()
+timestamp = pinned_time(args.timestamp) if args.deterministic or args.timestamp else None
+
+metrics = Instrumentation('ux', profile_dir=args.profile)
+
+# Create workbook. With --arabic, every sheet is written to the Arabic
+# workbook as well, with translated headers, right to left. Held in memory
+# with either engine, as XlsxWriter only adds tables to such sheets
+wb = open_workbook(args.output, args.engine, streaming=False, compression=args.compression, timestamp=timestamp)
+arabic_path = None
+if args.arabic or args.arabic_output:
+    arabic_path = args.arabic_output or '{}_AR{}'.format(*os.path.splitext(args.output))
+    wb = MirroredBook(wb, open_workbook(arabic_path, args.engine, streaming=False, compression=args.compression,
+                                        timestamp=timestamp), Translation(UX_ARABIC))
+
+# Define styles
+header_style = CellStyle(bold=True, font_color="FFFFFF", font_size=11, fill="1B5E20", border=True,
+                         h_align='center', v_align='center', wrap_text=True)
+cell_style = CellStyle(border=True)
+working_style = CellStyle(fill="C8E6C9")
+issue_style = CellStyle(fill="FFCDD2")
+pending_style = CellStyle(fill="FFF9C4")
+
+def ux_plan(headers, status=None, style=cell_style, table=True):
+    # Bordered cells under a header row that every continuation sheet
+    # repeats, with the "Status" cell filled by its value
+    return compile_spec(SheetSpec([Column(header, status=status if header == "Status" else None) for header in headers],
+                                  header_style=header_style, cell_style=style, table=table))
+
+def status_pivot(sheet, headers, items, field, statuses):
+    # Item counts by `field` and status, below the table
+    pivot = pivot_counts(items, headers, field, "Status", statuses)
+    ws, row = sheet.reserve(pivot.height + 2)
+    write_pivot(ws, row + 2, 1, pivot, header_style, cell_style, cell_style._replace(bold=True))
+
+def create_items_sheet(ws, headers, items, field, statuses):
+    # An inventory, with its pivot below it and columns fitted to both
+    sheet = ux_plan(headers, statuses).render(ws, items)
+    status_pivot(sheet, headers, items, field, statuses)
+    
+    for ws in sheet.sheets:
+        ws.fit_columns(50)
+    return sheet.sheets
+
+# Each sheet is a node over its inventory; only the selected ones are rendered
+graph = SheetGraph()
 
 # ============================================================================
 # SHEET 1: Navigation & Menu Items
 # ============================================================================
-ws1 = wb.active
-ws1.title = "1. Navigation"
-
 nav_headers = ["ID", "Location", "Element", "Label (EN)", "Label (AR)", "Target URL", "Status", "Notes", "Last Tested"]
-ws1.append(nav_headers)
-style_header(ws1)
 
-nav_items = [
+nav_items = RowStore(nav_headers, [
     # Main Header Navigation
     ["NAV-001", "Header", "Logo", "YETO", "يتو", "/", "Working", "Returns to homepage", "2026-01-30"],
     ["NAV-002", "Header", "Quick Tour Button", "Quick Tour", "جولة سريعة", "Modal", "Working", "Opens guided tour modal", "2026-01-30"],
@@ -133,32 +160,17 @@ nav_items = [
     ["NAV-056", "Footer", "Methodology Link", "Methodology", "المنهجية", "/methodology", "Working", "Footer nav", "2026-01-30"],
     ["NAV-057", "Footer", "Email Link", "yeto@causewaygrp.com", "yeto@causewaygrp.com", "mailto:yeto@causewaygrp.com", "Working", "Opens email client", "2026-01-30"],
     ["NAV-058", "Footer", "Data Policy", "Data Policy", "سياسة البيانات", "/data-policy", "Working", "Legal page", "2026-01-30"],
-]
-
-for item in nav_items:
-    ws1.append(item)
-    row = ws1.max_row
-    for cell in ws1[row]:
-        cell.border = thin_border
-    if item[6] == "Working":
-        ws1[f"G{row}"].fill = working_fill
-    elif item[6] == "Issue":
-        ws1[f"G{row}"].fill = issue_fill
-    elif item[6] == "Pending":
-        ws1[f"G{row}"].fill = pending_fill
+], unique=("ID",))
 
-auto_width(ws1)
+sheet1_status = {"Working": working_style, "Issue": issue_style, "Pending": pending_style}
+graph.sheet("1. Navigation", create_items_sheet, nav_headers, nav_items, "Location", sheet1_status)
 
 # ============================================================================
 # SHEET 2: Homepage Elements
 # ============================================================================
-ws2 = wb.create_sheet("2. Homepage")
-
 home_headers = ["ID", "Section", "Element Type", "Label/Content", "Action", "Target", "Status", "Notes", "Last Tested"]
-ws2.append(home_headers)
-style_header(ws2)
 
-home_items = [
+home_items = RowStore(home_headers, [
     # Hero Section
     ["HOME-001", "Hero", "CTA Button", "Explore Data", "Navigate", "/dashboard", "Working", "Primary CTA", "2026-01-30"],
     ["HOME-002", "Hero", "CTA Button", "Ask AI Assistant", "Navigate", "/ai-assistant", "Working", "Secondary CTA", "2026-01-30"],
@@ -205,28 +217,15 @@ home_items = [
     
     # Scroll to Top
     ["HOME-031", "Utility", "Button", "Scroll to Top", "Scroll", "#top", "Working", "Appears on scroll", "2026-01-30"],
-]
+], unique=("ID",))
 
-for item in home_items:
-    ws2.append(item)
-    row = ws2.max_row
-    for cell in ws2[row]:
-        cell.border = thin_border
-    if item[6] == "Working":
-        ws2[f"G{row}"].fill = working_fill
-    elif item[6] == "Issue":
-        ws2[f"G{row}"].fill = issue_fill
-
-auto_width(ws2)
+sheet2_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("2. Homepage", create_items_sheet, home_headers, home_items, "Section", sheet2_status)
 
 # ============================================================================
 # SHEET 3: Sector Pages
 # ============================================================================
-ws3 = wb.create_sheet("3. Sector Pages")
-
 sector_headers = ["ID", "Sector", "Element", "Description", "Action", "Status", "Data Source", "Notes", "Last Tested"]
-ws3.append(sector_headers)
-style_header(ws3)
 
 sectors = [
     ("Banking", "/sectors/banking"),
@@ -246,7 +245,8 @@ sectors = [
     ("Governance", "/sectors/governance"),
 ]
 
-sector_items = []
+# Ten rows per sector; the store keeps one copy of each repeated cell value
+sector_items = RowStore(sector_headers, unique=("ID",))
 idx = 1
 for sector_name, sector_url in sectors:
     sector_items.extend([
@@ -263,28 +263,15 @@ for sector_name, sector_url in sectors:
     ])
     idx += 10
 
-for item in sector_items:
-    ws3.append(item)
-    row = ws3.max_row
-    for cell in ws3[row]:
-        cell.border = thin_border
-    if item[5] == "Working":
-        ws3[f"F{row}"].fill = working_fill
-    elif item[5] == "Issue":
-        ws3[f"F{row}"].fill = issue_fill
-
-auto_width(ws3)
+sheet3_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("3. Sector Pages", create_items_sheet, sector_headers, sector_items, "Sector", sheet3_status)
 
 # ============================================================================
 # SHEET 4: AI Tools
 # ============================================================================
-ws4 = wb.create_sheet("4. AI Tools")
-
 ai_headers = ["ID", "Tool", "Feature", "Description", "Input Type", "Output Type", "Status", "Notes", "Last Tested"]
-ws4.append(ai_headers)
-style_header(ws4)
 
-ai_items = [
+ai_items = RowStore(ai_headers, [
     # AI Assistant
     ["AI-001", "AI Assistant", "Chat Input", "Text input for questions", "Text", "AI Response", "Working", "Streaming response", "2026-01-30"],
     ["AI-002", "AI Assistant", "Send Button", "Submit question", "Click", "Trigger", "Working", "Enter also works", "2026-01-30"],
@@ -319,30 +306,17 @@ ai_items = [
     ["AI-023", "Insight Miner", "Approve Button", "Accept insight", "Click", "Update", "Working", "Publishes", "2026-01-30"],
     ["AI-024", "Insight Miner", "Reject Button", "Dismiss insight", "Click", "Update", "Working", "Removes", "2026-01-30"],
     ["AI-025", "Insight Miner", "View Data", "See underlying data", "Click", "Modal", "Working", "Data points", "2026-01-30"],
-]
+], unique=("ID",))
 
-for item in ai_items:
-    ws4.append(item)
-    row = ws4.max_row
-    for cell in ws4[row]:
-        cell.border = thin_border
-    if item[6] == "Working":
-        ws4[f"G{row}"].fill = working_fill
-    elif item[6] == "Issue":
-        ws4[f"G{row}"].fill = issue_fill
-
-auto_width(ws4)
+sheet4_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("4. AI Tools", create_items_sheet, ai_headers, ai_items, "Tool", sheet4_status)
 
 # ============================================================================
 # SHEET 5: Admin Pages
 # ============================================================================
-ws5 = wb.create_sheet("5. Admin Pages")
-
 admin_headers = ["ID", "Page", "Element", "Description", "Permission", "Status", "Notes", "Last Tested"]
-ws5.append(admin_headers)
-style_header(ws5)
 
-admin_items = [
+admin_items = RowStore(admin_headers, [
     # Control Room
     ["ADM-001", "Control Room", "Refresh Button", "Update all data", "Admin", "Working", "Triggers refresh", "2026-01-30"],
     ["ADM-002", "Control Room", "Settings Button", "System settings", "Admin", "Working", "Opens modal", "2026-01-30"],
@@ -376,32 +350,17 @@ admin_items = [
     ["ADM-026", "Insight Miner", "Approved", "Published insights", "Admin", "Working", "Count shown", "2026-01-30"],
     ["ADM-027", "Insight Miner", "Published", "Live insights", "Admin", "Working", "Count shown", "2026-01-30"],
     ["ADM-028", "Insight Miner", "Insight Cards", "Individual insights", "Admin", "Working", "Approve/Reject", "2026-01-30"],
-]
-
-for item in admin_items:
-    ws5.append(item)
-    row = ws5.max_row
-    for cell in ws5[row]:
-        cell.border = thin_border
-    if item[5] == "Working":
-        ws5[f"F{row}"].fill = working_fill
-    elif item[5] == "Issue" or item[5] == "Needs Fix":
-        ws5[f"F{row}"].fill = issue_fill
-    elif item[5] == "Needs Key" or item[5] == "No API":
-        ws5[f"F{row}"].fill = pending_fill
+], unique=("ID",))
 
-auto_width(ws5)
+sheet5_status = {"Working": working_style, "Issue": issue_style, "Needs Fix": issue_style, "Needs Key": pending_style, "No API": pending_style}
+graph.sheet("5. Admin Pages", create_items_sheet, admin_headers, admin_items, "Page", sheet5_status)
 
 # ============================================================================
 # SHEET 6: Downloads & Documents
 # ============================================================================
-ws6 = wb.create_sheet("6. Downloads")
-
 download_headers = ["ID", "Page", "Document", "Format", "File Path", "Size", "Status", "Notes", "Last Tested"]
-ws6.append(download_headers)
-style_header(ws6)
 
-download_items = [
+download_items = RowStore(download_headers, [
     # Methodology Page Downloads
     ["DL-001", "Methodology", "Full Methodology Guide", "PDF", "/documents/YETO_Methodology_Guide.pdf", "~500KB", "Working", "6-page guide", "2026-01-30"],
     ["DL-002", "Methodology", "Indicator Catalog", "XLSX", "/documents/YETO_Indicator_Catalog.xlsx", "~200KB", "Working", "100+ indicators", "2026-01-30"],
@@ -427,30 +386,17 @@ download_items = [
     # Comparison Tool Exports
     ["DL-013", "Comparison Tool", "Comparison Results", "CSV", "Dynamic", "Varies", "Working", "Data export", "2026-01-30"],
     ["DL-014", "Comparison Tool", "Comparison Results", "PDF", "Dynamic", "Varies", "Working", "Visual report", "2026-01-30"],
-]
-
-for item in download_items:
-    ws6.append(item)
-    row = ws6.max_row
-    for cell in ws6[row]:
-        cell.border = thin_border
-    if item[6] == "Working":
-        ws6[f"G{row}"].fill = working_fill
-    elif item[6] == "Issue":
-        ws6[f"G{row}"].fill = issue_fill
+], unique=("ID",))
 
-auto_width(ws6)
+sheet6_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("6. Downloads", create_items_sheet, download_headers, download_items, "Page", sheet6_status)
 
 # ============================================================================
 # SHEET 7: User Journeys
 # ============================================================================
-ws7 = wb.create_sheet("7. User Journeys")
-
 journey_headers = ["ID", "Journey Name", "User Type", "Steps", "Entry Point", "Exit Point", "Status", "Conversion Goal"]
-ws7.append(journey_headers)
-style_header(ws7)
 
-journey_items = [
+journey_items = RowStore(journey_headers, [
     ["UJ-001", "First-time Visitor Exploration", "New Visitor", "Homepage → Quick Tour → Sector → Dashboard", "/", "/dashboard", "Working", "Account signup"],
     ["UJ-002", "Researcher Data Access", "Researcher", "Homepage → Data Repository → Filter → Download", "/", "/data-repository", "Working", "Data download"],
     ["UJ-003", "Policy Maker Briefing", "Executive", "Homepage → Executive Dashboard → Report Builder → Export", "/", "/executive/*", "Working", "Report generation"],
@@ -466,30 +412,17 @@ journey_items = [
     ["UJ-013", "Insight Approval", "Admin", "Login → Insight Miner → Review → Approve/Reject", "/admin/insight-miner", "/admin/insight-miner", "Working", "Insight published"],
     ["UJ-014", "Scenario Planning", "Strategist", "Homepage → Scenario Simulator → Configure → Run → Export", "/", "/scenario-simulator", "Working", "Strategic insight"],
     ["UJ-015", "Research Discovery", "Academic", "Homepage → Research Library → Search → Read → Cite", "/", "/research-library", "Working", "Citation/reference"],
-]
+], unique=("ID",))
 
-for item in journey_items:
-    ws7.append(item)
-    row = ws7.max_row
-    for cell in ws7[row]:
-        cell.border = thin_border
-    if item[6] == "Working":
-        ws7[f"G{row}"].fill = working_fill
-    elif item[6] == "Issue":
-        ws7[f"G{row}"].fill = issue_fill
-
-auto_width(ws7)
+sheet7_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("7. User Journeys", create_items_sheet, journey_headers, journey_items, "User Type", sheet7_status)
 
 # ============================================================================
 # SHEET 8: Forms & Inputs
 # ============================================================================
-ws8 = wb.create_sheet("8. Forms & Inputs")
-
 form_headers = ["ID", "Page", "Form/Input", "Field Type", "Validation", "Required", "Status", "Notes"]
-ws8.append(form_headers)
-style_header(ws8)
 
-form_items = [
+form_items = RowStore(form_headers, [
     # Contact Form
     ["FRM-001", "Contact", "Name", "Text", "Min 2 chars", "Yes", "Working", "Full name"],
     ["FRM-002", "Contact", "Email", "Email", "Valid email", "Yes", "Working", "Contact email"],
@@ -525,30 +458,17 @@ form_items = [
     ["FRM-022", "Notifications", "Sector Alerts", "Multi-select", "N/A", "No", "Working", "Choose sectors"],
     ["FRM-023", "Notifications", "Frequency", "Select", "Required", "Yes", "Working", "Daily/Weekly"],
     ["FRM-024", "Notifications", "Save", "Button", "N/A", "N/A", "Working", "Save preferences"],
-]
-
-for item in form_items:
-    ws8.append(item)
-    row = ws8.max_row
-    for cell in ws8[row]:
-        cell.border = thin_border
-    if item[6] == "Working":
-        ws8[f"G{row}"].fill = working_fill
-    elif item[6] == "Issue":
-        ws8[f"G{row}"].fill = issue_fill
+], unique=("ID",))
 
-auto_width(ws8)
+sheet8_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("8. Forms & Inputs", create_items_sheet, form_headers, form_items, "Page", sheet8_status)
 
 # ============================================================================
 # SHEET 9: API Endpoints
 # ============================================================================
-ws9 = wb.create_sheet("9. API Endpoints")
-
 api_headers = ["ID", "Endpoint", "Method", "Description", "Auth Required", "Status", "Response Type", "Notes"]
-ws9.append(api_headers)
-style_header(ws9)
 
-api_items = [
+api_items = RowStore(api_headers, [
     # Public Endpoints
     ["API-001", "/api/trpc/sectors.list", "GET", "List all sectors", "No", "Working", "JSON", "Public"],
     ["API-002", "/api/trpc/sectors.getById", "GET", "Get sector details", "No", "Working", "JSON", "Public"],
@@ -575,61 +495,91 @@ api_items = [
     ["API-017", "/api/trpc/admin.approveInsight", "POST", "Approve insight", "Admin", "Working", "JSON", "Admin only"],
     ["API-018", "/api/trpc/admin.publishContent", "POST", "Publish content", "Admin", "Working", "JSON", "Admin only"],
     ["API-019", "/api/trpc/admin.getSystemHealth", "GET", "System health check", "Admin", "Working", "JSON", "Admin only"],
-]
+], unique=("ID",))
 
-for item in api_items:
-    ws9.append(item)
-    row = ws9.max_row
-    for cell in ws9[row]:
-        cell.border = thin_border
-    if item[5] == "Working":
-        ws9[f"F{row}"].fill = working_fill
-    elif item[5] == "Issue":
-        ws9[f"F{row}"].fill = issue_fill
-
-auto_width(ws9)
+sheet9_status = {"Working": working_style, "Issue": issue_style}
+graph.sheet("9. API Endpoints", create_items_sheet, api_headers, api_items, "Auth Required", sheet9_status)
 
 # ============================================================================
 # SHEET 10: Summary Statistics
 # ============================================================================
-ws10 = wb.create_sheet("10. Summary")
-
 summary_headers = ["Category", "Total Items", "Working", "Issues", "Pending", "Coverage %"]
-ws10.append(summary_headers)
-style_header(ws10)
-
-summary_items = [
-    ["Navigation Items", 58, 58, 0, 0, "100%"],
-    ["Homepage Elements", 31, 31, 0, 0, "100%"],
-    ["Sector Page Elements", 150, 150, 0, 0, "100%"],
-    ["AI Tool Features", 25, 25, 0, 0, "100%"],
-    ["Admin Page Elements", 28, 24, 1, 3, "86%"],
-    ["Download Items", 14, 14, 0, 0, "100%"],
-    ["User Journeys", 15, 15, 0, 0, "100%"],
-    ["Form Inputs", 24, 24, 0, 0, "100%"],
-    ["API Endpoints", 19, 19, 0, 0, "100%"],
-    ["", "", "", "", "", ""],
-    ["TOTAL", 364, 360, 1, 3, "98.9%"],
-]
-
-for item in summary_items:
-    ws10.append(item)
-    row = ws10.max_row
-    for cell in ws10[row]:
-        cell.border = thin_border
-        cell.alignment = Alignment(horizontal='center')
 
-# Bold the total row
-for cell in ws10[ws10.max_row]:
-    cell.font = Font(bold=True)
+summary_plan = ux_plan(summary_headers, style=cell_style._replace(h_align='center'), table=False)
+total_plan = ux_plan(summary_headers, style=cell_style._replace(h_align='center', bold=True), table=False)
+
+def create_summary_sheet(ws, categories):
+    # Counted from the inventories, each status by the fill it gets on its
+    # sheet: working, issue or pending
+    summary_items = []
+    for label, items, statuses in categories:
+        counts = Counter(statuses.get(status) for status in items.column("Status"))
+        working, issues, pending = (counts[style] for style in (working_style, issue_style, pending_style))
+        summary_items.append([label, len(items), working, issues, pending, f"{working / len(items):.0%}"])
+    totals = [sum(item[column] for item in summary_items) for column in range(1, 5)]
+    summary_items.append(["", "", "", "", "", ""])
+    summary_items.append(["TOTAL", *totals, f"{totals[1] / totals[0]:.1%}"])
+    
+    sheet = summary_plan.sheet(ws)
+    for ws, row, item in sheet.rows(summary_items):
+        # Bold the total row
+        (total_plan if item is summary_items[-1] else summary_plan).write(ws, row, item)
+    
+    for ws in sheet.sheets:
+        ws.fit_columns(50)
+    return sheet.sheets
+
+graph.sheet("10. Summary", create_summary_sheet, [
+    ("Navigation Items", nav_items, sheet1_status),
+    ("Homepage Elements", home_items, sheet2_status),
+    ("Sector Page Elements", sector_items, sheet3_status),
+    ("AI Tool Features", ai_items, sheet4_status),
+    ("Admin Page Elements", admin_items, sheet5_status),
+    ("Download Items", download_items, sheet6_status),
+    ("User Journeys", journey_items, sheet7_status),
+    ("Form Inputs", form_items, sheet8_status),
+    ("API Endpoints", api_items, sheet9_status),
+])
 
-auto_width(ws10)
+# ============================================================================
+# Render the selected sheets
+# ============================================================================
+selected = None
+if args.sheets:
+    selected = [title.strip() for title in args.sheets.split(',') if title.strip()]
+    unknown = [title for title in selected if title not in graph.sheets()]
+    if unknown:
+        parser.error(f"unknown sheet {unknown[0]!r}; choose from: {', '.join(graph.sheets())}")
+graph.run(wb, metrics=metrics, selected=selected)
 
 # ============================================================================
 # Save workbook
 # ============================================================================
-output_path = "/home/ubuntu/yeto-platform/YETO_UX_Tracking_Complete.xlsx"
-wb.save(output_path)
+output_path = args.output
+with metrics.measure("Save", wb):
+    wb.close()
 print(f"UX Tracking Excel saved to: {output_path}")
-print(f"Total sheets: {len(wb.sheetnames)}")
-print(f"Sheets: {', '.join(wb.sheetnames)}")
+if arabic_path:
+    print(f"Arabic UX Tracking Excel saved to: {arabic_path}")
+print(f"Total sheets: {len(wb.sheets)}")
+print(f"Sheets: {', '.join(sheet.title for sheet in wb.sheets)}")
+
+run_details = {'engine': args.engine, 'compression': args.compression, 'output': output_path}
+outputs = [output_path]
+if arabic_path:
+    run_details['arabic_output'] = arabic_path
+    outputs.append(arabic_path)
+if args.artifacts:
+    store = ArtifactStore(args.artifacts)
+    run_details['artifacts'] = {}
+    for path in outputs:
+        digest, object_path, created = store.put(path)
+        run_details['artifacts'][path] = digest
+        print(f"{'Stored as' if created else 'Unchanged, already stored as'}: {object_path}")
+
+if args.report:
+    metrics.write_json(args.report, **run_details)
+    print(f"Run report saved to: {args.report}")
+if args.prometheus:
+    metrics.write_prometheus(args.prometheus)
+    print(f"Prometheus metrics saved to: {args.prometheus}")
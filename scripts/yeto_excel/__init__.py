@@ -0,0 +1,171 @@
+"""
+Shared helpers for the YETO Excel generators
+(generate-audit-excel.py and generate-ux-tracking.py)
+
+Requires openpyxl and numpy; XlsxWriter is needed only for the xlsxwriter engine.
+"""
+
+from .anomalies import (
+    FLAG_JUMP, FLAG_RANGE, FLAG_ZSCORE, SeriesFrame, detect_anomalies, flag_labels, series_frame,
+)
+from .arabic import AUDIT_ARABIC, AUDIT_PATTERNS, UX_ARABIC
+from .artifacts import ArtifactStore, file_digest, pinned_time
+from .backends import ENGINES, CellStyle, open_workbook
+from .bilingual import MirroredBook, MirroredSheet, Translation
+from .coverage import CoverageMatrix, Interner, build_coverage
+from .db_source import DEFAULT_BATCH_SIZE, DatabaseSource, connect
+from .etl import QUANTILES, RunStats, etl_performance
+from .events import DEFAULT_EVENT_WINDOW, EventFrame, EventImpact, IntervalIndex, event_frame, event_impact
+from .export_data import DEFAULT_EXPORT_PATH, EXPORT_TABLES, load_export, table_batches, table_count, table_rows
+from .freshness import (
+    DEFAULT_GRACE_MINUTES, DEFAULT_SLA_DAYS, CronSchedule, JobFreshness, SourceFreshness, cadence_days, compile_cron,
+    cron_instants, job_freshness, latest_activity, source_freshness,
+)
+from .glossary import (
+    GLOSSARY_FIELDS, GlossaryCoverage, GlossaryTerm, TermAutomaton, glossary_coverage, normalize_words, term_forms,
+)
+from .history import RunHistory
+from .instrumentation import Instrumentation
+from .pipeline import DEFAULT_QUEUE_SIZE, Pipeline, Stream, Task
+from .pivots import Pivot, pivot_counts, write_pivot
+from .probe import (
+    DEFAULT_CONCURRENCY, DEFAULT_HOST_RATE, DEFAULT_TIMEOUT, ProbeReport, ProbeResult, Prober, probe_urls,
+    probe_urls_async,
+)
+from .reconcile import (
+    DEFAULT_REGISTRY_PATH, LINK_THRESHOLD, REGISTRY_FILES, Resolution, SourceCluster, SourceRecord, institution_key,
+    load_registry, reconcile_sources, url_host,
+)
+from .regimes import ADEN, SANAA, STATE_LABELS, RegimeAlignment, align_regimes, asof_join
+from .rowstore import Record, RowStore
+from .scheduler import RENDERED, Node, SheetGraph
+from .schema import (
+    DEFAULT_DRIZZLE_PATH, HOT_ACCESS_PATHS, ForeignKey, Index, Schema, SchemaColumn, TableSchema, index_report,
+    load_schema, parse_migration,
+)
+from .sheets import EXCEL_MAX_ROWS, SpillingSheet, continuation_title, continued, table_name
+from .specs import Column, RenderPlan, SheetSpec, compile_spec, overlay
+from .tdigest import TDigest
+from .zipwriter import DEFAULT_COMPRESSION, ParallelZipFile
+
+__all__ = [
+    'ADEN',
+    'AUDIT_ARABIC',
+    'AUDIT_PATTERNS',
+    'ArtifactStore',
+    'CellStyle',
+    'Column',
+    'CoverageMatrix',
+    'CronSchedule',
+    'DEFAULT_BATCH_SIZE',
+    'DEFAULT_COMPRESSION',
+    'DEFAULT_CONCURRENCY',
+    'DEFAULT_DRIZZLE_PATH',
+    'DEFAULT_EVENT_WINDOW',
+    'DEFAULT_EXPORT_PATH',
+    'DEFAULT_GRACE_MINUTES',
+    'DEFAULT_HOST_RATE',
+    'DEFAULT_QUEUE_SIZE',
+    'DEFAULT_REGISTRY_PATH',
+    'DEFAULT_SLA_DAYS',
+    'DEFAULT_TIMEOUT',
+    'DatabaseSource',
+    'ENGINES',
+    'EXCEL_MAX_ROWS',
+    'EXPORT_TABLES',
+    'EventFrame',
+    'EventImpact',
+    'FLAG_JUMP',
+    'FLAG_RANGE',
+    'FLAG_ZSCORE',
+    'ForeignKey',
+    'GLOSSARY_FIELDS',
+    'GlossaryCoverage',
+    'GlossaryTerm',
+    'HOT_ACCESS_PATHS',
+    'Index',
+    'Instrumentation',
+    'Interner',
+    'IntervalIndex',
+    'JobFreshness',
+    'LINK_THRESHOLD',
+    'MirroredBook',
+    'MirroredSheet',
+    'Node',
+    'ParallelZipFile',
+    'Pipeline',
+    'Pivot',
+    'ProbeReport',
+    'ProbeResult',
+    'Prober',
+    'QUANTILES',
+    'REGISTRY_FILES',
+    'RENDERED',
+    'Record',
+    'RegimeAlignment',
+    'RenderPlan',
+    'Resolution',
+    'RowStore',
+    'RunHistory',
+    'RunStats',
+    'SANAA',
+    'STATE_LABELS',
+    'Schema',
+    'SchemaColumn',
+    'SeriesFrame',
+    'SheetGraph',
+    'SheetSpec',
+    'SourceCluster',
+    'SourceFreshness',
+    'SourceRecord',
+    'SpillingSheet',
+    'Stream',
+    'TDigest',
+    'TableSchema',
+    'Task',
+    'TermAutomaton',
+    'Translation',
+    'UX_ARABIC',
+    'align_regimes',
+    'asof_join',
+    'build_coverage',
+    'cadence_days',
+    'compile_cron',
+    'compile_spec',
+    'connect',
+    'continuation_title',
+    'continued',
+    'cron_instants',
+    'detect_anomalies',
+    'etl_performance',
+    'event_frame',
+    'event_impact',
+    'file_digest',
+    'flag_labels',
+    'glossary_coverage',
+    'index_report',
+    'institution_key',
+    'job_freshness',
+    'latest_activity',
+    'load_export',
+    'load_registry',
+    'load_schema',
+    'normalize_words',
+    'open_workbook',
+    'overlay',
+    'parse_migration',
+    'pinned_time',
+    'pivot_counts',
+    'probe_urls',
+    'probe_urls_async',
+    'reconcile_sources',
+    'series_frame',
+    'source_freshness',
+    'table_batches',
+    'table_count',
+    'table_name',
+    'table_rows',
+    'term_forms',
+    'url_host',
+    'write_pivot',
+]
@@ -0,0 +1,189 @@
+"""
+Vectorized outlier and jump detection over time_series.
+
+Observations are loaded once into numpy columns, sorted by (indicatorCode,
+regimeTag, date), and every statistic is computed with whole-array
+operations: trailing-window mean and standard deviation come from
+per-group cumulative sums, period-over-period jumps from a shifted copy of
+the value column. There is no Python loop per observation after loading.
+"""
+
+from itertools import islice
+
+import numpy as np
+
+from .coverage import Interner
+
+WINDOW = 12          # trailing observations used for the z-score baseline
+MIN_PERIODS = 4      # baseline size needed before a z-score is reported
+Z_THRESHOLD = 3.0
+JUMP_THRESHOLD = 0.5  # 50% change against the previous observation
+
+FLAG_ZSCORE = 1
+FLAG_JUMP = 2
+FLAG_RANGE = 4
+FLAG_LABELS = ((FLAG_ZSCORE, "Z-score"), (FLAG_JUMP, "Jump"), (FLAG_RANGE, "Out of range"))
+
+# Plausible value range per unit (lower-cased); units not listed are not range-checked
+_NON_NEGATIVE = (0.0, np.inf)
+UNIT_RANGES = {
+    '%': (-100.0, 100.0),
+    'percent': (-100.0, 100.0),
+    'index (0-1)': (0.0, 1.0),
+    'years': (0.0, 120.0),
+    'rank': (1.0, 250.0),
+    'per 1,000': (0.0, 1000.0),
+    'per 1,000 live births': (0.0, 1000.0),
+    'per 10,000 population': (0.0, 10000.0),
+    'per 100,000 live births': (0.0, 100000.0),
+    'usd billions': (0.0, 10000.0),
+    'usd millions': (0.0, 10000000.0),
+    'yer billions': (0.0, 10000000.0),
+    'persons': _NON_NEGATIVE,
+    'millions': _NON_NEGATIVE,
+    'projects': _NON_NEGATIVE,
+    'organizations': _NON_NEGATIVE,
+    'score': _NON_NEGATIVE,
+    'usd': _NON_NEGATIVE,
+    'yer': _NON_NEGATIVE,
+    'yer/usd': _NON_NEGATIVE,
+    'yer/kg': _NON_NEGATIVE,
+    'yer/l': _NON_NEGATIVE,
+    '2017 ppp $': _NON_NEGATIVE,
+}
+
+
+class SeriesFrame:
+    """Columnar time_series: one numpy array per field, categorical fields interned."""
+
+    __slots__ = ('groups', 'units', 'group', 'unit', 'date', 'value')
+
+    def __init__(self, groups, units, group, unit, date, value):
+        self.groups = groups    # Interner of (indicatorCode, regimeTag)
+        self.units = units      # Interner of unit labels
+        self.group = group
+        self.unit = unit
+        self.date = date
+        self.value = value
+
+    def __len__(self):
+        return len(self.value)
+
+    def take(self, index):
+        return SeriesFrame(self.groups, self.units, self.group[index], self.unit[index],
+                           self.date[index], self.value[index])
+
+    def sorted(self):
+        """Copy ordered by group, then date."""
+        return self.take(np.lexsort((self.date, self.group)))
+
+
+def _chunk_columns(chunk, groups, units):
+    count = len(chunk)
+    group = np.fromiter((groups((p['indicatorCode'], p.get('regimeTag') or 'unknown')) for p in chunk),
+                        dtype=np.int32, count=count)
+    unit = np.fromiter((units(p.get('unit') or '') for p in chunk), dtype=np.int32, count=count)
+    # ISO timestamps such as "2024-01-01T05:00:00.000Z"; the day is enough here
+    date = np.array([(p.get('date') or 'NaT')[:10] for p in chunk], dtype='datetime64[D]')
+    value = np.array([p.get('value') if p.get('value') is not None else 'nan' for p in chunk], dtype=np.float64)
+    return group, unit, date, value
+
+
+def series_frame(time_series, chunk_size=65536):
+    """
+    Build a SeriesFrame from time_series rows. Rows may be a list or a
+    one-shot stream; they are converted `chunk_size` at a time so only the
+    compact numpy columns are kept.
+    """
+    groups = Interner()
+    units = Interner()
+    rows = iter(time_series)
+    chunks = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        chunks.append(_chunk_columns(chunk, groups, units))
+    if chunks:
+        group, unit, date, value = (np.concatenate(column) for column in zip(*chunks))
+    else:
+        group, unit = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        date, value = np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64)
+    keep = ~np.isnan(value) & ~np.isnat(date)
+    return SeriesFrame(groups, units, group, unit, date, value).take(keep)
+
+
+def group_starts(group):
+    """Boolean mask of the first element of each run of equal group ids."""
+    starts = np.ones(len(group), dtype=bool)
+    starts[1:] = group[1:] != group[:-1]
+    return starts
+
+
+def trailing_stats(group, value, window=WINDOW, inclusive=False):
+    """
+    Mean, sample standard deviation and size of the `window` observations
+    before each element within its group (the element itself excluded
+    unless `inclusive`). `group` must be sorted.
+    """
+    n = len(value)
+    index = np.arange(n)
+    starts = group_starts(group)
+    first = np.maximum.accumulate(np.where(starts, index, 0))
+
+    # Centre on the group mean so the cumulative sums of squares stay well conditioned
+    sizes = np.bincount(group, minlength=group.max() + 1 if n else 0)
+    means = np.bincount(group, weights=value, minlength=len(sizes)) / np.maximum(sizes, 1)
+    x = value - means[group]
+
+    cs = np.concatenate(([0.0], np.cumsum(x)))
+    cs2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    hi = index + 1 if inclusive else index
+    lo = np.maximum(hi - window, first)
+    size = hi - lo
+    total = cs[hi] - cs[lo]
+    total2 = cs2[hi] - cs2[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / size
+        var = (total2 - total * mean) / (size - 1)
+        # One observation has no spread; rounding would otherwise leave 0 or inf
+        std = np.where(size > 1, np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return mean + means[group], std, size
+
+
+def detect_anomalies(frame, window=WINDOW, min_periods=MIN_PERIODS,
+                     z_threshold=Z_THRESHOLD, jump_threshold=JUMP_THRESHOLD):
+    """
+    Flag observations in `frame`. Returns (sorted frame, result) where
+    result holds per-observation arrays: previous, change, zscore and flags.
+    """
+    frame = frame.sorted()
+    value = frame.value
+    starts = group_starts(frame.group)
+
+    mean, std, size = trailing_stats(frame.group, value, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        zscore = np.where((size >= min_periods) & (std > 0), (value - mean) / std, np.nan)
+
+    previous = np.empty_like(value)
+    previous[0:1] = np.nan
+    previous[1:] = value[:-1]
+    previous[starts] = np.nan
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change = np.where(previous != 0, (value - previous) / np.abs(previous), np.nan)
+
+    lower = np.full(len(frame.units), -np.inf)
+    upper = np.full(len(frame.units), np.inf)
+    for unit_id, label in enumerate(frame.units.labels):
+        lower[unit_id], upper[unit_id] = UNIT_RANGES.get(label.strip().lower(), (-np.inf, np.inf))
+
+    flags = np.zeros(len(value), dtype=np.int8)
+    flags |= np.where(np.abs(np.nan_to_num(zscore)) >= z_threshold, FLAG_ZSCORE, 0).astype(np.int8)
+    flags |= np.where(np.abs(np.nan_to_num(change)) >= jump_threshold, FLAG_JUMP, 0).astype(np.int8)
+    flags |= np.where((value < lower[frame.unit]) | (value > upper[frame.unit]), FLAG_RANGE, 0).astype(np.int8)
+
+    return frame, {'previous': previous, 'change': change, 'zscore': zscore, 'flags': flags}
+
+
+def flag_labels(flags):
+    return ", ".join(label for bit, label in FLAG_LABELS if flags & bit)
@@ -0,0 +1,352 @@
+"""
+Arabic terms of the generated workbooks, for bilingual.Translation.
+
+Keys are the exact English strings the generators write: sheet titles,
+table titles, column headers, section headings and status labels. Text
+that is computed per run (subtitles with counts, record names) is written
+as is, apart from the AUDIT_PATTERNS forms. Sheet titles must stay within
+Excel's 31 characters.
+"""
+
+# Headers and labels both generators use
+COMMON_ARABIC = {
+    "ID": "المعرّف",
+    "Category": "الفئة",
+    "Description": "الوصف",
+    "Status": "الحالة",
+    "Notes": "ملاحظات",
+    "Feature": "الميزة",
+    "Sector": "القطاع",
+    "Data Source": "مصدر البيانات",
+    "Endpoint": "نقطة النهاية",
+    "Auth Required": "يتطلب المصادقة",
+    "API Endpoints": "نقاط نهاية API",
+    "Sector Pages": "صفحات القطاعات",
+    "Yes": "نعم",
+    "No": "لا",
+    "N/A": "غير متاح",
+    "Total": "المجموع",
+}
+
+UX_ARABIC = {
+    **COMMON_ARABIC,
+    # Sheets
+    "1. Navigation": "1. التنقل",
+    "2. Homepage": "2. الصفحة الرئيسية",
+    "3. Sector Pages": "3. صفحات القطاعات",
+    "4. AI Tools": "4. أدوات الذكاء الاصطناعي",
+    "5. Admin Pages": "5. صفحات الإدارة",
+    "6. Downloads": "6. التنزيلات",
+    "7. User Journeys": "7. رحلات المستخدم",
+    "8. Forms & Inputs": "8. النماذج والمدخلات",
+    "9. API Endpoints": "9. نقاط نهاية API",
+    "10. Summary": "10. الملخص",
+    # Headers
+    "Location": "الموقع",
+    "Element": "العنصر",
+    "Label (EN)": "التسمية (إنجليزي)",
+    "Label (AR)": "التسمية (عربي)",
+    "Target URL": "الرابط المستهدف",
+    "Last Tested": "آخر اختبار",
+    "Section": "القسم",
+    "Element Type": "نوع العنصر",
+    "Label/Content": "التسمية/المحتوى",
+    "Action": "الإجراء",
+    "Target": "الوجهة",
+    "Tool": "الأداة",
+    "Input Type": "نوع المدخلات",
+    "Output Type": "نوع المخرجات",
+    "Page": "الصفحة",
+    "Permission": "الصلاحية",
+    "Document": "المستند",
+    "Format": "الصيغة",
+    "File Path": "مسار الملف",
+    "Size": "الحجم",
+    "Journey Name": "اسم الرحلة",
+    "User Type": "نوع المستخدم",
+    "Steps": "الخطوات",
+    "Entry Point": "نقطة الدخول",
+    "Exit Point": "نقطة الخروج",
+    "Conversion Goal": "هدف التحويل",
+    "Form/Input": "النموذج/المدخل",
+    "Field Type": "نوع الحقل",
+    "Validation": "التحقق",
+    "Required": "إلزامي",
+    "Method": "الطريقة",
+    "Response Type": "نوع الاستجابة",
+    "Total Items": "إجمالي العناصر",
+    "Issues": "مشكلات",
+    "Coverage %": "نسبة التغطية",
+    # Statuses
+    "Working": "يعمل",
+    "Issue": "مشكلة",
+    "Pending": "قيد الانتظار",
+    "Needs Fix": "يحتاج إلى إصلاح",
+    "Needs Key": "يحتاج إلى مفتاح",
+    "No API": "لا توجد واجهة API",
+    # Summary categories
+    "Navigation Items": "عناصر التنقل",
+    "Homepage Elements": "عناصر الصفحة الرئيسية",
+    "Sector Page Elements": "عناصر صفحات القطاعات",
+    "AI Tool Features": "ميزات أدوات الذكاء الاصطناعي",
+    "Admin Page Elements": "عناصر صفحات الإدارة",
+    "Download Items": "عناصر التنزيل",
+    "User Journeys": "رحلات المستخدم",
+    "Form Inputs": "مدخلات النماذج",
+    "TOTAL": "الإجمالي",
+}
+
+AUDIT_ARABIC = {
+    **COMMON_ARABIC,
+    # Sheets
+    "Overview": "نظرة عامة",
+    "Database Audit": "تدقيق قاعدة البيانات",
+    "Schema": "المخطط",
+    "Index Coverage": "تغطية الفهارس",
+    "Source Coverage": "تغطية المصادر",
+    "Data Quality": "جودة البيانات",
+    "Regime Spreads": "فروق عدن وصنعاء",
+    "Regime Alignment": "مواءمة عدن وصنعاء",
+    "Event Impact": "أثر الأحداث",
+    "Glossary Coverage": "تغطية المصطلحات",
+    "Prompts Status": "حالة المهام",
+    "Data Sources": "مصادر البيانات",
+    "Source Reconciliation": "مطابقة المصادر",
+    "Implementation Status": "حالة التنفيذ",
+    "ETL Performance": "أداء ETL",
+    "Freshness SLA": "اتفاقية حداثة البيانات",
+    "Trends": "الاتجاهات",
+    # Table titles
+    "Database Schema": "مخطط قاعدة البيانات",
+    "Index Coverage of Hot Lookups": "تغطية الفهارس لعمليات البحث المتكررة",
+    "Sector Pages Analysis": "تحليل صفحات القطاعات",
+    "Source Coverage Matrix": "مصفوفة تغطية المصادر",
+    "Time Series Data Quality": "جودة بيانات السلاسل الزمنية",
+    "Dual-Regime Spreads (Aden - Sana'a)": "الفروق بين عدن وصنعاء (عدن - صنعاء)",
+    "Dual-Regime Aligned Series": "السلاسل المتوائمة لعدن وصنعاء",
+    "Economic Event Impact": "أثر الأحداث الاقتصادية",
+    "Glossary Coverage in Research": "تغطية مصطلحات المسرد في الأبحاث",
+    "Freshness SLA of Scheduled Jobs": "اتفاقية حداثة المهام المجدولة",
+    "Prompts 1-24 Implementation Status": "حالة تنفيذ المهام 1-24",
+    "tRPC API Endpoints": "نقاط نهاية tRPC API",
+    "Data Source Registry": "سجل مصادر البيانات",
+    "Implementation Status Checklist": "قائمة التحقق من حالة التنفيذ",
+    "Run Trends": "اتجاهات التشغيل",
+    # Overview
+    "YETO Platform Comprehensive Audit Report": "تقرير التدقيق الشامل لمنصة يتو",
+    "Yemen Economic Transparency Observatory - Full Platform Review":
+        "مرصد الشفافية الاقتصادية في اليمن - مراجعة شاملة للمنصة",
+    "KEY PLATFORM METRICS": "المؤشرات الرئيسية للمنصة",
+    "Database Records": "سجلات قاعدة البيانات",
+    "Sources": "المصادر",
+    "Indicators": "المؤشرات",
+    "Time Series Data Points": "نقاط بيانات السلاسل الزمنية",
+    "Economic Events": "الأحداث الاقتصادية",
+    "Research Publications": "المنشورات البحثية",
+    "Commercial Banks": "البنوك التجارية",
+    "Documents": "المستندات",
+    "Entities": "الكيانات",
+    "Users": "المستخدمون",
+    "Platform Components": "مكونات المنصة",
+    "React Components": "مكونات React",
+    "Total Pages": "إجمالي الصفحات",
+    "tRPC Routers": "موجهات tRPC",
+    "Database Tables": "جداول قاعدة البيانات",
+    "CONTENTS": "المحتويات",
+    # Contents descriptions
+    "Executive summary and key metrics": "الملخص التنفيذي والمؤشرات الرئيسية",
+    "Complete database table analysis with record counts": "تحليل كامل لجداول قاعدة البيانات مع عدد السجلات",
+    "Tables, indexes and foreign keys replayed from the drizzle migrations":
+        "الجداول والفهارس والمفاتيح الخارجية المستخلصة من ترحيلات drizzle",
+    "Indexes serving the hot lookups, with suggested missing indexes":
+        "الفهارس التي تخدم عمليات البحث المتكررة، مع اقتراح الفهارس الناقصة",
+    "All 16 sector pages with implementation status": "صفحات القطاعات الست عشرة مع حالة تنفيذها",
+    "Observations per sector, indicator and source": "المشاهدات حسب القطاع والمؤشر والمصدر",
+    "Outliers, jumps and out-of-range values in the time series":
+        "القيم الشاذة والقفزات والقيم خارج النطاق في السلاسل الزمنية",
+    "Aden vs Sana'a spreads, volatility and coverage gaps": "الفروق بين عدن وصنعاء وتقلبها وفجوات التغطية",
+    "Aden and Sana'a series aligned on a common calendar": "سلاسل عدن وصنعاء موحدة على تقويم مشترك",
+    "Indicator moves across each economic event's window": "تحركات المؤشرات خلال نافذة كل حدث اقتصادي",
+    "Glossary terms found in the titles and abstracts of the research":
+        "مصطلحات المسرد الواردة في عناوين الأبحاث وملخصاتها",
+    "Status of all 24 prompts implementation": "حالة تنفيذ المهام الأربع والعشرين",
+    "All tRPC endpoints and their functionality": "جميع نقاط نهاية tRPC ووظائفها",
+    "Complete data source registry, with endpoint health when probed":
+        "سجل مصادر البيانات الكامل، مع سلامة نقاط الوصول عند فحصها",
+    "Registry entries across the three source files resolved to distinct sources":
+        "إدخالات السجل في ملفات المصادر الثلاثة بعد توحيدها في مصادر متمايزة",
+    "Feature completion checklist": "قائمة التحقق من اكتمال الميزات",
+    "Run duration percentiles, throughput and failure rates per connector and job":
+        "مئينات مدة التشغيل والإنتاجية ومعدلات الإخفاق لكل موصل ومهمة",
+    "Missed scheduled runs per job and stale data per source":
+        "التشغيلات المجدولة الفائتة لكل مهمة والبيانات المتقادمة لكل مصدر",
+    "Headline metrics of this run against previous runs": "المؤشرات الرئيسية لهذا التشغيل مقارنة بالتشغيلات السابقة",
+    # Section headings
+    "STATEMENTS NOT MODELLED": "عبارات غير منمذجة",
+    "SECTOR TOTALS": "إجماليات القطاعات",
+    "FLAGGED SERIES": "السلاسل المعلَّمة",
+    "COVERAGE GAPS": "فجوات التغطية",
+    "MERGED SERIES": "السلاسل المدمجة",
+    "EVENT SUMMARY": "ملخص الأحداث",
+    "TIER BY SOURCE TYPE": "المستويات حسب نوع المصدر",
+    "ENDPOINTS BY ROUTER": "نقاط النهاية حسب الموجه",
+    "SUMMARY": "الملخص",
+    "TIER CLASSIFICATION": "تصنيف المستويات",
+    "ENDPOINT HEALTH": "سلامة نقاط الوصول",
+    "TERMS BY CATEGORY": "المصطلحات حسب الفئة",
+    "SOURCE FRESHNESS": "حداثة المصادر",
+    # Headers
+    "24h Avg": "متوسط 24 ساعة",
+    "7d Avg": "متوسط 7 أيام",
+    "30d Avg": "متوسط 30 يومًا",
+    "30d Max": "أقصى 30 يومًا",
+    "30d Min": "أدنى 30 يومًا",
+    "Aden": "عدن",
+    "Sana'a": "صنعاء",
+    "After": "بعد",
+    "Age (days)": "العمر (أيام)",
+    "Cadence": "الوتيرة",
+    "After Date": "تاريخ ما بعد",
+    "Aden Only": "عدن فقط",
+    "Sana'a Only": "صنعاء فقط",
+    "Both Regimes": "كلا السلطتين",
+    "Before": "قبل",
+    "Before Date": "تاريخ ما قبل",
+    "Best Index": "أفضل فهرس",
+    "Calendar Points": "نقاط التقويم",
+    "Canonical Name": "الاسم المعتمد",
+    "Change": "التغير",
+    "Change %": "التغير %",
+    "Changed": "تغيّر",
+    "Charts": "الرسوم البيانية",
+    "Columns": "الأعمدة",
+    "Completeness": "الاكتمال",
+    "Cron": "جدول Cron",
+    "Confidence": "الثقة",
+    "Covers": "يغطي",
+    "Data Points": "نقاط البيانات",
+    "Date": "التاريخ",
+    "Event": "الحدث",
+    "Event Date": "تاريخ الحدث",
+    "Expected": "المتوقع",
+    "Expected Next": "التشغيل المتوقع التالي",
+    "Failed": "فشل",
+    "Falling": "منخفض",
+    "Failure Rate": "معدل الإخفاق",
+    "Files": "الملفات",
+    "Flags": "العلامات",
+    "Foreign Keys": "المفاتيح الخارجية",
+    "HTTP": "HTTP",
+    "Host": "المضيف",
+    "Impact Level": "مستوى الأثر",
+    "Implementation Details": "تفاصيل التنفيذ",
+    "Indexes": "الفهارس",
+    "Indicator": "المؤشر",
+    "Indicator Name": "اسم المؤشر",
+    "Institution": "المؤسسة",
+    "Job Name": "اسم المهمة",
+    "Introduced In": "أضيف في",
+    "KPIs": "مؤشرات الأداء",
+    "Kind": "الصنف",
+    "Last (s)": "الأخير (ث)",
+    "Last Changed": "آخر تغيير",
+    "Last Modified / Error": "آخر تعديل / الخطأ",
+    "Last Run": "آخر تشغيل",
+    "Last Status": "آخر حالة",
+    "Last Updated": "آخر تحديث",
+    "Latency (ms)": "زمن الاستجابة (مللي ثانية)",
+    "Latest": "الأحدث",
+    "Latest Date": "أحدث تاريخ",
+    "Latest Spread": "أحدث فرق",
+    "Latest Spread %": "أحدث فرق %",
+    "Lookup Columns": "أعمدة البحث",
+    "Max (s)": "الأقصى (ث)",
+    "Mentions": "الإشارات",
+    "Max |Spread|": "أقصى |فرق|",
+    "Mean Spread": "متوسط الفرق",
+    "Mean |Change %|": "متوسط |التغير %|",
+    "Missed": "الفائتة",
+    "Metric": "المقياس",
+    "Name": "الاسم",
+    "Name Variants": "صيغ الاسم",
+    "Next Run": "التشغيل التالي",
+    "Observations": "المشاهدات",
+    "Previous": "السابق",
+    "Primary Key": "المفتاح الأساسي",
+    "Priority": "الأولوية",
+    "Prompt #": "رقم المهمة",
+    "Publications": "المنشورات",
+    "Ran": "نُفّذت",
+    "Record Count": "عدد السجلات",
+    "Record IDs": "معرّفات السجلات",
+    "Records": "السجلات",
+    "Records/s": "سجل/ث",
+    "Referenced By": "مشار إليه من",
+    "Regime": "السلطة",
+    "Rising": "مرتفع",
+    "Route": "المسار",
+    "Router": "الموجه",
+    "Runs": "التشغيلات",
+    "Runs (30d)": "التشغيلات (30 يومًا)",
+    "SLA (days)": "الحد المسموح (أيام)",
+    "Source": "المصدر",
+    "Source Name": "اسم المصدر",
+    "Sources Panel": "لوحة المصادر",
+    "Sectors Covered": "القطاعات المشمولة",
+    "Series": "السلاسل",
+    "Share": "النسبة",
+    "Spread": "الفرق",
+    "Spread %": "الفرق %",
+    "Spread Volatility": "تقلب الفرق",
+    "Spread Volatility (30)": "تقلب الفرق (30)",
+    "Suggested Index": "الفهرس المقترح",
+    "Table": "الجدول",
+    "Table Name": "اسم الجدول",
+    "Term": "المصطلح",
+    "Term (AR)": "المصطلح (عربي)",
+    "Tier": "المستوى",
+    "Type": "النوع",
+    "Unique": "فريد",
+    "Unit": "الوحدة",
+    "Update Frequency": "تواتر التحديث",
+    "Used By": "يستخدمه",
+    "Value": "القيمة",
+    "Z-Score": "الدرجة المعيارية",
+    "p50 (s)": "p50 (ث)",
+    "p95 (s)": "p95 (ث)",
+    "p99 (s)": "p99 (ث)",
+    # Status labels
+    "✓ Complete": "✓ مكتمل",
+    "✓ Active": "✓ نشط",
+    "✓ Yes": "✓ نعم",
+    "⚠ Empty": "⚠ فارغ",
+    "✓ Covered": "✓ مغطى",
+    "⚠ Partial": "⚠ جزئي",
+    "⚠ Missing": "⚠ مفقود",
+    "⚠ Uncovered": "⚠ غير مغطى",
+    "⚠ No table": "⚠ لا يوجد جدول",
+    "✓ Reachable": "✓ متاح",
+    "✓ Not modified": "✓ لم يتغير",
+    "⚠ HTTP error": "⚠ خطأ HTTP",
+    "⚠ Unreachable": "⚠ غير متاح",
+    "⚠ Invalid URL": "⚠ رابط غير صالح",
+    "✓ On schedule": "✓ في موعده",
+    "✓ Not yet due": "✓ لم يحن موعده",
+    "⚠ Missed runs": "⚠ تشغيلات فائتة",
+    "⚠ Never ran": "⚠ لم يعمل قط",
+    "⚠ Overdue": "⚠ متأخر",
+    "⚠ Invalid cron": "⚠ جدول Cron غير صالح",
+    "Disabled": "معطل",
+    "✓ Fresh": "✓ حديث",
+    "⚠ Stale": "⚠ متقادم",
+    "⚠ Future date": "⚠ تاريخ مستقبلي",
+    "⚠ No data": "⚠ لا توجد بيانات",
+    "No SLA": "بلا اتفاقية",
+    "Unchanged": "لم يتغير",
+}
+
+# (regex, template) forms of computed text; see bilingual.Translation
+AUDIT_PATTERNS = (
+    (r'Generated: (.+)', "تاريخ الإنشاء: {1}"),
+    (r'(.+) \(continued, part (\d+)\)', "{1} (تابع، الجزء {2})"),
+)
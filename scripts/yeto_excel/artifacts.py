@@ -0,0 +1,91 @@
+"""
+Reproducible output and a content-addressed artifact store.
+
+With a pinned timestamp (see `pinned_time`) the generators save the same
+bytes for the same inputs, so a workbook can be stored under the SHA-256 of
+its contents:
+
+    <store>/objects/ab/ab12...ef.xlsx    one file per distinct workbook
+    <store>/refs/<output name>           digest of the latest run's output
+
+An unchanged audit hashes to an existing object and costs no storage; a
+sync of the store (rsync, `aws s3 sync`) skips objects the remote already
+has, so it costs no upload either. Objects are hard-linked to the output
+path where the filesystem allows it, and written read-only; the workbook
+writers replace their output path instead of truncating it, so a later run
+never modifies a stored object through the link.
+"""
+
+import hashlib
+import os
+import shutil
+from datetime import datetime, timezone
+
+from .instrumentation import write_atomic
+
+# The earliest time a ZIP entry can carry; the fallback pinned timestamp
+ZIP_EPOCH = datetime(1980, 1, 1)
+
+
+def pinned_time(value=None):
+    """
+    Generation time of a reproducible run, as a naive UTC datetime: `value`
+    (ISO 8601), else $SOURCE_DATE_EPOCH (the reproducible-builds
+    convention), else the ZIP epoch.
+    """
+    if value:
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc).replace(tzinfo=None)
+    return ZIP_EPOCH
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link(source, destination):
+    # Hard link when possible (same filesystem), copy otherwise; never
+    # expose a partially written destination
+    temporary = f"{destination}.{os.getpid()}.tmp"
+    try:
+        os.link(source, temporary)
+    except OSError:
+        shutil.copyfile(source, temporary)
+    os.replace(temporary, destination)
+
+
+class ArtifactStore:
+    """Directory of workbooks keyed by the SHA-256 of their contents."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def object_path(self, digest, suffix='.xlsx'):
+        return os.path.join(self.directory, 'objects', digest[:2], digest + suffix)
+
+    def put(self, path, name=None):
+        """
+        Store the file at `path`; returns (digest, object path, created).
+        `created` is False when an identical file was already stored, in
+        which case `path` becomes a link to that object.
+        """
+        digest = file_digest(path)
+        target = self.object_path(digest, os.path.splitext(path)[1] or '.xlsx')
+        created = not os.path.exists(target)
+        if created:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _link(path, target)
+            os.chmod(target, 0o444)
+        elif not os.path.samefile(path, target):
+            _link(target, path)
+        write_atomic(os.path.join(self.directory, 'refs', name or os.path.basename(path)), digest + '\n')
+        return digest, target, created
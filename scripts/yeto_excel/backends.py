@@ -0,0 +1,489 @@
+"""
+Workbook backends for the generators.
+
+The generators write through a small backend-neutral interface (cells,
+styles, merges, freeze panes, hyperlinks, widths, tables) instead of
+openpyxl's object model, so the engine can be chosen per run:
+
+    openpyxl    builds the workbook in memory (streaming=True switches to
+                openpyxl's write-only mode)
+    xlsxwriter  writes rows straight to disk in constant-memory mode
+
+Rows and columns are 1-based, as in Excel and openpyxl. In streaming modes
+rows must be written in increasing order, or ValueError is raised; cells
+within the current row may be written in any order. XlsxWriter cannot add
+a table to a constant-memory sheet, whose header row is already on disk:
+there the first table of a sheet keeps only its filter buttons.
+
+Both engines save through zipwriter.ParallelZipFile, so `compression`
+(0 = stored ... 9) and `workers` apply to either, and `path` may be any
+binary file-like object as well as a filename. XlsxWriter packages the
+workbook into a temporary file, which is then repacked part by part. A `timestamp` (naive UTC
+datetime) pins the document properties and the ZIP entry times, so the same
+cells always save to the same bytes.
+"""
+
+import re
+import tempfile
+import warnings
+import zipfile
+from collections import namedtuple
+from copy import copy
+from datetime import datetime, timezone
+
+from openpyxl.utils import column_index_from_string, coordinate_to_tuple, get_column_letter, range_boundaries
+
+from .zipwriter import DEFAULT_COMPRESSION, ParallelZipFile
+
+ENGINES = ('openpyxl', 'xlsxwriter')
+
+CellStyle = namedtuple('CellStyle', [
+    'font_name', 'font_size', 'bold', 'italic', 'underline', 'font_color',
+    'fill', 'border', 'h_align', 'v_align', 'wrap_text', 'number_format',
+], defaults=(None,) * 12)
+CellStyle.__doc__ = """
+Backend-neutral cell style. Colours are RGB hex strings ('107040');
+`border` puts a thin border on all four sides, in the given colour or in
+the automatic colour when True. Derive styles with `style._replace(...)`.
+"""
+
+
+def column_index(column):
+    return column if isinstance(column, int) else column_index_from_string(column)
+
+
+class SheetBase:
+    """Common bookkeeping shared by the backend sheets."""
+
+    def __init__(self, book, title):
+        self.book = book
+        self.title = title
+        # Longest rendered text per column, for fit_columns()
+        self.text_width = {}
+        # Write counters, read by instrumentation.Instrumentation
+        self.rows = 0
+        self.cells = 0
+        self.styled_cells = 0
+        self._last_row = None
+
+    def _track(self, row, col, value, style=None):
+        self.cells += 1
+        if style is not None:
+            self.styled_cells += 1
+        if row != self._last_row:
+            self.rows += 1
+            self._last_row = row
+        if value is not None:
+            width = len(str(value))
+            if width > self.text_width.get(col, 0):
+                self.text_width[col] = width
+
+    def write(self, ref, value=None, style=None):
+        row, col = coordinate_to_tuple(ref)
+        self.cell(row, col, value, style)
+
+    def write_row(self, row, col, values, style=None):
+        """Write `values` from column `col`; `style` is one style or a list with one per value."""
+        styles = style if isinstance(style, (list, tuple)) and not isinstance(style, CellStyle) else None
+        for offset, value in enumerate(values):
+            self.cell(row, col + offset, value, styles[offset] if styles else style)
+
+    def fit_columns(self, max_width=50, padding=2):
+        for col, width in self.text_width.items():
+            self.column_width(col, min(width + padding, max_width))
+
+
+# ----------------------------------------------------------------------------
+# openpyxl
+# ----------------------------------------------------------------------------
+
+class OpenpyxlSheet(SheetBase):
+    def __init__(self, book, ws):
+        super().__init__(book, ws.title)
+        self.ws = ws
+        # Streaming (write-only) mode buffers the current row
+        self._row = None
+        self._cells = {}
+        self._written = 0
+
+    def cell(self, row, col, value=None, style=None):
+        self._track(row, col, value, style)
+        if not self.book.streaming:
+            cell = self.ws.cell(row=row, column=col, value=value)
+            if style is not None:
+                self.book.apply_style(cell, style)
+            return
+        if row != self._row:
+            if self._row is not None and row < self._row:
+                raise ValueError(f"Row {row} written after row {self._row} on streaming sheet '{self.title}'")
+            self.flush()
+            self._row = row
+        self._cells[col] = (value, style)
+
+    def flush(self):
+        if self._row is None:
+            return
+        from openpyxl.cell import WriteOnlyCell
+        while self._written < self._row - 1:
+            self.ws.append([])
+            self._written += 1
+        cells = [None] * max(self._cells)
+        for col, (value, style) in self._cells.items():
+            if style is None:
+                cells[col - 1] = value
+            else:
+                cell = WriteOnlyCell(self.ws, value=value)
+                self.book.apply_style(cell, style)
+                cells[col - 1] = cell
+        self.ws.append(cells)
+        self._written = self._row
+        self._row = None
+        self._cells = {}
+
+    def merge(self, ref, value=None, style=None):
+        if self.book.streaming:
+            raise NotImplementedError("openpyxl write-only sheets cannot merge cells")
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        self.cell(min_row, min_col, value, style)
+        self.ws.merge_cells(ref)
+
+    def hyperlink(self, ref, sheet_title, text, style=None):
+        self.write(ref, text, style)
+        if self.book.streaming:
+            raise NotImplementedError("openpyxl write-only sheets cannot hold hyperlinks")
+        self.ws[ref].hyperlink = f"#'{sheet_title}'!A1"
+
+    def column_width(self, column, width):
+        self.ws.column_dimensions[get_column_letter(column_index(column))].width = width
+
+    def row_height(self, row, height):
+        if not self.book.streaming:
+            self.ws.row_dimensions[row].height = height
+
+    def freeze(self, ref):
+        self.ws.freeze_panes = ref
+
+    def hide_gridlines(self):
+        self.ws.sheet_view.showGridLines = False
+
+    def right_to_left(self):
+        self.ws.sheet_view.rightToLeft = True
+
+    def table(self, ref, name, headers, header_style=None):
+        from openpyxl.worksheet.filters import AutoFilter
+        from openpyxl.worksheet.table import Table, TableColumn
+        # No table style: the cells keep their own formatting. The columns are
+        # named up front, as write-only sheets cannot be read back for headers
+        table = Table(displayName=name, ref=ref, autoFilter=AutoFilter(ref=ref),
+                      tableColumns=[TableColumn(id=i, name=header) for i, header in enumerate(headers, 1)])
+        with warnings.catch_warnings():
+            # Write-only sheets always warn that the columns must be added by hand
+            warnings.simplefilter('ignore', UserWarning)
+            self.ws.add_table(table)
+
+    def color_scale(self, ref, start_color, end_color, start_value=None):
+        from openpyxl.formatting.rule import ColorScaleRule
+        if start_value is None:
+            rule = ColorScaleRule(start_type='min', start_color=start_color, end_type='max', end_color=end_color)
+        else:
+            rule = ColorScaleRule(start_type='num', start_value=start_value, start_color=start_color,
+                                  end_type='max', end_color=end_color)
+        self.ws.conditional_formatting.add(ref, rule)
+
+
+class OpenpyxlBook:
+    engine = 'openpyxl'
+
+    def __init__(self, path, streaming=False, compression=DEFAULT_COMPRESSION, workers=None, timestamp=None):
+        from openpyxl import Workbook
+        self.path = path
+        self.streaming = streaming
+        self.compression = compression
+        self.workers = workers
+        self.timestamp = timestamp
+        self.wb = Workbook(write_only=streaming)
+        if not streaming:
+            self.wb.remove(self.wb.active)
+        self.sheets = []
+        self._styles = {}
+
+    def add_sheet(self, title, index=None):
+        sheet = OpenpyxlSheet(self, self.wb.create_sheet(title, index))
+        self.sheets.insert(len(self.sheets) if index is None else index, sheet)
+        return sheet
+
+    def index(self, sheet):
+        return self.sheets.index(sheet)
+
+    def apply_style(self, cell, style):
+        # Assigning Font/Border objects makes openpyxl hash them against the
+        # workbook's style tables on every cell; resolve each style once and
+        # copy the resulting index array onto later cells
+        array = self._styles.get(style)
+        if array is not None:
+            cell._style = copy(array)
+            return
+        from openpyxl.styles.cell_style import StyleArray
+        cell._style = StyleArray()
+        font, fill, border, alignment, number_format = self._convert(style)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if border is not None:
+            cell.border = border
+        if alignment is not None:
+            cell.alignment = alignment
+        if number_format is not None:
+            cell.number_format = number_format
+        self._styles[style] = copy(cell._style)
+
+    @staticmethod
+    def _convert(style):
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+        font = fill = border = alignment = None
+        if any(v is not None for v in (style.font_name, style.font_size, style.bold, style.italic,
+                                        style.underline, style.font_color)):
+            font = Font(name=style.font_name, size=style.font_size, bold=style.bold, italic=style.italic,
+                        underline=style.underline, color=style.font_color)
+        if style.fill is not None:
+            fill = PatternFill(start_color=style.fill, end_color=style.fill, fill_type='solid')
+        if style.border is not None:
+            side = Side(style='thin', color=None if style.border is True else style.border)
+            border = Border(left=side, right=side, top=side, bottom=side)
+        if style.h_align or style.v_align or style.wrap_text:
+            alignment = Alignment(horizontal=style.h_align, vertical=style.v_align, wrap_text=style.wrap_text)
+        return font, fill, border, alignment, style.number_format
+
+    def close(self):
+        from openpyxl.writer.excel import ExcelWriter
+        for sheet in self.sheets:
+            sheet.flush()
+        # Workbook.save() hard-codes a serial ZIP_DEFLATED archive
+        if self.timestamp is not None:
+            self.wb.properties.created = self.wb.properties.modified = self.timestamp
+        else:
+            self.wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        archive = ParallelZipFile(self.path, self.compression, self.workers, date_time=zip_time(self.timestamp))
+        ExcelWriter(self.wb, archive).save()
+
+
+# ----------------------------------------------------------------------------
+# XlsxWriter
+# ----------------------------------------------------------------------------
+
+class XlsxWriterSheet(SheetBase):
+    def __init__(self, book, worksheet):
+        super().__init__(book, worksheet.name)
+        self.worksheet = worksheet
+        # Last row streamed in constant-memory mode, and whether the sheet has its autofilter
+        self._row = None
+        self._filtered = False
+
+    def _advance(self, row, last_row=None):
+        # Constant-memory sheets flush each row once a later one is written and
+        # silently drop cells sent to it afterwards: refuse them instead
+        if not self.book.streaming:
+            return
+        if self._row is not None and row < self._row:
+            raise ValueError(f"Row {row} written after row {self._row} on streaming sheet '{self.title}'")
+        self._row = max(row, last_row or row)
+
+    def cell(self, row, col, value=None, style=None):
+        self._advance(row)
+        self._track(row, col, value, style)
+        fmt = self.book.format(style)
+        if value is None:
+            if fmt is not None:
+                self.worksheet.write_blank(row - 1, col - 1, None, fmt)
+        else:
+            self.worksheet.write(row - 1, col - 1, value, fmt)
+
+    def merge(self, ref, value=None, style=None):
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        # The blank cells of the range reach its last row
+        self._advance(min_row, max_row)
+        self._track(min_row, min_col, value, style)
+        self.worksheet.merge_range(min_row - 1, min_col - 1, max_row - 1, max_col - 1,
+                                   value if value is not None else '', self.book.format(style))
+
+    def hyperlink(self, ref, sheet_title, text, style=None):
+        row, col = coordinate_to_tuple(ref)
+        self._advance(row)
+        self._track(row, col, text, style)
+        self.worksheet.write_url(row - 1, col - 1, f"internal:'{sheet_title}'!A1", self.book.format(style), string=text)
+
+    def column_width(self, column, width):
+        col = column_index(column) - 1
+        self.worksheet.set_column(col, col, width)
+
+    def row_height(self, row, height):
+        self.worksheet.set_row(row - 1, height)
+
+    def freeze(self, ref):
+        row, col = coordinate_to_tuple(ref)
+        self.worksheet.freeze_panes(row - 1, col - 1)
+
+    def hide_gridlines(self):
+        self.worksheet.hide_gridlines(2)
+
+    def right_to_left(self):
+        self.worksheet.right_to_left()
+
+    def table(self, ref, name, headers, header_style=None):
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        if self.book.streaming:
+            # add_table() refuses constant-memory sheets; a sheet has one autofilter
+            if not self._filtered:
+                self.worksheet.autofilter(ref)
+                self._filtered = True
+            return
+        # add_table() rewrites the header cells, in `header_style`
+        header_format = self.book.format(header_style)
+        self.worksheet.add_table(min_row - 1, min_col - 1, max_row - 1, max_col - 1, {
+            'name': name, 'style': None,
+            'columns': [{'header': header, 'header_format': header_format} for header in headers],
+        })
+
+    def color_scale(self, ref, start_color, end_color, start_value=None):
+        options = {'type': '2_color_scale', 'min_color': f"#{start_color}", 'max_color': f"#{end_color}"}
+        if start_value is not None:
+            options.update(min_type='num', min_value=start_value)
+        self.worksheet.conditional_format(ref, options)
+
+    def flush(self):
+        pass
+
+
+class XlsxWriterBook:
+    engine = 'xlsxwriter'
+
+    def __init__(self, path, streaming=True, compression=DEFAULT_COMPRESSION, workers=None, timestamp=None):
+        import xlsxwriter
+        self.path = path
+        self.streaming = streaming
+        self.compression = compression
+        self.workers = workers
+        self.timestamp = timestamp
+        # XlsxWriter always deflates serially: it saves to a scratch file that close() repacks
+        self._package = tempfile.TemporaryFile()
+        self.workbook = xlsxwriter.Workbook(self._package, {
+            'constant_memory': streaming,
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+        })
+        if timestamp is not None:
+            # XlsxWriter stamps both dcterms:created and dcterms:modified with 'created'
+            self.workbook.set_properties({'created': timestamp})
+        self.sheets = []
+        self._formats = {}
+
+    def add_sheet(self, title, index=None):
+        sheet = XlsxWriterSheet(self, self.workbook.add_worksheet(title))
+        self.sheets.insert(len(self.sheets) if index is None else index, sheet)
+        return sheet
+
+    def index(self, sheet):
+        return self.sheets.index(sheet)
+
+    def format(self, style):
+        if style is None:
+            return None
+        fmt = self._formats.get(style)
+        if fmt is None:
+            fmt = self._formats[style] = self.workbook.add_format(self._convert(style))
+        return fmt
+
+    @staticmethod
+    def _convert(style):
+        props = {}
+        if style.font_name:
+            props['font_name'] = style.font_name
+        if style.font_size:
+            props['font_size'] = style.font_size
+        if style.bold:
+            props['bold'] = True
+        if style.italic:
+            props['italic'] = True
+        if style.underline == 'single':
+            props['underline'] = 1
+        if style.font_color:
+            props['font_color'] = f"#{style.font_color}"
+        if style.fill:
+            props['bg_color'] = f"#{style.fill}"
+            props['pattern'] = 1
+        if style.border:
+            props['border'] = 1
+            if style.border is not True:
+                props['border_color'] = f"#{style.border}"
+        if style.h_align:
+            props['align'] = style.h_align
+        if style.v_align:
+            props['valign'] = 'vcenter' if style.v_align == 'center' else style.v_align
+        if style.wrap_text:
+            props['text_wrap'] = True
+        if style.number_format:
+            props['num_format'] = style.number_format
+        return props
+
+    def close(self):
+        # Sheets may be inserted before existing ones (continuation sheets,
+        # an Overview written last); XlsxWriter saves them in the order added
+        added = self.workbook.worksheets()
+        order = [added.index(sheet.worksheet) for sheet in self.sheets]
+        if self.sheets:
+            self.sheets[0].worksheet.activate()
+        try:
+            self.workbook.close()
+            self._package.seek(0)
+            with zipfile.ZipFile(self._package) as package, \
+                    ParallelZipFile(self.path, self.compression, self.workers,
+                                    date_time=zip_time(self.timestamp)) as archive:
+                for name in package.namelist():
+                    if name == 'xl/workbook.xml':
+                        archive.writestr(name, reorder_sheets(package.read(name).decode('utf-8'), order))
+                        continue
+                    with package.open(name) as part:
+                        archive.write_stream(name, part)
+        finally:
+            self._package.close()
+
+
+def reorder_sheets(workbook_xml, order):
+    """
+    Rewrite an xl/workbook.xml part so its sheets come in `order`, a list of
+    the sheets' current positions, renumbering the sheet references of the
+    defined names (print areas, autofilters) and of the workbook view.
+    """
+    if order == sorted(order):
+        return workbook_xml
+    position = {old: new for new, old in enumerate(order)}
+    sheets = re.search(r'<sheets>(.*?)</sheets>', workbook_xml)
+    elements = re.findall(r'<sheet [^>]*/>', sheets.group(1))
+    reordered = ''.join(elements[old] for old in order)
+    workbook_xml = f"{workbook_xml[:sheets.start(1)]}{reordered}{workbook_xml[sheets.end(1):]}"
+    return re.sub(r'\b(localSheetId|activeTab|firstSheet)="(\d+)"',
+                  lambda match: f'{match[1]}="{position[int(match[2])]}"', workbook_xml)
+
+
+def zip_time(timestamp):
+    # ZIP entry times carry no timezone and cannot predate 1980
+    return max(timestamp.timetuple()[:6], (1980, 1, 1, 0, 0, 0)) if timestamp is not None else None
+
+
+def open_workbook(path, engine='openpyxl', streaming=None, compression=DEFAULT_COMPRESSION, workers=None,
+                  timestamp=None):
+    """
+    Open a workbook for writing at `path` (a filename or a binary file-like
+    object). `streaming` defaults to each engine's natural mode: in memory
+    for openpyxl, constant memory for XlsxWriter. `compression` is the
+    deflate level of the saved package (0 stores parts uncompressed) and
+    `workers` the number of deflate threads (default: one per CPU). A
+    `timestamp` makes the saved file reproducible.
+    """
+    if engine == 'openpyxl':
+        return OpenpyxlBook(path, bool(streaming), compression, workers, timestamp)
+    if engine == 'xlsxwriter':
+        return XlsxWriterBook(path, True if streaming is None else streaming, compression, workers, timestamp)
+    raise ValueError(f"Unknown workbook engine {engine!r}; expected one of {', '.join(ENGINES)}")
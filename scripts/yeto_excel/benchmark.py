@@ -0,0 +1,80 @@
+"""
+Write-throughput benchmark for the workbook backends.
+
+Writes the same styled table (a header row plus `--rows` data rows) through
+every engine/mode and reports wall time, rows per second and file size;
+--memory also traces peak Python memory (several times slower). Run from
+the scripts directory:
+
+    python -m yeto_excel.benchmark --rows 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from .backends import ENGINES, CellStyle, open_workbook
+from .zipwriter import DEFAULT_COMPRESSION
+
+HEADER = CellStyle(font_name='Calibri', font_size=12, bold=True, font_color='FFFFFF', fill='107040',
+                   border='CCCCCC', h_align='center')
+CELL = CellStyle(font_name='Calibri', font_size=11, font_color='2D2D2D', border='CCCCCC')
+AMOUNT = CELL._replace(number_format='#,##0.00')
+STYLES = [CELL, CELL, CELL, AMOUNT, CELL, AMOUNT]
+
+
+def write_table(path, engine, streaming, rows, compression=DEFAULT_COMPRESSION, workers=None):
+    book = open_workbook(path, engine, streaming=streaming, compression=compression, workers=workers)
+    ws = book.add_sheet("Time Series")
+    ws.freeze('A2')
+    ws.write_row(1, 1, ["Indicator", "Regime", "Date", "Value", "Unit", "Change"], HEADER)
+    for i in range(rows):
+        ws.write_row(i + 2, 1, (
+            f"INDICATOR_{i % 116}", 'aden_irg' if i % 2 else 'sanaa_defacto',
+            f"20{10 + i % 16}-{1 + i % 12:02d}-01", 1500.0 + i % 997, 'YER/USD', (i % 41 - 20) / 100,
+        ), STYLES)
+    book.close()
+
+
+def run(engine, streaming, rows, directory, memory=False, compression=DEFAULT_COMPRESSION, workers=None):
+    path = os.path.join(directory, f"{engine}-{'streaming' if streaming else 'memory'}.xlsx")
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    write_table(path, engine, streaming, rows, compression, workers)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, os.path.getsize(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the workbook backends")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--engine', choices=ENGINES, action='append', help="Limit to these engines (repeatable)")
+    parser.add_argument('--memory', action='store_true', help="Trace peak Python memory")
+    parser.add_argument('--compression', type=int, choices=range(10), default=DEFAULT_COMPRESSION, metavar='0-9')
+    parser.add_argument('--workers', type=int, help="Deflate threads (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    cases = [(engine, streaming) for engine in args.engine or ENGINES for streaming in (False, True)]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for engine, streaming in cases:
+            elapsed, peak, size = run(engine, streaming, args.rows, directory, args.memory, args.compression, args.workers)
+            results.append((engine, streaming, elapsed, peak, size))
+
+    baseline = results[0][2]
+    print(f"{'engine':<12}{'mode':<11}{'seconds':>9}{'rows/s':>11}{'peak MiB':>10}{'size MiB':>10}{'speed-up':>10}")
+    for engine, streaming, elapsed, peak, size in results:
+        peak = f"{peak / 2**20:.1f}" if peak is not None else '-'
+        print(f"{engine:<12}{'streaming' if streaming else 'memory':<11}{elapsed:>9.2f}{args.rows / elapsed:>11,.0f}"
+              f"{peak:>10}{size / 2**20:>10.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+English and Arabic workbooks written in one pass.
+
+MirroredBook stands in for a backend workbook (see backends.py) and hands
+every sheet call to two of them: the primary workbook gets the values as
+given, the mirror gets them through a Translation and lays its sheets out
+right to left. A generator therefore computes each sheet's rows, resolves
+its styles and decides where rows spill once; only the cell writes happen
+twice.
+
+    book = MirroredBook(open_workbook(en_path), open_workbook(ar_path), Translation(UX_ARABIC))
+    ws = book.add_sheet("10. Summary")      # "10. الملخص", right to left, in the mirror
+    ws.write_row(1, 1, ["Category", "Working"], HEADER)
+    book.close()
+
+A Translation maps whole strings (sheet titles, headers, status labels)
+and, failing that, the first matching pattern; every other value (IDs,
+URLs, names, numbers) is written unchanged. Pattern lookups go through a
+bounded LRU cache: repeated labels are matched once, and the memory stays
+flat however many distinct data values pass through. The CellStyles are
+shared: both workbooks resolve the same style objects into their own style
+tables.
+"""
+
+import re
+from functools import lru_cache
+
+from .sheets import MAX_SHEET_TITLE, continuation_title
+
+_CONTINUATION = re.compile(r'(.*) \((\d+)\)$')
+
+# Distinct strings whose pattern lookup is remembered
+MEMO_SIZE = 4096
+
+
+class Translation:
+    """
+    Translates strings through `table`, then through `patterns`: (regex,
+    template) pairs whose template is a str.format() string filled with the
+    translated groups, e.g. (r'Generated: (.+)', "تاريخ الإنشاء: {1}").
+    """
+
+    def __init__(self, table, patterns=()):
+        self.table = dict(table)
+        self.patterns = [(re.compile(pattern), template) for pattern, template in patterns]
+        self._match = lru_cache(maxsize=MEMO_SIZE)(self._match_patterns)
+
+    def __call__(self, value):
+        if type(value) is not str:
+            return value
+        translated = self.table.get(value)
+        if translated is not None:
+            return translated
+        return self._match(value) if self.patterns else value
+
+    def _match_patterns(self, text):
+        for pattern, template in self.patterns:
+            match = pattern.fullmatch(text)
+            if match:
+                return template.format(text, *(self(group) for group in match.groups()))
+        return text
+
+    def title(self, title):
+        """Sheet title; continuation sheets ("Title (2)") follow their base title."""
+        match = _CONTINUATION.fullmatch(title)
+        if match and match.group(1) in self.table:
+            return continuation_title(self.table[match.group(1)], int(match.group(2)))
+        return self.table.get(title, title)[:MAX_SHEET_TITLE]
+
+
+class MirroredSheet:
+    """A sheet of a MirroredBook; every call is made on both backend sheets."""
+
+    def __init__(self, book, primary, mirror):
+        self.book = book
+        self.title = primary.title
+        self.primary = primary
+        self.mirror = mirror
+        self.translate = book.translation
+
+    # Write counters, read by instrumentation.Instrumentation
+    @property
+    def rows(self):
+        return self.primary.rows + self.mirror.rows
+
+    @property
+    def cells(self):
+        return self.primary.cells + self.mirror.cells
+
+    @property
+    def styled_cells(self):
+        return self.primary.styled_cells + self.mirror.styled_cells
+
+    def cell(self, row, col, value=None, style=None):
+        self.primary.cell(row, col, value, style)
+        self.mirror.cell(row, col, self.translate(value), style)
+
+    def write(self, ref, value=None, style=None):
+        self.primary.write(ref, value, style)
+        self.mirror.write(ref, self.translate(value), style)
+
+    def write_row(self, row, col, values, style=None):
+        self.primary.write_row(row, col, values, style)
+        translate = self.translate
+        self.mirror.write_row(row, col, [translate(value) for value in values], style)
+
+    def merge(self, ref, value=None, style=None):
+        self.primary.merge(ref, value, style)
+        self.mirror.merge(ref, self.translate(value), style)
+
+    def hyperlink(self, ref, sheet_title, text, style=None):
+        self.primary.hyperlink(ref, sheet_title, text, style)
+        title = self.translate.title(sheet_title)
+        self.mirror.hyperlink(ref, title, title if text == sheet_title else self.translate(text), style)
+
+    def column_width(self, column, width):
+        self.primary.column_width(column, width)
+        self.mirror.column_width(column, width)
+
+    def row_height(self, row, height):
+        self.primary.row_height(row, height)
+        self.mirror.row_height(row, height)
+
+    def freeze(self, ref):
+        self.primary.freeze(ref)
+        self.mirror.freeze(ref)
+
+    def hide_gridlines(self):
+        self.primary.hide_gridlines()
+        self.mirror.hide_gridlines()
+
+    def right_to_left(self):
+        self.primary.right_to_left()
+        self.mirror.right_to_left()
+
+    def table(self, ref, name, headers, header_style=None):
+        self.primary.table(ref, name, headers, header_style)
+        # The column names must match the (translated) header cells
+        self.mirror.table(ref, name, [self.translate(header) for header in headers], header_style)
+
+    def color_scale(self, ref, start_color, end_color, start_value=None):
+        self.primary.color_scale(ref, start_color, end_color, start_value)
+        self.mirror.color_scale(ref, start_color, end_color, start_value)
+
+    def fit_columns(self, max_width=50, padding=2):
+        # Each workbook fits its own text
+        self.primary.fit_columns(max_width, padding)
+        self.mirror.fit_columns(max_width, padding)
+
+
+class MirroredBook:
+    """
+    Writes `primary` and `mirror` (backend workbooks) together; see the
+    module docstring. The mirror's sheets are right to left unless
+    `right_to_left` is False.
+    """
+
+    def __init__(self, primary, mirror, translation, right_to_left=True):
+        self.primary = primary
+        self.mirror = mirror
+        self.translation = translation
+        self.right_to_left = right_to_left
+        self.engine = primary.engine
+        # Merges and hyperlinks must work in both
+        self.streaming = primary.streaming or mirror.streaming
+        self.path = primary.path
+        self.sheets = []
+
+    def add_sheet(self, title, index=None):
+        mirror = self.mirror.add_sheet(self.translation.title(title), index)
+        if self.right_to_left:
+            mirror.right_to_left()
+        sheet = MirroredSheet(self, self.primary.add_sheet(title, index), mirror)
+        self.sheets.insert(len(self.sheets) if index is None else index, sheet)
+        return sheet
+
+    def index(self, sheet):
+        return self.sheets.index(sheet)
+
+    def close(self):
+        self.primary.close()
+        self.mirror.close()
@@ -0,0 +1,124 @@
+"""
+Sector x source x indicator coverage matrix.
+
+Counts how many time_series observations each source contributes to each
+indicator, and rolls the indicators up into their sector. Counts are kept
+in a sparse dict keyed by interned integer ids, so the structure only
+grows with the populated (sector, source, indicator) triples rather than
+with sectors x sources x indicators. Sources are keyed by their id: the
+publisher is only the label shown, as two sources may share one.
+"""
+
+from collections import Counter
+
+UNCLASSIFIED_SECTOR = 'unclassified'
+
+
+class Interner:
+    """Maps labels to dense integer ids, in first-seen order."""
+
+    __slots__ = ('ids', 'labels')
+
+    def __init__(self):
+        self.ids = {}
+        self.labels = []
+
+    def __call__(self, label):
+        index = self.ids.get(label)
+        if index is None:
+            index = self.ids[label] = len(self.labels)
+            self.labels.append(label)
+        return index
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class CoverageMatrix:
+    __slots__ = ('sectors', 'sources', 'indicators', 'indicator_names', 'source_names', 'counts')
+
+    def __init__(self):
+        self.sectors = Interner()
+        # Interned source ids (None for observations without one)
+        self.sources = Interner()
+        self.indicators = Interner()
+        self.indicator_names = {}
+        self.source_names = {}
+        # (sector_id, indicator_id, source_id) -> observation count
+        self.counts = Counter()
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def active_sources(self):
+        """Source ids that contribute at least one observation, busiest first."""
+        totals = Counter()
+        for (_, _, source_id), count in self.counts.items():
+            totals[source_id] += count
+        return [source_id for source_id, _ in totals.most_common()]
+
+    def source_labels(self, source_ids, reserved=()):
+        """
+        Display label of each interned source id, usable as table headers: never
+        blank, and unique ignoring case among themselves and the `reserved`
+        headers. A label shared by several sources, or with a reserved header,
+        gets the source's id.
+        """
+        labels = []
+        for source_id in source_ids:
+            key = self.sources.labels[source_id]
+            if key is None:
+                labels.append("No source")
+            else:
+                labels.append((self.source_names.get(key) or '').strip() or f"Source #{key}")
+        uses = Counter(label.casefold() for label in [*labels, *reserved])
+        seen = {header.casefold() for header in reserved}
+        unique = []
+        for source_id, label in zip(source_ids, labels):
+            if uses[label.casefold()] > 1:
+                label = f"{label} (#{self.sources.labels[source_id]})"
+            # A publisher may itself be named like a disambiguated label
+            candidate, number = label, 2
+            while candidate.casefold() in seen:
+                candidate, number = f"{label} ({number})", number + 1
+            seen.add(candidate.casefold())
+            unique.append(candidate)
+        return unique
+
+    def indicator_rows(self):
+        """Yield (sector, indicator code, indicator name, {source_id: count}) sorted by sector and code."""
+        rows = {}
+        for (sector_id, indicator_id, source_id), count in self.counts.items():
+            rows.setdefault((sector_id, indicator_id), {})[source_id] = count
+        for sector_id, indicator_id in sorted(rows, key=lambda key: (self.sectors.labels[key[0]], self.indicators.labels[key[1]])):
+            code = self.indicators.labels[indicator_id]
+            yield self.sectors.labels[sector_id], code, self.indicator_names.get(code, code), rows[(sector_id, indicator_id)]
+
+    def sector_rows(self):
+        """Yield (sector, {source_id: count}) sorted by sector."""
+        rows = {}
+        for (sector_id, _, source_id), count in self.counts.items():
+            cells = rows.setdefault(sector_id, Counter())
+            cells[source_id] += count
+        for sector_id in sorted(rows, key=lambda key: self.sectors.labels[key]):
+            yield self.sectors.labels[sector_id], rows[sector_id]
+
+
+def build_coverage(time_series, indicators, sources):
+    matrix = CoverageMatrix()
+
+    sector_by_code = {}
+    for indicator in indicators:
+        sector_by_code[indicator['code']] = indicator.get('sector') or UNCLASSIFIED_SECTOR
+        matrix.indicator_names[indicator['code']] = indicator.get('nameEn') or indicator['code']
+    for source in sources:
+        matrix.source_names[source['id']] = source.get('publisher')
+
+    # Resolve each distinct key once, then count interned triples
+    raw = Counter((point.get('indicatorCode'), point.get('sourceId')) for point in time_series)
+    for (code, source_id), count in raw.items():
+        sector_id = matrix.sectors(sector_by_code.get(code, UNCLASSIFIED_SECTOR))
+        indicator_id = matrix.indicators(code)
+        matrix.counts[(sector_id, indicator_id, matrix.sources(source_id))] += count
+    return matrix
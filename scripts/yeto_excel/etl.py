@@ -0,0 +1,148 @@
+"""
+ETL run performance per connector and scheduler job.
+
+Streams `ingestion_runs` (grouped by connector) and `scheduler_run_history`
+(grouped by job) in batches and keeps, per group, run and failure counts,
+records processed, total run time and a t-digest of run durations. Memory
+is bounded by the number of connectors and jobs, not by the number of
+runs, and the per-group digests merge into an "all" total for each kind.
+
+Runs still in progress, and skipped scheduler runs, are left out of the
+counts. `scheduler_jobs` adds each job's type and last run; its lifetime
+runCount/failCount are used when they exceed what the history still holds
+(the history may be pruned, and the JSON export does not carry it).
+"""
+
+from datetime import datetime
+
+from .export_data import table_batches, table_rows
+from .tdigest import TDigest
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+INGESTION_COLUMNS = ['id', 'connectorName', 'status', 'startedAt', 'completedAt', 'duration', 'recordsFetched']
+HISTORY_COLUMNS = ['id', 'jobName', 'status', 'startedAt', 'completedAt', 'duration', 'recordsProcessed']
+
+
+def _duration_ms(row):
+    duration = row.get('duration')
+    if duration is not None:
+        return duration
+    if row.get('startedAt') and row.get('completedAt'):
+        started = datetime.fromisoformat(row['startedAt'].replace('Z', '+00:00'))
+        completed = datetime.fromisoformat(row['completedAt'].replace('Z', '+00:00'))
+        return (completed - started).total_seconds() * 1000
+    return None
+
+
+class RunStats:
+    """Counters and a duration digest for one connector or job."""
+
+    __slots__ = ('kind', 'name', 'job_type', 'runs', 'failed', 'records', 'duration_ms', 'digest',
+                 'last_run', 'last_status', 'last_duration_ms', '_pending')
+
+    def __init__(self, kind, name, job_type=None):
+        self.kind = kind
+        self.name = name
+        self.job_type = job_type
+        self.runs = 0
+        self.failed = 0
+        self.records = 0
+        self.duration_ms = 0
+        self.digest = TDigest()
+        self.last_run = None
+        self.last_status = None
+        self.last_duration_ms = None
+        self._pending = []
+
+    def add(self, status, duration_ms, records, started):
+        self.runs += 1
+        if status == 'failed':
+            self.failed += 1
+        self.records += records or 0
+        if duration_ms is not None:
+            self.duration_ms += duration_ms
+            self._pending.append(duration_ms)
+        if started and (self.last_run is None or started > self.last_run):
+            self.last_run, self.last_status, self.last_duration_ms = started, status, duration_ms
+
+    def flush(self):
+        # Durations are folded into the digest once per batch, in one numpy call
+        if self._pending:
+            self.digest.update(self._pending)
+            self._pending = []
+
+    def merge(self, other):
+        other.flush()
+        self.flush()
+        self.runs += other.runs
+        self.failed += other.failed
+        self.records += other.records
+        self.duration_ms += other.duration_ms
+        self.digest.merge(other.digest)
+        if other.last_run and (self.last_run is None or other.last_run > self.last_run):
+            self.last_run, self.last_status, self.last_duration_ms = other.last_run, other.last_status, other.last_duration_ms
+        return self
+
+    @property
+    def failure_rate(self):
+        return self.failed / self.runs if self.runs else None
+
+    @property
+    def throughput(self):
+        """Records per second of run time."""
+        return self.records / (self.duration_ms / 1000) if self.duration_ms else None
+
+    def quantiles_seconds(self, qs=QUANTILES):
+        """Duration quantiles in seconds (None without timed runs), followed by the maximum."""
+        self.flush()
+        if not self.digest.count:
+            return [None] * (len(qs) + 1)
+        return [value / 1000 for value in self.digest.quantiles(qs)] + [self.digest.max / 1000]
+
+
+def _stream(source, table, columns, key, records_column, kind, stats, batch_size):
+    for batch in table_batches(source, table, batch_size, columns):
+        for row in batch:
+            status = row.get('status')
+            if status in ('running', 'skipped'):
+                continue
+            name = row.get(key) or 'unknown'
+            group = stats.get(name)
+            if group is None:
+                group = stats[name] = RunStats(kind, name)
+            group.add(status, _duration_ms(row), row.get(records_column), row.get('startedAt'))
+        for group in stats.values():
+            group.flush()
+
+
+def etl_performance(source, batch_size):
+    """
+    Returns (connectors, jobs): RunStats per connector and per scheduler
+    job, each list sorted by name and followed by its merged total.
+    """
+    connectors = {}
+    _stream(source, 'ingestion_runs', INGESTION_COLUMNS, 'connectorName', 'recordsFetched', 'Connector',
+            connectors, batch_size)
+    jobs = {}
+    _stream(source, 'scheduler_run_history', HISTORY_COLUMNS, 'jobName', 'recordsProcessed', 'Job', jobs, batch_size)
+
+    for job in table_rows(source, 'scheduler_jobs'):
+        stats = jobs.get(job['jobName'])
+        if stats is None:
+            stats = jobs[job['jobName']] = RunStats('Job', job['jobName'])
+        stats.job_type = job.get('jobType')
+        if (job.get('runCount') or 0) > stats.runs:
+            stats.runs, stats.failed = job['runCount'], job.get('failCount') or 0
+        if job.get('lastRunAt') and (stats.last_run is None or job['lastRunAt'] > stats.last_run):
+            stats.last_run, stats.last_status = job['lastRunAt'], job.get('lastRunStatus')
+            stats.last_duration_ms = job.get('lastRunDuration')
+
+    result = []
+    for kind, groups in (('Connector', connectors), ('Job', jobs)):
+        ordered = [groups[name] for name in sorted(groups)]
+        total = RunStats(kind, f"All {kind.lower()}s")
+        for group in ordered:
+            total.merge(group)
+        result.append(ordered + [total] if ordered else [])
+    return tuple(result)
@@ -0,0 +1,192 @@
+"""
+Impact of economic_events on the time_series around them.
+
+Each event opens a window of `before` days before and `after` days after
+its date. The windows go into an IntervalIndex, and every observation is
+stabbed into the windows that contain it and start after the previous
+observation of its series: each window is found by the first observation
+of a series inside it, so every (event, series) pair with data near the
+event is produced exactly once, and no event is compared against every
+series. For each pair, the "before" value is
+the latest observation on or before the event date and the "after" value
+is the latest observation in the window after it. Both are read with one
+vectorized searchsorted over (series, date) keys.
+
+Events tagged to one regime only join the series of that regime and the
+series that are not regime-specific. Events tagged 'mixed' or 'unknown'
+join every series.
+"""
+
+import numpy as np
+
+from .anomalies import group_starts
+from .regimes import ADEN, SANAA, regime_key
+
+# Annual series dominate the export, so a year on each side catches one release
+DEFAULT_EVENT_WINDOW = 365
+# Observations stabbed at a time, which bounds the (observation, event) pairs held at once
+STAB_CHUNK = 65536
+
+_REGIME_CODES = {ADEN: 1, SANAA: 2}
+
+
+class IntervalIndex:
+    """
+    Closed integer intervals [start, end], sorted by start. A point is
+    looked up among the intervals starting at most the widest interval's
+    width before it, so a stab costs two binary searches plus its matches.
+    """
+
+    __slots__ = ('order', 'start', 'end', 'width')
+
+    def __init__(self, start, end):
+        self.order = np.argsort(start, kind='stable')
+        self.start = np.asarray(start)[self.order]
+        self.end = np.asarray(end)[self.order]
+        self.width = int((self.end - self.start).max()) if len(self.start) else 0
+
+    def stab(self, points, floor=None):
+        """
+        (point index, interval index) of every interval containing each of
+        `points`; with `floor`, only the intervals starting after the
+        point's floor.
+        """
+        points = np.asarray(points)
+        lowest = points - self.width
+        if floor is not None:
+            lowest = np.maximum(lowest, np.asarray(floor) + 1)
+        lo = np.searchsorted(self.start, lowest, side='left')
+        hi = np.searchsorted(self.start, points, side='right')
+        counts = np.maximum(hi - lo, 0)
+        point = np.repeat(np.arange(len(points)), counts)
+        # Position of each pair within its point's run of candidates
+        offset = np.arange(len(point)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate = np.repeat(lo, counts) + offset
+        inside = self.end[candidate] >= points[point]
+        return point[inside], self.order[candidate[inside]]
+
+
+class EventFrame:
+    """Columnar economic_events: dates and regime codes as arrays, the descriptive fields as lists."""
+
+    __slots__ = ('date', 'regime', 'records')
+
+    def __init__(self, date, regime, records):
+        self.date = date          # datetime64[D]
+        self.regime = regime      # 0 for all regimes, else the _REGIME_CODES of the one it concerns
+        self.records = records    # (id, title, category, impactLevel, regimeTag)
+
+    def __len__(self):
+        return len(self.date)
+
+
+def event_frame(events):
+    """Build an EventFrame from economic_events rows; rows without a date are skipped."""
+    records, dates, regimes = [], [], []
+    for event in events:
+        if not event.get('eventDate'):
+            continue
+        tag = event.get('regimeTag') or 'unknown'
+        records.append((event.get('id'), event.get('title') or "", event.get('category') or "",
+                        event.get('impactLevel') or "", tag))
+        dates.append(event['eventDate'][:10])
+        regimes.append(_REGIME_CODES.get(tag, 0))
+    return EventFrame(np.array(dates, dtype='datetime64[D]'), np.array(regimes, dtype=np.int8), records)
+
+
+class EventImpact:
+    """
+    One entry per (event, series) pair with an observation on both sides
+    of the event, ordered by event date, then indicator and regime. Each
+    field is an array over the pairs; `event` indexes the EventFrame and
+    `group` the SeriesFrame's groups.
+    """
+
+    __slots__ = ('events', 'groups', 'event', 'group', 'observations', 'before_date', 'before', 'after_date',
+                 'after', 'change', 'change_pct', 'candidates')
+
+    def __init__(self, events, groups, event, group, observations, before_date, before, after_date, after,
+                 candidates):
+        self.events = events
+        self.groups = groups
+        self.event = event
+        self.group = group
+        self.observations = observations
+        self.before_date = before_date
+        self.before = before
+        self.after_date = after_date
+        self.after = after
+        self.change = after - before
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.change_pct = np.where(before != 0, self.change / np.abs(before), np.nan)
+        # Pairs with data somewhere in the window, including those missing one side
+        self.candidates = candidates
+
+    def __len__(self):
+        return len(self.event)
+
+    def events_with_data(self):
+        return len(np.unique(self.event))
+
+
+def _series_regimes(groups):
+    """_REGIME_CODES of each series group, 0 when it is not regime-specific."""
+    codes = np.zeros(len(groups), dtype=np.int8)
+    for group_id, (code, regime_tag) in enumerate(groups.labels):
+        key = regime_key(code, regime_tag)
+        if key is not None:
+            codes[group_id] = _REGIME_CODES[key[1]]
+    return codes
+
+
+def _candidate_pairs(frame, day, events, index, chunk_size):
+    """(event, group) of the pairs with an observation in the event's window, each once."""
+    series_regime = _series_regimes(frame.groups)
+    # Day of the previous observation of the same series; windows starting by then were found from it
+    previous = np.empty_like(day)
+    previous[1:] = day[:-1]
+    previous[group_starts(frame.group)] = np.iinfo(np.int64).min // 2
+    events_found, groups_found = [], []
+    for start in range(0, len(day), chunk_size):
+        stop = start + chunk_size
+        point, event = index.stab(day[start:stop], previous[start:stop])
+        group = frame.group[start:stop][point]
+        event_regime = events.regime[event]
+        match = (event_regime == 0) | (series_regime[group] == 0) | (event_regime == series_regime[group])
+        events_found.append(event[match])
+        groups_found.append(group[match])
+    if not events_found:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(events_found).astype(np.int64), np.concatenate(groups_found).astype(np.int64)
+
+
+def event_impact(events, frame, before=DEFAULT_EVENT_WINDOW, after=DEFAULT_EVENT_WINDOW, chunk_size=STAB_CHUNK):
+    """
+    Join `events` (an EventFrame) to `frame` (a SeriesFrame) through their
+    windows; see the module docstring. Returns an EventImpact.
+    """
+    frame = frame.sorted()
+    epoch = min(frame.date.min(), events.date.min()) if len(frame) and len(events) else np.datetime64(0, 'D')
+    day = (frame.date - epoch).astype(np.int64)
+    event_day = (events.date - epoch).astype(np.int64)
+    index = IntervalIndex(event_day - before, event_day + after)
+    event, group = _candidate_pairs(frame, day, events, index, chunk_size)
+    candidates = len(event)
+
+    # (series, day) keys are increasing because the frame is sorted by series, then date
+    span = int(max(day.max(initial=0), event_day.max(initial=0))) + before + after + 1
+    series_key = frame.group.astype(np.int64) * span + day + before
+    base = group * span + event_day[event] + before
+    lo = np.searchsorted(series_key, base - before, side='left')
+    mid = np.searchsorted(series_key, base, side='right')
+    hi = np.searchsorted(series_key, base + after, side='right')
+    both = (mid > lo) & (hi > mid)
+
+    event, group, lo, mid, hi = event[both], group[both], lo[both], mid[both], hi[both]
+    # Series in indicator order within each event
+    rank = np.empty(len(frame.groups), dtype=np.int64)
+    rank[sorted(range(len(frame.groups)), key=frame.groups.labels.__getitem__)] = np.arange(len(frame.groups))
+    order = np.lexsort((rank[group], events.date[event]))
+    event, group, lo, mid, hi = event[order], group[order], lo[order], mid[order], hi[order]
+    return EventImpact(events, frame.groups, event, group, hi - lo, frame.date[mid - 1], frame.value[mid - 1],
+                       frame.date[hi - 1], frame.value[hi - 1], candidates)
@@ -0,0 +1,56 @@
+"""
+Access to the platform's JSON data export (data-export.json).
+
+The export is a single object keyed by table name, each holding a list of
+row dicts with the database's camelCase column names. A DatabaseSource
+(see db_source.py) can stand in for the export anywhere a source is
+accepted; its rows are streamed instead of held in memory.
+"""
+
+import json
+import os
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_EXPORT_PATH = os.path.join(REPO_ROOT, 'data-export.json')
+
+# Tables written by scripts/export-data-for-production.ts
+EXPORT_TABLES = (
+    'research_publications', 'glossary_terms', 'time_series', 'indicators', 'economic_events', 'documents',
+    'users', 'sources', 'provenance_ledger_full', 'confidence_ratings', 'data_vintages', 'scheduler_jobs',
+    'alerts', 'research_organizations', 'research_authors', 'publication_authors',
+)
+
+
+def load_export(path=DEFAULT_EXPORT_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def table_rows(source, name):
+    """
+    Rows of one table; tables missing from the export are empty. For a
+    DatabaseSource this is a one-shot iterator over a streamed query.
+    """
+    if isinstance(source, dict):
+        return source.get(name) or []
+    return source.rows(name)
+
+
+def table_batches(source, name, batch_size, columns=None):
+    """
+    Rows of one table in lists of at most `batch_size` rows. `columns`
+    narrows the query of a DatabaseSource; export rows are passed whole.
+    """
+    if not isinstance(source, dict):
+        yield from source.batches(name, columns, batch_size=batch_size)
+        return
+    rows = source.get(name) or []
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def table_count(source, name):
+    """Row count of one table, or None when the export does not carry it."""
+    if isinstance(source, dict):
+        return len(source[name]) if name in source else None
+    return source.count(name)
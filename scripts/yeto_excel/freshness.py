@@ -0,0 +1,363 @@
+"""
+Freshness SLA of the scheduler jobs and of the data sources.
+
+Jobs: every cron schedule is expanded into the instants it should have
+run at over the window, and each instant is checked against the job's run
+history. A scheduled run is missed when no run started between it and the
+next scheduled one (or now, for the latest), once its grace period is
+over. Each distinct expression is compiled once (compile_cron is cached)
+into minute offsets and month, day and weekday masks, and expanded once
+over a calendar of the window shared by all of them. The runs of all the
+jobs on one expression are then placed among its instants by a single
+searchsorted, each run covering the latest instant at or before it, so
+the work grows with the runs and the distinct expressions rather than
+with the scheduled instants of every job.
+
+Sources: a source is stale when its latest time_series observation is
+older than its cadence plus its typical publication lag. The cadence and
+lag come from the registry records at the source's host, or else from the
+frequency of the indicators the source feeds; irregular sources have no
+SLA. An observation dated after the reference time is flagged rather than
+counted as fresh.
+
+Both are checked as of a reference time the caller picks. A reproducible
+run cannot use the clock, and its pinned generation time says nothing
+about the data, so latest_activity() gives the latest run or observation
+the data holds instead.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+
+from .export_data import table_batches, table_rows
+from .reconcile import url_host
+
+DEFAULT_SLA_DAYS = 365
+DEFAULT_GRACE_MINUTES = 60
+# How far ahead the next scheduled run is looked for
+LOOKAHEAD_DAYS = 366
+
+RUN_COLUMNS = ['jobName', 'status', 'startedAt']
+OBSERVATION_COLUMNS = ['sourceId', 'indicatorCode', 'date']
+
+# Cadence keywords and their period in days; the shortest one named applies
+CADENCE_DAYS = (
+    ('daily', 1), ('continuous', 1), ('real-time', 1), ('weekly', 7), ('monthly', 31), ('quarterly', 92),
+    ('annual', 366), ('yearly', 366), ('biennial', 731),
+)
+
+JOB_STATUSES = ("✓ On schedule", "✓ Not yet due", "⚠ Missed runs", "⚠ Never ran", "⚠ Overdue", "⚠ Invalid cron",
+                "Disabled")
+SOURCE_STATUSES = ("✓ Fresh", "⚠ Stale", "⚠ Future date", "⚠ No data", "No SLA")
+
+CronSchedule = namedtuple('CronSchedule', ['expression', 'times', 'months', 'days', 'weekdays', 'either_day'])
+Calendar = namedtuple('Calendar', ['days', 'month', 'day', 'weekday'])
+JobFreshness = namedtuple('JobFreshness', ['name', 'job_type', 'cron', 'expected', 'ran', 'missed', 'last_run',
+                                           'next_run', 'expected_next', 'status'])
+SourceFreshness = namedtuple('SourceFreshness', ['source_id', 'publisher', 'cadence', 'allowed_days', 'latest',
+                                                 'age_days', 'status'])
+
+_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day of month', 1, 31), ('month', 1, 12), ('day of week', 0, 7))
+_NAMES = {
+    'month': {name: number for number, name in enumerate(
+        ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)},
+    'day of week': {name: number for number, name in enumerate(('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'))},
+}
+_MACROS = {
+    '@yearly': '0 0 1 1 *', '@annually': '0 0 1 1 *', '@monthly': '0 0 1 * *', '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *', '@midnight': '0 0 * * *', '@hourly': '0 * * * *',
+}
+_NOT_A_TIME = np.datetime64('NaT', 'm')
+
+
+def _number(text, field):
+    number = _NAMES.get(field, {}).get(text.lower())
+    if number is None:
+        number = int(text)    # ValueError for anything else
+    return number
+
+
+def _field(text, field, low, high):
+    """Boolean mask over 0..high of the values the cron field `text` allows."""
+    allowed = np.zeros(high + 1, dtype=bool)
+    for part in text.split(','):
+        body, slash, step = part.partition('/')
+        step = int(step) if slash else 1
+        if body == '*':
+            first, last = low, high
+        elif '-' in body:
+            first, last = (_number(value, field) for value in body.split('-', 1))
+        else:
+            # 'a/n' runs from a to the end of the range
+            first = _number(body, field)
+            last = high if slash else first
+        if step < 1 or not low <= first <= last <= high:
+            raise ValueError(f"{part!r} is out of range for the {field}")
+        allowed[first:last + 1:step] = True
+    return allowed
+
+
+@lru_cache(maxsize=None)
+def compile_cron(expression):
+    """CronSchedule of a five-field cron expression or an @daily style macro; ValueError if invalid."""
+    fields = _MACROS.get(expression.strip().lower(), expression).split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron expression {expression!r} does not have five fields")
+    try:
+        minutes, hours, days, months, weekdays = (_field(text, *spec) for text, spec in zip(fields, _FIELDS))
+    except ValueError as error:
+        raise ValueError(f"Cron expression {expression!r}: {error}") from None
+    # 7 is Sunday as well as 0
+    weekdays[0] |= weekdays[7]
+    times = (np.flatnonzero(hours)[:, None] * 60 + np.flatnonzero(minutes)[None, :]).ravel()
+    # With both day fields restricted, cron runs on a day either one allows
+    either_day = not fields[2].startswith('*') and not fields[4].startswith('*')
+    return CronSchedule(expression, times.astype('timedelta64[m]'), months, days, weekdays[:7], either_day)
+
+
+def calendar(start, end):
+    """Calendar of the days from `start` up to and including `end`."""
+    days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    months = days.astype('datetime64[M]')
+    # 1970-01-01 was a Thursday
+    return Calendar(days, months.astype(np.int64) % 12 + 1, (days - months).astype(np.int64) + 1,
+                    (days.astype(np.int64) + 4) % 7)
+
+
+def cron_instants(schedule, start, end, days=None):
+    """Sorted datetime64[m] instants in [start, end) at which `schedule` runs."""
+    start, end = np.datetime64(start, 'm'), np.datetime64(end, 'm')
+    if days is None:
+        days = calendar(start, end)
+    if schedule.either_day:
+        matches = schedule.days[days.day] | schedule.weekdays[days.weekday]
+    else:
+        matches = schedule.days[days.day] & schedule.weekdays[days.weekday]
+    matches &= schedule.months[days.month]
+    instants = (days.days[matches].astype('datetime64[m]')[:, None] + schedule.times[None, :]).ravel()
+    return instants[(instants >= start) & (instants < end)]
+
+
+def _instant(value):
+    """Minute of an ISO string or datetime (UTC), or NaT."""
+    if not value:
+        return _NOT_A_TIME
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, 'm')
+    try:
+        return np.datetime64(str(value)[:16], 'm')
+    except ValueError:
+        return _NOT_A_TIME
+
+
+def _instants(values):
+    """datetime64[m] array of ISO strings or datetimes (UTC); NaT where a value does not parse."""
+    try:
+        return np.array([value[:16] if isinstance(value, str) else _instant(value) for value in values],
+                        dtype='datetime64[m]')
+    except ValueError:
+        return np.array([_instant(value) for value in values], dtype='datetime64[m]')
+
+
+def _groups(keys, count):
+    """Order of `keys` by value and the bounds of each value 0..count-1 in that order."""
+    order = np.argsort(keys, kind='stable')
+    return order, np.searchsorted(keys[order], np.arange(count + 1))
+
+
+def _moment(instant):
+    return None if np.isnat(instant) else instant.item()
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value)[:10] if value else None
+
+
+def latest_activity(source, batch_size):
+    """Latest run start or observation date in the data, as a naive UTC datetime; None without any."""
+    latest = _NOT_A_TIME
+    tables = (('scheduler_run_history', 'startedAt'), ('scheduler_jobs', 'lastRunAt'), ('time_series', 'date'))
+    for table, column in tables:
+        for batch in table_batches(source, table, batch_size, [column]):
+            times = _instants([row.get(column) for row in batch])
+            times = times[~np.isnat(times)]
+            if len(times) and (np.isnat(latest) or times.max() > latest):
+                latest = times.max()
+    return _moment(latest)
+
+
+def job_freshness(source, now, batch_size, window_days=DEFAULT_SLA_DAYS, grace_minutes=DEFAULT_GRACE_MINUTES):
+    """
+    JobFreshness of every scheduler job, in table order: runs expected over
+    the `window_days` up to `now` (from the job's creation, if later),
+    those a run started for, and those missed.
+    """
+    now = np.datetime64(now, 'm')
+    start = now - np.timedelta64(window_days, 'D')
+    grace = np.timedelta64(grace_minutes, 'm')
+    jobs = list(table_rows(source, 'scheduler_jobs'))
+    index = {job.get('jobName'): number for number, job in enumerate(jobs)}
+
+    # Start of every run, skipped ones aside, and each job's own last run
+    run_jobs, run_starts = [], []
+    for batch in table_batches(source, 'scheduler_run_history', batch_size, RUN_COLUMNS):
+        for row in batch:
+            number = index.get(row.get('jobName'))
+            if number is not None and row.get('status') not in ('skipped', None) and row.get('startedAt'):
+                run_jobs.append(number)
+                run_starts.append(row['startedAt'])
+    for number, job in enumerate(jobs):
+        if job.get('lastRunAt'):
+            run_jobs.append(number)
+            run_starts.append(job['lastRunAt'])
+    run_jobs = np.array(run_jobs, dtype=np.int64)
+    run_times = _instants(run_starts)
+    # NaT is the smallest int64, so jobs without runs keep it
+    last_runs = np.full(len(jobs), _NOT_A_TIME).astype(np.int64)
+    np.maximum.at(last_runs, run_jobs, run_times.astype(np.int64))
+    last_runs = last_runs.view('datetime64[m]')
+    in_window = (run_times >= start) & (run_times <= now)
+    run_jobs, run_times = run_jobs[in_window], run_times[in_window]
+
+    # Jobs and runs grouped by expression, each expression expanded once
+    expressions = [(job.get('cronExpression') or '').strip() for job in jobs]
+    distinct = {expression: number for number, expression in enumerate(dict.fromkeys(expressions))}
+    job_schedules = np.array([distinct[expression] for expression in expressions], dtype=np.int64)
+    job_order, job_bounds = _groups(job_schedules, len(distinct))
+    run_order, run_bounds = _groups(job_schedules[run_jobs], len(distinct))
+    created = _instants([job.get('createdAt') for job in jobs])
+    since = np.where(created > start, created, start)
+    days = calendar(start, now + np.timedelta64(LOOKAHEAD_DAYS, 'D'))
+
+    expected = np.zeros(len(jobs), dtype=np.int64)
+    ran = np.zeros(len(jobs), dtype=np.int64)
+    first = np.zeros(len(jobs), dtype=np.int64)
+    expected_next = np.full(len(jobs), _NOT_A_TIME)
+    invalid = set()
+    for number, expression in enumerate(distinct):
+        try:
+            instants = cron_instants(compile_cron(expression), start, days.days[-1] + 1, days)
+        except ValueError:
+            invalid.add(expression)
+            continue
+        members = job_order[job_bounds[number]:job_bounds[number + 1]]
+        first[members] = np.searchsorted(instants, since[members])
+        # Scheduled runs whose grace period is over, and the next one
+        due = np.searchsorted(instants, now - grace, side='right')
+        upcoming = np.searchsorted(instants, now)
+        expected[members] = np.maximum(due - first[members], 0)
+        if upcoming < len(instants):
+            expected_next[members] = instants[upcoming]
+
+        # A run covers the latest scheduled run at or before it; a slot
+        # counts once however many runs started in it
+        runs = run_order[run_bounds[number]:run_bounds[number + 1]]
+        slots = np.searchsorted(instants, run_times[runs], side='right') - 1
+        counted = (slots >= first[run_jobs[runs]]) & (slots < due)
+        covered = np.unique(run_jobs[runs][counted] * len(instants) + slots[counted])
+        ran += np.bincount(covered // len(instants), minlength=len(jobs))
+
+    result = []
+    for number, job in enumerate(jobs):
+        expression = (job.get('cronExpression') or '').strip()
+        next_run = _instant(job.get('nextRunAt'))
+        missed = int(expected[number] - ran[number])
+        if job.get('isEnabled') is not None and not job['isEnabled']:
+            status = "Disabled"
+        elif expression in invalid:
+            status = "⚠ Invalid cron"
+        elif not expected[number]:
+            status = "✓ Not yet due"
+        elif not ran[number]:
+            status = "⚠ Never ran"
+        elif missed:
+            status = "⚠ Missed runs"
+        elif not np.isnat(next_run) and next_run + grace < now:
+            status = "⚠ Overdue"
+        else:
+            status = "✓ On schedule"
+        result.append(JobFreshness(
+            job.get('jobName'), job.get('jobType'), expression, int(expected[number]), int(ran[number]), missed,
+            _moment(last_runs[number]), _moment(next_run), _moment(expected_next[number]), status,
+        ))
+    return result
+
+
+def cadence_days(cadence):
+    """Period in days of the shortest cadence named in `cadence`; None when irregular or unknown."""
+    text = (cadence or '').lower()
+    periods = [days for keyword, days in CADENCE_DAYS if keyword in text]
+    return min(periods) if periods else None
+
+
+def source_freshness(source, records, now, batch_size):
+    """
+    SourceFreshness of every source, in table order. `records` are the
+    registry SourceRecords, in order of preference; None leaves the
+    indicators' frequency as the only cadence.
+    """
+    # Cadence and lag of the first registry record at each host that has them
+    cadences, lags = {}, {}
+    for record in records or ():
+        host = url_host(record.url)
+        if host:
+            if cadence_days(record.cadence or record.frequency) is not None:
+                cadences.setdefault(host, record.cadence or record.frequency)
+            if record.lag_days is not None:
+                lags.setdefault(host, record.lag_days)
+    frequencies, indicator_cadences = {}, {}
+    for row in table_rows(source, 'indicators'):
+        frequencies[row.get('code')] = row.get('frequency')
+        if row.get('primarySourceId') is not None and row.get('frequency'):
+            indicator_cadences.setdefault(row['primarySourceId'], set()).add(row['frequency'])
+
+    latest = {}
+    for batch in table_batches(source, 'time_series', batch_size, OBSERVATION_COLUMNS):
+        for row in batch:
+            source_id, day = row.get('sourceId'), _day(row.get('date'))
+            if source_id is None or not day:
+                continue
+            if day > latest.get(source_id, ''):
+                latest[source_id] = day
+            frequency = frequencies.get(row.get('indicatorCode'))
+            if frequency:
+                indicator_cadences.setdefault(source_id, set()).add(frequency)
+
+    sources = list(table_rows(source, 'sources'))
+    cadence, lag = [], []
+    for row in sources:
+        host = url_host(row.get('url'))
+        named = cadences.get(host)
+        if named is None and row.get('id') in indicator_cadences:
+            # The most frequent series the source feeds sets its pace
+            named = min(indicator_cadences[row['id']], key=lambda text: cadence_days(text) or float('inf'))
+        cadence.append(named)
+        lag.append(lags.get(host, 0))
+    periods = np.array([cadence_days(text) or -1 for text in cadence], dtype=np.int64)
+    allowed = periods + np.array(lag, dtype=np.int64)
+    observed = np.array([latest.get(row.get('id')) or 'NaT' for row in sources], dtype='datetime64[D]')
+    ages = (np.datetime64(now, 'D') - observed).astype(np.int64)
+    stale = ages > allowed
+
+    result = []
+    for number, row in enumerate(sources):
+        limit = int(allowed[number]) if periods[number] >= 0 else None
+        age = None if np.isnat(observed[number]) else int(ages[number])
+        if age is None:
+            status = "⚠ No data"
+        elif age < 0:
+            status = "⚠ Future date"
+        elif limit is None:
+            status = "No SLA"
+        else:
+            status = "⚠ Stale" if stale[number] else "✓ Fresh"
+        result.append(SourceFreshness(row.get('id'), row.get('publisher'), cadence[number], limit,
+                                      latest.get(row.get('id')), age, status))
+    return result
@@ -0,0 +1,158 @@
+"""
+Glossary terms tagged in the research texts.
+
+Every English and Arabic form of every glossary term goes into one
+Aho-Corasick automaton over words: a trie of the terms' word sequences
+with failure links, so a single left-to-right pass over a text finds all
+occurrences of all terms, overlapping ones included, in time linear in
+the text plus the matches, however many terms there are. Each document's
+title and abstract, in both languages, are tagged in that one pass.
+
+Text is compared in a normalised form: case-folded (NFKC first), with the
+Arabic harakat and tatweel dropped, the alef, yaa and taa marbuta
+spellings folded together and the definite article, with the prepositions
+fused to it, taken off ("للبنك" and "البنك" both read "بنك"), then split
+into words. A term matches whole words only; "(GDP)" style acronyms in a
+term are forms of it on their own.
+"""
+
+import re
+import unicodedata
+from array import array
+from collections import deque, namedtuple
+
+# Fields tagged, where a table has them (documents have no abstract)
+GLOSSARY_FIELDS = ('title', 'titleAr', 'abstract', 'abstractAr')
+
+_ARABIC_MARKS = re.compile('[\u0640\u064b-\u065f\u0670]')
+_ARABIC_FOLD = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ى': 'ي', 'ة': 'ه'})
+# The article and the prepositions written with it, ahead of two letters or more
+_ARABIC_ARTICLE = re.compile(r'\b(?:وال|بال|كال|فال|لل|ال)(?=\w\w)')
+_WORD = re.compile(r'\w+')
+_PARENTHESES = re.compile(r'\(([^)]*)\)')
+
+GlossaryTerm = namedtuple('GlossaryTerm', ['term_id', 'english', 'arabic', 'category'])
+
+
+def normalize_words(text):
+    """Words of `text` in the normalised form the automaton compares."""
+    if not text:
+        return []
+    text = _ARABIC_MARKS.sub('', unicodedata.normalize('NFKC', text).casefold())
+    return _WORD.findall(_ARABIC_ARTICLE.sub('', text.translate(_ARABIC_FOLD)))
+
+
+def term_forms(term):
+    """Distinct word sequences `term` is matched by: each name without its acronym, and the acronym."""
+    forms = []
+    for name in (term.english, term.arabic):
+        if not name:
+            continue
+        for form in (_PARENTHESES.sub(' ', name), *_PARENTHESES.findall(name)):
+            words = tuple(normalize_words(form))
+            if words and words not in forms:
+                forms.append(words)
+    return forms
+
+
+class TermAutomaton:
+    """Aho-Corasick automaton over words; see the module docstring."""
+
+    __slots__ = ('goto', 'fail', 'output')
+
+    def __init__(self, patterns):
+        # `patterns` are (words, value) pairs; matches() yields the values
+        self.goto = [{}]
+        outputs = [[]]
+        for words, value in patterns:
+            state = 0
+            for word in words:
+                following = self.goto[state].get(word)
+                if following is None:
+                    following = self.goto[state][word] = len(self.goto)
+                    self.goto.append({})
+                    outputs.append([])
+                state = following
+            outputs[state].append(value)
+
+        # Breadth first, so the failure state (always shallower) is complete
+        # before the states that fall back to it inherit its matches
+        self.fail = array('I', bytes(4 * len(self.goto)))
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                outputs[child].extend(outputs[self.fail[child]])
+                queue.append(child)
+        self.output = [tuple(values) for values in outputs]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def matches(self, words):
+        """Value of every pattern occurrence in `words`, in order of where it ends."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class GlossaryCoverage:
+    """
+    How often each glossary term occurs in the documents tagged: `mentions`
+    counts occurrences and `documents` the documents with at least one,
+    both indexed like `terms`.
+    """
+
+    __slots__ = ('terms', 'mentions', 'documents', 'scanned', 'tagged')
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.mentions = array('q', bytes(8 * len(terms)))
+        self.documents = array('q', bytes(8 * len(terms)))
+        self.scanned = 0     # documents read
+        self.tagged = 0      # documents with at least one term
+
+    @property
+    def covered(self):
+        return sum(1 for count in self.documents if count)
+
+    def rows(self):
+        """(term, documents, mentions), most widely covered first, glossary order among equals."""
+        order = sorted(range(len(self.terms)), key=lambda index: (-self.documents[index], -self.mentions[index]))
+        for index in order:
+            yield self.terms[index], self.documents[index], self.mentions[index]
+
+    def uncovered(self):
+        return [term for term, count in zip(self.terms, self.documents) if not count]
+
+
+def glossary_coverage(glossary, *tables, fields=GLOSSARY_FIELDS):
+    """Tag the `fields` of every document of `tables` with the terms of the `glossary` rows."""
+    terms = [GlossaryTerm(row.get('id'), row.get('termEn'), row.get('termAr'), row.get('category'))
+             for row in glossary]
+    automaton = TermAutomaton((form, index) for index, term in enumerate(terms) for form in term_forms(term))
+    coverage = GlossaryCoverage(terms)
+    mentions, documents = coverage.mentions, coverage.documents
+    for table in tables:
+        for document in table:
+            found = set()
+            for field in fields:
+                text = document.get(field)
+                if text:
+                    for index in automaton.matches(normalize_words(text)):
+                        mentions[index] += 1
+                        found.add(index)
+            for index in found:
+                documents[index] += 1
+            coverage.scanned += 1
+            coverage.tagged += bool(found)
+    return coverage
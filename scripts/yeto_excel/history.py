@@ -0,0 +1,163 @@
+"""
+Local run-history store (SQLite) behind the audit's "Trends" sheet.
+
+Every run appends its headline metrics (table counts, completion rates,
+per-sheet timings) as one sample per metric:
+
+    runs     (id, started, script, details, status, finished)  indexed by started
+    metrics  (id, name)                          unique name
+    samples  (metric_id, recorded, run_id, value)
+
+`samples` is a WITHOUT ROWID table clustered on (metric_id, recorded), so
+every windowed query (latest value, previous value, average/min/max over
+the last day, week or month) is a range scan over one metric's slice of
+the B-tree. Its cost depends on the window, not on how many years of
+hourly runs the file holds.
+
+A run is 'running' from `start_run` until `finish_run` marks it 'finished',
+or 'failed' and drops its samples, so a run that stopped halfway neither
+counts nor leaves partial metrics in the windows.
+"""
+
+import json
+import sqlite3
+import time
+
+DAY = 86400
+
+# (label, seconds) of the windows summarised on the Trends sheet
+TREND_WINDOWS = (('24h', DAY), ('7d', 7 * DAY), ('30d', 30 * DAY))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    script TEXT NOT NULL,
+    details TEXT,
+    status TEXT NOT NULL DEFAULT 'finished',
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS samples (
+    metric_id INTEGER NOT NULL REFERENCES metrics (id),
+    recorded REAL NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    value REAL NOT NULL,
+    PRIMARY KEY (metric_id, recorded, run_id)
+) WITHOUT ROWID;
+"""
+
+
+class RunHistory:
+    """Append-only metric history of generator runs."""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        # WAL keeps readers (dashboards, ad-hoc queries) off the writer's back
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # Files written before runs had a status: their runs all finished
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        if 'status' not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE runs ADD COLUMN status TEXT NOT NULL DEFAULT 'finished'")
+                self.connection.execute("ALTER TABLE runs ADD COLUMN finished REAL")
+        self.run_id = None
+        self.started = None
+        self._metric_ids = {}
+
+    def start_run(self, script, started=None, **details):
+        self.started = started if started is not None else time.time()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started, script, details, status) VALUES (?, ?, ?, 'running')",
+                (self.started, script, json.dumps(details, sort_keys=True)),
+            )
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def finish_run(self, failed=False, finished=None):
+        """Mark the current run finished, or failed and without samples."""
+        with self.connection:
+            if failed:
+                # One keyed lookup per metric instead of a scan of every sample
+                self.connection.execute(
+                    "DELETE FROM samples WHERE metric_id IN (SELECT id FROM metrics) AND recorded = ? AND run_id = ?",
+                    (self.started, self.run_id),
+                )
+            self.connection.execute(
+                "UPDATE runs SET status = ?, finished = ? WHERE id = ?",
+                ('failed' if failed else 'finished', finished if finished is not None else time.time(), self.run_id),
+            )
+
+    def metric_id(self, name):
+        metric_id = self._metric_ids.get(name)
+        if metric_id is None:
+            self.connection.execute("INSERT OR IGNORE INTO metrics (name) VALUES (?)", (name,))
+            metric_id = self.connection.execute("SELECT id FROM metrics WHERE name = ?", (name,)).fetchone()[0]
+            self._metric_ids[name] = metric_id
+        return metric_id
+
+    def record(self, values):
+        """Store {metric name: value} for the current run; re-recording a metric replaces it."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO samples (metric_id, recorded, run_id, value) VALUES (?, ?, ?, ?)",
+                [(self.metric_id(name), self.started, self.run_id, float(value))
+                 for name, value in values.items() if value is not None],
+            )
+
+    def run_count(self):
+        """(count, first start) of the finished runs and the current one."""
+        return self.connection.execute(
+            "SELECT COUNT(*), MIN(started) FROM runs WHERE status = 'finished' OR id = ?", (self.run_id,),
+        ).fetchone()
+
+    def metric_names(self):
+        return [name for name, in self.connection.execute("SELECT name FROM metrics ORDER BY name")]
+
+    def latest(self, name, until, limit=2):
+        """The last `limit` (recorded, value) samples at or before `until`, newest first."""
+        return self.connection.execute(
+            "SELECT recorded, value FROM samples WHERE metric_id = ? AND recorded <= ? "
+            "ORDER BY recorded DESC LIMIT ?",
+            (self.metric_id(name), until, limit),
+        ).fetchall()
+
+    def window(self, name, start, end):
+        """(count, average, minimum, maximum) of the samples recorded in (start, end]."""
+        return self.connection.execute(
+            "SELECT COUNT(*), AVG(value), MIN(value), MAX(value) FROM samples "
+            "WHERE metric_id = ? AND recorded > ? AND recorded <= ?",
+            (self.metric_id(name), start, end),
+        ).fetchone()
+
+    def trends(self, until=None, windows=TREND_WINDOWS):
+        """
+        One dict per metric: latest and previous value, and count/avg/min/max
+        over each window ending at `until` (the current run by default).
+        """
+        until = until if until is not None else self.started
+        rows = []
+        for name in self.metric_names():
+            samples = self.latest(name, until)
+            if not samples:
+                continue
+            row = {
+                'metric': name,
+                'latest': samples[0][1],
+                'latest_at': samples[0][0],
+                'previous': samples[1][1] if len(samples) > 1 else None,
+            }
+            for label, seconds in windows:
+                row[label] = self.window(name, until - seconds, until)
+            rows.append(row)
+        return rows
+
+    def close(self):
+        self.connection.close()
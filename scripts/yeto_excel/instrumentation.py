@@ -0,0 +1,162 @@
+"""
+Per-sheet instrumentation for the generators.
+
+Each step (one sheet, the shared time-series load, the final save) records
+wall time, CPU time, the peak-memory high-water delta, and the rows, cells
+and styled cells it wrote through the workbook backend. Results go to a
+JSON run report and to a Prometheus textfile (for node_exporter's textfile
+collector); with a profile directory each step also leaves a cProfile dump.
+
+Peak memory is the growth of the process's maximum resident set size during
+the step: cheap enough to leave on for nightly runs, unlike tracemalloc,
+but zero for steps that stay below an earlier peak.
+"""
+
+import cProfile
+import json
+import os
+import re
+import socket
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = 'yeto_excel'
+
+# (report field, metric name, help text)
+METRICS = [
+    ('wall_seconds', 'step_wall_seconds', "Wall time spent in the step"),
+    ('cpu_seconds', 'step_cpu_seconds', "Process CPU time spent in the step"),
+    ('peak_memory_bytes', 'step_peak_memory_delta_bytes', "Growth of the peak resident set size during the step"),
+    ('rows', 'step_rows', "Rows written by the step"),
+    ('cells', 'step_cells', "Cells written by the step"),
+    ('styled_cells', 'step_styled_cells', "Styled cells written by the step"),
+]
+
+
+def peak_rss():
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def book_counters(book):
+    if book is None:
+        return 0, 0, 0
+    sheets = book.sheets
+    return (sum(sheet.rows for sheet in sheets), sum(sheet.cells for sheet in sheets),
+            sum(sheet.styled_cells for sheet in sheets))
+
+
+def slug(name):
+    return re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_').lower() or 'step'
+
+
+class Instrumentation:
+    """Records one entry per measured step of a generator run."""
+
+    def __init__(self, script, profile_dir=None):
+        self.script = script
+        self.profile_dir = profile_dir
+        self.started = datetime.now(timezone.utc)
+        self.steps = []
+        self._open = None
+
+    def begin(self, name, book=None):
+        """Start measuring `name`; cell counts are taken from `book`'s sheets."""
+        if self._open is not None:
+            self.end()
+        profiler = None
+        if self.profile_dir:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self._open = (name, book, book_counters(book), peak_rss(), time.process_time(), time.perf_counter(), profiler)
+
+    def end(self):
+        if self._open is None:
+            return None
+        name, book, counters, rss, cpu, wall, profiler = self._open
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, f"{slug(self.script)}-{len(self.steps) + 1:02d}-{slug(name)}.prof"))
+        rows, cells, styled_cells = (after - before for after, before in zip(book_counters(book), counters))
+        step = {
+            'name': name,
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'peak_memory_bytes': max(peak_rss() - rss, 0),
+            'rows': rows,
+            'cells': cells,
+            'styled_cells': styled_cells,
+        }
+        self.steps.append(step)
+        self._open = None
+        return step
+
+    @contextmanager
+    def measure(self, name, book=None):
+        self.begin(name, book)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def report(self, **details):
+        self.end()
+        totals = {field: sum(step[field] for step in self.steps) for field, _, _ in METRICS}
+        totals['wall_seconds'] = round(totals['wall_seconds'], 6)
+        totals['cpu_seconds'] = round(totals['cpu_seconds'], 6)
+        return {
+            'script': self.script,
+            'host': socket.gethostname(),
+            'started': self.started.isoformat(timespec='seconds'),
+            'peak_rss_bytes': peak_rss(),
+            **details,
+            'totals': totals,
+            'steps': self.steps,
+        }
+
+    def write_json(self, path, **details):
+        write_atomic(path, json.dumps(self.report(**details), indent=2, ensure_ascii=False) + '\n')
+
+    def write_prometheus(self, path, **details):
+        report = self.report(**details)
+        script = label_value(self.script)
+        lines = []
+        for field, metric, help_text in METRICS:
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for step in report['steps']:
+                lines.append(f'{name}{{script="{script}",step="{label_value(step["name"])}"}} {step[field]}')
+        name = f"{METRIC_PREFIX}_run_timestamp_seconds"
+        lines += [
+            f"# HELP {name} Start time of the last run",
+            f"# TYPE {name} gauge",
+            f'{name}{{script="{script}"}} {self.started.timestamp():.0f}',
+        ]
+        write_atomic(path, '\n'.join(lines) + '\n')
+
+
+def label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_atomic(path, text):
+    # The textfile collector may read at any moment; never expose a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        handle.write(text)
+    os.replace(temporary, path)
@@ -0,0 +1,240 @@
+"""
+Producer/consumer pipeline overlapping the generators' I/O with rendering.
+
+Sheets are rendered one after another on the calling thread, but what they
+read (database tables, the migrations and registry files, the source URL
+probe) does not depend on the rendering. A Pipeline starts those reads up
+front, as producers on an asyncio event loop in a background thread, and a
+sheet waits only for its own inputs, so a run takes about as long as the
+longer of its I/O and its rendering instead of both:
+
+    with Pipeline() as pipeline:
+        schema = pipeline.submit("Parse migrations", load_schema, directory)
+        frame = pipeline.submit("Load time series", series_frame, rows, lane='source')
+        alignments = pipeline.submit("Align regimes", align_regimes, frame)
+        batches = pipeline.stream("Raw time_series", table_batches(source, 'time_series', 5000), lane='source')
+        ...
+        create_schema_sheet(ws, schema.result())
+        for batch in batches:
+            ...
+
+submit() runs a blocking function on a worker thread and run() an async
+one on the loop; both return a Task, and Tasks passed as arguments are
+waited for and replaced by their results first. stream() iterates a
+(blocking or async) iterable into a bounded queue that the caller
+consumes: once `maxsize` items wait unread the producer stops reading, so
+memory stays bounded however fast the source is.
+
+Producers that share a `lane` run one at a time, in submission order, on
+the lane's own thread. A database connection (sqlite3's included) is only
+used from one thread at a time that way, and a streamed cursor is closed
+before the next query starts on the connection. Consume the streams of one
+lane in the order they were opened.
+
+A producer's exception is raised where its result is used, in the sheet
+that waits for the Task or iterates the stream, and in the producers that
+depend on it; other sheets are unaffected. Leaving the `with` block (on an
+error or not) cancels the producers still running and closes the
+iterators of their streams; a thread already inside a blocking call
+finishes that call first.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+# Items a stream reads ahead of its consumer
+DEFAULT_QUEUE_SIZE = 4
+
+_END = object()
+
+
+class _Failure:
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Task:
+    """Handle on a producer; result() waits for it and raises its exception."""
+
+    __slots__ = ('name', 'future')
+
+    def __init__(self, name, future):
+        self.name = name
+        self.future = future    # concurrent.futures.Future
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        return self.future.cancel()
+
+    def __repr__(self):
+        state = 'done' if self.future.done() else 'running'
+        return f"Task({self.name!r}, {state})"
+
+
+class Stream:
+    """Items of a streamed producer, read from its bounded queue in order."""
+
+    __slots__ = ('name', 'queue', 'task', 'loop')
+
+    def __init__(self, name, queue, task, loop):
+        self.name = name
+        self.queue = queue
+        self.task = task
+        self.loop = loop
+
+    def __iter__(self):
+        try:
+            while True:
+                item = asyncio.run_coroutine_threadsafe(self.queue.get(), self.loop).result()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            # A consumer that stops early releases the producer, and its lane
+            self.task.cancel()
+
+    def close(self):
+        self.task.cancel()
+
+
+class Pipeline:
+    """
+    Event loop thread running the producers of one generator run; see the
+    module docstring. `workers` threads run the producers without a lane.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.loop = None
+        self._thread = None
+        self._pool = None
+        self._lanes = {}
+
+    def __enter__(self):
+        self.loop = asyncio.new_event_loop()
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='pipeline')
+        self._thread = threading.Thread(target=self.loop.run_forever, name='pipeline-loop', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Cancel the producers still running, wait for them to stop and shut the threads down."""
+        if self.loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._settle(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        for executor, _ in self._lanes.values():
+            executor.shutdown()
+        self._pool.shutdown()
+        self.loop = None
+
+    async def _settle(self):
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _lane(self, lane):
+        """(executor, lock) of `lane`; the shared pool and no lock without one."""
+        if lane is None:
+            return self._pool, nullcontext()
+        if lane not in self._lanes:
+            # Created on the calling thread, before any producer of the lane runs
+            self._lanes[lane] = (ThreadPoolExecutor(1, thread_name_prefix=f'pipeline-{lane}'), asyncio.Lock())
+        return self._lanes[lane]
+
+    def _start(self, name, coroutine):
+        if self.loop is None:
+            coroutine.close()
+            raise RuntimeError("Pipeline is not running; use it as a context manager")
+        return Task(name, asyncio.run_coroutine_threadsafe(coroutine, self.loop))
+
+    @staticmethod
+    async def _resolve(args):
+        return [await asyncio.wrap_future(arg.future) if isinstance(arg, Task) else arg for arg in args]
+
+    async def _call(self, executor, call):
+        # The thread cannot be interrupted: a cancelled producer still waits
+        # for its call to return, so the lane stays busy until then
+        pending = asyncio.get_running_loop().run_in_executor(executor, call)
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            if not pending.done():
+                await asyncio.wait([pending])
+
+    def submit(self, name, function, *args, lane=None):
+        """Run `function(*args)` on a worker thread (the lane's, with one); returns a Task."""
+        executor, lock = self._lane(lane)
+
+        async def produce():
+            # The lane is taken before waiting for the arguments, which keeps
+            # its producers in submission order
+            async with lock:
+                resolved = await self._resolve(args)
+                return await self._call(executor, functools.partial(function, *resolved))
+
+        return self._start(name, produce())
+
+    def run(self, name, function, *args):
+        """Run the coroutine `function(*args)` on the pipeline's loop; returns a Task."""
+        async def produce():
+            return await function(*await self._resolve(args))
+
+        return self._start(name, produce())
+
+    def stream(self, name, iterable, maxsize=DEFAULT_QUEUE_SIZE, lane=None):
+        """
+        Read `iterable` (an iterable, or an async iterable read on the loop)
+        ahead of the consumer, at most `maxsize` items; returns a Stream.
+        """
+        executor, lock = self._lane(lane)
+        queue = asyncio.Queue(maxsize)
+
+        async def produce():
+            async with lock:
+                try:
+                    if hasattr(iterable, '__aiter__'):
+                        async for item in iterable:
+                            await queue.put(item)
+                    else:
+                        await self._drain(executor, iter(iterable), queue)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    await queue.put(_Failure(exc))
+                    raise
+                await queue.put(_END)
+
+        return Stream(name, queue, self._start(name, produce()), self.loop)
+
+    async def _drain(self, executor, iterator, queue):
+        try:
+            while True:
+                item = await self._call(executor, functools.partial(next, iterator, _END))
+                if item is _END:
+                    return
+                # Waits while the queue is full: the backpressure
+                await queue.put(item)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                # On the thread that read it, which owns a database cursor
+                await self._call(executor, close)
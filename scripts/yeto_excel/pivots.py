@@ -0,0 +1,89 @@
+"""
+Pivot summaries computed in Python.
+
+Analysts pivot the audit and UX sheets by status, sector or router. Neither
+backend can author PivotTable parts (openpyxl only keeps the pivots of
+workbooks it loaded, XlsxWriter has none), and Excel would refresh a
+PivotTable's cache from the sheet on open anyway. A Pivot is the finished
+crosstab instead: row counts by two fields, counted while the rows are at
+hand and written below them as a native table with totals, so there is
+nothing left for Excel to compute.
+
+    pivot = pivot_counts(items, headers, "Location", "Status", ("Working", "Issue"))
+    write_pivot(ws, row, 1, pivot, HEADER, CELL, BOLD)
+"""
+
+import numpy as np
+from openpyxl.utils import get_column_letter
+
+from .coverage import Interner
+from .sheets import table_name
+
+TOTAL = "Total"
+
+
+class Pivot:
+    """Counts of rows per (row label, column label), labels in first-seen order."""
+
+    __slots__ = ('row_field', 'column_field', 'row_labels', 'column_labels', 'counts')
+
+    def __init__(self, row_field, column_field, row_labels, column_labels, counts):
+        self.row_field = row_field
+        self.column_field = column_field
+        self.row_labels = row_labels
+        self.column_labels = column_labels
+        self.counts = counts    # int array, rows x columns
+
+    def __len__(self):
+        return len(self.row_labels)
+
+    @property
+    def height(self):
+        """Rows taken by write_pivot(): header, one per row label, totals."""
+        return len(self.row_labels) + 2
+
+    def headers(self):
+        return [self.row_field] + list(self.column_labels) + [TOTAL]
+
+    def rows(self):
+        totals = self.counts.sum(axis=1).tolist()
+        for label, counts, total in zip(self.row_labels, self.counts.tolist(), totals):
+            yield [label] + counts + [total]
+
+    def totals(self):
+        return [TOTAL] + self.counts.sum(axis=0).tolist() + [int(self.counts.sum())]
+
+
+def pivot_counts(rows, headers, row_field, column_field, column_order=()):
+    """
+    Pivot of `rows` (sequences laid out as `headers`) by the values of
+    `row_field` and `column_field`. Labels in `column_order` come first, in
+    that order and even when no row has them.
+    """
+    row_index, column_index = headers.index(row_field), headers.index(column_field)
+    row_labels, column_labels = Interner(), Interner()
+    for label in column_order:
+        column_labels(label)
+    pairs = [(row_labels(row[row_index]), column_labels(row[column_index])) for row in rows]
+    counts = np.zeros((len(row_labels), len(column_labels)), dtype=np.int64)
+    if pairs:
+        r, c = np.array(pairs).T
+        counts = np.bincount(r * len(column_labels) + c, minlength=counts.size).reshape(counts.shape)
+    return Pivot(row_field, column_field, row_labels.labels, column_labels.labels, counts)
+
+
+def write_pivot(ws, row, col, pivot, header_style=None, cell_style=None, total_style=None):
+    """
+    Write `pivot` on a backend sheet from (row, col): the header and body
+    rows as a native table, the totals row below it. Takes pivot.height rows.
+    """
+    headers = pivot.headers()
+    ws.write_row(row, col, headers, header_style)
+    first = row
+    for values in pivot.rows():
+        row += 1
+        ws.write_row(row, col, values, cell_style)
+    if len(pivot):
+        ref = f"{get_column_letter(col)}{first}:{get_column_letter(col + len(headers) - 1)}{row}"
+        ws.table(ref, table_name(f"{ws.title} {pivot.row_field} by {pivot.column_field}"), headers, header_style)
+    ws.write_row(row + 1, col, pivot.totals(), total_style)
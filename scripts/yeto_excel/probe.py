@@ -0,0 +1,333 @@
+"""
+Health probe of the source URLs.
+
+probe_urls() requests every URL on one asyncio event loop and reports
+whether it answers, how fast, and whether it changed since the last probe:
+
+    report = probe_urls(urls, cache_path='yeto-probe-cache.json')
+    report.results[url].state      # 'ok', 'not modified', 'http error', ...
+
+Requests to one host share a kept-alive connection and are spaced at least
+1 / `per_host_rate` seconds apart, so the dozens of api.worldbank.org URLs
+in the registry cost one TLS handshake and never burst the host. Different
+hosts are probed in parallel, `concurrency` at a time. Once connecting to a
+host fails (it doesn't resolve or refuses), its other URLs fail at once.
+
+URLs are probed with HEAD (GET when a server refuses HEAD). The cache file
+keeps each URL's ETag and Last-Modified and sends them back as
+If-None-Match / If-Modified-Since: an unchanged resource answers 304 Not
+Modified, and a 200 with other validators is a change. Without validators
+(or on the first probe) a URL's change state is None.
+
+Only the standard library is used: a minimal HTTP/1.1 client over asyncio
+streams, reading Content-Length, chunked and close-delimited responses.
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import time
+from collections import namedtuple
+from urllib.parse import urljoin, urlsplit
+
+from .instrumentation import write_atomic
+
+# Bumped whenever the cache format changes, which invalidates caches
+PROBE_CACHE_VERSION = 1
+
+DEFAULT_CONCURRENCY = 16
+# Requests per second sent to any one host
+DEFAULT_HOST_RATE = 2.0
+DEFAULT_TIMEOUT = 15.0
+MAX_REDIRECTS = 5
+# GET bodies longer than this are not read to keep the connection; it is closed instead
+MAX_DRAIN = 1 << 20
+USER_AGENT = 'YETO-audit-probe/1.0'
+
+REDIRECTS = frozenset((301, 302, 303, 307, 308))
+
+ProbeResult = namedtuple('ProbeResult', [
+    'url', 'state', 'status', 'latency', 'changed', 'etag', 'last_modified', 'final_url', 'error',
+])
+ProbeResult.__doc__ = """
+Outcome of probing one URL. `state` is 'ok' (2xx), 'not modified' (304),
+'http error' (4xx/5xx or too many redirects), 'unreachable' (DNS, connect,
+TLS or timeout failures) or 'invalid' (not an http(s) URL); `latency` is
+the seconds until the response headers arrived, over all redirects;
+`changed` is True, False or None (unknown).
+"""
+
+
+def _absolute(url):
+    """`url` with https:// added when it has no scheme."""
+    url = url.strip()
+    return url if '://' in url else 'https://' + url
+
+
+def _split(url):
+    """(scheme, host, port, request target) of an absolute `url`."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f"Not an http(s) URL: {url}")
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    return parts.scheme, parts.hostname, port, target
+
+
+class _Host:
+    """One host's kept-alive connection, the lock serialising requests on it and its rate limit."""
+
+    def __init__(self, interval):
+        self.lock = asyncio.Lock()
+        self.interval = interval
+        self.next_start = 0.0
+        self.streams = None
+        # Set when connecting failed; the host's other URLs fail without waiting their turn
+        self.down = None
+
+    async def wait_turn(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.next_start > now:
+            await asyncio.sleep(self.next_start - now)
+            now = loop.time()
+        self.next_start = now + self.interval
+
+    def close(self):
+        if self.streams is not None:
+            self.streams[1].close()
+            self.streams = None
+
+
+class Prober:
+    """Probes URLs with shared connections; see probe_urls()."""
+
+    def __init__(self, cache=None, concurrency=DEFAULT_CONCURRENCY, per_host_rate=DEFAULT_HOST_RATE,
+                 timeout=DEFAULT_TIMEOUT, ssl_context=None):
+        # {url: {'etag': ..., 'last_modified': ...}}, updated in place
+        self.cache = cache if cache is not None else {}
+        self.concurrency = concurrency
+        self.interval = 1 / per_host_rate if per_host_rate else 0.0
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.hosts = {}
+        self.requests = 0
+        self.connections = 0
+        self._slots = None
+
+    def _host(self, scheme, host, port):
+        key = (scheme, host, port)
+        if key not in self.hosts:
+            self.hosts[key] = _Host(self.interval)
+        return self.hosts[key]
+
+    async def _connect(self, scheme, host, port):
+        streams = await asyncio.open_connection(host, port, ssl=self.ssl_context if scheme == 'https' else None)
+        self.connections += 1
+        return streams
+
+    async def _exchange(self, host_state, scheme, host, port, method, target, headers):
+        """Send one request on the host's connection; returns (status, headers)."""
+        reused = host_state.streams is not None
+        if not reused:
+            try:
+                host_state.streams = await self._connect(scheme, host, port)
+            except OSError as exc:
+                host_state.down = exc
+                raise
+        reader, writer = host_state.streams
+        default_port = 443 if scheme == 'https' else 80
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host if port == default_port else f'{host}:{port}'}",
+                 f"User-Agent: {USER_AGENT}", "Accept: */*", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        self.requests += 1
+        try:
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            await writer.drain()
+            status_line = await reader.readline()
+        except ConnectionError:
+            if not reused:
+                raise
+            status_line = b''
+        if not status_line:
+            host_state.close()
+            if reused:
+                # The server closed the idle connection; retry once on a new one
+                return await self._exchange(host_state, scheme, host, port, method, target, headers)
+            raise ConnectionError("Connection closed without a response")
+        try:
+            version, status = status_line.decode('latin-1').split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise ConnectionError(f"Malformed status line: {status_line[:80]!r}") from None
+        response = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response[name.strip().lower()] = value.strip()
+        keep_alive = version != 'HTTP/1.0' and response.get('connection', '').lower() != 'close'
+        if method != 'HEAD' and status not in (204, 304) and status >= 200:
+            keep_alive = await self._drain(reader, response) and keep_alive
+        if not keep_alive:
+            host_state.close()
+        return status, response
+
+    async def _drain(self, reader, response):
+        """Read (and discard) a response body; False when the connection can't be reused."""
+        if 'chunked' in response.get('transfer-encoding', '').lower():
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return True
+                total += size
+                if total > MAX_DRAIN:
+                    return False
+                await reader.readexactly(size + 2)
+        if 'content-length' in response:
+            length = int(response['content-length'])
+            if length > MAX_DRAIN:
+                return False
+            await reader.readexactly(length)
+            return True
+        # Delimited by the server closing the connection
+        return False
+
+    async def _hop(self, url, method, headers):
+        scheme, host, port, target = _split(url)
+        host_state = self._host(scheme, host, port)
+        async with host_state.lock:
+            if host_state.down is not None:
+                raise host_state.down
+            await host_state.wait_turn()
+            async with self._slots:
+                started = time.perf_counter()
+                try:
+                    status, response = await asyncio.wait_for(
+                        self._exchange(host_state, scheme, host, port, method, target, headers), self.timeout)
+                except BaseException:
+                    # The connection is in an unknown state
+                    host_state.close()
+                    raise
+                return status, response, time.perf_counter() - started
+
+    async def probe(self, url):
+        cached = self.cache.get(url) or {}
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        location = _absolute(url)
+        try:
+            _split(location)
+        except ValueError as exc:
+            return ProbeResult(url, 'invalid', None, None, None, None, None, None, str(exc))
+        latency = 0.0
+        method = 'HEAD'
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, response, elapsed = await self._hop(location, method, headers)
+                latency += elapsed
+                if status in (405, 501) and method == 'HEAD':
+                    method = 'GET'
+                    status, response, elapsed = await self._hop(location, method, headers)
+                    latency += elapsed
+                if status in REDIRECTS and 'location' in response:
+                    location = urljoin(location, response['location'])
+                    continue
+                break
+            else:
+                return ProbeResult(url, 'http error', status, latency, None, None, None, location, "Too many redirects")
+        except asyncio.TimeoutError:
+            return ProbeResult(url, 'unreachable', None, None, None, None, None, location, "Timed out")
+        except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+            # ValueError: a redirect to a non-http(s) URL, or a malformed chunk size
+            return ProbeResult(url, 'unreachable', None, None, None, None, None, location,
+                               str(exc) or type(exc).__name__)
+
+        if status == 304:
+            return ProbeResult(url, 'not modified', status, latency, False, cached.get('etag'),
+                               cached.get('last_modified'), location, None)
+        etag, last_modified = response.get('etag'), response.get('last-modified')
+        if status >= 400:
+            return ProbeResult(url, 'http error', status, latency, None, etag, last_modified, location, None)
+        changed = None
+        if etag and cached.get('etag'):
+            changed = etag != cached['etag']
+        elif last_modified and cached.get('last_modified'):
+            changed = last_modified != cached['last_modified']
+        if etag or last_modified:
+            self.cache[url] = {'etag': etag, 'last_modified': last_modified}
+        return ProbeResult(url, 'ok', status, latency, changed, etag, last_modified, location, None)
+
+    async def probe_all(self, urls):
+        """{url: ProbeResult} for the distinct `urls`."""
+        self._slots = asyncio.Semaphore(self.concurrency)
+        urls = list(dict.fromkeys(urls))
+        try:
+            results = await asyncio.gather(*(self.probe(url) for url in urls))
+        finally:
+            for host_state in self.hosts.values():
+                host_state.close()
+        return dict(zip(urls, results))
+
+
+class ProbeReport:
+    """Result of probe_urls()."""
+
+    def __init__(self, results, requests, connections, elapsed):
+        self.results = results
+        self.requests = requests
+        # Connections opened; fewer than requests when connections were reused
+        self.connections = connections
+        self.elapsed = elapsed
+
+    def count(self, *states):
+        return sum(result.state in states for result in self.results.values())
+
+    @property
+    def changed(self):
+        return sum(result.changed is True for result in self.results.values())
+
+
+def _read_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except ValueError:
+        return {}
+    return cache.get('urls', {}) if cache.get('version') == PROBE_CACHE_VERSION else {}
+
+
+def probe_urls(urls, cache_path=None, concurrency=DEFAULT_CONCURRENCY, per_host_rate=DEFAULT_HOST_RATE,
+               timeout=DEFAULT_TIMEOUT, ssl_context=None):
+    """
+    Probe `urls` (see the module docstring) and return a ProbeReport. With a
+    `cache_path`, validators are read from and written back to that file.
+    """
+    return asyncio.run(probe_urls_async(urls, cache_path, concurrency, per_host_rate, timeout, ssl_context))
+
+
+async def probe_urls_async(urls, cache_path=None, concurrency=DEFAULT_CONCURRENCY, per_host_rate=DEFAULT_HOST_RATE,
+                           timeout=DEFAULT_TIMEOUT, ssl_context=None):
+    """probe_urls() on the running event loop, e.g. as a producer of a Pipeline."""
+    cache = _read_cache(cache_path)
+    before = json.dumps(cache, sort_keys=True)
+    prober = Prober(cache, concurrency, per_host_rate, timeout, ssl_context)
+    started = time.perf_counter()
+    results = await prober.probe_all(urls)
+    elapsed = time.perf_counter() - started
+    if cache_path and json.dumps(cache, sort_keys=True) != before:
+        write_atomic(cache_path, json.dumps({'version': PROBE_CACHE_VERSION, 'urls': cache}, sort_keys=True,
+                                            separators=(',', ':')))
+    return ProbeReport(results, prober.requests, prober.connections, elapsed)
@@ -0,0 +1,354 @@
+"""
+Entity resolution across the three source registry files.
+
+data/sources-registry.csv, data/sources_master_292.json and
+data/new_sources.json describe overlapping sets of sources with their own
+IDs and spellings (new_sources.json cuts names at 45 characters). To say
+how many distinct sources there are, records are linked when they describe
+the same source and the links are closed into clusters.
+
+Comparing every pair is quadratic, so records are first grouped into
+blocks that share a cheap key, and only records sharing a block are
+compared:
+
+    inst:<acronym>   normalised institution ("Central Bank of Yemen" and
+                     "CBY" are both `cby`)
+    host:<domain>    registrable domain of the URL (data.imf.org and
+                     www.imf.org are both `imf.org`)
+    name:<tokens>    the first name tokens, which catches truncated names
+    id:<id>          the registry ID the files share
+
+Blocks larger than MAX_BLOCK are split by the next name token, so one big
+publisher costs many small blocks rather than one quadratic one, and a pair
+that shares several blocks is compared once.
+
+Names are compared word by word (the Dice coefficient of their word sets,
+where a word matches its own prefix, so `inves` matches `investments`):
+character similarity overrates names that share a long publisher prefix,
+such as "World Bank Global Economic Monitor" and "World Bank Yemen Economic
+Monitor". A name that is a prefix of the other counts as a near match. The
+name score is nudged up by a shared host, institution or ID and down by
+conflicting hosts. Pairs at or above LINK_THRESHOLD are linked; a cluster's
+confidence is its weakest link.
+"""
+
+import csv
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+from itertools import combinations
+from urllib.parse import urlsplit
+
+from .export_data import REPO_ROOT
+
+DEFAULT_REGISTRY_PATH = os.path.join(REPO_ROOT, 'data')
+
+# (file, origin label), in order of preference for a cluster's canonical record
+REGISTRY_FILES = (
+    ('sources-registry.csv', 'registry'),
+    ('sources_master_292.json', 'master'),
+    ('new_sources.json', 'new'),
+)
+
+LINK_THRESHOLD = 0.85
+MAX_BLOCK = 64
+# Names at least this long that are a prefix of another name are truncations
+PREFIX_MIN_LENGTH = 24
+# Shortest word that matches a longer word it is a prefix of
+WORD_PREFIX_MIN_LENGTH = 4
+
+SourceRecord = namedtuple('SourceRecord', ['origin', 'record_id', 'name', 'institution', 'url', 'tier', 'frequency',
+                                           'cadence', 'lag_days'],
+                          defaults=(None, None, None))
+SourceCluster = namedtuple('SourceCluster', ['records', 'confidence', 'canonical'])
+
+_MISSING = {'', 'nan', 'none', 'null', 'n', 'n/a', 'na', 'unknown'}
+_STOPWORDS = frozenset(('the', 'of', 'and', 'for', 'on', 'in', 'de', 'des', 'du', 'la', 'le', 'a', 'an'))
+# Second-level labels under which the registrable domain has three labels
+_SECOND_LEVEL = frozenset(('ac', 'co', 'com', 'edu', 'gov', 'gv', 'net', 'org'))
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value.lower() in _MISSING else value
+
+
+def normalise(text):
+    """Casefolded words of `text`, single-spaced; URLs pasted into it are dropped."""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKC', re.sub(r'https?://\S+', ' ', text)).casefold()
+    return ' '.join(re.findall(r'\w+', text))
+
+
+def _tokens(text):
+    return [token for token in normalise(text).split() if token not in _STOPWORDS]
+
+
+def institution_key(institution):
+    """
+    Acronym form of an institution: a parenthesised acronym if given, the
+    single word of a one-word name, else the initials of its words.
+    """
+    institution = _clean(institution)
+    if not institution:
+        return None
+    acronym = re.search(r'\(([A-Z][A-Za-z&]{1,9})\)', institution)
+    if acronym:
+        return acronym.group(1).lower()
+    tokens = _tokens(re.sub(r'\([^)]*\)', ' ', institution)) or _tokens(institution)
+    if len(tokens) == 1:
+        return tokens[0]
+    return ''.join(token[0] for token in tokens)
+
+
+def url_host(url):
+    """Lower-cased host of `url` without 'www.', or None."""
+    url = _clean(url)
+    if not url:
+        return None
+    if '//' not in url:
+        url = '//' + url
+    try:
+        host = urlsplit(url.strip(' ,;')).hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    host = host.strip('.,')
+    if host.startswith('www.'):
+        host = host[4:]
+    # Cut-off URLs such as 'https://www.fatf-' have no usable host
+    return host if re.search(r'\.[a-z]{2,}$|^\d+\.\d+\.\d+\.\d+$', host) else None
+
+
+def registrable_domain(host):
+    labels = host.split('.')
+    if labels[-1].isdigit():
+        return host
+    if len(labels) > 2 and labels[-2] in _SECOND_LEVEL and len(labels[-1]) == 2:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def _read(path):
+    if path.endswith('.csv'):
+        with open(path, encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _lag_days(value):
+    value = _clean(value)
+    try:
+        return None if value is None else round(float(value))
+    except ValueError:
+        return None
+
+
+def load_registry(directory=DEFAULT_REGISTRY_PATH, files=REGISTRY_FILES):
+    """SourceRecords of every registry file present in `directory`."""
+    records = []
+    for filename, origin in files:
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            continue
+        for row in _read(path):
+            name = _clean(row.get('name_en') or row.get('name'))
+            if not name:
+                continue
+            records.append(SourceRecord(
+                origin,
+                _clean(row.get('src_id') or row.get('source_id')),
+                name,
+                _clean(row.get('institution')),
+                _clean(row.get('url')) or _clean(row.get('domain')),
+                _clean(row.get('tier')),
+                _clean(row.get('update_frequency') or row.get('frequency')),
+                _clean(row.get('cadence_norm') or row.get('cadence')),
+                _lag_days(row.get('typical_lag_days')),
+            ))
+    return records
+
+
+class _Features:
+    """Per-record values computed once and reused in every comparison."""
+
+    __slots__ = ('name', 'tokens', 'words', 'institution', 'host', 'domain', 'record_id')
+
+    def __init__(self, record):
+        self.name = normalise(record.name)
+        self.tokens = _tokens(record.name)
+        self.words = frozenset(self.tokens)
+        self.institution = institution_key(record.institution)
+        self.host = url_host(record.url)
+        self.domain = registrable_domain(self.host) if self.host else None
+        # SRC-7, SRC-007 and SRC-0007 are the same ID
+        match = re.match(r'([A-Za-z]+)-?0*(\d+)$', record.record_id or '')
+        self.record_id = f"{match.group(1).upper()}-{match.group(2)}" if match else record.record_id
+
+
+def _block_keys(features):
+    keys = []
+    if features.institution:
+        keys.append(f"inst:{features.institution}")
+    if features.domain:
+        keys.append(f"host:{features.domain}")
+    if len(features.tokens) >= 2:
+        keys.append(f"name:{' '.join(features.tokens[:2])}")
+    if features.record_id:
+        keys.append(f"id:{features.record_id}")
+    return keys
+
+
+def candidate_blocks(features, max_block=MAX_BLOCK):
+    """Lists of record indexes to compare pairwise; oversized blocks are split."""
+    blocks = defaultdict(list)
+    for i, feature in enumerate(features):
+        for key in _block_keys(feature):
+            blocks[key].append(i)
+    pending = [(key, members, 0) for key, members in blocks.items() if len(members) > 1]
+    while pending:
+        key, members, depth = pending.pop()
+        if len(members) <= max_block:
+            yield members
+            continue
+        # Refine by the next name token; records whose names run out stay together
+        refined = defaultdict(list)
+        for i in members:
+            tokens = features[i].tokens
+            refined[tokens[depth] if depth < len(tokens) else ''].append(i)
+        if set(refined) == {''}:
+            # The names ran out without separating these records; compare in windows
+            for start in range(0, len(members), max_block // 2):
+                yield members[start:start + max_block]
+            continue
+        pending.extend((f"{key}/{token}", part, depth + 1) for token, part in refined.items() if len(part) > 1)
+
+
+def _word_matches(a, b):
+    """Words of `a` matching a word of `b`, exactly or as a prefix."""
+    common = a & b
+    matched = len(common)
+    rest_a, rest_b = a - common, b - common
+    if rest_a and rest_b:
+        for word in rest_a:
+            for other in rest_b:
+                shorter, longer = (word, other) if len(word) <= len(other) else (other, word)
+                if len(shorter) >= WORD_PREFIX_MIN_LENGTH and longer.startswith(shorter):
+                    matched += 1
+                    rest_b = rest_b - {other}
+                    break
+    return matched
+
+
+def name_similarity(a, b):
+    """Similarity in [0, 1] of two _Features' names."""
+    if a.name == b.name:
+        return 1.0
+    shorter, longer = sorted((a.name, b.name), key=len)
+    if len(shorter) >= PREFIX_MIN_LENGTH and longer.startswith(shorter):
+        return 0.95
+    if not a.words or not b.words:
+        return 0.0
+    return 2 * _word_matches(a.words, b.words) / (len(a.words) + len(b.words))
+
+
+def pair_confidence(a, b):
+    """Confidence that two _Features describe the same source."""
+    score = name_similarity(a, b)
+    if a.host and a.host == b.host:
+        score += 0.02
+    elif a.domain and b.domain and a.domain != b.domain:
+        score -= 0.1
+    if a.institution and a.institution == b.institution:
+        score += 0.02
+    if a.record_id and a.record_id == b.record_id:
+        score += 0.02
+    return max(0.0, min(1.0, score))
+
+
+class _DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+class Resolution:
+    """Result of reconcile_sources()."""
+
+    def __init__(self, records, clusters, compared, origins):
+        self.records = records
+        # Largest first, then by canonical name
+        self.clusters = clusters
+        # Candidate pairs compared, against len(records) choose 2 without blocking
+        self.compared = compared
+        self.origins = origins
+
+    @property
+    def all_pairs(self):
+        return len(self.records) * (len(self.records) - 1) // 2
+
+    @property
+    def merged(self):
+        return [cluster for cluster in self.clusters if len(cluster.records) > 1]
+
+
+def reconcile_sources(records, threshold=LINK_THRESHOLD, max_block=MAX_BLOCK):
+    """Cluster SourceRecords that describe the same source."""
+    features = [_Features(record) for record in records]
+    links = _DisjointSet(len(records))
+    # Weakest accepted link per pair of records, kept for the cluster confidence
+    accepted = {}
+    seen = set()
+    compared = 0
+    for block in candidate_blocks(features, max_block):
+        for i, j in combinations(sorted(block), 2):
+            # A pair can share several blocks; compare it once
+            if (i, j) in seen:
+                continue
+            seen.add((i, j))
+            compared += 1
+            confidence = pair_confidence(features[i], features[j])
+            if confidence >= threshold:
+                accepted[i, j] = confidence
+                links.union(i, j)
+
+    members = defaultdict(list)
+    for i in range(len(records)):
+        members[links.find(i)].append(i)
+    weakest = {}
+    for (i, j), confidence in accepted.items():
+        root = links.find(i)
+        weakest[root] = min(weakest.get(root, 1.0), confidence)
+
+    preference = {origin: rank for rank, (_, origin) in enumerate(REGISTRY_FILES)}
+    clusters = []
+    for root, indexes in members.items():
+        cluster = [records[i] for i in indexes]
+        # The preferred file's record, longest name first (the others may be
+        # truncated), skipping names with a URL pasted into them
+        canonical = min(cluster, key=lambda record: (
+            '://' in record.name, preference.get(record.origin, len(preference)), -len(record.name),
+            record.record_id or '',
+        ))
+        clusters.append(SourceCluster(cluster, weakest.get(root), canonical))
+    clusters.sort(key=lambda cluster: (-len(cluster.records), cluster.canonical.name.casefold()))
+    origins = sorted({record.origin for record in records}, key=lambda origin: preference.get(origin, len(preference)))
+    return Resolution(records, clusters, compared, origins)
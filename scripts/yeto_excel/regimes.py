@@ -0,0 +1,156 @@
+"""
+Dual-regime (Aden vs Sana'a) alignment of time_series.
+
+Since 2016 the Central Bank of Yemen is split between Aden (IRG) and
+Sana'a (de facto authorities), and series are recorded per regime either
+through `regimeTag` (e.g. FX_RATE_PARALLEL tagged aden_irg/sanaa_defacto)
+or through a code suffix (CBY_FX_PARALLEL_ADEN / CBY_FX_PARALLEL_SANAA).
+Each pair is aligned on the union of both calendars with a vectorized
+as-of join (np.searchsorted), which carries the last observation forward
+for at most `tolerance` days. A base code found both ways for the same
+regime (FX_RATE tagged aden_irg and FX_RATE_ADEN) is merged into one
+series, averaging any date both report, and listed in `merged`.
+"""
+
+import numpy as np
+
+from .anomalies import trailing_stats
+
+ADEN = 'aden_irg'
+SANAA = 'sanaa_defacto'
+REGIME_SUFFIXES = {'_ADEN': ADEN, '_SANAA': SANAA}
+VOLATILITY_WINDOW = 30
+
+# Calendar point states
+BOTH, ADEN_ONLY, SANAA_ONLY, NEITHER = 0, 1, 2, 3
+STATE_LABELS = {ADEN_ONLY: "Sana'a missing", SANAA_ONLY: "Aden missing", NEITHER: "Both missing"}
+
+
+def regime_key(code, regime_tag):
+    """(base indicator code, regime) for a series, or None if it is not regime-specific."""
+    for suffix, regime in REGIME_SUFFIXES.items():
+        if code.endswith(suffix):
+            return code[:-len(suffix)], regime
+    if regime_tag in (ADEN, SANAA):
+        return code, regime_tag
+    return None
+
+
+def asof_join(calendar, dates, values, tolerance):
+    """Value of the latest observation at or before each calendar date, NaN if older than `tolerance`."""
+    index = np.searchsorted(dates, calendar, side='right') - 1
+    found = index >= 0
+    index = np.maximum(index, 0)
+    fresh = found & (calendar - dates[index] <= tolerance)
+    return np.where(fresh, values[index], np.nan)
+
+
+def default_tolerance(dates):
+    """Twice the median spacing of a series, so one missed release is tolerated."""
+    if len(dates) < 2:
+        return np.timedelta64(0, 'D')
+    return np.median(np.diff(dates)).astype('timedelta64[D]') * 2
+
+
+def merge_series(dates, values):
+    """Sort the observations of several series by date, averaging those on the same date."""
+    calendar, inverse = np.unique(dates, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(calendar))
+    return calendar, np.bincount(inverse, weights=values, minlength=len(calendar)) / counts
+
+
+class RegimeAlignment:
+    __slots__ = ('indicator', 'calendar', 'aden', 'sanaa', 'spread', 'spread_pct', 'volatility', 'state', 'merged')
+
+    def __init__(self, indicator, calendar, aden, sanaa, merged=None):
+        self.indicator = indicator
+        # {regime: [(code, regimeTag), ...]} for the regimes fed by more than one series
+        self.merged = merged or {}
+        self.calendar = calendar
+        self.aden = aden
+        self.sanaa = sanaa
+        self.spread = aden - sanaa
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.spread_pct = np.where(sanaa != 0, self.spread / sanaa, np.nan)
+
+        has_aden = ~np.isnan(aden)
+        has_sanaa = ~np.isnan(sanaa)
+        self.state = np.where(has_aden, np.where(has_sanaa, BOTH, ADEN_ONLY), np.where(has_sanaa, SANAA_ONLY, NEITHER))
+
+        # Rolling standard deviation of the spread over the points where both regimes report
+        self.volatility = np.full(len(calendar), np.nan)
+        both = self.state == BOTH
+        if both.any():
+            _, std, size = trailing_stats(np.zeros(both.sum(), dtype=np.int32), self.spread[both],
+                                          VOLATILITY_WINDOW, inclusive=True)
+            self.volatility[both] = np.where(size >= 2, std, np.nan)
+
+    def gaps(self):
+        """Runs of calendar points where at least one regime is missing: (state, start, end, points)."""
+        state = self.state
+        if not len(state):
+            return []
+        change = np.flatnonzero(np.diff(state)) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change, [len(state)])) - 1
+        keep = state[starts] != BOTH
+        return [
+            (int(state[s]), self.calendar[s], self.calendar[e], int(e - s + 1))
+            for s, e in zip(starts[keep].tolist(), ends[keep].tolist())
+        ]
+
+    def summary(self):
+        both = self.state == BOTH
+        spread = self.spread[both]
+        latest = np.flatnonzero(both)
+        return {
+            'points': len(self.calendar),
+            'both': int(both.sum()),
+            'aden_only': int((self.state == ADEN_ONLY).sum()),
+            'sanaa_only': int((self.state == SANAA_ONLY).sum()),
+            'mean_spread': float(spread.mean()) if len(spread) else None,
+            'max_spread': float(np.abs(spread).max()) if len(spread) else None,
+            'spread_std': float(spread.std(ddof=1)) if len(spread) > 1 else None,
+            'latest_date': self.calendar[latest[-1]] if len(latest) else None,
+            'latest_spread': float(self.spread[latest[-1]]) if len(latest) else None,
+            'latest_spread_pct': float(self.spread_pct[latest[-1]]) if len(latest) else None,
+        }
+
+
+def align_regimes(frame, tolerance=None):
+    """
+    Align every indicator reported for both regimes in `frame` (a SeriesFrame).
+    Returns a list of RegimeAlignment sorted by indicator.
+    """
+    frame = frame.sorted()
+    bounds = np.searchsorted(frame.group, np.arange(len(frame.groups) + 1))
+    series = {}
+    for group_id, (code, regime_tag) in enumerate(frame.groups.labels):
+        key = regime_key(code, regime_tag)
+        if key is None or bounds[group_id] == bounds[group_id + 1]:
+            continue
+        series.setdefault(key[0], {}).setdefault(key[1], []).append(group_id)
+
+    def observations(group_ids):
+        if len(group_ids) == 1:
+            part = slice(bounds[group_ids[0]], bounds[group_ids[0] + 1])
+            return frame.date[part], frame.value[part]
+        parts = np.concatenate([np.arange(bounds[g], bounds[g + 1]) for g in group_ids])
+        return merge_series(frame.date[parts], frame.value[parts])
+
+    alignments = []
+    for indicator in sorted(series):
+        regimes = series[indicator]
+        if ADEN not in regimes or SANAA not in regimes:
+            continue
+        aden_dates, aden_values = observations(regimes[ADEN])
+        sanaa_dates, sanaa_values = observations(regimes[SANAA])
+        merged = {regime: [frame.groups.labels[g] for g in group_ids]
+                  for regime, group_ids in regimes.items() if len(group_ids) > 1}
+        calendar = np.union1d(aden_dates, sanaa_dates)
+        aden = asof_join(calendar, aden_dates, aden_values,
+                         default_tolerance(aden_dates) if tolerance is None else tolerance)
+        sanaa = asof_join(calendar, sanaa_dates, sanaa_values,
+                          default_tolerance(sanaa_dates) if tolerance is None else tolerance)
+        alignments.append(RegimeAlignment(indicator, calendar, aden, sanaa, merged))
+    return alignments
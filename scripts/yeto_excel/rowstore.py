@@ -0,0 +1,104 @@
+"""
+Columnar store for the rows of a sheet.
+
+The inventories behind the UX sheets repeat a handful of values on every
+row ("Working", "2026-01-30", the sector name ten times over). A RowStore
+keeps each column apart instead of a list per row: text columns as codes
+into an Interner, one array('I') entry per row, and numeric columns as
+plain arrays. A row costs its codes, not a list of references; only the
+ID columns, unique to each row, keep a reference per row.
+
+Rows are read back through Records, `__slots__` views of (store, index)
+that index and iterate like the lists they replace, so RenderPlan.render()
+and pivot_counts() take a RowStore as they take a list of lists:
+
+    items = RowStore(headers, unique=("ID",))
+    items.append(["NAV-001", "Header", "Logo", ...])
+    plan.render(ws, items)
+"""
+
+from array import array
+
+from .coverage import Interner
+
+
+class Record:
+    """Row `index` of a RowStore, read on access."""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __len__(self):
+        return len(self.store.headers)
+
+    def __getitem__(self, offset):
+        labels, values = self.store.columns[offset]
+        value = values[self.index]
+        return value if labels is None else labels[value]
+
+    def __iter__(self):
+        index = self.index
+        for labels, values in self.store.columns:
+            yield values[index] if labels is None else labels[values[index]]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"Record({list(self)!r})"
+
+
+class RowStore:
+    """
+    Rows laid out as `headers`. Columns named in `numeric` are arrays of
+    that typecode ({"Total Items": 'q'}). Columns named in `unique` hold a
+    different value on (nearly) every row, like the IDs, so there is
+    nothing to share and they stay a plain list. Every other column is
+    dictionary-encoded and takes any hashable value, None included.
+    """
+
+    __slots__ = ('headers', 'interners', 'columns', '_length')
+
+    def __init__(self, headers, rows=(), numeric=None, unique=()):
+        numeric = numeric or {}
+        self.headers = list(headers)
+        self.interners = [None if header in numeric or header in unique else Interner() for header in self.headers]
+        # (labels or None, codes or values) per column
+        self.columns = [(interner.labels, array('I')) if interner is not None
+                        else (None, array(numeric[header]) if header in numeric else [])
+                        for header, interner in zip(self.headers, self.interners)]
+        self._length = 0
+        self.extend(rows)
+
+    def append(self, values):
+        if len(values) != len(self.headers):
+            raise ValueError(f"Row has {len(values)} values for {len(self.headers)} columns")
+        for interner, (_, column), value in zip(self.interners, self.columns, values):
+            column.append(value if interner is None else interner(value))
+        self._length += 1
+
+    def extend(self, rows):
+        for values in rows:
+            self.append(values)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RowStore index out of range")
+        return Record(self, index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield Record(self, index)
+
+    def column(self, header):
+        """Values of column `header`, one per row."""
+        labels, values = self.columns[self.headers.index(header)]
+        return list(values) if labels is None else [labels[code] for code in values]
@@ -0,0 +1,186 @@
+"""
+Sheets declared as a dependency graph, rendered only as far as asked.
+
+Several sheets are derived from what others compute: the Overview lists
+every sheet and counts the schema's tables, the UX summary counts the
+items of the nine inventory sheets. A SheetGraph declares each sheet as a
+node over its inputs, so a run that asks for a few sheets computes those
+and what they read, and nothing else:
+
+    graph = SheetGraph()
+    schema = graph.dataset("Parse migrations", load_schema, directory)
+    frame = graph.dataset("Load time series", series_frame, rows, lane='source')
+    alignments = graph.dataset("Align regimes", align_regimes, frame)
+    graph.sheet("Schema", create_schema_sheet, schema)
+    graph.sheet("Regime Spreads", create_regime_spreads_sheet, alignments)
+    graph.sheet("Overview", create_overview_sheet, RENDERED, schema, index=0)
+    graph.run(wb, pipeline, metrics, selected=["Overview"])
+
+A Node passed as an argument is a dependency, replaced by its value when
+the node runs: a dataset's result, a sheet's worksheets (the list its
+function returned) or a step's result. RENDERED stands for the worksheets
+of every sheet rendered before, keyed by title, without pulling any of
+them into the run.
+
+Datasets are computed once and shared by every node that reads them. With
+a Pipeline they are all submitted when the run starts, as producers on
+its lanes (coroutine functions on its loop), so independent datasets load
+concurrently with each other and with the rendering; without one, each is
+computed when first needed. Sheets and steps run on the calling thread,
+one after another in declaration order, since the workbook backends are
+not thread-safe; a sheet waits only for its own datasets, and that wait
+is measured as a step named after the dataset.
+"""
+
+import asyncio
+import inspect
+from contextlib import nullcontext
+
+RENDERED = object()
+
+DATASET, STEP, SHEET = 'dataset', 'step', 'sheet'
+
+
+class Node:
+    """A dataset, step or sheet of a SheetGraph."""
+
+    __slots__ = ('name', 'kind', 'function', 'args', 'lane', 'index', 'optional')
+
+    def __init__(self, name, kind, function, args, lane=None, index=None, optional=False):
+        self.name = name
+        self.kind = kind
+        self.function = function
+        self.args = args
+        self.lane = lane
+        self.index = index
+        self.optional = optional
+
+    def dependencies(self):
+        return [arg for arg in self.args if isinstance(arg, Node)]
+
+    def __repr__(self):
+        return f"Node({self.name!r}, {self.kind})"
+
+
+class SheetGraph:
+    """Nodes of one workbook, in declaration order; see the module docstring."""
+
+    def __init__(self):
+        self.nodes = {}
+        self._tasks = {}
+        self._values = {}
+
+    def _add(self, node):
+        if node.name in self.nodes:
+            raise ValueError(f"Node {node.name!r} is already declared")
+        self.nodes[node.name] = node
+        return node
+
+    def dataset(self, name, function, *args, lane=None):
+        """
+        Value computed by `function(*args)`, once per run; `lane` is the
+        Pipeline lane it runs on. Its Node arguments must be datasets.
+        """
+        for arg in args:
+            if arg is RENDERED or isinstance(arg, Node) and arg.kind != DATASET:
+                raise ValueError(f"Dataset {name!r} can only depend on datasets")
+        return self._add(Node(name, DATASET, function, args, lane=lane))
+
+    def step(self, name, function, *args):
+        """`function(*args)` run on the calling thread, without a worksheet."""
+        return self._add(Node(name, STEP, function, args))
+
+    def sheet(self, title, function, *args, index=None, optional=False):
+        """
+        Sheet `title`, added at `index` (the end by default) and filled by
+        `function(ws, *args)`, which returns its worksheets. An `optional`
+        sheet is left out when one of its datasets is None.
+        """
+        return self._add(Node(title, SHEET, function, args, index=index, optional=optional))
+
+    def sheets(self):
+        return [node.name for node in self.nodes.values() if node.kind == SHEET]
+
+    def required(self, selected=None):
+        """Nodes the sheets titled in `selected` (all sheets by default) need, in declaration order."""
+        if selected is None:
+            return list(self.nodes.values())
+        pending = []
+        for title in selected:
+            node = self.nodes.get(title)
+            if node is None or node.kind != SHEET:
+                raise ValueError(f"Unknown sheet {title!r}; the workbook has: {', '.join(self.sheets())}")
+            pending.append(node)
+        needed = set()
+        while pending:
+            node = pending.pop()
+            if node.name not in needed:
+                needed.add(node.name)
+                pending.extend(node.dependencies())
+        return [node for node in self.nodes.values() if node.name in needed]
+
+    def run(self, wb, pipeline=None, metrics=None, selected=None):
+        """
+        Render the sheets titled in `selected` (all of them by default) and
+        what they depend on into `wb`; returns the worksheets of each sheet
+        rendered, keyed by title.
+        """
+        nodes = self.required(selected)
+        self._tasks = {}
+        self._values = {}
+        if pipeline is not None:
+            for node in nodes:
+                if node.kind == DATASET:
+                    # Declared before any node that reads them, so submitted first
+                    args = [self._tasks[arg.name] if isinstance(arg, Node) else arg for arg in node.args]
+                    if inspect.iscoroutinefunction(node.function):
+                        self._tasks[node.name] = pipeline.run(node.name, node.function, *args)
+                    else:
+                        self._tasks[node.name] = pipeline.submit(node.name, node.function, *args, lane=node.lane)
+
+        rendered = {}
+        for node in nodes:
+            if node.kind == DATASET:
+                continue
+            values = [self._resolve(arg, rendered, metrics) for arg in node.args]
+            if node.optional and any(value is None for arg, value in zip(node.args, values)
+                                     if isinstance(arg, Node) and arg.kind == DATASET):
+                continue
+            with self._measure(metrics, node.name, wb):
+                if node.kind == SHEET:
+                    ws = wb.add_sheet(node.name, node.index)
+                    rendered[node.name] = node.function(ws, *values)
+                else:
+                    self._values[node.name] = node.function(*values)
+        return rendered
+
+    def value(self, node):
+        """Value of `node` in the last run; None when the run did not need it, or for None."""
+        if node is None:
+            return None
+        if node.name not in self._values and node.name in self._tasks:
+            self._values[node.name] = self._tasks[node.name].result()
+        return self._values.get(node.name)
+
+    @staticmethod
+    def _measure(metrics, name, book=None):
+        return nullcontext() if metrics is None else metrics.measure(name, book)
+
+    def _resolve(self, arg, rendered, metrics):
+        if arg is RENDERED:
+            return dict(rendered)
+        if not isinstance(arg, Node):
+            return arg
+        if arg.kind == SHEET:
+            return rendered.get(arg.name)
+        if arg.name not in self._values:
+            # Only a dataset can be missing: steps ran before the nodes after them
+            with self._measure(metrics, arg.name):
+                task = self._tasks.get(arg.name)
+                if task is not None:
+                    self._values[arg.name] = task.result()
+                else:
+                    args = [self._resolve(value, rendered, None) for value in arg.args]
+                    value = arg.function(*args)
+                    self._values[arg.name] = asyncio.run(value) if inspect.isawaitable(value) else value
+        return self._values[arg.name]
@@ -0,0 +1,398 @@
+"""
+Schema model of the database, built from the drizzle/ migrations.
+
+The migrations listed in drizzle/meta/_journal.json (the MySQL files
+drizzle-kit generates and applies, in journal order) are parsed statement
+by statement into operations: create/drop table, add/modify/drop column,
+create/drop index, add/drop constraint. Replaying the operations gives the
+current tables with their columns, indexes and foreign keys, each tagged
+with the migration that introduced it. The other .sql files in drizzle/
+are hand-maintained (partly PostgreSQL) scripts that drizzle never applies,
+and are not read.
+
+Parsing is cached per migration: the cache file maps each migration to the
+SHA-256 of its contents and its parsed operations, so a run only parses the
+migrations added (or edited) since the last one; replaying is cheap.
+
+    schema = load_schema()                        # drizzle/ of this repo
+    schema.tables['time_series'].indexes          # {name: Index}
+    index_report(schema)                          # HOT_ACCESS_PATHS coverage
+
+MySQL indexes a foreign key's columns itself when no index starts with
+them, so foreign keys count towards coverage as implicit indexes.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+from .export_data import REPO_ROOT
+from .instrumentation import write_atomic
+
+DEFAULT_DRIZZLE_PATH = os.path.join(REPO_ROOT, 'drizzle')
+
+# Bumped whenever the operation format changes, which invalidates caches
+CACHE_VERSION = 1
+
+# Lookups the platform and the audit run against large tables, as
+# (table, columns, used by). An index serves a lookup when the lookup's
+# columns are its leading columns, in order: equality columns first, the
+# range or sort column last.
+HOT_ACCESS_PATHS = (
+    ('time_series', ('indicatorCode', 'date'), "Series by indicator over a date range (sector pages, KPIs)"),
+    ('time_series', ('indicatorCode', 'regimeTag', 'date'), "Aden/Sana'a series of an indicator (regime sheets)"),
+    ('time_series', ('sourceId',), "Observations per source (coverage matrix)"),
+    ('economic_events', ('eventDate',), "Event timeline by date"),
+    ('ingestion_runs', ('connectorName', 'startedAt'), "Latest runs of a connector (ETL Performance)"),
+    ('scheduler_run_history', ('jobName', 'startedAt'), "Latest runs of a job (ETL Performance)"),
+    ('research_publications', ('publicationYear',), "Research library by year"),
+    ('indicators', ('code',), "Indicator lookup by code"),
+)
+
+SchemaColumn = namedtuple('SchemaColumn', ['name', 'type', 'nullable', 'default', 'introduced_in'])
+Index = namedtuple('Index', ['name', 'columns', 'unique', 'introduced_in'])
+ForeignKey = namedtuple('ForeignKey', ['name', 'columns', 'ref_table', 'ref_columns', 'on_delete', 'introduced_in'])
+
+_STATEMENT_END = re.compile(r';[ \t]*(?:--> statement-breakpoint)?[ \t]*$', re.M)
+_NAME = r'`([^`]+)`'
+_NAMES = r'\(((?:`[^`]+`,?\s*)+)\)'
+# A column type, with its (possibly quoted) arguments: enum('a','b c'), decimal(20,6)
+_TYPE = r"(\w+(?:\((?:[^()']|'[^']*')*\))?(?: unsigned)?)"
+_DEFAULT = re.compile(r"\bDEFAULT ('(?:[^']|'')*'|\((?:[^()]|\([^()]*\))*\)|\S+)")
+
+_CREATE_TABLE = re.compile(rf'CREATE TABLE (?:IF NOT EXISTS )?{_NAME}\s*\((.*)\)', re.S)
+_COLUMN = re.compile(rf'{_NAME}\s+{_TYPE}(.*)', re.S)
+_PRIMARY_KEY = re.compile(rf'(?:CONSTRAINT {_NAME} )?PRIMARY KEY\s*{_NAMES}')
+_UNIQUE = re.compile(rf'(?:CONSTRAINT {_NAME} )?UNIQUE(?: (?:KEY|INDEX) {_NAME})?\s*{_NAMES}')
+_FOREIGN_KEY = re.compile(rf'(?:CONSTRAINT {_NAME} )?FOREIGN KEY\s*{_NAMES}\s*REFERENCES {_NAME}\s*{_NAMES}'
+                          r'(?: ON DELETE (\w+(?: \w+)?))?')
+_CREATE_INDEX = re.compile(rf'CREATE (UNIQUE )?INDEX {_NAME} ON {_NAME}\s*{_NAMES}')
+_DROP_INDEX = re.compile(rf'DROP INDEX {_NAME} ON {_NAME}')
+_DROP_TABLE = re.compile(rf'DROP TABLE (?:IF EXISTS )?{_NAME}')
+_RENAME_TABLE = re.compile(rf'RENAME TABLE {_NAME} TO {_NAME}')
+_ALTER_TABLE = re.compile(rf'ALTER TABLE {_NAME} (.*)', re.S)
+_ADD_COLUMN = re.compile(r'ADD (?:COLUMN )?(`.*)', re.S)
+_MODIFY_COLUMN = re.compile(r'MODIFY (?:COLUMN )?(`.*)', re.S)
+_DROP_COLUMN = re.compile(rf'DROP COLUMN {_NAME}')
+_RENAME_COLUMN = re.compile(rf'RENAME COLUMN {_NAME} TO {_NAME}')
+_DROP_CONSTRAINT = re.compile(rf'DROP (?:FOREIGN KEY|INDEX|CONSTRAINT) {_NAME}')
+_DROP_PRIMARY_KEY = re.compile(r'DROP PRIMARY KEY')
+
+
+def _names(text):
+    return re.findall(_NAME, text)
+
+
+def _column(definition):
+    match = _COLUMN.match(definition)
+    name, column_type, rest = match.groups()
+    default = _DEFAULT.search(rest)
+    return [name, column_type, 'NOT NULL' not in rest and 'PRIMARY KEY' not in rest,
+            default.group(1) if default else None]
+
+
+def _constraint(table, definition):
+    """The operation for a table constraint, or None."""
+    match = _FOREIGN_KEY.match(definition)
+    if match:
+        name, columns, ref_table, ref_columns, on_delete = match.groups()
+        return ['foreign_key', table, name or f"{table}_{'_'.join(_names(columns))}_fk", _names(columns),
+                ref_table, _names(ref_columns), (on_delete or 'no action').lower()]
+    match = _PRIMARY_KEY.match(definition)
+    if match:
+        return ['index', table, 'PRIMARY', _names(match.group(2)), True]
+    match = _UNIQUE.match(definition)
+    if match:
+        constraint, key, columns = match.groups()
+        columns = _names(columns)
+        return ['index', table, constraint or key or columns[0], columns, True]
+    return None
+
+
+def _split_definitions(body):
+    # Commas inside parentheses (types, key column lists) do not separate definitions
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(body):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(body[start:i].strip())
+            start = i + 1
+    parts.append(body[start:].strip())
+    return [part for part in parts if part]
+
+
+def parse_statement(statement):
+    """
+    Operations (JSON-serialisable lists) for one SQL statement. Statements
+    that do not change the schema model come back as ['unparsed', text].
+    """
+    match = _CREATE_TABLE.match(statement)
+    if match:
+        table, body = match.groups()
+        operations = [['create_table', table]]
+        for definition in _split_definitions(body):
+            if definition.startswith('`'):
+                column = _column(definition)
+                operations.append(['add_column', table] + column)
+                if 'PRIMARY KEY' in definition[len(column[0]) + 2:]:
+                    operations.append(['index', table, 'PRIMARY', [column[0]], True])
+            else:
+                operations.append(_constraint(table, definition) or ['unparsed', definition])
+        return operations
+
+    match = _CREATE_INDEX.match(statement)
+    if match:
+        unique, name, table, columns = match.groups()
+        return [['index', table, name, _names(columns), bool(unique)]]
+    match = _DROP_INDEX.match(statement)
+    if match:
+        name, table = match.groups()
+        return [['drop_index', table, name]]
+    match = _DROP_TABLE.match(statement)
+    if match:
+        return [['drop_table', match.group(1)]]
+    match = _RENAME_TABLE.match(statement)
+    if match:
+        return [['rename_table'] + list(match.groups())]
+
+    match = _ALTER_TABLE.match(statement)
+    if match:
+        table, action = match.groups()
+        if action.startswith('ADD CONSTRAINT') or action.startswith('ADD PRIMARY') or action.startswith('ADD UNIQUE'):
+            operation = _constraint(table, action[len('ADD '):])
+            if operation:
+                return [operation]
+        for pattern, kind in ((_MODIFY_COLUMN, 'modify_column'), (_ADD_COLUMN, 'add_column')):
+            column = pattern.match(action)
+            if column:
+                return [[kind, table] + _column(column.group(1))]
+        column = _DROP_COLUMN.match(action)
+        if column:
+            return [['drop_column', table, column.group(1)]]
+        column = _RENAME_COLUMN.match(action)
+        if column:
+            return [['rename_column', table] + list(column.groups())]
+        constraint = _DROP_CONSTRAINT.match(action)
+        if constraint:
+            return [['drop_constraint', table, constraint.group(1)]]
+        if _DROP_PRIMARY_KEY.match(action):
+            return [['drop_index', table, 'PRIMARY']]
+    return [['unparsed', ' '.join(statement.split())[:200]]]
+
+
+def parse_migration(text):
+    """All operations of one migration file, in order."""
+    operations = []
+    for statement in _STATEMENT_END.split(text):
+        statement = statement.replace('--> statement-breakpoint', '').strip()
+        # Drop leading comment lines
+        while statement.startswith('--'):
+            statement = statement.partition('\n')[2].strip()
+        if statement:
+            operations.extend(parse_statement(statement))
+    return operations
+
+
+class TableSchema:
+    __slots__ = ('name', 'columns', 'indexes', 'foreign_keys', 'introduced_in', 'changed_in')
+
+    def __init__(self, name, introduced_in):
+        self.name = name
+        self.columns = {}
+        self.indexes = {}
+        self.foreign_keys = {}
+        self.introduced_in = introduced_in
+        self.changed_in = introduced_in
+
+    @property
+    def primary_key(self):
+        index = self.indexes.get('PRIMARY')
+        return index.columns if index else ()
+
+    def covering_indexes(self):
+        """
+        Every index usable for lookups, as (name, columns): explicit indexes,
+        then the implicit index MySQL adds for a foreign key no index leads with.
+        """
+        indexes = [(index.name, index.columns) for index in self.indexes.values()]
+        for key in self.foreign_keys.values():
+            if not any(columns[:len(key.columns)] == key.columns for _, columns in indexes):
+                indexes.append((key.name, key.columns))
+        return indexes
+
+
+class Schema:
+    """Tables after replaying the migrations; see load_schema()."""
+
+    def __init__(self):
+        self.tables = {}
+        self.migrations = []
+        # Statements the model does not cover (data migrations, triggers, ...)
+        self.unparsed = []
+        # How many migrations were parsed, and how many came from the cache
+        self.parsed = 0
+        self.cached = 0
+
+    def apply(self, operations, migration):
+        self.migrations.append(migration)
+        for operation in operations:
+            kind, args = operation[0], operation[1:]
+            if kind == 'unparsed':
+                self.unparsed.append((migration, args[0]))
+                continue
+            if kind == 'create_table':
+                self.tables[args[0]] = TableSchema(args[0], migration)
+                continue
+            if kind == 'drop_table':
+                self.tables.pop(args[0], None)
+                continue
+            if kind == 'rename_table':
+                table = self.tables.pop(args[0], None)
+                if table is not None:
+                    table.name = args[1]
+                    self.tables[args[1]] = table
+                continue
+            table = self.tables.get(args[0])
+            if table is None:
+                self.unparsed.append((migration, f"{kind} on unknown table {args[0]}"))
+                continue
+            if migration != table.introduced_in:
+                table.changed_in = migration
+            self._apply(table, kind, args[1:], migration)
+
+    def _apply(self, table, kind, args, migration):
+        if kind == 'add_column':
+            name, column_type, nullable, default = args
+            table.columns[name] = SchemaColumn(name, column_type, nullable, default, migration)
+        elif kind == 'modify_column':
+            name, column_type, nullable, default = args
+            previous = table.columns.get(name)
+            table.columns[name] = SchemaColumn(name, column_type, nullable, default,
+                                               previous.introduced_in if previous else migration)
+        elif kind == 'drop_column':
+            table.columns.pop(args[0], None)
+            # MySQL drops the column from its indexes, and indexes left empty
+            for name, index in list(table.indexes.items()):
+                columns = tuple(column for column in index.columns if column != args[0])
+                if columns:
+                    table.indexes[name] = index._replace(columns=columns)
+                else:
+                    del table.indexes[name]
+        elif kind == 'rename_column':
+            old, new = args
+            column = table.columns.pop(old, None)
+            if column is not None:
+                table.columns[new] = column._replace(name=new)
+            for name, index in table.indexes.items():
+                table.indexes[name] = index._replace(columns=tuple(new if c == old else c for c in index.columns))
+        elif kind == 'index':
+            name, columns, unique = args
+            table.indexes[name] = Index(name, tuple(columns), unique, migration)
+        elif kind == 'drop_index':
+            table.indexes.pop(args[0], None)
+        elif kind == 'foreign_key':
+            name, columns, ref_table, ref_columns, on_delete = args
+            table.foreign_keys[name] = ForeignKey(name, tuple(columns), ref_table, tuple(ref_columns), on_delete,
+                                                  migration)
+        elif kind == 'drop_constraint':
+            # DROP FOREIGN KEY / DROP INDEX / DROP CONSTRAINT share one namespace here
+            table.foreign_keys.pop(args[0], None)
+            table.indexes.pop(args[0], None)
+
+    def referenced_by(self):
+        """{table: number of foreign keys pointing at it}."""
+        counts = {}
+        for table in self.tables.values():
+            for key in table.foreign_keys.values():
+                counts[key.ref_table] = counts.get(key.ref_table, 0) + 1
+        return counts
+
+
+def migration_files(directory):
+    """(tag, path) of every migration, in the order drizzle applies them."""
+    journal = os.path.join(directory, 'meta', '_journal.json')
+    if os.path.exists(journal):
+        with open(journal, encoding='utf-8') as f:
+            tags = [entry['tag'] for entry in sorted(json.load(f)['entries'], key=lambda entry: entry['idx'])]
+    else:
+        tags = sorted(name[:-4] for name in os.listdir(directory) if re.match(r'\d{4}_.*\.sql$', name))
+    return [(tag, os.path.join(directory, f"{tag}.sql")) for tag in tags]
+
+
+def _read_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except ValueError:
+        return {}
+    return cache.get('migrations', {}) if cache.get('version') == CACHE_VERSION else {}
+
+
+def load_schema(directory=DEFAULT_DRIZZLE_PATH, cache_path=None):
+    """
+    Replay the migrations of a drizzle directory into a Schema. With a
+    `cache_path`, migrations whose SHA-256 matches the cache are not parsed
+    again, and the cache is rewritten when anything changed.
+    """
+    cache = _read_cache(cache_path)
+    updated = {}
+    schema = Schema()
+    for tag, path in migration_files(directory):
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        entry = cache.get(tag)
+        if entry is not None and entry['sha256'] == digest:
+            schema.cached += 1
+        else:
+            entry = {'sha256': digest, 'operations': parse_migration(data.decode('utf-8'))}
+            schema.parsed += 1
+        updated[tag] = entry
+        schema.apply(entry['operations'], tag)
+    if cache_path and updated != cache:
+        write_atomic(cache_path, json.dumps({'version': CACHE_VERSION, 'migrations': updated}, separators=(',', ':')))
+    return schema
+
+
+def index_report(schema, access_paths=HOT_ACCESS_PATHS):
+    """
+    One dict per access path: table, columns, used_by, status ('covered',
+    'partial', 'missing' or 'no table'), the best index (the one leading
+    with most of the lookup's columns), the columns it covers, and a
+    suggested CREATE INDEX for paths that are not covered.
+    """
+    report = []
+    for table_name, columns, used_by in access_paths:
+        entry = {'table': table_name, 'columns': columns, 'used_by': used_by,
+                 'index': None, 'covered': (), 'suggestion': None}
+        table = schema.tables.get(table_name)
+        if table is None:
+            entry['status'] = 'no table'
+            report.append(entry)
+            continue
+        best, covered = None, 0
+        for name, index_columns in table.covering_indexes():
+            prefix = 0
+            while prefix < min(len(columns), len(index_columns)) and index_columns[prefix] == columns[prefix]:
+                prefix += 1
+            if prefix > covered:
+                best, covered = name, prefix
+        entry['index'], entry['covered'] = best, columns[:covered]
+        entry['status'] = 'covered' if covered == len(columns) else 'partial' if covered else 'missing'
+        if covered < len(columns):
+            name = f"{table_name}_{'_'.join(columns)}_idx"
+            entry['suggestion'] = (f"CREATE INDEX `{name}` ON `{table_name}` "
+                                   f"({','.join(f'`{column}`' for column in columns)});")
+        report.append(entry)
+    return report
@@ -0,0 +1,93 @@
+"""
+Row emission with automatic spill into continuation sheets.
+
+Excel caps a worksheet at 1,048,576 rows. Instead of letting openpyxl fail
+at save time, SpillingSheet tracks the next free row while rows are emitted
+and rolls over into "Sheet (2)", "Sheet (3)", ... as soon as the limit is
+reached. Each continuation sheet is prepared by the same callback as the
+first one, so titles, headers, widths and freeze panes carry over.
+"""
+
+import re
+
+EXCEL_MAX_ROWS = 1048576
+MAX_SHEET_TITLE = 31
+
+
+def continuation_title(title, part):
+    suffix = f" ({part})"
+    return title[:MAX_SHEET_TITLE - len(suffix)] + suffix
+
+
+def continued(description, part):
+    """Description of part `part` of a sheet, as listed in a contents index."""
+    return description if part == 1 else f"{description} (continued, part {part})"
+
+
+def table_name(title):
+    """Excel table name for a sheet title: "Data Sources (2)" -> "tblDataSources2"."""
+    return 'tbl' + ''.join(word[:1].upper() + word[1:] for word in re.findall(r'[A-Za-z0-9]+', title))
+
+
+class SpillingSheet:
+    """
+    Hands out (sheet, row) slots for data rows on a backend sheet
+    (see backends.py).
+
+    `prepare(ws)` writes the preamble (title, header row, widths, freeze
+    panes) of a sheet and returns the first data row. It is called for the
+    initial sheet and again for every continuation sheet.
+    """
+
+    def __init__(self, ws, prepare, max_rows=EXCEL_MAX_ROWS):
+        self.wb = ws.book
+        self.title = ws.title
+        self.prepare = prepare
+        self.max_rows = max_rows
+        self.sheets = [ws]
+        self.ws = ws
+        self.row = self._prepare(ws)
+        # First data row of each sheet, and the last of each sheet spilled from
+        self.starts = [self.row]
+        self.ends = []
+
+    def _prepare(self, ws):
+        row = self.prepare(ws)
+        if row > self.max_rows:
+            raise ValueError(f"Sheet preamble of '{self.title}' leaves no room for data rows")
+        return row
+
+    def _spill(self):
+        index = self.wb.index(self.ws) + 1
+        title = continuation_title(self.title, len(self.sheets) + 1)
+        ws = self.wb.add_sheet(title, index)
+        self.ends.append(self.row - 1)
+        self.sheets.append(ws)
+        self.ws = ws
+        self.row = self._prepare(ws)
+        self.starts.append(self.row)
+
+    def reserve(self, count):
+        """Make sure `count` consecutive rows fit on the current sheet."""
+        if self.row + count - 1 > self.max_rows:
+            self._spill()
+        return self.ws, self.row
+
+    def next_row(self):
+        ws, row = self.reserve(1)
+        self.row += 1
+        return ws, row
+
+    def rows(self, items):
+        for item in items:
+            ws, row = self.next_row()
+            yield ws, row, item
+
+    def spans(self):
+        """(sheet, first data row, last data row) of every sheet; the last is before the first when empty."""
+        return list(zip(self.sheets, self.starts, self.ends + [self.row - 1]))
+
+    def append(self, values, start_col=1, style=None):
+        ws, row = self.next_row()
+        ws.write_row(row, start_col, values, style)
+        return ws, row
@@ -0,0 +1,179 @@
+"""
+Declarative table sheets compiled into render plans.
+
+A SheetSpec describes a table sheet (preamble, columns, widths, per-column
+styles and status rules); compile_spec() resolves it once into a
+RenderPlan holding the finished CellStyle of every column, for odd and
+even rows and for every status variant. Writing a row is then one style
+list lookup and a write_row call; only columns with status rules look at
+their values.
+
+    plan = compile_spec(SheetSpec(
+        columns=[
+            Column("Table", 25),
+            Column("Records", 15, CellStyle(number_format='#,##0')),
+            Column("Status", 12, rules=(('✓', OK), (None, WARN))),
+        ],
+        start_col=2, header_row=4, header_style=HEADER, cell_style=CELL,
+        stripe='F5F5F5', title="Database Audit", title_style=TITLE, freeze='B',
+    ))
+    sheet = plan.render(ws, rows)    # a SpillingSheet, for summary rows
+
+Column `style` and the status patches are partial CellStyles: only their
+non-None fields are laid over the sheet's `cell_style`. `status` maps exact
+cell values to patches; `rules` are (test, patch) pairs where the test is
+a substring of the cell text, a callable on the cell value, or None to
+match anything, and the first match wins.
+"""
+
+from collections import namedtuple
+
+from openpyxl.utils import get_column_letter
+
+from .backends import CellStyle
+from .sheets import EXCEL_MAX_ROWS, SpillingSheet, table_name
+
+Column = namedtuple('Column', ['header', 'width', 'style', 'status', 'rules'], defaults=(None, None, None, None))
+
+SheetSpec = namedtuple('SheetSpec', [
+    'columns', 'start_col', 'header_row', 'header_style', 'header_height', 'cell_style', 'stripe',
+    'title', 'title_style', 'title_height', 'subtitle_style', 'freeze', 'gridlines', 'margin', 'sparse', 'table',
+], defaults=(1, 1, None, None, None, None, None, None, 35, None, None, True, 3, False, False))
+SheetSpec.__doc__ = """
+Layout of a table sheet. The title goes in row 2 and the subtitle (given
+at render time) in row 3 of `start_col`; the header row is `header_row`
+and data starts below it. `stripe` fills even data rows (status and rule
+fills take precedence); `freeze` is the first scrolling column (panes
+freeze above the data and left of it); `margin` is the width of the
+columns left of `start_col`; `sparse` leaves None values unwritten instead
+of writing styled blanks; `table` makes the header and data rows of every
+sheet rendered a native Excel table (with autofilter) named after the
+sheet. Without a `cell_style`, columns without a style of their own are
+written unstyled.
+"""
+
+
+def overlay(style, patch):
+    """`style` with the non-None fields of `patch` laid over it."""
+    if patch is None:
+        return style
+    if style is None:
+        return patch
+    changes = {field: value for field, value in patch._asdict().items() if value is not None}
+    return style._replace(**changes) if changes else style
+
+
+def _matcher(test):
+    if test is None:
+        return lambda value: True
+    if isinstance(test, str):
+        return lambda value: value is not None and test in str(value)
+    return test
+
+
+class RenderPlan:
+    """A compiled SheetSpec; see compile_spec()."""
+
+    def __init__(self, spec, row_styles, status, rules):
+        self.spec = spec
+        # (even-row styles, odd-row styles), one per column, indexed by row % 2
+        self.row_styles = row_styles
+        # [(column offset, {value: (even, odd)})]
+        self.status = status
+        # [(column offset, [(matcher, (even, odd))])]
+        self.rules = rules
+        self.headers = [column.header for column in spec.columns]
+
+    def prepare(self, ws, subtitle=None):
+        """Write the preamble and return the first data row."""
+        spec = self.spec
+        if not spec.gridlines:
+            ws.hide_gridlines()
+        if spec.margin is not None:
+            for col in range(1, spec.start_col):
+                ws.column_width(col, spec.margin)
+        if spec.title is not None:
+            ws.cell(2, spec.start_col, spec.title, spec.title_style)
+            ws.row_height(2, spec.title_height)
+        if subtitle is not None:
+            ws.cell(3, spec.start_col, subtitle, spec.subtitle_style)
+        ws.write_row(spec.header_row, spec.start_col, self.headers, spec.header_style)
+        if spec.header_height is not None:
+            ws.row_height(spec.header_row, spec.header_height)
+        for offset, column in enumerate(spec.columns):
+            if column.width is not None:
+                ws.column_width(spec.start_col + offset, column.width)
+        if spec.freeze is not None:
+            ws.freeze(f"{spec.freeze}{spec.header_row + 1}")
+        return spec.header_row + 1
+
+    def styles(self, row, values):
+        parity = row % 2
+        styles = self.row_styles[parity]
+        if not (self.status or self.rules):
+            return styles
+        styles = list(styles)
+        for offset, variants in self.status:
+            variant = variants.get(values[offset])
+            if variant is not None:
+                styles[offset] = variant[parity]
+        for offset, rules in self.rules:
+            value = values[offset]
+            for matches, variant in rules:
+                if matches(value):
+                    styles[offset] = variant[parity]
+                    break
+        return styles
+
+    def write(self, ws, row, values):
+        styles = self.styles(row, values)
+        if not self.spec.sparse:
+            ws.write_row(row, self.spec.start_col, values, styles)
+            return
+        for offset, value in enumerate(values):
+            if value is not None:
+                ws.cell(row, self.spec.start_col + offset, value, styles[offset])
+
+    def sheet(self, ws, subtitle=None, max_rows=EXCEL_MAX_ROWS):
+        """A SpillingSheet whose sheets (and continuation sheets) get this preamble."""
+        return SpillingSheet(ws, lambda ws: self.prepare(ws, subtitle), max_rows)
+
+    def render(self, ws, rows, subtitle=None):
+        """Write every row of `rows`, spilling as needed; returns the SpillingSheet."""
+        sheet = self.sheet(ws, subtitle)
+        write = self.write
+        for ws, row, values in sheet.rows(rows):
+            write(ws, row, values)
+        if self.spec.table:
+            self.tabulate(sheet)
+        return sheet
+
+    def tabulate(self, sheet):
+        """Make the rows of each of `sheet`'s sheets a table; sheets without data rows get none."""
+        spec = self.spec
+        last_col = get_column_letter(spec.start_col + len(self.headers) - 1)
+        for ws, first, last in sheet.spans():
+            if last >= first:
+                ws.table(f"{get_column_letter(spec.start_col)}{spec.header_row}:{last_col}{last}",
+                         table_name(ws.title), self.headers, spec.header_style)
+
+    def column_letter(self, header):
+        return get_column_letter(self.spec.start_col + self.headers.index(header))
+
+
+def compile_spec(spec):
+    stripe = CellStyle(fill=spec.stripe) if spec.stripe is not None else None
+    plain, status, rules = [], [], []
+    for offset, column in enumerate(spec.columns):
+        odd = overlay(spec.cell_style, column.style)
+        # Indexed by row % 2: even rows carry the stripe, which status fills override
+        base = (overlay(odd, stripe), odd)
+        plain.append(base)
+        if column.status:
+            status.append((offset, {value: (overlay(base[0], patch), overlay(base[1], patch))
+                                    for value, patch in column.status.items()}))
+        if column.rules:
+            rules.append((offset, [(_matcher(test), (overlay(base[0], patch), overlay(base[1], patch)))
+                                   for test, patch in column.rules]))
+    row_styles = ([pair[0] for pair in plain], [pair[1] for pair in plain])
+    return RenderPlan(spec, row_styles, status, rules)
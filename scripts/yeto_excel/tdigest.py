@@ -0,0 +1,98 @@
+"""
+Merging t-digest for streaming quantiles.
+
+A t-digest summarises a stream of values as about `compression / 2`
+weighted centroids. Centroids are small near the tails and large in the
+middle (the arcsine scale function), so p95/p99 stay accurate while memory
+is fixed no matter how many values were added. Digests of separate streams
+merge into the digest of their union, so per-job digests roll up into
+totals without another pass over the data.
+
+Values are buffered and folded into the centroids in vectorised numpy
+batches: sort, compute each point's position on the scale function, and
+sum the points that fall into the same unit of scale with reduceat.
+"""
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 200
+
+
+def _scale(q, compression):
+    # k1 scale function: arcsine, so clusters shrink towards q = 0 and q = 1
+    return compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+
+
+class TDigest:
+    __slots__ = ('compression', 'means', 'weights', 'count', 'min', 'max', '_buffer', '_buffer_size')
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffer_size = 10 * compression
+
+    def add(self, value):
+        self._buffer.append(value)
+        if len(self._buffer) >= self._buffer_size:
+            self._flush()
+
+    def update(self, values):
+        """Add an iterable or array of values."""
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values):
+            self._fold(values, np.ones(len(values)))
+
+    def merge(self, other):
+        """Fold another digest into this one."""
+        other._flush()
+        if other.count:
+            self._flush()
+            self._fold(other.means, other.weights, other.min, other.max)
+        return self
+
+    def _flush(self):
+        if self._buffer:
+            values = np.asarray(self._buffer, dtype=float)
+            self._buffer = []
+            self._fold(values, np.ones(len(values)))
+
+    def _fold(self, means, weights, low=None, high=None):
+        self.min = float(min(self.min, means.min() if low is None else low))
+        self.max = float(max(self.max, means.max() if high is None else high))
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # Each point joins the cluster of the scale unit its centre falls in
+        centre = (np.cumsum(weights) - weights / 2) / total
+        cluster = np.floor(_scale(centre, self.compression) - _scale(0.0, self.compression))
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+        self.count = total
+
+    def quantile(self, q):
+        """Estimated q-quantile (0 <= q <= 1); NaN for an empty digest."""
+        self._flush()
+        if not self.count:
+            return float('nan')
+        if len(self.means) == 1:
+            return float(self.means[0])
+        # Interpolate between centroid centres, pinned to the exact extremes
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, centres, self.count]
+        values = np.r_[self.min, self.means, self.max]
+        return float(np.interp(q * self.count, positions, values))
+
+    def quantiles(self, qs):
+        return [self.quantile(q) for q in qs]
+
+    def __len__(self):
+        self._flush()
+        return len(self.means)
@@ -0,0 +1,103 @@
+"""
+Anomaly detection: the cumulative-sum window statistics against a plain
+loop across group boundaries and short groups, jumps after a zero, and
+the plausible range of every unit.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+
+from yeto_excel import FLAG_JUMP, FLAG_RANGE, FLAG_ZSCORE, detect_anomalies, series_frame
+from yeto_excel.anomalies import UNIT_RANGES, trailing_stats
+
+
+def rows(code, values, unit='YER/USD', regime='aden_irg', start=date(2024, 1, 1)):
+    return [{'indicatorCode': code, 'regimeTag': regime, 'unit': unit,
+             'date': (start + timedelta(days=30 * i)).isoformat() + 'T00:00:00.000Z', 'value': str(value)}
+            for i, value in enumerate(values)]
+
+
+def loop_stats(values, window, inclusive=False):
+    # Mean, sample std and size of the window before (or up to) each value
+    result = []
+    for i in range(len(values)):
+        end = i + 1 if inclusive else i
+        before = values[max(0, end - window):end]
+        mean = sum(before) / len(before) if before else math.nan
+        std = (math.sqrt(sum((v - mean) ** 2 for v in before) / (len(before) - 1))
+               if len(before) > 1 else math.nan)
+        result.append((mean, std, len(before)))
+    return result
+
+
+def test_trailing_stats_match_a_loop():
+    rng = np.random.default_rng(5)
+    # Groups longer and shorter than the window, down to a single value
+    sizes = [30, 1, 2, 5, 13, 12, 3]
+    group = np.repeat(np.arange(len(sizes)), sizes)
+    value = rng.normal(1000, 50, len(group)) + group * 10_000
+    for inclusive in (False, True):
+        mean, std, size = trailing_stats(group, value, window=12, inclusive=inclusive)
+        expected = []
+        for g in range(len(sizes)):
+            expected += loop_stats(value[group == g].tolist(), 12, inclusive)
+        for i, (m, s, n) in enumerate(expected):
+            assert size[i] == n
+            assert np.isnan(mean[i]) if math.isnan(m) else math.isclose(mean[i], m, rel_tol=1e-9)
+            assert np.isnan(std[i]) if math.isnan(s) else math.isclose(std[i], s, rel_tol=1e-6, abs_tol=1e-6)
+
+
+def test_zscores_match_a_loop():
+    rng = np.random.default_rng(11)
+    long = rng.normal(100, 5, 25).round(2).tolist()
+    long[20] = 400.0
+    short = [10.0, 11.0, 9.0, 10.5, 60.0]    # fewer points than the window
+    tiny = [5.0, 500.0, 5.0]                 # below the minimum baseline
+    data = rows('A', long) + rows('B', short) + rows('C', tiny)
+    frame, result = detect_anomalies(series_frame(data))
+
+    expected = []
+    for values in (long, short, tiny):
+        for value, (mean, std, size) in zip(values, loop_stats(values, 12)):
+            expected.append((value - mean) / std if size >= 4 and std > 0 else math.nan)
+    zscore = result['zscore']
+    for got, want in zip(zscore.tolist(), expected):
+        assert math.isnan(got) if math.isnan(want) else math.isclose(got, want, rel_tol=1e-6)
+    # The first values of each group see nothing of the group before
+    starts = [0, len(long), len(long) + len(short)]
+    assert np.isnan(zscore[starts]).all()
+    flagged = np.flatnonzero(result['flags'] & FLAG_ZSCORE).tolist()
+    assert 20 in flagged and len(long) + 4 in flagged
+    assert not any(i >= len(long) + len(short) for i in flagged)
+
+
+def test_jumps_after_zero_and_across_groups():
+    data = rows('A', [0, 5, 5, 10, 4]) + rows('B', [100, 101])
+    frame, result = detect_anomalies(series_frame(data))
+    change, flags = result['change'], result['flags']
+    # No change against a zero, nor against the previous group's last value
+    assert np.isnan(change[[0, 1, 5]]).all()
+    assert change[[2, 3, 4]].tolist() == [0.0, 1.0, -0.6]
+    assert [bool(flag & FLAG_JUMP) for flag in flags.tolist()] == [False, False, False, True, True, False, False]
+    assert np.isnan(result['previous'][5])
+
+
+def test_range_flags_per_unit():
+    data = []
+    for number, (unit, (low, high)) in enumerate(UNIT_RANGES.items()):
+        # Inside, and just outside each finite bound; case and spacing of the label do not matter
+        values = [low if np.isfinite(low) else -1e9, high if np.isfinite(high) else 1e12]
+        values += [value for value in (low - 1, high + 1) if np.isfinite(value)]
+        data += rows(f"U{number}", values, unit=f" {unit.upper()} ")
+    data += rows('FREE', [-1e9, 1e12], unit='Tonnes')
+    frame, result = detect_anomalies(series_frame(data), jump_threshold=np.inf)
+    out_of_range = (result['flags'] & FLAG_RANGE) > 0
+    for number, (unit, (low, high)) in enumerate(UNIT_RANGES.items()):
+        flags = out_of_range[frame.group == frame.groups((f"U{number}", 'aden_irg'))]
+        finite = int(np.isfinite(low)) + int(np.isfinite(high))
+        assert flags.tolist() == [False, False] + [True] * finite, unit
+    assert not out_of_range[frame.group == frame.groups(('FREE', 'aden_irg'))].any()
@@ -0,0 +1,70 @@
+"""
+Reproducible saves and the content-addressed artifact store.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import os
+import time
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from yeto_excel import ArtifactStore, CellStyle, file_digest, open_workbook, pinned_time
+
+PINNED = datetime(2026, 1, 30, 12, 0, 0)
+
+
+def write_workbook(path, engine, timestamp, value="✓ Complete"):
+    book = open_workbook(path, engine, timestamp=timestamp)
+    ws = book.add_sheet("Data")
+    ws.write_row(1, 1, ["Indicator", "Status"], CellStyle(bold=True, fill='107040'))
+    for row in range(2, 202):
+        ws.write_row(row, 1, [f"CODE_{row}", value])
+    book.add_sheet("Overview", 0).hyperlink('A1', "Data", "Data")
+    book.close()
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'xlsxwriter'])
+def test_pinned_saves_are_byte_identical(tmp_path, engine):
+    if engine == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+    write_workbook(tmp_path / 'first.xlsx', engine, PINNED)
+    time.sleep(2.1)  # ZIP times have a 2-second resolution
+    write_workbook(tmp_path / 'second.xlsx', engine, PINNED)
+    assert (tmp_path / 'first.xlsx').read_bytes() == (tmp_path / 'second.xlsx').read_bytes()
+
+    with zipfile.ZipFile(tmp_path / 'first.xlsx') as archive:
+        assert {info.date_time for info in archive.infolist()} == {(2026, 1, 30, 12, 0, 0)}
+        assert b'2026-01-30T12:00:00Z' in archive.read('docProps/core.xml')
+
+
+def test_pinned_time_sources(monkeypatch):
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+    assert pinned_time() == datetime(1980, 1, 1)
+    assert pinned_time('2026-01-30T15:00:00+03:00') == PINNED
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1769774400')
+    assert pinned_time() == PINNED
+
+
+def test_store_keeps_one_object_per_content(tmp_path):
+    store = ArtifactStore(tmp_path / 'store')
+    output = str(tmp_path / 'audit.xlsx')
+
+    write_workbook(output, 'openpyxl', PINNED)
+    digest, object_path, created = store.put(output)
+    assert created and digest == file_digest(object_path)
+    assert os.path.basename(object_path) == f"{digest}.xlsx"
+
+    # Same content again: nothing new is stored
+    write_workbook(output, 'openpyxl', PINNED)
+    assert store.put(output) == (digest, object_path, False)
+
+    # The next save replaces the output path instead of writing through a link
+    write_workbook(output, 'openpyxl', PINNED, value="⚠ Pending")
+    assert file_digest(object_path) == digest
+    changed, _, created = store.put(output)
+    assert created and changed != digest
+    assert (tmp_path / 'store' / 'refs' / 'audit.xlsx').read_text() == changed + '\n'
+    assert len(list((tmp_path / 'store' / 'objects').rglob('*.xlsx'))) == 2
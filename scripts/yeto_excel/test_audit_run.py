@@ -0,0 +1,67 @@
+"""
+A run of generate-audit-excel.py on a small export, with the run history:
+the sheets written row by row (Source Coverage, ETL Performance, Trends)
+get native tables like the rendered ones, under unique non-blank headers
+in the English and the Arabic workbook.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import ENGINES
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'generate-audit-excel.py')
+
+EXPORT = {
+    'indicators': [{'code': 'FX_RATE', 'nameEn': "Exchange rate", 'sector': 'currency_fx'}],
+    # Publishers named like a fixed column, blank, and differing only in case
+    'sources': [
+        {'id': 1, 'publisher': "Sector"},
+        {'id': 2, 'publisher': "  "},
+        {'id': 3, 'publisher': "World Bank"},
+        {'id': 4, 'publisher': "world bank"},
+    ],
+    'time_series': [
+        {'indicatorCode': 'FX_RATE', 'sourceId': source_id, 'regimeTag': 'aden_irg', 'unit': 'YER/USD',
+         'date': f"2024-01-0{source_id}T00:00:00.000Z", 'value': 1500.0 + source_id}
+        for source_id in (1, 2, 3, 4)
+    ],
+    'ingestion_runs': [
+        {'id': 1, 'connectorName': 'cby', 'status': 'success', 'startedAt': '2024-01-01T00:00:00Z',
+         'completedAt': '2024-01-01T00:01:00Z', 'duration': 60000, 'recordsFetched': 10},
+    ],
+}
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_row_by_row_sheets_get_tables(tmp_path, engine):
+    if engine == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+    export = tmp_path / 'data-export.json'
+    export.write_text(json.dumps(EXPORT), encoding='utf-8')
+    output = tmp_path / 'audit.xlsx'
+    subprocess.run([sys.executable, SCRIPT, '--export', str(export), '--output', str(output), '--engine', engine,
+                    '--history', str(tmp_path / 'history.sqlite'), '--arabic'], check=True, capture_output=True)
+
+    for path, titles in ((output, ("Source Coverage", "ETL Performance", "Trends")),
+                         (tmp_path / 'audit_AR.xlsx', ("تغطية المصادر", "أداء ETL", "الاتجاهات"))):
+        wb = load_workbook(path)
+        for title in titles:
+            ws = wb[title]
+            [table] = ws.tables.values()
+            headers = [column.name for column in table.tableColumns]
+            assert all(header.strip() for header in headers), title
+            assert len({header.casefold() for header in headers}) == len(headers), title
+            # The header cells read the same as the table's column names
+            first = ws[table.ref.split(':')[0]]
+            assert [ws.cell(first.row, first.column + i).value for i in range(len(headers))] == headers
+    wb = load_workbook(output)
+    assert [column.name for column in wb["Source Coverage"].tables['tblSourceCoverage'].tableColumns][4:] == [
+        "Sector (#1)", "Source #2", "World Bank (#3)", "world bank (#4)"]
@@ -0,0 +1,178 @@
+"""
+Parity between the openpyxl and XlsxWriter workbook backends.
+
+The same content is written through each engine, read back with openpyxl
+and compared cell by cell.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import ENGINES, CellStyle, SpillingSheet, open_workbook
+
+pytest.importorskip('xlsxwriter')
+
+HEADER = CellStyle(font_name='Calibri', font_size=12, bold=True, font_color='FFFFFF', fill='107040',
+                   border='CCCCCC', h_align='center', v_align='center', wrap_text=True)
+CELL = CellStyle(font_name='Calibri', font_size=11, font_color='2D2D2D', border=True)
+AMOUNT = CELL._replace(number_format='#,##0.00', h_align='right')
+STRIPE = CELL._replace(fill='F5F5F5')
+
+ROWS = [(f"ROW-{i:03d}", i * 1.5, "✓ Complete" if i % 3 else "⚠ Pending", None) for i in range(1, 26)]
+
+
+def write_workbook(path, engine, streaming=None):
+    book = open_workbook(path, engine, streaming=streaming)
+
+    def prepare(ws):
+        ws.write_row(1, 1, ["ID", "Amount", "Status", "Notes"], HEADER)
+        ws.column_width('A', 14)
+        ws.column_width(3, 20)
+        ws.freeze('B2')
+        return 2
+
+    sheet = SpillingSheet(book.add_sheet("Data"), prepare, max_rows=11)
+    for ws, row, item in sheet.rows(ROWS):
+        ws.write_row(row, 1, item, [CELL, AMOUNT, STRIPE if row % 2 == 0 else CELL, CELL])
+    for part in sheet.sheets:
+        part.color_scale('B2:B11', 'FFFFFF', '107040', start_value=0)
+
+    # Written last, placed first
+    ws = book.add_sheet("Index", 0)
+    if not book.streaming or engine == 'xlsxwriter':
+        ws.merge('A1:C1', "Contents", CellStyle(font_name='Georgia', font_size=24, bold=True))
+        ws.row_height(1, 35)
+        for row, part in enumerate(sheet.sheets, start=3):
+            ws.hyperlink(f'A{row}', part.title, part.title, CellStyle(font_color='107040', underline='single'))
+    ws.hide_gridlines()
+    ws.fit_columns(30)
+    book.close()
+    return book
+
+
+def snapshot(path):
+    def rgb(color):
+        return color.rgb[-6:] if color is not None and isinstance(color.rgb, str) else None
+
+    wb = load_workbook(path)
+    sheets = {}
+    for ws in wb:
+        cells = {}
+        for row in ws.iter_rows():
+            for cell in row:
+                if cell.value is None and not cell.has_style:
+                    continue
+                link = None
+                if cell.hyperlink is not None:
+                    link = cell.hyperlink.location or cell.hyperlink.target.lstrip('#')
+                # Unset font name/size render as the workbook default (Calibri 11)
+                cells[cell.coordinate] = (
+                    cell.value, bool(cell.font.b), cell.font.name or 'Calibri', cell.font.sz or 11, rgb(cell.font.color),
+                    cell.font.u, rgb(cell.fill.fgColor) if cell.fill.fill_type else None,
+                    cell.border.left.style, rgb(cell.border.left.color), cell.number_format,
+                    cell.alignment.horizontal, bool(cell.alignment.wrap_text), link,
+                )
+        widths = {}
+        for key, dimension in ws.column_dimensions.items():
+            if dimension.customWidth:
+                for col in range(dimension.min, dimension.max + 1):
+                    # XlsxWriter stores the width including Excel's padding
+                    widths[col] = round(dimension.width)
+        sheets[ws.title] = {
+            'cells': cells,
+            'merged': sorted(str(r) for r in ws.merged_cells.ranges),
+            'freeze': ws.freeze_panes,
+            'widths': widths,
+            'gridlines': ws.sheet_view.showGridLines,
+            'color_scales': sorted(str(rng.sqref) for rng in ws.conditional_formatting),
+        }
+    return wb.sheetnames, sheets
+
+
+def test_engines_write_the_same_workbook(tmp_path):
+    write_workbook(tmp_path / 'openpyxl.xlsx', 'openpyxl')
+    write_workbook(tmp_path / 'xlsxwriter.xlsx', 'xlsxwriter')
+    names, expected = snapshot(tmp_path / 'openpyxl.xlsx')
+    other_names, actual = snapshot(tmp_path / 'xlsxwriter.xlsx')
+
+    assert names == other_names == ["Index", "Data", "Data (2)", "Data (3)"]
+    for title in names:
+        for key in ('cells', 'merged', 'freeze', 'gridlines', 'color_scales'):
+            assert expected[title][key] == actual[title][key], (title, key)
+        for col, width in expected[title]['widths'].items():
+            assert abs(actual[title]['widths'][col] - width) <= 1, (title, col)
+
+    index = expected["Index"]['cells']
+    assert index['A3'][-1] == "'Data'!A1" and index['A5'][-1] == "'Data (3)'!A1"
+    assert expected["Data"]['cells']['B2'][-4] == '#,##0.00'
+
+
+def test_streaming_engines_match_in_memory_output(tmp_path):
+    write_workbook(tmp_path / 'memory.xlsx', 'openpyxl')
+    write_workbook(tmp_path / 'streamed.xlsx', 'openpyxl', streaming=True)
+    _, expected = snapshot(tmp_path / 'memory.xlsx')
+    _, actual = snapshot(tmp_path / 'streamed.xlsx')
+    for title in ("Data", "Data (2)", "Data (3)"):
+        assert expected[title]['cells'] == actual[title]['cells']
+        assert expected[title]['freeze'] == actual[title]['freeze']
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_streaming_sheets_reject_rows_out_of_order(tmp_path, engine):
+    book = open_workbook(tmp_path / 'out.xlsx', engine, streaming=True)
+    ws = book.add_sheet("Data")
+    ws.write_row(5, 1, ["late"])
+    ws.write_row(6, 1, ["later"])
+    ws.cell(6, 3, "same row")
+    with pytest.raises(ValueError, match="Row 2 written after row 6"):
+        ws.cell(2, 1, "early")
+    if engine == 'xlsxwriter':
+        # A merge streams blank cells down to its last row
+        ws.merge('A8:B9', "merged")
+        with pytest.raises(ValueError, match="Row 8 written after row 9"):
+            ws.hyperlink('A8', "Data", "link")
+    book.close()
+    assert load_workbook(tmp_path / 'out.xlsx')["Data"]['C6'].value == "same row"
+
+
+def test_books_closing_at_once_keep_their_own_zip_settings(tmp_path):
+    # Each XlsxWriter book is repacked through its own writer
+    books = []
+    for number, compression in enumerate((0, 9, 0, 9)):
+        book = open_workbook(tmp_path / f"book{number}.xlsx", 'xlsxwriter', compression=compression)
+        book.add_sheet("Data").write_row(1, 1, ["text " * 200] * 20)
+        books.append((book, compression))
+    with ThreadPoolExecutor(len(books)) as executor:
+        list(executor.map(lambda item: item[0].close(), books))
+    for number, (_, compression) in enumerate(books):
+        with zipfile.ZipFile(tmp_path / f"book{number}.xlsx") as archive:
+            types = {info.compress_type for info in archive.infolist()}
+        assert types == ({zipfile.ZIP_STORED} if compression == 0 else {zipfile.ZIP_DEFLATED}), number
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_inserted_sheets_keep_their_filters_and_print_areas(tmp_path, streaming):
+    path = tmp_path / 'order.xlsx'
+    book = open_workbook(path, 'xlsxwriter', streaming=streaming)
+    data = book.add_sheet("Data")
+    data.write_row(1, 1, ["ID", "Name"])
+    data.write_row(2, 1, [1, "One"])
+    data.table('A1:B2', 'DataTable', ["ID", "Name"])
+    book.add_sheet("Index", 0).write('A1', "Contents")
+    book.add_sheet("Notes", 1).worksheet.print_area('A1:C3')
+    book.close()
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Index", "Notes", "Data"] and wb.active.title == "Index"
+    assert wb["Notes"].print_area == "'Notes'!$A$1:$C$3"
+    assert wb["Data"].auto_filter.ref == 'A1:B2' if streaming else list(wb["Data"].tables) == ['DataTable']
+
+
+def test_unknown_engine_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_workbook(tmp_path / 'out.xlsx', 'pandas')
@@ -0,0 +1,93 @@
+"""
+English and Arabic workbooks written in one pass: translated titles
+(continuation sheets included), headers and statuses, right-to-left
+mirror sheets, shared styles, an English workbook identical to one
+written on its own, and a translation memo bounded however many distinct
+values are written.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import CellStyle, MirroredBook, SpillingSheet, Translation, open_workbook, pinned_time
+from yeto_excel.bilingual import MEMO_SIZE
+
+HEADER = CellStyle(bold=True, font_color='FFFFFF', fill='107040')
+WORKING = CellStyle(fill='C8E6C9')
+
+ARABIC = {"Pages": "الصفحات", "Overview": "نظرة عامة", "Page ID": "معرف الصفحة", "Status": "الحالة",
+          "Working": "يعمل"}
+STAMP = pinned_time('2026-10-19T00:00:00')
+PATTERNS = [(r'Generated: (.+)', "تاريخ الإنشاء: {1}"), (r'(\w+) \((\d+) rows\)', "{1} ({2} صفوف)")]
+
+
+def write_workbook(book):
+    def prepare(ws):
+        ws.write_row(1, 1, ["Page ID", "Status"], HEADER)
+        ws.column_width('A', 12)
+        ws.freeze('A2')
+        return 2
+
+    overview = book.add_sheet("Overview")
+    overview.write('A1', "Generated: 2026-10-19")
+    sheet = SpillingSheet(book.add_sheet("Pages"), prepare, max_rows=6)
+    for ws, row, i in sheet.rows(range(8)):
+        ws.write_row(row, 1, [f"P-{i:02d}", "Working"], [None, WORKING])
+    for row, part in enumerate(sheet.sheets, 2):
+        overview.hyperlink(f'A{row}', part.title, part.title)
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'xlsxwriter'])
+def test_mirrored_workbooks(tmp_path, engine):
+    if engine == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+    alone = open_workbook(tmp_path / 'alone.xlsx', engine, timestamp=STAMP)
+    write_workbook(alone)
+    alone.close()
+    book = MirroredBook(open_workbook(tmp_path / 'en.xlsx', engine, timestamp=STAMP),
+                        open_workbook(tmp_path / 'ar.xlsx', engine, timestamp=STAMP), Translation(ARABIC, PATTERNS))
+    write_workbook(book)
+    book.close()
+
+    assert (tmp_path / 'en.xlsx').read_bytes() == (tmp_path / 'alone.xlsx').read_bytes()
+    english, arabic = load_workbook(tmp_path / 'en.xlsx'), load_workbook(tmp_path / 'ar.xlsx')
+    assert english.sheetnames == ["Overview", "Pages", "Pages (2)"]
+    assert arabic.sheetnames == ["نظرة عامة", "الصفحات", "الصفحات (2)"]
+    assert all(ws.sheet_view.rightToLeft for ws in arabic.worksheets)
+    assert not any(ws.sheet_view.rightToLeft for ws in english.worksheets)
+
+    overview = arabic["نظرة عامة"]
+    assert overview['A1'].value == "تاريخ الإنشاء: 2026-10-19"
+    assert [overview[f'A{row}'].value for row in (2, 3)] == ["الصفحات", "الصفحات (2)"]
+    link = overview['A3'].hyperlink
+    assert (link.location or link.target.lstrip('#')) == "'الصفحات (2)'!A1"
+
+    continued = arabic["الصفحات (2)"]
+    assert [continued['A1'].value, continued['B1'].value] == ["معرف الصفحة", "الحالة"]
+    assert [continued['A2'].value, continued['B2'].value] == ["P-05", "يعمل"]
+    assert continued['B2'].fill.fgColor.rgb == english["Pages (2)"]['B2'].fill.fgColor.rgb
+    assert continued['B2'].fill.fgColor.rgb.endswith('C8E6C9')
+    assert continued.freeze_panes == 'A2'
+
+
+def test_translation():
+    translate = Translation(ARABIC, PATTERNS)
+    assert translate("Working") == "يعمل"
+    assert translate("Pages (12 rows)") == "الصفحات (12 صفوف)"
+    assert translate("SRC-0001") == "SRC-0001"
+    assert translate(42) == 42 and translate(None) is None
+    assert translate.title("Pages (3)") == "الصفحات (3)"
+    assert translate.title("Unknown") == "Unknown"
+
+
+def test_translation_memory_is_bounded():
+    translate = Translation(ARABIC, PATTERNS)
+    # Data values pass through once each; the labels keep coming back
+    for number in range(3 * MEMO_SIZE):
+        assert translate(f"SRC-{number:05d}") == f"SRC-{number:05d}"
+        assert translate("Pages (12 rows)") == "الصفحات (12 صفوف)"
+    info = translate._match.cache_info()
+    assert info.currsize == MEMO_SIZE
+    assert info.hits >= 3 * MEMO_SIZE - 1
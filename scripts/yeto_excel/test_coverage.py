@@ -0,0 +1,92 @@
+"""
+Coverage matrix: a small hand-made export counted against a plain loop,
+the "unclassified" sector fallback, and sources sharing a publisher kept
+apart.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import json
+from collections import Counter
+
+from yeto_excel import Interner, build_coverage, load_export, table_rows
+
+EXPORT = {
+    'indicators': [
+        {'code': 'FX_RATE', 'nameEn': "Exchange rate", 'sector': 'currency_fx'},
+        {'code': 'CPI', 'nameEn': "Consumer prices", 'sector': 'prices'},
+        {'code': 'WHEAT', 'nameEn': None, 'sector': 'prices'},
+        {'code': 'AID', 'nameEn': "Aid flows", 'sector': None},
+    ],
+    'sources': [
+        {'id': 1, 'publisher': "Central Bank of Yemen"},
+        {'id': 2, 'publisher': "World Bank"},
+        # Aden and Sana'a branches both published as the Central Bank
+        {'id': 3, 'publisher': "Central Bank of Yemen"},
+        {'id': 4, 'publisher': None},
+    ],
+    'time_series': (
+        [{'indicatorCode': 'FX_RATE', 'sourceId': 1}] * 5 + [{'indicatorCode': 'FX_RATE', 'sourceId': 3}] * 4
+        + [{'indicatorCode': 'CPI', 'sourceId': 2}] * 3 + [{'indicatorCode': 'WHEAT', 'sourceId': 2}] * 2
+        + [{'indicatorCode': 'WHEAT', 'sourceId': 4}, {'indicatorCode': 'AID', 'sourceId': 2},
+           {'indicatorCode': 'NOT_LISTED', 'sourceId': 99}, {'indicatorCode': 'NOT_LISTED', 'sourceId': None}]
+    ),
+}
+
+
+def test_interner_keeps_first_seen_order():
+    interner = Interner()
+    assert [interner(label) for label in ('b', 'a', 'b', None, 'a')] == [0, 1, 0, 2, 1]
+    assert interner.labels == ['b', 'a', None] and len(interner) == 3
+
+
+def test_coverage_of_a_small_export(tmp_path):
+    path = tmp_path / 'data-export.json'
+    path.write_text(json.dumps(EXPORT), encoding='utf-8')
+    source = load_export(str(path))
+    matrix = build_coverage(table_rows(source, 'time_series'), table_rows(source, 'indicators'),
+                            table_rows(source, 'sources'))
+
+    # The same counts by a plain loop over the observations
+    sectors = {indicator['code']: indicator['sector'] or 'unclassified' for indicator in EXPORT['indicators']}
+    expected = Counter((sectors.get(point['indicatorCode'], 'unclassified'), point['indicatorCode'],
+                        point['sourceId']) for point in EXPORT['time_series'])
+    found = Counter()
+    for sector, code, name, counts in matrix.indicator_rows():
+        for source_id, count in counts.items():
+            found[(sector, code, matrix.sources.labels[source_id])] += count
+    assert found == expected
+    assert matrix.total == len(EXPORT['time_series'])
+
+    # Rows come sorted by sector then code; unnamed indicators show their code
+    rows = [(sector, code, name) for sector, code, name, _ in matrix.indicator_rows()]
+    assert rows == [
+        ('currency_fx', 'FX_RATE', "Exchange rate"), ('prices', 'CPI', "Consumer prices"), ('prices', 'WHEAT', 'WHEAT'),
+        ('unclassified', 'AID', "Aid flows"), ('unclassified', 'NOT_LISTED', 'NOT_LISTED'),
+    ]
+    sector_totals = {sector: sum(counts.values()) for sector, counts in matrix.sector_rows()}
+    assert sector_totals == {'currency_fx': 9, 'prices': 6, 'unclassified': 3}
+
+    # One column per source id, busiest first; a shared publisher is told apart by id
+    active = matrix.active_sources()
+    assert [matrix.sources.labels[source_id] for source_id in active] == [2, 1, 3, 4, 99, None]
+    assert matrix.source_labels(active) == [
+        "World Bank", "Central Bank of Yemen (#1)", "Central Bank of Yemen (#3)", "Source #4", "Source #99",
+        "No source",
+    ]
+    assert matrix.source_labels(active[:2]) == ["World Bank", "Central Bank of Yemen"]
+
+
+def test_source_labels_can_head_table_columns(tmp_path):
+    sources = [{'id': 1, 'publisher': "Observations"}, {'id': 2, 'publisher': " "}, {'id': 3, 'publisher': "OCHA"},
+               {'id': 4, 'publisher': "ocha"}, {'id': 5, 'publisher': "OCHA (#3)"}]
+    export = {'indicators': [], 'sources': sources,
+              'time_series': [{'indicatorCode': 'CPI', 'sourceId': source['id']} for source in sources]}
+    path = tmp_path / 'data-export.json'
+    path.write_text(json.dumps(export), encoding='utf-8')
+    source = load_export(str(path))
+    matrix = build_coverage(table_rows(source, 'time_series'), table_rows(source, 'indicators'),
+                            table_rows(source, 'sources'))
+    # Unique ignoring case, never blank, and apart from the fixed headers
+    assert matrix.source_labels(matrix.active_sources(), reserved=["Sector", "Observations"]) == [
+        "Observations (#1)", "Source #2", "OCHA (#3)", "ocha (#4)", "OCHA (#3) (2)"]
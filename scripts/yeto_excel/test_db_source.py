@@ -0,0 +1,85 @@
+"""
+DatabaseSource against a local SQLite stand-in.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+from yeto_excel import DatabaseSource, SpillingSheet, connect, open_workbook, series_frame, table_batches
+
+
+def make_database(path, points=25):
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE time_series (id INTEGER PRIMARY KEY, indicatorCode TEXT, regimeTag TEXT, "
+        "date TEXT, value TEXT, unit TEXT, sourceId INTEGER)"
+    )
+    connection.execute("CREATE TABLE research_publications (id INTEGER PRIMARY KEY, title TEXT)")
+    connection.executemany(
+        "INSERT INTO time_series VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(i, 'FX_RATE_PARALLEL', 'aden_irg', f"2024-01-{i:02d}T00:00:00.000Z", f"{1500 + i}.000000", 'YER/USD', 1)
+         for i in range(1, points + 1)],
+    )
+    connection.executemany("INSERT INTO research_publications VALUES (?, ?)", [(1, "Article IV"), (2, "Food Security Update")])
+    connection.commit()
+    connection.close()
+
+
+def test_batches_are_bounded_and_ordered(tmp_path):
+    make_database(tmp_path / 'yeto.db')
+    source = connect(f"sqlite:///{tmp_path / 'yeto.db'}", batch_size=10)
+    batches = list(source.batches('time_series'))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [row['id'] for batch in batches for row in batch] == list(range(1, 26))
+    assert batches[0][0]['indicatorCode'] == 'FX_RATE_PARALLEL'
+
+
+def test_rows_match_the_export_shape():
+    class Cursor:
+        # Mimics a MySQL driver returning native datetime/Decimal values
+        description = [('id',), ('date',), ('value',)]
+
+        def execute(self, query):
+            self.rows = [(1, datetime(2024, 1, 1, 5, 0, 0), Decimal('1866.510000'))]
+
+        def fetchmany(self, size):
+            rows, self.rows = self.rows[:size], self.rows[size:]
+            return rows
+
+        def close(self):
+            pass
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    rows = list(DatabaseSource(Connection()).rows('time_series'))
+    assert rows == [{'id': 1, 'date': '2024-01-01T05:00:00.000Z', 'value': '1866.510000'}]
+
+
+def test_streamed_rows_feed_the_series_frame(tmp_path):
+    make_database(tmp_path / 'yeto.db')
+    source = connect(f"sqlite:///{tmp_path / 'yeto.db'}", batch_size=4)
+    frame = series_frame(source.rows('time_series'), chunk_size=7)
+    assert len(frame) == 25
+    assert frame.value.max() == 1525.0
+
+
+def test_batches_stream_into_write_only_sheets(tmp_path):
+    make_database(tmp_path / 'yeto.db')
+    source = connect(f"sqlite:///{tmp_path / 'yeto.db'}", batch_size=10)
+    wb = open_workbook(tmp_path / 'raw.xlsx', streaming=True)
+
+    def prepare(ws):
+        ws.write_row(1, 1, ['id', 'value'])
+        return 2
+
+    sheet = SpillingSheet(wb.add_sheet("Time Series"), prepare, max_rows=11)
+    for batch in table_batches(source, 'time_series', 10):
+        for record in batch:
+            sheet.append([record['id'], record['value']])
+    assert [ws.title for ws in wb.sheets] == ["Time Series", "Time Series (2)", "Time Series (3)"]
+    wb.close()
@@ -0,0 +1,91 @@
+"""
+Event impact join: interval stabbing, before/after values and regime
+matching, and agreement with a brute-force scan on a large frame.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import numpy as np
+
+from yeto_excel import Interner, IntervalIndex, SeriesFrame, event_frame, event_impact, series_frame
+
+
+def observation(code, regime, date, value):
+    return {'indicatorCode': code, 'regimeTag': regime, 'date': f"{date}T00:00:00.000Z", 'value': value, 'unit': ''}
+
+
+def test_interval_stab():
+    index = IntervalIndex(np.array([10, 0, 5]), np.array([12, 20, 6]))
+    point, interval = index.stab(np.array([5, 11, 25]))
+    assert sorted(zip(point.tolist(), interval.tolist())) == [(0, 1), (0, 2), (1, 0), (1, 1)]
+    # Only intervals starting after the floor
+    point, interval = index.stab(np.array([11, 11]), np.array([-1, 5]))
+    assert sorted(zip(point.tolist(), interval.tolist())) == [(0, 0), (0, 1), (1, 0)]
+
+
+def test_before_and_after_values():
+    frame = series_frame([
+        observation('GDP', 'mixed', '2019-12-31', 100.0),
+        observation('GDP', 'mixed', '2020-06-30', 90.0),
+        observation('GDP', 'mixed', '2020-12-31', 80.0),
+        observation('FX_RATE', 'aden_irg', '2020-01-15', 600.0),
+        observation('FX_RATE', 'aden_irg', '2020-04-15', 750.0),
+        observation('FX_RATE', 'sanaa_defacto', '2020-01-15', 560.0),
+        observation('FX_RATE', 'sanaa_defacto', '2020-04-15', 570.0),
+        # Outside every window
+        observation('CPI', 'mixed', '2015-01-01', 1.0),
+    ])
+    events = event_frame([
+        {'id': 1, 'title': "Aden measure", 'eventDate': '2020-03-01T00:00:00.000Z', 'regimeTag': 'aden_irg'},
+        {'id': 2, 'title': "Nationwide shock", 'eventDate': '2020-02-01T00:00:00.000Z', 'regimeTag': 'mixed'},
+        {'id': 3, 'title': "Undated"},
+    ])
+    impact = event_impact(events, frame, before=90, after=365)
+
+    rows = [(events.records[e][1], impact.groups.labels[g], float(b), float(a))
+            for e, g, b, a in zip(impact.event, impact.group, impact.before, impact.after)]
+    assert rows == [
+        ("Nationwide shock", ('FX_RATE', 'aden_irg'), 600.0, 750.0),
+        ("Nationwide shock", ('FX_RATE', 'sanaa_defacto'), 560.0, 570.0),
+        ("Nationwide shock", ('GDP', 'mixed'), 100.0, 80.0),
+        # The Sana'a series is left out of an Aden event
+        ("Aden measure", ('FX_RATE', 'aden_irg'), 600.0, 750.0),
+        ("Aden measure", ('GDP', 'mixed'), 100.0, 80.0),
+    ]
+    assert impact.observations.tolist() == [2, 2, 3, 2, 3]
+    assert impact.change_pct[2] == -0.2
+    assert impact.events_with_data() == 2 and len(events) == 2
+
+
+def test_matches_brute_force_at_scale():
+    rng = np.random.default_rng(11)
+    groups = Interner()
+    for i in range(60):
+        groups((f"IND_{i}", ('aden_irg', 'sanaa_defacto', 'mixed')[i % 3]))
+    n = 150000
+    group = rng.integers(0, len(groups), n).astype(np.int32)
+    date = np.datetime64('2000-01-01') + rng.integers(0, 9000, n).astype('timedelta64[D]')
+    frame = SeriesFrame(groups, Interner(), group, np.zeros(n, dtype=np.int32), date, rng.normal(100, 10, n))
+    events = event_frame([
+        {'id': i, 'eventDate': str(np.datetime64('2000-01-01') + int(day)), 'regimeTag': ('aden_irg', 'mixed')[i % 2]}
+        for i, day in enumerate(rng.integers(0, 9000, 3000))
+    ])
+    impact = event_impact(events, frame, before=20, after=40)
+    assert len(impact) > 10000
+
+    frame = frame.sorted()
+    found = {(e, g): (b, a) for e, g, b, a in zip(impact.event.tolist(), impact.group.tolist(),
+                                                 impact.before.tolist(), impact.after.tolist())}
+    for e in range(0, len(events), 97):
+        day = events.date[e]
+        for g, (code, regime) in enumerate(groups.labels):
+            if events.records[e][4] == 'aden_irg' and regime == 'sanaa_defacto':
+                assert (e, g) not in found
+                continue
+            series = frame.group == g
+            before = series & (frame.date <= day) & (frame.date >= day - 20)
+            after = series & (frame.date > day) & (frame.date <= day + 40)
+            if before.any() and after.any():
+                assert found[e, g] == (frame.value[np.flatnonzero(before)[-1]], frame.value[np.flatnonzero(after)[-1]])
+            else:
+                assert (e, g) not in found
@@ -0,0 +1,156 @@
+"""
+Freshness SLA: cron expansion against a minute-by-minute check, missed
+and covered runs per job, source staleness from the registry cadence, and
+thousands of jobs over a year of history within a second.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from yeto_excel import (
+    SourceRecord, cadence_days, compile_cron, cron_instants, job_freshness, latest_activity, source_freshness,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0)    # a Monday
+
+
+def test_cron_matches_a_clock_check():
+    cases = {
+        '0 0 */2 * *': lambda t: t.hour == t.minute == 0 and t.day % 2 == 1,
+        '0 7 1,15 * *': lambda t: (t.hour, t.minute) == (7, 0) and t.day in (1, 15),
+        '30 4 * * 1-5': lambda t: (t.hour, t.minute) == (4, 30) and t.weekday() < 5,
+        '15 */6 * * *': lambda t: t.minute == 15 and t.hour % 6 == 0,
+        # Both day fields restricted: either one
+        '0 0 13 * fri': lambda t: t.hour == t.minute == 0 and (t.day == 13 or t.weekday() == 4),
+        '0 12 * feb-apr 7': lambda t: (t.hour, t.minute) == (12, 0) and t.month in (2, 3, 4) and t.weekday() == 6,
+        '@monthly': lambda t: t.hour == t.minute == 0 and t.day == 1,
+    }
+    start, end = datetime(2024, 1, 20), datetime(2024, 5, 10)
+    for expression, fires in cases.items():
+        expected, moment = [], start
+        while moment < end:
+            if fires(moment):
+                expected.append(moment)
+            moment += timedelta(minutes=15)
+        instants = cron_instants(compile_cron(expression), start, end)
+        assert instants.astype(datetime).tolist() == expected, expression
+    assert compile_cron('0 0 */2 * *') is compile_cron('0 0 */2 * *')
+
+    for expression in ('61 * * * *', '* * *', '0 0 * * 8', 'x 0 * * *', '0 0 5-2 * *'):
+        with pytest.raises(ValueError, match="Cron expression"):
+            compile_cron(expression)
+
+
+def test_missed_and_covered_runs():
+    jobs = [
+        {'jobName': 'daily', 'cronExpression': '0 6 * * *', 'isEnabled': True, 'createdAt': '2026-10-10T00:00:00Z'},
+        {'jobName': 'weekly', 'cronExpression': '0 10 * * 1', 'isEnabled': True, 'createdAt': '2026-10-01T00:00:00Z',
+         'nextRunAt': '2026-10-26T10:00:00.000Z'},
+        {'jobName': 'late', 'cronExpression': '0 10 * * 1', 'isEnabled': True, 'createdAt': '2026-10-01T00:00:00Z',
+         'lastRunAt': '2026-10-19T10:01:00.000Z', 'nextRunAt': '2026-10-19T09:00:00.000Z'},
+        {'jobName': 'new', 'cronExpression': '*/30 * * * *', 'isEnabled': True, 'createdAt': '2026-10-19T11:00:00Z'},
+        {'jobName': 'broken', 'cronExpression': 'every day', 'isEnabled': True},
+        {'jobName': 'off', 'cronExpression': 'every day', 'isEnabled': False},
+    ]
+    history = [{'jobName': 'daily', 'status': 'success', 'startedAt': f"2026-10-{day}T06:02:00.000Z"}
+               for day in range(10, 20) if day not in (14, 16)]
+    history += [
+        {'jobName': 'daily', 'status': 'failed', 'startedAt': '2026-10-12T06:40:00.000Z'},    # same slot twice
+        {'jobName': 'daily', 'status': 'skipped', 'startedAt': '2026-10-16T06:00:00.000Z'},
+        {'jobName': 'daily', 'status': 'success', 'startedAt': '2026-10-09T06:00:00.000Z'},   # before its creation
+        {'jobName': 'gone', 'status': 'success', 'startedAt': '2026-10-19T06:00:00.000Z'},
+    ]
+    history += [{'jobName': 'weekly', 'status': 'success', 'startedAt': f"2026-10-{day:02d}T10:30:00"}
+                for day in (5, 12, 19)]
+    source = {'scheduler_jobs': jobs, 'scheduler_run_history': history}
+
+    result = {job.name: job for job in job_freshness(source, NOW, batch_size=4)}
+    daily = result['daily']
+    # Oct 10-19: the 14th had no run and the 16th's was skipped
+    assert (daily.expected, daily.ran, daily.missed, daily.status) == (10, 8, 2, "⚠ Missed runs")
+    assert daily.last_run == datetime(2026, 10, 19, 6, 2)
+    assert daily.expected_next == datetime(2026, 10, 20, 6, 0)
+    assert (result['weekly'].expected, result['weekly'].ran, result['weekly'].status) == (3, 3, "✓ On schedule")
+    # Only its lastRunAt is known: the two Mondays before are missed
+    assert (result['late'].ran, result['late'].missed, result['late'].status) == (1, 2, "⚠ Missed runs")
+    assert (result['new'].expected, result['new'].status) == (1, "⚠ Never ran")
+    assert result['new'].expected_next == NOW
+    assert result['broken'].status == "⚠ Invalid cron" and result['off'].status == "Disabled"
+
+    # With every slot covered, the stale nextRunAt is what is left
+    source['scheduler_run_history'] += [{'jobName': 'late', 'status': 'success', 'startedAt': f"2026-10-{day}T10:00"}
+                                        for day in ('05', '12')]
+    late = next(job for job in job_freshness(source, NOW, batch_size=4) if job.name == 'late')
+    assert (late.missed, late.status) == (0, "⚠ Overdue")
+
+
+def test_source_staleness():
+    assert [cadence_days(text) for text in ("WEEKLY", "Quarterly/Annual", "BIENNIAL", "Ad hoc", None)] == \
+        [7, 92, 731, None, None]
+    source = {
+        'sources': [
+            {'id': 1, 'publisher': "CBY Aden", 'url': 'https://www.cby-ye.com/'},
+            {'id': 2, 'publisher': "FEWS NET", 'url': None},
+            {'id': 3, 'publisher': "Occasional studies", 'url': 'https://studies.example.org'},
+            {'id': 4, 'publisher': "Empty", 'url': None},
+            {'id': 5, 'publisher': "Forecasts", 'url': 'https://www.cby-ye.com/outlook'},
+        ],
+        'indicators': [{'code': 'FOOD_PRICE', 'frequency': 'monthly'}, {'code': 'GDP', 'frequency': 'annual'}],
+        'time_series': [
+            {'sourceId': 1, 'indicatorCode': 'FX', 'date': '2026-10-12T00:00:00.000Z'},
+            {'sourceId': 1, 'indicatorCode': 'FX', 'date': '2026-09-01T00:00:00.000Z'},
+            {'sourceId': 2, 'indicatorCode': 'GDP', 'date': '2026-08-01T00:00:00.000Z'},
+            {'sourceId': 2, 'indicatorCode': 'FOOD_PRICE', 'date': '2026-07-01T00:00:00.000Z'},
+            {'sourceId': 3, 'indicatorCode': 'NOTE', 'date': '2020-01-01'},
+            {'sourceId': 5, 'indicatorCode': 'FX', 'date': '2026-12-31T00:00:00.000Z'},
+        ],
+    }
+    records = [
+        SourceRecord('registry', 'SRC-1', "Central Bank of Yemen", "CBY", 'cby-ye.com', 'T1', 'Weekly', 'WEEKLY'),
+        SourceRecord('master', 'SRC-1', "Central Bank of Yemen", "CBY", 'cby-ye.com', 'T1', 'Daily', None, 3),
+        SourceRecord('registry', 'SRC-9', "Studies", None, 'studies.example.org', 'T3', 'Ad hoc', 'IRREGULAR'),
+    ]
+    result = {fresh.source_id: fresh for fresh in source_freshness(source, records, NOW, batch_size=2)}
+    # Weekly plus three days' lag, 7 days old
+    assert (result[1].cadence, result[1].allowed_days, result[1].age_days, result[1].status) == \
+        ('WEEKLY', 10, 7, "✓ Fresh")
+    # The monthly series it feeds set its pace
+    assert (result[2].cadence, result[2].latest, result[2].status) == ('monthly', '2026-08-01', "⚠ Stale")
+    assert (result[3].allowed_days, result[3].status) == (None, "No SLA")
+    assert (result[4].latest, result[4].status) == (None, "⚠ No data")
+    # Dated after the reference time: flagged, not fresh
+    assert (result[5].age_days, result[5].status) == (-73, "⚠ Future date")
+
+    # The reference of a pinned run: the latest run or observation
+    assert latest_activity(source, batch_size=2) == datetime(2026, 12, 31)
+    source['scheduler_run_history'] = [{'jobName': 'daily', 'startedAt': '2027-01-02T06:00:00.000Z'}]
+    assert latest_activity(source, batch_size=2) == datetime(2027, 1, 2, 6, 0)
+    assert latest_activity({}, batch_size=2) is None
+
+
+def test_thousands_of_jobs_within_a_second():
+    rng = np.random.default_rng(3)
+    shared = ['0 0 */2 * *', '0 7 1,15 * *', '0 10 * * 1', '0 */6 * * *', '30 4 * * 1-5', '@daily', '0 * * * *']
+    jobs, history = [], []
+    start = np.datetime64(NOW, 'm') - np.timedelta64(365, 'D')
+    for number in range(3000):
+        expression = shared[number % len(shared)] if number % 4 else f"{number % 60} {number % 24} * * *"
+        jobs.append({'jobName': f"job{number}", 'cronExpression': expression, 'isEnabled': True})
+        # A run about every other day, at random minutes, over the year
+        minutes = np.sort(rng.integers(0, 365 * 1440, 180))
+        history += [{'jobName': f"job{number}", 'status': 'success', 'startedAt': str(start + minute)}
+                    for minute in minutes.tolist()]
+    source = {'scheduler_jobs': jobs, 'scheduler_run_history': history}
+
+    started = time.perf_counter()
+    result = job_freshness(source, NOW, batch_size=10_000)
+    elapsed = time.perf_counter() - started
+    assert len(result) == 3000 and elapsed < 1.0
+    assert all(job.ran + job.missed == job.expected and job.ran <= 180 for job in result)
+    hourly = next(job for job in result if job.cron == '0 * * * *')
+    assert hourly.expected == 365 * 24 and hourly.status == "⚠ Missed runs"
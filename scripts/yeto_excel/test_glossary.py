@@ -0,0 +1,60 @@
+"""
+Glossary tagging: Arabic and English normalisation, term forms, the
+automaton against a brute-force scan, and coverage counts per term.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import random
+
+from yeto_excel import GlossaryTerm, TermAutomaton, glossary_coverage, normalize_words, term_forms
+
+GLOSSARY = [
+    {'id': 1, 'termEn': "Central Bank of Yemen", 'termAr': "البنك المركزي اليمني", 'category': 'monetary_policy'},
+    {'id': 2, 'termEn': "Exchange Rate", 'termAr': "سعر الصرف", 'category': 'monetary_policy'},
+    {'id': 3, 'termEn': "Parallel Market Rate", 'termAr': "سعر السوق الموازي", 'category': 'monetary_policy'},
+    {'id': 4, 'termEn': "Gross Domestic Product (GDP)", 'termAr': "الناتج المحلي الإجمالي", 'category': 'economy'},
+    {'id': 5, 'termEn': "Fuel Subsidy", 'termAr': "دعم الوقود", 'category': 'energy'},
+]
+
+
+def test_normalised_words():
+    assert normalize_words("Central-Bank of YEMEN's") == ['central', 'bank', 'of', 'yemen', 's']
+    # Harakat, tatweel and the alef/taa marbuta spellings; the article and its prepositions
+    assert normalize_words("التقرير السنوي للبنك المركزيّ") == ['تقرير', 'سنوي', 'بنك', 'مركزي']
+    assert normalize_words("إيرادات النفـــط") == normalize_words("ايرادات نفط")
+    assert normalize_words("الدولية") == normalize_words("دوليه")
+    assert normalize_words(None) == []
+    term = GlossaryTerm(4, "Gross Domestic Product (GDP)", "الناتج المحلي (ن م)", 'economy')
+    assert term_forms(term) == [('gross', 'domestic', 'product'), ('gdp',), ('ناتج', 'محلي'), ('ن', 'م')]
+
+
+def test_automaton_matches_brute_force():
+    rng = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(40)]
+    patterns = {tuple(rng.choices(vocabulary, k=rng.randint(1, 4))) for _ in range(300)}
+    patterns = sorted(patterns)
+    automaton = TermAutomaton((words, index) for index, words in enumerate(patterns))
+    for _ in range(50):
+        text = rng.choices(vocabulary, k=400)
+        expected = [index for index, words in enumerate(patterns)
+                    for end in range(len(words), len(text) + 1) if tuple(text[end - len(words):end]) == words]
+        assert sorted(automaton.matches(text)) == sorted(expected)
+
+
+def test_coverage_counts():
+    publications = [
+        {'title': "Central Bank of Yemen Annual Report", 'titleAr': "التقرير السنوي للبنك المركزي اليمني"},
+        {'title': "Exchange rate and the parallel market rate", 'abstract': "GDP fell as the exchange rate slid"},
+        {'title': "Yemen Economic Update", 'abstract': None},
+    ]
+    documents = [{'title': "Fuel subsidies", 'titleAr': "دعم الوقود في عدن"}]
+    coverage = glossary_coverage(GLOSSARY, iter(publications), iter(documents))
+    assert (coverage.scanned, coverage.tagged, coverage.covered) == (4, 3, 5)
+    counts = {term.term_id: (documents, mentions) for term, documents, mentions in coverage.rows()}
+    # Both titles of the first report; "exchange rate" in a title and an abstract
+    assert counts == {1: (1, 2), 2: (1, 2), 3: (1, 1), 4: (1, 1), 5: (1, 1)}
+    assert [term.term_id for term, _, _ in coverage.rows()][:2] == [1, 2]
+
+    coverage = glossary_coverage(GLOSSARY, publications[2:])
+    assert coverage.tagged == 0 and len(coverage.uncovered()) == len(GLOSSARY)
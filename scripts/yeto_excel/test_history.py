@@ -0,0 +1,98 @@
+"""
+Run history: latest/previous values and window aggregates against the
+samples written, that windows are range scans of the clustered key, and
+that a failed run neither counts nor leaves samples behind.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import sqlite3
+
+from yeto_excel import RunHistory
+from yeto_excel.history import DAY
+
+HOUR = 3600
+NOW = 1_790_000_000.0
+
+
+def hourly_runs(history, hours):
+    # One run an hour up to NOW; 'rows' grows by 10 a run, 'every_other' skips odd hours
+    for hour in range(hours, -1, -1):
+        history.start_run('audit', NOW - hour * HOUR)
+        history.record({'rows': 1000 - 10 * hour, 'every_other': hour if hour % 2 == 0 else None})
+        history.finish_run(finished=NOW - hour * HOUR + 60)
+
+
+def test_trends_match_the_samples(tmp_path):
+    history = RunHistory(str(tmp_path / 'history.sqlite'))
+    hourly_runs(history, 40 * 24)
+    trends = {trend['metric']: trend for trend in history.trends()}
+
+    rows = trends['rows']
+    assert (rows['latest'], rows['previous'], rows['latest_at']) == (1000, 990, NOW)
+    # (start, end] windows: 24 hourly runs in a day, 720 in 30 days
+    for label, hours in (('24h', 24), ('7d', 7 * 24), ('30d', 30 * 24)):
+        values = [1000 - 10 * hour for hour in range(hours)]
+        assert rows[label] == (hours, sum(values) / hours, min(values), max(values)), label
+
+    every_other = trends['every_other']
+    assert (every_other['latest'], every_other['previous']) == (0, 2)
+    assert every_other['24h'] == (12, 11.0, 0, 22)
+
+    # Earlier ends see only what was recorded by then
+    earlier = {trend['metric']: trend for trend in history.trends(until=NOW - 5 * HOUR)}
+    assert (earlier['rows']['latest'], earlier['rows']['previous']) == (950, 940)
+    assert (earlier['every_other']['latest'], earlier['every_other']['previous']) == (6, 8)
+    assert history.trends(until=NOW - 41 * DAY) == []
+    assert history.run_count() == (40 * 24 + 1, NOW - 40 * 24 * HOUR)
+    history.close()
+
+
+def test_windows_are_range_scans(tmp_path):
+    history = RunHistory(str(tmp_path / 'history.sqlite'))
+    history.start_run('audit', NOW)
+    history.record({'rows': 1})
+    for query in ("SELECT recorded, value FROM samples WHERE metric_id = ? AND recorded <= ? "
+                  "ORDER BY recorded DESC LIMIT ?",
+                  "SELECT COUNT(*), AVG(value), MIN(value), MAX(value) FROM samples "
+                  "WHERE metric_id = ? AND recorded > ? AND recorded <= ?"):
+        plan = " ".join(row[-1] for row in history.connection.execute(f"EXPLAIN QUERY PLAN {query}", (1, NOW, NOW)))
+        assert "SEARCH samples USING PRIMARY KEY (metric_id=? AND recorded" in plan, plan
+    history.close()
+
+
+def test_failed_run_leaves_no_samples(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    history = RunHistory(path)
+    hourly_runs(history, 2)
+    history.start_run('audit', NOW + HOUR, output='broken.xlsx')
+    history.record({'rows': 5, 'only_in_failed_run': 1})
+    # The current run counts while it is running
+    assert history.run_count() == (4, NOW - 2 * HOUR)
+    assert {trend['metric']: trend['latest'] for trend in history.trends()}['rows'] == 5
+    history.finish_run(failed=True)
+    history.close()
+
+    history = RunHistory(path)
+    history.start_run('audit', NOW + 2 * HOUR)
+    trends = {trend['metric']: trend for trend in history.trends()}
+    assert trends['rows']['latest'] == 1000 and 'only_in_failed_run' not in trends
+    assert history.run_count() == (4, NOW - 2 * HOUR)
+    statuses = history.connection.execute("SELECT status FROM runs ORDER BY started").fetchall()
+    assert [status for status, in statuses] == ['finished'] * 3 + ['failed', 'running']
+    history.close()
+
+
+def test_files_without_run_status_are_upgraded(tmp_path):
+    path = str(tmp_path / 'history.sqlite')
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE runs (id INTEGER PRIMARY KEY, started REAL NOT NULL, script TEXT NOT NULL, details TEXT);
+        INSERT INTO runs (started, script) VALUES (1000.0, 'audit');
+    """)
+    connection.commit()
+    connection.close()
+    history = RunHistory(path)
+    history.start_run('audit', 2000.0)
+    assert history.run_count() == (2, 1000.0)
+    history.close()
@@ -0,0 +1,120 @@
+"""
+Instrumentation: two fake steps measured and read back from the JSON
+report and the Prometheus textfile, with the per-step counter deltas,
+label escaping and the atomic replace of the written files.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import json
+import os
+import re
+
+from yeto_excel import Instrumentation
+from yeto_excel.instrumentation import METRIC_PREFIX, METRICS, label_value
+
+SAMPLE = re.compile(r'^(?P<name>[a-z_]+)\{(?P<labels>.*)\} (?P<value>\S+)$')
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+class FakeSheet:
+    def __init__(self):
+        self.rows = self.cells = self.styled_cells = 0
+
+    def write(self, rows, columns, styled):
+        self.rows += rows
+        self.cells += rows * columns
+        self.styled_cells += styled
+
+
+class FakeBook:
+    def __init__(self):
+        self.sheets = []
+
+    def add_sheet(self):
+        self.sheets.append(FakeSheet())
+        return self.sheets[-1]
+
+
+def unescape(value):
+    return re.sub(r'\\(.)', lambda match: '\n' if match.group(1) == 'n' else match.group(1), value)
+
+
+def parse_textfile(text):
+    """{metric: {(script, step): value}} and the metric types of a textfile."""
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            types[name] = kind
+        elif not line.startswith('#'):
+            match = SAMPLE.match(line)
+            assert match, line
+            labels = {key: unescape(value) for key, value in LABEL.findall(match['labels'])}
+            samples.setdefault(match['name'], {})[(labels['script'], labels.get('step'))] = float(match['value'])
+    return samples, types
+
+
+def run_two_steps():
+    metrics = Instrumentation('audit "nightly"')
+    book = FakeBook()
+    first = book.add_sheet()
+    # Counted before the first step: not part of any delta
+    first.write(rows=3, columns=2, styled=1)
+    with metrics.measure('Load "time_series"', book):
+        first.write(rows=10, columns=4, styled=40)
+    with metrics.measure('Sheet\\Overview\nfinal', book):
+        book.add_sheet().write(rows=5, columns=3, styled=0)
+        first.write(rows=1, columns=4, styled=4)
+    return metrics
+
+
+def test_json_report(tmp_path):
+    metrics = run_two_steps()
+    path = tmp_path / 'report.json'
+    path.write_text("stale")
+    metrics.write_json(str(path), output='audit.xlsx')
+    report = json.loads(path.read_text(encoding='utf-8'))
+
+    assert report['script'] == 'audit "nightly"' and report['output'] == 'audit.xlsx'
+    steps = report['steps']
+    assert [step['name'] for step in steps] == ['Load "time_series"', 'Sheet\\Overview\nfinal']
+    assert [(step['rows'], step['cells'], step['styled_cells']) for step in steps] == [(10, 40, 40), (6, 19, 4)]
+    assert all(step['wall_seconds'] >= 0 and step['peak_memory_bytes'] >= 0 for step in steps)
+    assert report['totals']['rows'] == 16 and report['totals']['cells'] == 59
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_prometheus_textfile(tmp_path, monkeypatch):
+    metrics = run_two_steps()
+    path = tmp_path / 'textfile' / 'yeto.prom'
+    replaced = []
+    real_replace = os.replace
+
+    def replace(source, target):
+        # The new file is complete before it takes the place of the old one
+        with open(source, encoding='utf-8') as handle:
+            replaced.append((source, target, handle.read()))
+        real_replace(source, target)
+
+    monkeypatch.setattr(os, 'replace', replace)
+    metrics.write_prometheus(str(path))
+    text = path.read_text(encoding='utf-8')
+    [(source, target, written)] = replaced
+    assert target == str(path) and source != target and written == text
+    assert os.listdir(path.parent) == ['yeto.prom']
+
+    samples, types = parse_textfile(text)
+    script = 'audit "nightly"'
+    steps = ['Load "time_series"', 'Sheet\\Overview\nfinal']
+    names = [f"{METRIC_PREFIX}_{metric}" for _, metric, _ in METRICS]
+    assert set(samples) == set(names) | {f"{METRIC_PREFIX}_run_timestamp_seconds"}
+    assert set(types.values()) == {'gauge'} and set(types) == set(samples)
+    for name in names:
+        assert list(samples[name]) == [(script, step) for step in steps]
+    assert [samples[f"{METRIC_PREFIX}_step_cells"][(script, step)] for step in steps] == [40, 19]
+    assert [samples[f"{METRIC_PREFIX}_step_styled_cells"][(script, step)] for step in steps] == [40, 4]
+    assert samples[f"{METRIC_PREFIX}_run_timestamp_seconds"][(script, None)] == round(metrics.started.timestamp())
+    # Quotes, backslashes and newlines never end a label value or a line
+    assert label_value('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+    assert len(text.splitlines()) == len(METRICS) * (2 + len(steps)) + 3
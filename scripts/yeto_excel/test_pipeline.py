@@ -0,0 +1,132 @@
+"""
+Producer/consumer pipeline: I/O overlapping the caller's work, bounded
+read-ahead, lanes in submission order, errors raised where the result is
+used, and streams closed on early exit.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from yeto_excel import Pipeline, connect, series_frame, table_batches, table_rows
+
+
+def numbers(count, log):
+    try:
+        for i in range(count):
+            log.append(i)
+            yield i
+    finally:
+        log.append(('closed', threading.current_thread().name))
+
+
+def test_producers_overlap_the_caller():
+    def fetch(value):
+        time.sleep(0.2)
+        return value
+
+    async def double(value):
+        await asyncio.sleep(0.2)
+        return value * 2
+
+    started = time.perf_counter()
+    with Pipeline() as pipeline:
+        first = pipeline.submit("first", fetch, 1)
+        second = pipeline.submit("second", fetch, 2)
+        doubled = pipeline.run("doubled", double, second)
+        time.sleep(0.2)    # the caller renders meanwhile
+        assert (first.result(), doubled.result()) == (1, 4)
+    assert time.perf_counter() - started < 0.55
+
+
+def test_lane_runs_in_submission_order():
+    order = []
+
+    def step(name, *_):
+        time.sleep(0.02)
+        order.append((name, threading.current_thread().name))
+        return name
+
+    with Pipeline() as pipeline:
+        first = pipeline.submit("a", step, 'a', lane='db')
+        # Waits for `first`, but keeps its place on the lane
+        second = pipeline.submit("b", step, 'b', first, lane='db')
+        third = pipeline.submit("c", step, 'c', lane='db')
+        assert [task.result() for task in (first, second, third)] == ['a', 'b', 'c']
+    assert [name for name, _ in order] == ['a', 'b', 'c']
+    assert len({thread for _, thread in order}) == 1
+
+
+def test_stream_reads_a_bounded_number_ahead():
+    log = []
+    with Pipeline() as pipeline:
+        stream = pipeline.stream("numbers", numbers(1000, log), maxsize=3, lane='db')
+        time.sleep(0.2)
+        # Three queued, one read and waiting for room
+        assert len(log) == 4
+        for i, value in enumerate(stream):
+            assert value == i
+            if value == 10:
+                break
+        time.sleep(0.1)
+        # Closed on the lane's thread once the consumer stopped
+        assert log[-1] == ('closed', 'pipeline-db_0')
+        assert len(log) < 20
+        # The lane is free again
+        assert pipeline.submit("after", len, "abc", lane='db').result(timeout=5) == 3
+
+
+def test_errors_reach_the_consumers():
+    def fail():
+        raise ValueError("connection lost")
+
+    def broken(count):
+        yield from range(count)
+        raise OSError("cursor reset")
+
+    with Pipeline() as pipeline:
+        failed = pipeline.submit("failed", fail)
+        dependent = pipeline.submit("dependent", len, failed)
+        unrelated = pipeline.submit("unrelated", len, "abc")
+        with pytest.raises(ValueError, match="connection lost"):
+            dependent.result()
+        assert unrelated.result() == 3
+
+        received = []
+        with pytest.raises(OSError, match="cursor reset"):
+            for item in pipeline.stream("broken", broken(5)):
+                received.append(item)
+        assert received == [0, 1, 2, 3, 4]
+
+
+def test_exit_cancels_open_streams():
+    log = []
+    with pytest.raises(RuntimeError):
+        with Pipeline() as pipeline:
+            pipeline.stream("numbers", numbers(10 ** 6, log), maxsize=2)
+            time.sleep(0.1)
+            raise RuntimeError("sheet failed")
+    assert log[-1][0] == 'closed' and len(log) < 10
+
+
+def test_database_reads_on_a_lane(tmp_path):
+    # The connection is opened here and used from the lane's thread
+    connection = sqlite3.connect(tmp_path / 'yeto.db')
+    connection.execute("CREATE TABLE time_series (id INTEGER PRIMARY KEY, indicatorCode TEXT, regimeTag TEXT, "
+                       "date TEXT, value TEXT, unit TEXT)")
+    connection.executemany("INSERT INTO time_series VALUES (?, ?, ?, ?, ?, ?)",
+                           [(i, 'FX_RATE_PARALLEL', 'aden_irg', f"2024-01-{i:02d}T00:00:00.000Z", str(1500 + i), 'YER/USD')
+                            for i in range(1, 26)])
+    connection.commit()
+    connection.close()
+    source = connect(f"sqlite:///{tmp_path / 'yeto.db'}", batch_size=7)
+    with Pipeline() as pipeline:
+        frame = pipeline.submit("frame", series_frame, table_rows(source, 'time_series'), lane='source')
+        batches = pipeline.stream("batches", table_batches(source, 'time_series', 7), lane='source')
+        rows = [row for batch in batches for row in batch]
+        assert len(frame.result()) == len(rows) > 7
@@ -0,0 +1,82 @@
+"""
+Pivot summaries and native tables: crosstab counts and totals, and tables
+whose header cells match their column names through both backends,
+streamed or not, including one table per continuation sheet. XlsxWriter's
+constant-memory sheets keep only the filter of their first table.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import CellStyle, Column, SheetSpec, compile_spec, open_workbook, pivot_counts, table_name, write_pivot
+
+HEADER = CellStyle(bold=True, fill='107040')
+CELL = CellStyle(border=True)
+BOLD = CELL._replace(bold=True)
+
+HEADERS = ["Page", "Section", "Status"]
+ITEMS = [("home", "Public", "Working"), ("login", "Auth", "Issue"), ("about", "Public", "Working"),
+         ("admin", "Admin", "Working"), ("faq", "Public", "Issue")]
+SPEC = SheetSpec([Column("Page", 12), Column("Section", 12), Column("Status", 12)],
+                 start_col=2, header_row=3, header_style=HEADER, cell_style=CELL, title="Pages", table=True)
+
+
+def test_pivot_counts_and_totals():
+    pivot = pivot_counts(ITEMS, HEADERS, "Section", "Status", ("Working", "Missing"))
+    assert pivot.headers() == ["Section", "Working", "Missing", "Issue", "Total"]
+    assert list(pivot.rows()) == [["Public", 2, 0, 1, 3], ["Auth", 0, 0, 1, 1], ["Admin", 1, 0, 0, 1]]
+    assert pivot.totals() == ["Total", 3, 0, 2, 5]
+    assert pivot.height == 5
+
+    empty = pivot_counts([], HEADERS, "Section", "Status")
+    assert len(empty) == 0 and empty.totals() == ["Total", 0]
+
+
+def test_table_name():
+    assert table_name("Sources (2) Type by Tier") == "tblSources2TypeByTier"
+    assert table_name("API Endpoints") == "tblAPIEndpoints"
+
+
+def tables(ws):
+    """(ref, column names, header cell values) of each table on an openpyxl sheet."""
+    found = []
+    for table in ws.tables.values():
+        header = ws[table.ref][0]
+        found.append((table.ref, [column.name for column in table.tableColumns], [cell.value for cell in header]))
+    return sorted(found)
+
+
+@pytest.mark.parametrize('engine, streaming', [('openpyxl', False), ('openpyxl', True),
+                                               ('xlsxwriter', False), ('xlsxwriter', True)])
+def test_tables_through_backends(tmp_path, engine, streaming):
+    if engine == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+    path = tmp_path / 'tables.xlsx'
+    book = open_workbook(path, engine, streaming=streaming)
+    plan = compile_spec(SPEC)
+    sheet = plan.sheet(book.add_sheet("Pages"), max_rows=6)
+    for ws, row, values in sheet.rows(ITEMS):
+        plan.write(ws, row, values)
+    plan.tabulate(sheet)
+    pivot = pivot_counts(ITEMS, HEADERS, "Section", "Status")
+    write_pivot(book.add_sheet("Summary"), 2, 2, pivot, HEADER, CELL, BOLD)
+    book.close()
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Pages", "Pages (2)", "Summary"]
+    if engine == 'xlsxwriter' and streaming:
+        assert [len(ws.tables) for ws in wb.worksheets] == [0, 0, 0]
+        assert [ws.auto_filter.ref for ws in wb.worksheets] == ["B3:D6", "B3:D5", "B2:E5"]
+        return
+    first, second, summary = wb.worksheets
+    assert tables(first) == [("B3:D6", HEADERS, HEADERS)]
+    assert tables(second) == [("B3:D5", HEADERS, HEADERS)]
+    assert first.tables["tblPages"].autoFilter.ref == "B3:D6"
+    assert "tblPages2" in second.tables
+    assert tables(summary) == [("B2:E5", pivot.headers(), pivot.headers())]
+    assert "tblSummarySectionByStatus" in summary.tables
+    # The totals row stays outside the table
+    assert [cell.value for cell in summary[6][1:5]] == ["Total", 3, 2, 5]
+    assert summary['B6'].font.b
@@ -0,0 +1,124 @@
+"""
+Source URL probe against a local stub server: states, redirects, the HEAD
+fallback, conditional requests backed by the cache file, connection reuse
+and the per-host rate limit.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from yeto_excel import probe_urls
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, headers=(), body=b''):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        if self.path == '/data':
+            if self.headers.get('If-None-Match') == self.server.etag:
+                return self.reply(304)
+            return self.reply(200, [('ETag', self.server.etag), ('Last-Modified', 'Mon, 19 Oct 2026 08:00:00 GMT')])
+        if self.path == '/moved':
+            return self.reply(301, [('Location', '/data')])
+        if self.path == '/gone':
+            return self.reply(404)
+        if self.path == '/get-only':
+            return self.reply(405)
+        return self.reply(200)
+
+    def do_GET(self):
+        if self.path == '/get-only':
+            # Chunked, so the client has to read the body to reuse the connection
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b'5\r\nhello\r\n0\r\n\r\n')
+            return
+        self.do_HEAD()
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    httpd.connections = 0
+    httpd.etag = '"v1"'
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_states_and_connection_reuse(server):
+    httpd, base = server
+    dead = f"http://127.0.0.1:{closed_port()}/"
+    urls = [f"{base}/data", f"{base}/moved", f"{base}/gone", f"{base}/get-only", f"{base}/plain", dead, 'ftp://x/y']
+    report = probe_urls(urls + [f"{base}/data"], per_host_rate=None, timeout=5)
+    results = report.results
+    assert list(results) == urls
+
+    assert results[f"{base}/data"].state == 'ok' and results[f"{base}/data"].etag == '"v1"'
+    assert results[f"{base}/data"].changed is None
+    assert results[f"{base}/moved"].final_url == f"{base}/data" and results[f"{base}/moved"].status == 200
+    assert (results[f"{base}/gone"].state, results[f"{base}/gone"].status) == ('http error', 404)
+    assert (results[f"{base}/get-only"].state, results[f"{base}/get-only"].status) == ('ok', 200)
+    assert results[dead].state == 'unreachable' and results[dead].error
+    assert results['ftp://x/y'].state == 'invalid'
+    assert report.count('ok') == 4 and report.count('unreachable', 'invalid') == 2
+
+    # Seven requests (a redirect and a HEAD fallback) to the stub on one connection
+    assert report.requests == 7 and httpd.connections == 1
+
+
+def test_conditional_requests_detect_changes(server, tmp_path):
+    httpd, base = server
+    cache = tmp_path / 'probe-cache.json'
+    url = f"{base}/data"
+    assert probe_urls([url], cache).results[url].changed is None
+
+    second = probe_urls([url], cache).results[url]
+    assert (second.state, second.status, second.changed) == ('not modified', 304, False)
+    assert second.etag == '"v1"'
+
+    httpd.etag = '"v2"'
+    third = probe_urls([url], cache).results[url]
+    assert (third.state, third.changed, third.etag) == ('ok', True, '"v2"')
+    assert probe_urls([url], cache).results[url].state == 'not modified'
+
+
+def test_per_host_rate_limit(server):
+    httpd, base = server
+    urls = [f"{base}/plain?{i}" for i in range(6)]
+    started = time.perf_counter()
+    report = probe_urls(urls, per_host_rate=20)
+    # Five intervals of 1/20 s between six requests
+    assert time.perf_counter() - started >= 0.25
+    assert report.count('ok') == 6 and httpd.connections == 1
@@ -0,0 +1,68 @@
+"""
+Entity resolution of the source registry files: normalisation, linking of
+truncated and re-spelled names, and blocking that keeps comparisons far
+below all pairs.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import random
+
+from yeto_excel import SourceRecord, institution_key, reconcile_sources, url_host
+
+
+def record(origin, record_id, name, institution=None, url=None):
+    return SourceRecord(origin, record_id, name, institution, url, None)
+
+
+def groups(resolution):
+    return sorted(sorted(r.record_id for r in cluster.records) for cluster in resolution.clusters)
+
+
+def test_normalised_keys():
+    assert institution_key("Central Bank of Yemen") == institution_key("CBY") == 'cby'
+    assert institution_key("International Monetary Fund (IMF)") == 'imf'
+    assert institution_key("nan") is None
+    assert url_host("https://www.worldbank.org/en/country/yemen") == 'worldbank.org'
+    assert url_host("data.imf.org") == 'data.imf.org'
+    assert url_host("N/A") is None
+
+
+def test_truncated_and_respelled_names_link():
+    records = [
+        record('registry', 'SRC-0026', "International Finance Corporation (IFC) Investments", "IFC", "https://ifc.org"),
+        record('new', 'SRC-026', "International Finance Corporation (IFC) Inves", "IFC", "ifc.org"),
+        record('master', 'SRC-0031', "International Finance Corporation (IFC) Country Reports", "IFC",
+               "https://www.ifc.org"),
+        record('registry', 'SRC-0040', "Rethinking Yemen's Economy (RYE)", "DeepRoot"),
+        record('master', 'SRC-0040', "Rethinking Yemen's Economy Initiative (RYE)", "DeepRoot"),
+        # Same publisher and host, different product
+        record('registry', 'SRC-0050', "World Bank Global Economic Monitor (GEM)", "World Bank",
+               "https://worldbank.org"),
+        record('master', 'SRC-0051', "World Bank Yemen Economic Monitor", "World Bank", "https://worldbank.org"),
+    ]
+    resolution = reconcile_sources(records)
+    assert groups(resolution) == [
+        ['SRC-0026', 'SRC-026'], ['SRC-0031'], ['SRC-0040', 'SRC-0040'], ['SRC-0050'], ['SRC-0051'],
+    ]
+    ifc = resolution.clusters[0]
+    # The preferred file's untruncated name is canonical
+    assert ifc.canonical.origin == 'registry' and ifc.canonical.name.endswith("Investments")
+    assert 0.85 <= ifc.confidence <= 1
+    assert resolution.origins == ['registry', 'master', 'new']
+
+
+def test_blocking_at_scale():
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(400)]
+    records = []
+    for i in range(7000):
+        name = f"Source {i} " + " ".join(rng.sample(words, 3))
+        host = f"https://data{i % 2000}.org"
+        for origin in ('registry', 'master', 'new'):
+            spelling = name[:45] if origin == 'new' else name
+            records.append(record(origin, f"SRC-{i:05d}", spelling, f"Institution {i % 300}", host))
+    resolution = reconcile_sources(records)
+    assert len(resolution.records) == 21000 and len(resolution.clusters) == 7000
+    assert all(len(cluster.records) == 3 for cluster in resolution.clusters)
+    assert resolution.compared < resolution.all_pairs / 500
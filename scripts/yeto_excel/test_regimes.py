@@ -0,0 +1,93 @@
+"""
+Dual-regime alignment: the as-of join's carry-forward limit, runs of
+calendar points with a regime missing, the rolling spread volatility
+against a plain loop, and a base code reported both by tag and by suffix.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import math
+
+import numpy as np
+
+from yeto_excel import ADEN, SANAA, align_regimes, asof_join, series_frame
+from yeto_excel.regimes import ADEN_ONLY, NEITHER, SANAA_ONLY, default_tolerance
+
+D = np.datetime64
+
+
+def observations(code, regime, values):
+    return [{'indicatorCode': code, 'regimeTag': regime, 'unit': 'YER/USD', 'date': f"{day}T00:00:00.000Z",
+             'value': value} for day, value in values.items()]
+
+
+def test_asof_join_carries_forward_within_tolerance():
+    dates = np.array(['2024-01-01', '2024-01-11', '2024-01-21', '2024-03-01'], dtype='datetime64[D]')
+    values = np.array([1.0, 2.0, 3.0, 4.0])
+    # Spacing 10, 10, 40 days: the median is 10, so a value is carried 20 days
+    tolerance = default_tolerance(dates)
+    assert tolerance == np.timedelta64(20, 'D')
+    calendar = np.array(['2023-12-31', '2024-01-01', '2024-01-15', '2024-02-10', '2024-02-11',
+                         '2024-03-01', '2024-03-21', '2024-03-22'], dtype='datetime64[D]')
+    joined = asof_join(calendar, dates, values, tolerance)
+    expected = [math.nan, 1.0, 2.0, 3.0, math.nan, 4.0, 4.0, math.nan]
+    assert [math.isnan(a) if math.isnan(b) else a == b for a, b in zip(joined.tolist(), expected)] == [True] * 8
+    assert default_tolerance(dates[:1]) == np.timedelta64(0, 'D')
+
+
+def test_gap_runs_and_volatility():
+    days = [str(D('2024-01-01') + 7 * i) for i in range(40)]
+    rng = np.random.default_rng(2)
+    aden = dict(zip(days, (1000 + rng.normal(0, 20, 40)).round(1).tolist()))
+    sanaa = dict(zip(days, (530 + rng.normal(0, 5, 40)).round(1).tolist()))
+    # Sana'a silent for six weeks; two days only one side reports, within tolerance
+    for day in days[10:16]:
+        del sanaa[day]
+    aden['2024-08-01'] = 1100.0
+    sanaa['2024-10-09'] = 540.0
+    rows = observations('FX_RATE', ADEN, aden) + observations('FX_RATE', SANAA, sanaa)
+    [alignment] = align_regimes(series_frame(rows))
+
+    assert alignment.indicator == 'FX_RATE' and not alignment.merged
+    # Weekly series: each value is carried at most two weeks
+    gaps = alignment.gaps()
+    assert [(state, str(start), str(end), points) for state, start, end, points in gaps] == [
+        (ADEN_ONLY, days[12], days[15], 4)]
+    assert alignment.summary()['aden_only'] == 4
+
+    # The volatility over the last 30 points where both report
+    both = alignment.state == 0
+    spread = alignment.spread[both].tolist()
+    for i, got in enumerate(alignment.volatility[both].tolist()):
+        window = spread[max(0, i - 29):i + 1]
+        mean = sum(window) / len(window)
+        expected = math.sqrt(sum((s - mean) ** 2 for s in window) / (len(window) - 1)) if len(window) > 1 else None
+        assert math.isnan(got) if expected is None else math.isclose(got, expected, rel_tol=1e-6)
+    assert np.isnan(alignment.volatility[~both]).all()
+
+
+def test_gap_states():
+    aden = {'2024-01-01': 1.0, '2024-02-01': 1.0, '2024-03-01': 1.0, '2024-09-01': 1.0}
+    sanaa = {'2024-01-01': 2.0, '2024-02-01': 2.0, '2024-05-01': 2.0, '2024-06-01': 2.0}
+    rows = observations('CPI', ADEN, aden) + observations('CPI', SANAA, sanaa)
+    [alignment] = align_regimes(series_frame(rows), tolerance=np.timedelta64(40, 'D'))
+    # March is carried 29 days for Sana'a, May and September are too far from the other side
+    states = [(state, str(start), str(end), points) for state, start, end, points in alignment.gaps()]
+    assert states == [(SANAA_ONLY, '2024-05-01', '2024-06-01', 2), (ADEN_ONLY, '2024-09-01', '2024-09-01', 1)]
+    assert alignment.state.tolist() == [0, 0, 0, SANAA_ONLY, SANAA_ONLY, ADEN_ONLY]
+    # Every calendar date is someone's observation, so one point is never missing from both
+    assert NEITHER not in alignment.state
+
+
+def test_tag_and_suffix_of_one_regime_are_merged():
+    aden_tagged = {'2024-01-01': 100.0, '2024-03-01': 120.0}
+    aden_suffixed = {'2024-02-01': 110.0, '2024-03-01': 130.0}
+    sanaa = {'2024-01-01': 50.0, '2024-02-01': 50.0, '2024-03-01': 50.0}
+    rows = (observations('FX_RATE', ADEN, aden_tagged) + observations('FX_RATE_ADEN', 'unknown', aden_suffixed)
+            + observations('FX_RATE', SANAA, sanaa))
+    [alignment] = align_regimes(series_frame(rows))
+    # Neither series replaces the other: both months are kept, the shared date averaged
+    assert alignment.aden.tolist() == [100.0, 110.0, 125.0]
+    assert alignment.spread.tolist() == [50.0, 60.0, 75.0]
+    assert sorted(alignment.merged) == [ADEN]
+    assert sorted(alignment.merged[ADEN]) == [('FX_RATE', ADEN), ('FX_RATE_ADEN', 'unknown')]
@@ -0,0 +1,67 @@
+"""
+Columnar row store: rows read back as written, shared labels, numeric
+columns, rendering identical to plain lists, and the memory it saves.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import tracemalloc
+
+import pytest
+
+from yeto_excel import CellStyle, Column, RowStore, SheetSpec, compile_spec, open_workbook, pivot_counts
+
+HEADERS = ["ID", "Sector", "Status", "Count"]
+ROWS = [[f"SEC-{i:03d}", ("Banking", "Trade", "Energy")[i % 3], "Issue" if i % 7 == 0 else "Working", i * 10]
+        for i in range(1, 31)]
+
+
+def test_rows_read_back():
+    store = RowStore(HEADERS, ROWS, numeric={"Count": 'q'})
+    assert len(store) == 30
+    assert list(store[0]) == ROWS[0] and store[-1] == ROWS[-1]
+    assert store[6][2] == "Issue" and store[6][3] == 70 and len(store[6]) == 4
+    assert [list(record) for record in store] == ROWS
+    assert store.column("Sector")[:4] == ["Trade", "Energy", "Banking", "Trade"]
+    # Repeated values are held once
+    assert store.interners[1].labels == ["Trade", "Energy", "Banking"]
+    assert store.columns[3][1].typecode == 'q'
+    unique = RowStore(HEADERS, ROWS, numeric={"Count": 'q'}, unique=("ID",))
+    assert unique.columns[0] == (None, [row[0] for row in ROWS]) and unique[5] == ROWS[5]
+    with pytest.raises(IndexError):
+        store[30]
+    with pytest.raises(ValueError):
+        store.append(["SEC-999", "Trade"])
+
+
+def test_pivot_counts_from_store():
+    store = RowStore(HEADERS, ROWS, numeric={"Count": 'q'})
+    assert list(pivot_counts(store, HEADERS, "Sector", "Status").rows()) == \
+        list(pivot_counts(ROWS, HEADERS, "Sector", "Status").rows())
+
+
+def test_renders_like_lists(tmp_path):
+    plan = compile_spec(SheetSpec([Column(header, status={"Issue": CellStyle(fill='FFCDD2')} if header == "Status"
+                                          else None) for header in HEADERS], cell_style=CellStyle(border=True)))
+    for name, rows in (('lists', ROWS), ('store', RowStore(HEADERS, ROWS, numeric={"Count": 'q'}))):
+        book = open_workbook(tmp_path / f'{name}.xlsx', timestamp=None)
+        plan.render(book.add_sheet("Sectors"), rows)
+        book.close()
+    assert (tmp_path / 'lists.xlsx').read_bytes() == (tmp_path / 'store.xlsx').read_bytes()
+
+
+def test_smaller_than_lists():
+    def allocated(build):
+        tracemalloc.start()
+        rows = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del rows
+        return size
+
+    def rows():
+        return [[f"SEC-{i:05d}", f"Sector {i % 15}", "Working", "Database", "Real-time data", "2026-01-30"]
+                for i in range(20000)]
+
+    headers = ["ID", "Sector", "Status", "Source", "Notes", "Last Tested"]
+    assert allocated(rows) > 2.5 * allocated(lambda: RowStore(headers, rows(), unique=("ID",)))
@@ -0,0 +1,95 @@
+"""
+Sheet graph: a selection computes only what its sheets need, shared
+datasets are computed once, independent ones load concurrently, and the
+derived sheets see the sheets rendered before them.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import asyncio
+import time
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import RENDERED, Instrumentation, Pipeline, SheetGraph, open_workbook
+
+
+def write_rows(ws, *rows):
+    for row, values in enumerate(rows, start=1):
+        ws.write(f'A{row}', str(values))
+    return [ws]
+
+
+def contents(ws, parts):
+    # Derived: one line per sheet rendered before it
+    return write_rows(ws, *parts)
+
+
+def build(calls, delay=0):
+    def load(name):
+        calls.append(name)
+        time.sleep(delay)
+        return [name] * 3
+
+    graph = SheetGraph()
+    frame = graph.dataset("Load frame", load, 'frame', lane='source')
+    events = graph.dataset("Load events", load, 'events', lane='events')
+    joined = graph.dataset("Join", lambda *parts: calls.append('join') or sum(parts, []), frame, events)
+    graph.sheet("Quality", write_rows, frame)
+    graph.sheet("Events", write_rows, joined)
+    graph.sheet("API", write_rows, "static")
+    graph.sheet("Overview", contents, RENDERED, index=0)
+    return graph
+
+
+def test_selection_computes_what_it_needs(tmp_path):
+    calls = []
+    graph = build(calls)
+    assert [node.name for node in graph.required(["Quality", "Overview"])] == ["Load frame", "Quality", "Overview"]
+
+    book = open_workbook(tmp_path / 'partial.xlsx', timestamp=None)
+    rendered = graph.run(book, selected=["Quality", "Overview"])
+    book.close()
+    assert calls == ['frame'] and list(rendered) == ["Quality", "Overview"]
+    ws = load_workbook(tmp_path / 'partial.xlsx')["Overview"]
+    assert ws['A1'].value == "Quality"
+    assert graph.value(graph.nodes["Load events"]) is None
+
+    with pytest.raises(ValueError, match="Unknown sheet 'Trends'"):
+        graph.required(["Trends"])
+    with pytest.raises(ValueError, match="only depend on datasets"):
+        graph.dataset("Counts", len, graph.nodes["Quality"])
+
+
+def test_shared_datasets_load_once_and_concurrently(tmp_path):
+    calls = []
+    graph = build(calls, delay=0.3)
+    metrics = Instrumentation('test')
+    book = open_workbook(tmp_path / 'full.xlsx', timestamp=None)
+    started = time.perf_counter()
+    with Pipeline() as pipeline:
+        graph.run(book, pipeline, metrics)
+    elapsed = time.perf_counter() - started
+    book.close()
+    # Both loads on their own lanes at once, `frame` read by two nodes
+    assert sorted(calls) == ['events', 'frame', 'join'] and elapsed < 0.55
+    assert load_workbook(tmp_path / 'full.xlsx').sheetnames == ["Overview", "Quality", "Events", "API"]
+    # The wait for a dataset is a step of its own
+    assert [step['name'] for step in metrics.steps] == ["Load frame", "Quality", "Join", "Events", "API", "Overview"]
+    assert graph.value(graph.nodes["Join"]) == ['frame'] * 3 + ['events'] * 3
+
+
+def test_optional_sheets_and_coroutines(tmp_path):
+    async def probe():
+        await asyncio.sleep(0)
+        return None
+
+    graph = SheetGraph()
+    missing = graph.dataset("Probe", probe)
+    graph.sheet("Health", write_rows, missing, optional=True)
+    graph.sheet("Notes", write_rows, missing)
+    book = open_workbook(tmp_path / 'optional.xlsx', timestamp=None)
+    # Without a pipeline the coroutine runs when first needed
+    assert list(graph.run(book)) == ["Notes"]
+    book.close()
@@ -0,0 +1,111 @@
+"""
+Schema model replayed from drizzle migrations, the per-file parse cache and
+the index coverage report.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import json
+
+from yeto_excel import index_report, load_schema, parse_migration
+
+MIGRATIONS = {
+    '0000_init': """CREATE TABLE `sources` (
+	`id` int AUTO_INCREMENT NOT NULL,
+	`name` varchar(255) NOT NULL,
+	`tier` enum('T0','T1','T2, T3') DEFAULT 'T1',
+	CONSTRAINT `sources_id` PRIMARY KEY(`id`)
+);
+--> statement-breakpoint
+CREATE TABLE `time_series` (
+	`id` int AUTO_INCREMENT NOT NULL,
+	`indicatorCode` varchar(100) NOT NULL,
+	`regimeTag` enum('aden_irg','sanaa_defacto') NOT NULL,
+	`date` timestamp NOT NULL DEFAULT (now()),
+	`sourceId` int NOT NULL,
+	`notes` text,
+	CONSTRAINT `time_series_id` PRIMARY KEY(`id`),
+	CONSTRAINT `indicator_regime_date_unique` UNIQUE(`indicatorCode`,`regimeTag`,`date`)
+);
+--> statement-breakpoint
+ALTER TABLE `time_series` ADD CONSTRAINT `time_series_sourceId_sources_id_fk` FOREIGN KEY (`sourceId`) REFERENCES `sources`(`id`) ON DELETE no action ON UPDATE no action;--> statement-breakpoint
+CREATE INDEX `date_idx` ON `time_series` (`date`);--> statement-breakpoint
+CREATE INDEX `notes_idx` ON `time_series` (`notes`);""",
+    '0001_changes': """ALTER TABLE `time_series` MODIFY COLUMN `notes` varchar(500);--> statement-breakpoint
+ALTER TABLE `time_series` ADD `unit` varchar(50) NOT NULL;--> statement-breakpoint
+DROP INDEX `notes_idx` ON `time_series`;--> statement-breakpoint
+ALTER TABLE `sources` DROP COLUMN `tier`;""",
+}
+
+ACCESS_PATHS = (
+    ('time_series', ('indicatorCode', 'date'), "range scans"),
+    ('time_series', ('indicatorCode', 'regimeTag'), "regimes"),
+    ('time_series', ('sourceId',), "per source"),
+    ('time_series', ('unit',), "per unit"),
+    ('events', ('eventDate',), "timeline"),
+)
+
+
+def write_drizzle(directory, migrations=MIGRATIONS):
+    (directory / 'meta').mkdir(parents=True, exist_ok=True)
+    entries = [{'idx': i, 'tag': tag} for i, tag in enumerate(migrations)]
+    (directory / 'meta' / '_journal.json').write_text(json.dumps({'entries': entries}))
+    for tag, text in migrations.items():
+        (directory / f"{tag}.sql").write_text(text)
+
+
+def test_replayed_schema(tmp_path):
+    write_drizzle(tmp_path)
+    schema = load_schema(tmp_path)
+    assert sorted(schema.tables) == ['sources', 'time_series'] and not schema.unparsed
+
+    series = schema.tables['time_series']
+    assert list(series.columns) == ['id', 'indicatorCode', 'regimeTag', 'date', 'sourceId', 'notes', 'unit']
+    assert series.primary_key == ('id',)
+    assert series.columns['date'].default == '(now())' and not series.columns['date'].nullable
+    # A modified column keeps the migration that introduced it
+    assert series.columns['notes'].type == 'varchar(500)' and series.columns['notes'].introduced_in == '0000_init'
+    assert series.columns['unit'].introduced_in == '0001_changes'
+    assert sorted(series.indexes) == ['PRIMARY', 'date_idx', 'indicator_regime_date_unique']
+    assert series.foreign_keys['time_series_sourceId_sources_id_fk'].ref_table == 'sources'
+    assert (series.introduced_in, series.changed_in) == ('0000_init', '0001_changes')
+    assert list(schema.tables['sources'].columns) == ['id', 'name']
+    assert schema.referenced_by() == {'sources': 1}
+
+
+def test_enum_values_do_not_split_columns():
+    operations = parse_migration(MIGRATIONS['0000_init'])
+    tier = next(op for op in operations if op[:3] == ['add_column', 'sources', 'tier'])
+    assert tier == ['add_column', 'sources', 'tier', "enum('T0','T1','T2, T3')", True, "'T1'"]
+
+
+def test_cache_parses_only_changed_migrations(tmp_path):
+    write_drizzle(tmp_path / 'drizzle')
+    cache = tmp_path / 'cache.json'
+    first = load_schema(tmp_path / 'drizzle', cache)
+    assert (first.parsed, first.cached) == (2, 0)
+
+    second = load_schema(tmp_path / 'drizzle', cache)
+    assert (second.parsed, second.cached) == (0, 2)
+    assert second.tables['time_series'].columns == first.tables['time_series'].columns
+
+    changed = dict(MIGRATIONS, **{'0002_events': "CREATE TABLE `events` (\n\t`eventDate` timestamp NOT NULL\n);"})
+    write_drizzle(tmp_path / 'drizzle', changed)
+    third = load_schema(tmp_path / 'drizzle', cache)
+    assert (third.parsed, third.cached) == (1, 2)
+    assert 'events' in third.tables
+
+
+def test_index_report(tmp_path):
+    write_drizzle(tmp_path)
+    report = {(entry['table'], entry['columns']): entry for entry in index_report(load_schema(tmp_path), ACCESS_PATHS)}
+
+    partial = report['time_series', ('indicatorCode', 'date')]
+    assert partial['status'] == 'partial' and partial['covered'] == ('indicatorCode',)
+    assert partial['suggestion'] == ("CREATE INDEX `time_series_indicatorCode_date_idx` ON `time_series` "
+                                     "(`indicatorCode`,`date`);")
+    assert report['time_series', ('indicatorCode', 'regimeTag')]['status'] == 'covered'
+    # MySQL indexes foreign key columns implicitly
+    assert report['time_series', ('sourceId',)]['index'] == 'time_series_sourceId_sources_id_fk'
+    assert report['time_series', ('unit',)]['status'] == 'missing'
+    assert report['events', ('eventDate',)]['status'] == 'no table'
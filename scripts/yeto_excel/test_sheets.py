@@ -0,0 +1,79 @@
+"""
+Spilling sheets: rollover into continuation sheets at a small row limit,
+the preamble repeated on every part, continuation titles and contents
+descriptions, reserved blocks, and a preamble too tall for any data.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import SpillingSheet, continuation_title, continued, open_workbook
+
+
+def preamble(rows):
+    # Title and header on top, data from row `rows + 1`
+    def prepare(ws):
+        ws.write('A1', "Data Sources")
+        for row in range(2, rows + 1):
+            ws.write_row(row, 1, ["ID", "Name"])
+        ws.freeze(f'A{rows + 1}')
+        return rows + 1
+    return prepare
+
+
+def test_rows_spill_into_continuation_sheets(tmp_path):
+    path = tmp_path / 'spill.xlsx'
+    book = open_workbook(path)
+    book.add_sheet("Before")
+    sheet = SpillingSheet(book.add_sheet("Data Sources"), preamble(2), max_rows=6)
+    book.add_sheet("After")
+    for ws, row, number in sheet.rows(range(1, 11)):
+        ws.write_row(row, 1, [number, f"Source {number}"])
+    book.close()
+
+    # Four data rows (3-6) a sheet; continuations follow the sheet they continue
+    assert [ws.title for ws in sheet.sheets] == ["Data Sources", "Data Sources (2)", "Data Sources (3)"]
+    assert [(ws.title, first, last) for ws, first, last in sheet.spans()] == [
+        ("Data Sources", 3, 6), ("Data Sources (2)", 3, 6), ("Data Sources (3)", 3, 4)]
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Before", "Data Sources", "Data Sources (2)", "Data Sources (3)", "After"]
+    for ws, first in zip(sheet.sheets, (1, 5, 9)):
+        part = wb[ws.title]
+        assert part['A1'].value == "Data Sources" and [part['A2'].value, part['B2'].value] == ["ID", "Name"]
+        assert part.freeze_panes == 'A3'
+        assert part['A3'].value == first
+    assert wb["Data Sources (3)"].max_row == 4
+
+
+def test_reserved_blocks_stay_on_one_sheet(tmp_path):
+    book = open_workbook(tmp_path / 'reserve.xlsx')
+    sheet = SpillingSheet(book.add_sheet("Data"), preamble(2), max_rows=6)
+    sheet.append(["a"])
+    sheet.append(["b"])
+    # Three rows do not fit below row 4: the block starts a new part
+    ws, row = sheet.reserve(3)
+    assert (ws.title, row) == ("Data (2)", 3)
+    assert sheet.reserve(3) == (ws, 3)
+    assert [(ws.title, first, last) for ws, first, last in sheet.spans()] == [("Data", 3, 4), ("Data (2)", 3, 2)]
+    book.close()
+
+
+def test_continuation_titles():
+    assert continuation_title("Pages", 2) == "Pages (2)"
+    # Sheet titles stop at 31 characters; the part number is kept
+    long = continuation_title("Comprehensive Source Reconciliation", 12)
+    assert long == "Comprehensive Source Recon (12)" and len(long) == 31
+    assert continued("Observations per source", 1) == "Observations per source"
+    assert continued("Observations per source", 3) == "Observations per source (continued, part 3)"
+
+
+def test_preamble_taller_than_the_limit_is_refused(tmp_path):
+    book = open_workbook(tmp_path / 'tall.xlsx')
+    with pytest.raises(ValueError, match="Sheet preamble of 'Data' leaves no room for data rows"):
+        SpillingSheet(book.add_sheet("Data"), preamble(6), max_rows=6)
+    # The last row of the sheet left for data
+    sheet = SpillingSheet(book.add_sheet("Fits"), preamble(5), max_rows=6)
+    assert [sheet.next_row()[1] for _ in range(3)] == [6, 6, 6]
+    assert [ws.title for ws in sheet.sheets] == ["Fits", "Fits (2)", "Fits (3)"]
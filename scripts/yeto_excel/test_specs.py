@@ -0,0 +1,63 @@
+"""
+Compiled sheet specs: per-column styles, status and rule variants, and the
+preamble a plan writes on every (continuation) sheet.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+from openpyxl import load_workbook
+
+from yeto_excel import CellStyle, Column, SheetSpec, compile_spec, open_workbook, overlay
+
+HEADER = CellStyle(bold=True, fill='107040')
+CELL = CellStyle(font_color='2D2D2D', border=True)
+OK = CellStyle(font_color='107040')
+WARN = CellStyle(font_color='CC6600')
+
+SPEC = SheetSpec([
+    Column("Table", 20),
+    Column("Records", 12, CellStyle(number_format='#,##0')),
+    Column("Status", 12, rules=(('✓', OK), (None, WARN))),
+    Column("Tier", 8, status={"T0": CellStyle(fill='FFD700')}),
+], start_col=2, header_row=4, header_style=HEADER, cell_style=CELL, stripe='F5F5F5', title="Audit", freeze='C')
+
+
+def test_overlay_keeps_unpatched_fields():
+    assert overlay(CELL, OK) == CELL._replace(font_color='107040')
+    assert overlay(CELL, None) is CELL
+    assert overlay(None, OK) is OK
+
+
+def test_styles_are_resolved_per_column_and_row_parity():
+    plan = compile_spec(SPEC)
+    odd = plan.styles(5, ("sources", 178, "✓ Active", "T1"))
+    assert odd == [CELL, CELL._replace(number_format='#,##0'), CELL._replace(font_color='107040'), CELL]
+    even = plan.styles(6, ("gaps", 0, "⚠ Empty", "T0"))
+    assert even[1] == CELL._replace(number_format='#,##0', fill='F5F5F5')
+    assert even[2] == CELL._replace(font_color='CC6600', fill='F5F5F5')
+    assert even[3] == CELL._replace(fill='FFD700')
+    # Without status columns every row reuses one precomputed list
+    plain = compile_spec(SPEC._replace(columns=SPEC.columns[:2]))
+    assert plain.styles(5, ("a", 1)) is plain.styles(7, ("b", 2))
+
+
+def test_render_writes_preamble_on_every_part(tmp_path):
+    path = tmp_path / 'specs.xlsx'
+    book = open_workbook(path)
+    plan = compile_spec(SPEC._replace(sparse=True))
+    sheet = plan.sheet(book.add_sheet("Data"), "subtitle", max_rows=7)
+    for ws, row, values in sheet.rows([(f"t{i}", i, "✓", None) for i in range(5)]):
+        plan.write(ws, row, values)
+    book.close()
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Data", "Data (2)"]
+    for ws in wb:
+        assert ws['B2'].value == "Audit" and ws['B3'].value == "subtitle"
+        assert [cell.value for cell in ws[4][1:5]] == ["Table", "Records", "Status", "Tier"]
+        assert ws.freeze_panes == 'C5' and ws.column_dimensions['C'].width == 12
+    first = wb["Data"]
+    assert first['C6'].value == 1 and first['C6'].number_format == '#,##0'
+    assert first['D6'].font.color.rgb.endswith('107040') and first['D6'].fill.fgColor.rgb.endswith('F5F5F5')
+    # Sparse plans leave None values unwritten
+    assert first['E5'].value is None and not first['E5'].has_style
@@ -0,0 +1,82 @@
+"""
+t-digest accuracy against exact numpy quantiles, and ETL stats from a
+streamed SQLite run log.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from yeto_excel import TDigest, connect, etl_performance
+
+VALUES = np.random.default_rng(7).lognormal(8, 1.2, 200_000)
+
+
+def rank_error(digest, q):
+    return abs((VALUES < digest.quantile(q)).mean() - q)
+
+
+@pytest.mark.parametrize('q', [0.5, 0.95, 0.99])
+def test_quantiles_are_close_to_exact(q):
+    digest = TDigest()
+    for chunk in np.array_split(VALUES, 37):
+        digest.update(chunk)
+    assert rank_error(digest, q) < 0.002
+    assert digest.min == VALUES.min() and digest.max == VALUES.max()
+    assert len(digest) <= digest.compression
+
+
+def test_merged_digests_match_a_single_stream():
+    merged = TDigest()
+    for part in np.array_split(VALUES, 20):
+        digest = TDigest()
+        for value in part[:100]:
+            digest.add(value)
+        digest.update(part[100:])
+        merged.merge(digest)
+    assert merged.count == len(VALUES)
+    for q in (0.5, 0.95, 0.99):
+        assert rank_error(merged, q) < 0.002
+
+
+def test_empty_digest():
+    assert np.isnan(TDigest().quantile(0.5))
+
+
+def test_etl_performance_from_streamed_runs(tmp_path):
+    path = tmp_path / 'etl.db'
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE ingestion_runs (id INTEGER PRIMARY KEY, connectorName TEXT, status TEXT, "
+                       "startedAt TEXT, completedAt TEXT, duration INTEGER, recordsFetched INTEGER)")
+    connection.execute("CREATE TABLE scheduler_run_history (id INTEGER PRIMARY KEY, jobName TEXT, status TEXT, "
+                       "startedAt TEXT, completedAt TEXT, duration INTEGER, recordsProcessed INTEGER)")
+    connection.execute("CREATE TABLE scheduler_jobs (id INTEGER PRIMARY KEY, jobName TEXT, jobType TEXT, "
+                       "lastRunAt TEXT, lastRunStatus TEXT, lastRunDuration INTEGER, runCount INTEGER, failCount INTEGER)")
+    connection.executemany("INSERT INTO ingestion_runs VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (i, 'cby' if i % 2 else 'imf', 'failed' if i % 10 == 0 else 'success',
+         f"2026-01-{1 + i % 28:02d}T00:00:00.000Z", None, 1000 * (1 + i % 100), 50)
+        for i in range(1, 2001)
+    ] + [(2001, 'cby', 'running', '2026-01-30T00:00:00.000Z', None, None, 0)])
+    connection.execute("INSERT INTO scheduler_run_history VALUES "
+                       "(1, 'fx_update', 'success', '2026-01-29T00:00:00.000Z', '2026-01-29T00:00:04.000Z', NULL, 8)")
+    connection.execute("INSERT INTO scheduler_jobs VALUES (1, 'fx_update', 'data_refresh', NULL, NULL, NULL, 12, 3)")
+    connection.commit()
+    connection.close()
+
+    connectors, jobs = etl_performance(connect(f"sqlite:///{path}", batch_size=128), 128)
+    cby, imf, total = connectors
+    assert (cby.name, imf.name, total.name) == ('cby', 'imf', "All connectors")
+    assert cby.runs == imf.runs == 1000 and total.runs == 2000
+    assert total.failed == 200 and total.failure_rate == 0.1
+    p50, p95, p99, slowest = total.quantiles_seconds()
+    assert abs(p50 - 50.5) < 2 and abs(p95 - 95.5) < 2 and slowest == 100
+    assert total.throughput == pytest.approx(100_000 / total.duration_ms * 1000)
+
+    fx_update, all_jobs = jobs
+    # Lifetime counters win over the (pruned) history; the duration comes from the timestamps
+    assert (fx_update.job_type, fx_update.runs, fx_update.failed) == ('data_refresh', 12, 3)
+    assert fx_update.quantiles_seconds() == [4.0, 4.0, 4.0, 4.0]
+    assert all_jobs.runs == 12
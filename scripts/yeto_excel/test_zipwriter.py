@@ -0,0 +1,105 @@
+"""
+ParallelZipFile output checked with zipfile and openpyxl.
+
+Run with: python -m pytest scripts/yeto_excel
+"""
+
+import io
+import zipfile
+
+import pytest
+from openpyxl import load_workbook
+
+from yeto_excel import CellStyle, ParallelZipFile, open_workbook
+
+# Repetitive but not constant, like sheet XML
+PART = b''.join(b'<row r="%d"><c t="n"><v>%d</v></c></row>' % (i, i * 7919 % 104729) for i in range(20000))
+
+
+class Pipe(io.RawIOBase):
+    """Write-only, non-seekable sink."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def getvalue(self):
+        return b''.join(self.chunks)
+
+
+@pytest.mark.parametrize('level', [0, 1, 6, 9])
+def test_chunked_parts_round_trip(tmp_path, level):
+    path = tmp_path / 'parts.zip'
+    source = tmp_path / 'sheet1.xml'
+    source.write_bytes(PART[::-1])
+    with ParallelZipFile(path, level, workers=4, chunk_size=4096) as archive:
+        archive.writestr('xl/worksheets/sheet2.xml', PART)
+        archive.writestr('empty.xml', b'')
+        archive.writestr(zipfile.ZipInfo('[Content_Types].xml', (1980, 1, 1, 0, 0, 0)), '<Types/>')
+        archive.write(source, 'xl/worksheets/sheet1.xml')
+        archive.write_stream('xl/styles.xml', io.BytesIO(PART[:5000]))
+        assert archive.namelist()[0] == 'xl/worksheets/sheet2.xml'
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert archive.read('xl/worksheets/sheet2.xml') == PART
+        assert archive.read('xl/worksheets/sheet1.xml') == PART[::-1]
+        assert archive.read('empty.xml') == b''
+        assert archive.read('xl/styles.xml') == PART[:5000]
+        assert archive.getinfo('[Content_Types].xml').date_time == (1980, 1, 1, 0, 0, 0)
+        info = archive.getinfo('xl/worksheets/sheet2.xml')
+        assert info.compress_type == (zipfile.ZIP_STORED if level == 0 else zipfile.ZIP_DEFLATED)
+        if level:
+            assert info.compress_size < info.file_size / 4
+
+
+def test_chunking_costs_little_ratio():
+    # Each chunk is primed with the previous 32 KiB, so splitting barely
+    # changes the compressed size
+    sizes = []
+    for chunk_size in (1 << 24, 1 << 16):
+        sink = io.BytesIO()
+        with ParallelZipFile(sink, 6, chunk_size=chunk_size) as archive:
+            archive.writestr('part.xml', PART)
+        sizes.append(len(sink.getvalue()))
+    assert sizes[1] < sizes[0] * 1.02
+
+
+def test_non_seekable_sink_uses_data_descriptors():
+    sink = Pipe()
+    with ParallelZipFile(sink, chunk_size=8192) as archive:
+        archive.writestr('a.xml', PART)
+        archive.writestr('b.xml', b'<b/>')
+    with zipfile.ZipFile(io.BytesIO(sink.getvalue())) as archive:
+        assert archive.testzip() is None
+        assert archive.getinfo('a.xml').flag_bits & 0x08
+        assert archive.read('a.xml') == PART
+
+
+@pytest.mark.parametrize('engine', ['openpyxl', 'xlsxwriter'])
+def test_workbooks_save_to_file_like_sinks(engine):
+    if engine == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+    sink = io.BytesIO()
+    book = open_workbook(sink, engine, compression=1, workers=2)
+    ws = book.add_sheet("Data")
+    ws.write_row(1, 1, ["Indicator", "Value"], CellStyle(bold=True))
+    for row in range(2, 2002):
+        ws.write_row(row, 1, [f"CODE_{row}", row * 1.5])
+    book.close()
+
+    wb = load_workbook(io.BytesIO(sink.getvalue()))
+    assert wb.sheetnames == ["Data"]
+    assert wb["Data"]["A1"].font.b
+    assert wb["Data"]["B2001"].value == 2001 * 1.5
+
+
+def test_invalid_level_is_rejected():
+    with pytest.raises(ValueError):
+        ParallelZipFile(io.BytesIO(), 10)
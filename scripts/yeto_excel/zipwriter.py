@@ -0,0 +1,217 @@
+"""
+Parallel-deflate ZIP writer for saving workbooks.
+
+An .xlsx file is a ZIP package whose size is dominated by a few large sheet
+XML parts. zipfile deflates every part in a single thread; ParallelZipFile
+splits each part into chunks and deflates them on a thread pool (zlib
+releases the GIL). As in pigz, every chunk is primed with the last 32 KiB of
+the previous one and flushed to a byte boundary, so the chunks join into one
+ordinary deflate stream that any unzip tool, Excel or LibreOffice reads
+back.
+
+ParallelZipFile implements the subset of zipfile.ZipFile that the openpyxl
+packager calls (`writestr`, `write`, `namelist`, `close`), plus `write_stream`
+to copy a part from an open file such as another archive's member, and writes
+to a path or to any binary file-like object. Sinks that cannot seek (pipes,
+sockets, HTTP responses) get data descriptors after each part instead of
+patched local headers. A path is written to a temporary file and renamed into
+place on close, so readers never see a partial workbook and a path that is a
+hard link (see artifacts.ArtifactStore) is replaced rather than overwritten.
+With `date_time` every part carries that fixed modification time, which
+together with the packagers' fixed part order makes the archive a pure
+function of its contents. ZIP64 is not supported: parts and the archive must
+stay under 4 GiB, which is far beyond what Excel opens anyway.
+"""
+
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZIP_DEFLATED, ZIP_STORED, LargeZipFile, ZipInfo
+
+DEFAULT_COMPRESSION = 6
+CHUNK_SIZE = 1 << 20
+WINDOW_SIZE = 1 << 15
+
+ZIP_LIMIT = 0xFFFFFFFF
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+END_OF_ARCHIVE = struct.Struct('<4s4H2LH')
+DATA_DESCRIPTOR = struct.Struct('<4sLLL')
+
+
+def _deflate(chunk, level, zdict, final):
+    options = {'zdict': zdict} if zdict else {}
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, **options)
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _dos_time(date_time):
+    year, month, day, hour, minute, second = date_time[:6]
+    return (hour << 11) | (minute << 5) | (second // 2), ((max(year, 1980) - 1980) << 9) | (month << 5) | day
+
+
+class ParallelZipFile:
+    """Write-only ZIP archive whose parts are deflated on a thread pool."""
+
+    def __init__(self, file, compresslevel=DEFAULT_COMPRESSION, workers=None, chunk_size=CHUNK_SIZE, date_time=None):
+        if not 0 <= compresslevel <= 9:
+            raise ValueError(f"Compression level must be between 0 (stored) and 9, not {compresslevel}")
+        self.level = compresslevel
+        self.compression = ZIP_STORED if compresslevel == 0 else ZIP_DEFLATED
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.date_time = tuple(date_time[:6]) if date_time is not None else None
+        if isinstance(file, (str, os.PathLike)):
+            self.path = os.fspath(file)
+            self._temporary = f"{self.path}.{os.getpid()}.tmp"
+            self.fp = open(self._temporary, 'wb')
+        else:
+            self.path = self._temporary = None
+            self.fp = file
+        try:
+            self.seekable = self.fp.seekable()
+            self._start = self.fp.tell() if self.seekable else 0
+        except (AttributeError, OSError):
+            self.seekable = False
+            self._start = 0
+        self.offset = 0
+        self.entries = []
+        self._pool = None
+
+    # zipfile.ZipFile API -----------------------------------------------------
+
+    def writestr(self, zinfo_or_arcname, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        zinfo = self._zinfo(zinfo_or_arcname, time.localtime(time.time())[:6])
+        view = memoryview(data)
+        self._write_part(zinfo, (view[i:i + self.chunk_size] for i in range(0, len(view), self.chunk_size)))
+
+    def write(self, filename, arcname=None):
+        date_time = time.localtime(os.stat(filename).st_mtime)[:6]
+        zinfo = self._zinfo(arcname or os.path.basename(filename), date_time)
+        with open(filename, 'rb') as part:
+            self.write_stream(zinfo, part)
+
+    def write_stream(self, zinfo_or_arcname, stream):
+        """Write the rest of binary file object `stream` as a part, a chunk at a time."""
+        zinfo = self._zinfo(zinfo_or_arcname, time.localtime(time.time())[:6])
+        self._write_part(zinfo, iter(lambda: stream.read(self.chunk_size), b''))
+
+    def namelist(self):
+        return [entry[0].decode('utf-8') for entry in self.entries]
+
+    def close(self):
+        if self.fp is None:
+            return
+        complete = False
+        try:
+            self._write_central_directory()
+            self.fp.flush()
+            complete = True
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+            if self._temporary is not None:
+                self.fp.close()
+                if complete:
+                    os.replace(self._temporary, self.path)
+                else:
+                    os.remove(self._temporary)
+            self.fp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ------------------------------------------------------------------------
+
+    def _zinfo(self, zinfo_or_arcname, date_time):
+        if isinstance(zinfo_or_arcname, ZipInfo):
+            return zinfo_or_arcname
+        return ZipInfo(zinfo_or_arcname, date_time)
+
+    def _emit(self, data):
+        self.fp.write(data)
+        self.offset += len(data)
+
+    def _compressed(self, chunks):
+        """Yield (raw, compressed) pairs in order, keeping the pool busy."""
+        if self.level == 0:
+            for chunk in chunks:
+                yield chunk, chunk
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='deflate')
+        pending = deque()
+        zdict = None
+        chunk = next(chunks, None)
+        if chunk is None:
+            yield b'', _deflate(b'', self.level, None, True)
+            return
+        while chunk is not None:
+            following = next(chunks, None)
+            pending.append((chunk, self._pool.submit(_deflate, chunk, self.level, zdict, following is None)))
+            zdict = bytes(chunk[-WINDOW_SIZE:])
+            chunk = following
+            # Bound the chunks in flight so memory stays flat on huge parts
+            if len(pending) >= 2 * self.workers:
+                raw, future = pending.popleft()
+                yield raw, future.result()
+        while pending:
+            raw, future = pending.popleft()
+            yield raw, future.result()
+
+    def _write_part(self, zinfo, chunks):
+        name = zinfo.filename.encode('utf-8')
+        flags = FLAG_UTF8 if not zinfo.filename.isascii() else 0
+        if not self.seekable:
+            flags |= FLAG_DATA_DESCRIPTOR
+        dos_time, dos_date = _dos_time(self.date_time or zinfo.date_time)
+        header_offset = self.offset
+        if header_offset > ZIP_LIMIT:
+            raise LargeZipFile("Archive larger than 4 GiB; ZIP64 is not supported")
+
+        def local_header(crc, compressed_size, size):
+            return LOCAL_HEADER.pack(b'PK\x03\x04', 20, 0, flags, self.compression, dos_time, dos_date,
+                                     crc, compressed_size, size, len(name), 0) + name
+
+        self._emit(local_header(0, 0, 0))
+        crc = size = compressed_size = 0
+        for raw, data in self._compressed(chunks):
+            crc = zlib.crc32(raw, crc)
+            size += len(raw)
+            compressed_size += len(data)
+            self._emit(data)
+        if max(size, compressed_size) > ZIP_LIMIT:
+            raise LargeZipFile(f"Part '{zinfo.filename}' larger than 4 GiB; ZIP64 is not supported")
+
+        if self.seekable:
+            end = self.fp.tell()
+            self.fp.seek(self._start + header_offset)
+            self.fp.write(local_header(crc, compressed_size, size))
+            self.fp.seek(end)
+        else:
+            self._emit(DATA_DESCRIPTOR.pack(b'PK\x07\x08', crc, compressed_size, size))
+        self.entries.append((name, flags, dos_time, dos_date, crc, compressed_size, size,
+                             zinfo.external_attr or (0o600 << 16), header_offset))
+
+    def _write_central_directory(self):
+        directory_offset = self.offset
+        for name, flags, dos_time, dos_date, crc, compressed_size, size, external_attr, header_offset in self.entries:
+            self._emit(CENTRAL_HEADER.pack(
+                b'PK\x01\x02', 20, 3, 20, 0, flags, self.compression, dos_time, dos_date,
+                crc, compressed_size, size, len(name), 0, 0, 0, 0, external_attr, header_offset,
+            ) + name)
+        if len(self.entries) > 0xFFFF or self.offset > ZIP_LIMIT:
+            raise LargeZipFile("Too many parts or archive larger than 4 GiB; ZIP64 is not supported")
+        self._emit(END_OF_ARCHIVE.pack(b'PK\x05\x06', 0, 0, len(self.entries), len(self.entries),
+                                       self.offset - directory_offset, directory_offset, 0))